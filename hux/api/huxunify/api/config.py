@@ -9,6 +9,7 @@ Decouple always searches for Options in this order:
 from pathlib import Path, PurePath
 from typing import Union
 from decouple import config
+from huxunifylib.database import constants as db_c
 from huxunify.api import constants as api_c
 
 
@@ -20,6 +21,14 @@ class Config:
 
     # Cloud Provider
     CLOUD_PROVIDER = config(api_c.CLOUD_PROVIDER, default="")
+    # streamed uploads keep at most CLOUD_UPLOAD_CONCURRENCY parts of
+    # CLOUD_UPLOAD_PART_SIZE bytes in flight, S3 parts are at least 5 MiB.
+    CLOUD_UPLOAD_PART_SIZE = config(
+        api_c.CLOUD_UPLOAD_PART_SIZE, default=8 * 1024 * 1024, cast=int
+    )
+    CLOUD_UPLOAD_CONCURRENCY = config(
+        api_c.CLOUD_UPLOAD_CONCURRENCY, default=4, cast=int
+    )
 
     # Azure Config
     AZURE_BATCH_ACCOUNT_NAME = config(
@@ -109,6 +118,81 @@ class Config:
     OKTA_REDIRECT_URI = config(api_c.OKTA_REDIRECT_URI, default="")
     OKTA_TEST_USER_NAME = config(api_c.OKTA_TEST_USER_NAME, default="")
     OKTA_TEST_USER_PW = config(api_c.OKTA_TEST_USER_PW, default="")
+    # seconds a token introspection/userinfo result is cached for, capped by
+    # the token expiry, set to 0 to disable the token cache.
+    OKTA_TOKEN_CACHE_TTL = config(
+        api_c.OKTA_TOKEN_CACHE_TTL, default=300, cast=int
+    )
+    OKTA_TOKEN_CACHE_SIZE = config(
+        api_c.OKTA_TOKEN_CACHE_SIZE, default=10000, cast=int
+    )
+    # share cached token results across workers via the mongo cache.
+    OKTA_TOKEN_CACHE_SHARED = config(
+        api_c.OKTA_TOKEN_CACHE_SHARED, default=True, cast=bool
+    )
+    # validate access tokens by calling the OKTA introspect endpoint
+    # (introspect) or locally against the cached issuer signing keys (jwks).
+    # with jwks, the user info is read from the sub, email, name and role
+    # claims of the token, the OKTA userinfo endpoint is only called for
+    # tokens without the email and name claims.
+    OKTA_TOKEN_VALIDATION = config(
+        api_c.OKTA_TOKEN_VALIDATION, default=api_c.OKTA_VALIDATION_INTROSPECT
+    )
+    OKTA_AUDIENCE = config(api_c.OKTA_AUDIENCE, default=OKTA_ISSUER)
+    OKTA_JWKS_REFRESH_INTERVAL = config(
+        api_c.OKTA_JWKS_REFRESH_INTERVAL, default=3600, cast=int
+    )
+
+    # seconds a resolved user document is cached for per worker, user
+    # writes invalidate the entry, set to 0 to disable the user cache.
+    USER_CACHE_TTL = config(api_c.USER_CACHE_TTL, default=30, cast=int)
+    USER_CACHE_SIZE = config(api_c.USER_CACHE_SIZE, default=10000, cast=int)
+
+    # in-process cache in front of the mongo cache collection, entries never
+    # outlive the mongo entry.
+    CACHE_L1_ENABLED = config(api_c.CACHE_L1_ENABLED, default=True, cast=bool)
+    CACHE_L1_TTL = config(api_c.CACHE_L1_TTL, default=60, cast=int)
+    # seconds tagged entries are kept in process. Invalidating a tag only
+    # clears the cache of the worker that wrote, so other workers may serve
+    # a tagged entry for up to this long after the write.
+    CACHE_L1_TAGGED_TTL = config(
+        api_c.CACHE_L1_TAGGED_TTL, default=5, cast=int
+    )
+    CACHE_L1_SIZE = config(api_c.CACHE_L1_SIZE, default=1024, cast=int)
+    CACHE_L1_MAX_BYTES = config(
+        api_c.CACHE_L1_MAX_BYTES, default=64 * 1024 * 1024, cast=int
+    )
+    # seconds a worker waits on another worker recomputing a cache entry
+    # before computing it itself.
+    CACHE_LEASE_WAIT_SECONDS = config(
+        api_c.CACHE_LEASE_WAIT_SECONDS, default=5, cast=float
+    )
+    # refresh ahead cache entries are served stale after this many seconds
+    # while a bounded pool of background workers recomputes them.
+    CACHE_STALE_AFTER_SECONDS = config(
+        api_c.CACHE_STALE_AFTER_SECONDS, default=900, cast=int
+    )
+    CACHE_REFRESH_WORKERS = config(
+        api_c.CACHE_REFRESH_WORKERS, default=4, cast=int
+    )
+    CACHE_REFRESH_QUEUE_SIZE = config(
+        api_c.CACHE_REFRESH_QUEUE_SIZE, default=64, cast=int
+    )
+    # codec for large cache values, zstd needs the zstandard package and
+    # falls back to zlib without it. compressed values larger than the
+    # chunk size are split across documents.
+    CACHE_CODEC = config(api_c.CACHE_CODEC, default=db_c.CACHE_CODEC_ZLIB)
+    CACHE_CHUNK_SIZE = config(
+        api_c.CACHE_CHUNK_SIZE, default=db_c.CACHE_CHUNK_SIZE, cast=int
+    )
+    # independent sections of an endpoint are resolved concurrently, and
+    # left out of the response if they take longer than the timeout.
+    CACHE_SECTION_WORKERS = config(
+        api_c.CACHE_SECTION_WORKERS, default=16, cast=int
+    )
+    CACHE_SECTION_TIMEOUT = config(
+        api_c.CACHE_SECTION_TIMEOUT, default=30, cast=float
+    )
 
     # DECISIONING CONFIGURATION
     DECISIONING_URL = config(api_c.DECISIONING_URL, default="")
@@ -137,6 +221,37 @@ class Config:
 
     CDP_SERVICE = config(api_c.CDP_SERVICE, default="")
     CDP_CONNECTION_SERVICE = config(api_c.CDP_CONNECTION_SERVICE, default="")
+    # seconds CDP insights responses are shared per worker between callers
+    # asking with the same filters, set to 0 to disable.
+    CDP_CACHE_TTL = config(api_c.CDP_CACHE_TTL, default=60, cast=int)
+    CDP_CACHE_SIZE = config(api_c.CDP_CACHE_SIZE, default=256, cast=int)
+    # audience filter sets counted per request to the CDP, set to 0 to count
+    # each audience with its own request.
+    CDP_COUNT_BATCH_SIZE = config(
+        api_c.CDP_COUNT_BATCH_SIZE, default=100, cast=int
+    )
+    # pooled keep-alive HTTP clients of the CDP, CDP connections and OKTA
+    # connectors, requests sent without a timeout use HTTP_TIMEOUT seconds.
+    HTTP_POOL_SIZE = config(api_c.HTTP_POOL_SIZE, default=10, cast=int)
+    HTTP_ASYNC_POOL_SIZE = config(
+        api_c.HTTP_ASYNC_POOL_SIZE, default=100, cast=int
+    )
+    HTTP_RETRIES = config(api_c.HTTP_RETRIES, default=3, cast=int)
+    HTTP_BACKOFF_FACTOR = config(
+        api_c.HTTP_BACKOFF_FACTOR, default=0.3, cast=float
+    )
+    HTTP_TIMEOUT = config(api_c.HTTP_TIMEOUT, default=60, cast=float)
+    # async batches keep at most ASYNC_BATCH_CONCURRENCY requests in flight,
+    # retrying 429 and 5xx responses with jittered backoff.
+    ASYNC_BATCH_CONCURRENCY = config(
+        api_c.ASYNC_BATCH_CONCURRENCY, default=20, cast=int
+    )
+    ASYNC_REQUEST_TIMEOUT = config(
+        api_c.ASYNC_REQUEST_TIMEOUT, default=10, cast=float
+    )
+    ASYNC_REQUEST_RETRIES = config(
+        api_c.ASYNC_REQUEST_RETRIES, default=3, cast=int
+    )
 
     # setting to enable/disable downloading of empty audience file in
     # /audiences/{audience_id}/{download_type} endpoint
@@ -237,6 +352,11 @@ class PyTestConfig(Config):
     # OKTA CONFIGURATION
     OKTA_CLIENT_ID = "test-client-id"
     OKTA_ISSUER = "https://fake.fake"
+    OKTA_TOKEN_CACHE_TTL = 0
+    OKTA_TOKEN_CACHE_SHARED = False
+    OKTA_AUDIENCE = OKTA_ISSUER
+    USER_CACHE_TTL = 0
+    CACHE_L1_ENABLED = False
 
     # JIRA
     JIRA_PROJECT_KEY = "fake-jira-project"
@@ -250,6 +370,7 @@ class PyTestConfig(Config):
     # CDP CONFIGURATION
     CDP_SERVICE = "https://fake.fake.com"
     CDP_CONNECTION_SERVICE = "https://fake.fake.com"
+    CDP_CACHE_TTL = 0
 
     RETURN_EMPTY_AUDIENCE_FILE = config(
         api_c.RETURN_EMPTY_AUDIENCE_FILE, default=False, cast=bool
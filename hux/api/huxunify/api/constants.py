@@ -37,10 +37,42 @@ OKTA_ISSUER = "OKTA_ISSUER"
 OKTA_REDIRECT_URI = "OKTA_REDIRECT_URI"
 OKTA_TEST_USER_NAME = "OKTA_TEST_USER_NAME"
 OKTA_TEST_USER_PW = "OKTA_TEST_USER_PW"
+OKTA_TOKEN_CACHE_TTL = "OKTA_TOKEN_CACHE_TTL"
+OKTA_TOKEN_CACHE_SIZE = "OKTA_TOKEN_CACHE_SIZE"
+OKTA_TOKEN_CACHE_SHARED = "OKTA_TOKEN_CACHE_SHARED"
+OKTA_TOKEN_VALIDATION = "OKTA_TOKEN_VALIDATION"
+OKTA_AUDIENCE = "OKTA_AUDIENCE"
+OKTA_JWKS_REFRESH_INTERVAL = "OKTA_JWKS_REFRESH_INTERVAL"
+USER_CACHE_TTL = "USER_CACHE_TTL"
+USER_CACHE_SIZE = "USER_CACHE_SIZE"
+CACHE_L1_ENABLED = "CACHE_L1_ENABLED"
+CACHE_L1_TTL = "CACHE_L1_TTL"
+CACHE_L1_TAGGED_TTL = "CACHE_L1_TAGGED_TTL"
+CACHE_L1_SIZE = "CACHE_L1_SIZE"
+CACHE_L1_MAX_BYTES = "CACHE_L1_MAX_BYTES"
+CACHE_LEASE_WAIT_SECONDS = "CACHE_LEASE_WAIT_SECONDS"
+CACHE_STALE_AFTER_SECONDS = "CACHE_STALE_AFTER_SECONDS"
+CACHE_REFRESH_WORKERS = "CACHE_REFRESH_WORKERS"
+CACHE_REFRESH_QUEUE_SIZE = "CACHE_REFRESH_QUEUE_SIZE"
+CACHE_CODEC = "CACHE_CODEC"
+CACHE_CHUNK_SIZE = "CACHE_CHUNK_SIZE"
+CACHE_SECTION_WORKERS = "CACHE_SECTION_WORKERS"
+CACHE_SECTION_TIMEOUT = "CACHE_SECTION_TIMEOUT"
 RETURN_EMPTY_AUDIENCE_FILE = "RETURN_EMPTY_AUDIENCE_FILE"
 JSON_SORT_KEYS_CONST = "JSON_SORT_KEYS"
 CDP_SERVICE = "CDP_SERVICE"
 CDP_CONNECTION_SERVICE = "CDP_CONNECTION_SERVICE"
+CDP_CACHE_TTL = "CDP_CACHE_TTL"
+CDP_CACHE_SIZE = "CDP_CACHE_SIZE"
+CDP_COUNT_BATCH_SIZE = "CDP_COUNT_BATCH_SIZE"
+HTTP_POOL_SIZE = "HTTP_POOL_SIZE"
+HTTP_ASYNC_POOL_SIZE = "HTTP_ASYNC_POOL_SIZE"
+HTTP_RETRIES = "HTTP_RETRIES"
+HTTP_BACKOFF_FACTOR = "HTTP_BACKOFF_FACTOR"
+HTTP_TIMEOUT = "HTTP_TIMEOUT"
+ASYNC_BATCH_CONCURRENCY = "ASYNC_BATCH_CONCURRENCY"
+ASYNC_REQUEST_TIMEOUT = "ASYNC_REQUEST_TIMEOUT"
+ASYNC_REQUEST_RETRIES = "ASYNC_REQUEST_RETRIES"
 DECISIONING_URL = "DECISIONING_URL"
 DISABLE_DELIVERIES = "DISABLE_DELIVERIES"
 DISABLE_SCHEDULED_DELIVERIES = "DISABLE_SCHEDULED_DELIVERIES"
@@ -71,6 +103,8 @@ AUDIENCE_ROUTER_CERT_PATH = "../rds-combined-ca-bundle.pem"
 AUDIENCE_ROUTER_MONGO_PASSWORD_FROM = "unifieddb_rw"
 
 CLOUD_PROVIDER = "CLOUD_PROVIDER"
+CLOUD_UPLOAD_PART_SIZE = "CLOUD_UPLOAD_PART_SIZE"
+CLOUD_UPLOAD_CONCURRENCY = "CLOUD_UPLOAD_CONCURRENCY"
 
 # Azure constants
 AZURE_BATCH_ACCOUNT_NAME = "AZURE_BATCH_ACCOUNT_NAME"
@@ -894,6 +928,17 @@ AUTHENTICATION_TOKEN_TYPE_HINT = "token_type_hint"
 OKTA_USER_ID = "user_id"
 OKTA_UID = "uid"
 OKTA_ID_SUB = "sub"
+OKTA_TOKEN_EXPIRY = "exp"
+OKTA_TOKEN_HASH = "okta_token_hash"
+OKTA_TOKEN_LOOKUP = "lookup"
+OKTA_TOKEN_PAYLOAD = "payload"
+OKTA_TOKEN_EXPIRES_AT = "expires_at"
+OKTA_INTROSPECT_LOOKUP = "introspect"
+OKTA_USER_INFO_LOOKUP = "userinfo"
+OKTA_VALIDATION_INTROSPECT = "introspect"
+OKTA_VALIDATION_JWKS = "jwks"
+OKTA_JWKS_KEY_ID = "kid"
+OKTA_JWKS_ALGORITHMS = ["RS256"]
 
 # define access levels for RBAC
 AccessLevel = namedtuple(
@@ -1114,6 +1159,14 @@ CUSTOMERS_INSIGHTS = "customers-insights"
 GEOGRAPHICAL = "geo"
 CUSTOMERS_API_HEADER_KEY = "x-api-key"
 CUSTOMERS_DEFAULT_BATCH_SIZE = 1000
+# bytes of an audience file kept in memory while it waits for its turn in
+# a download zip, the rest is spooled to disk.
+AUDIENCE_FILE_SPOOL_SIZE = 64 * 1024 * 1024
+# bytes of an audience file copied into a download zip at a time.
+AUDIENCE_FILE_CHUNK_SIZE = 1024 * 1024
+# audience files of a download uploaded while the zip is streamed, the
+# others are uploaded from their spool once they are in the zip.
+AUDIENCE_STREAM_UPLOADS = 2
 CUSTOMER_COUNT = "customer_count"
 OPT_IN = "Opt-In"
 OPT_OUT = "Opt-Out"
@@ -1158,6 +1211,14 @@ TIMESTAMP = "timestamp"
 STITCHED = "stitched"
 PINNING = "pinning"
 
+# seconds cache entries of a namespace (cache key endpoint prefix) are kept in
+# the in-process cache, namespaces not listed use the CACHE_L1_TTL config.
+CACHE_L1_NAMESPACE_TTLS = {
+    CUSTOMERS_ENDPOINT: 300,
+    IDR_ENDPOINT: 300,
+    CUSTOMERS_INSIGHTS: 300,
+}
+
 # IDR Matching Trends
 MATCHING_TRENDS = "matching-trends"
 
@@ -1,47 +1,500 @@
 """Purpose of this file is for interacting with caching service."""
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from typing import Union, Callable, Tuple
 
-from typing import Union, Callable
+import bson
+from bson.errors import InvalidDocument
 
 from huxunifylib.util.general.logging import logger
+from huxunifylib.database import constants as db_c
 from huxunifylib.database.cache_management import (
-    get_cache_entry,
+    get_cache_document,
     create_cache_entry,
+    get_cache_key_digest,
+    is_cache_document_stale,
+    acquire_cache_lease,
+    release_cache_lease,
+    add_cache_invalidation_listener,
 )
 
-from huxunify.api.route.utils import get_db_client
+from huxunify.api import constants as api_c
+from huxunify.api.config import get_config
+from huxunify.api.data_connectors.memory_cache import MemoryCache
+from huxunify.api.data_connectors.mongo import get_db_client
+from huxunify.api.exceptions import integration_api_exceptions as iae
+from huxunify.api.prometheus import (
+    record_cache_lookup,
+    record_cache_value_size,
+    Caches,
+)
+
+# create_cache_entry keyword arguments.
+STALE_AFTER_SECONDS = "stale_after_seconds"
+CODEC = "codec"
+CHUNK_SIZE = "chunk_size"
+TAGS = "tags"
+
+# seconds between cache lookups while waiting on another worker's lease.
+LEASE_POLL_INTERVAL = 0.25
+
+# cache key digest -> BSON encoded cache value, kept per worker in
+# front of the mongo cache collection. Values are stored encoded so every
+# hit decodes a fresh copy callers are free to mutate.
+local_cache = MemoryCache(
+    Caches.CACHE_L1,
+    max_entries=get_config().CACHE_L1_SIZE,
+    max_bytes=get_config().CACHE_L1_MAX_BYTES,
+)
+# the in-process cache does not index tags, it is cleared on invalidation
+# since writes to tagged documents are rare next to reads. Only the worker
+# invalidating is cleared, so tagged entries are kept in process for at most
+# CACHE_L1_TAGGED_TTL seconds, the staleness bound of the other workers.
+add_cache_invalidation_listener(lambda tags: local_cache.clear())
+
+# bounded pool recomputing stale refresh ahead entries, at most
+# CACHE_REFRESH_QUEUE_SIZE distinct keys are pending at a time.
+refresh_executor = ThreadPoolExecutor(
+    max_workers=get_config().CACHE_REFRESH_WORKERS,
+    thread_name_prefix="cache_refresh",
+)
+refresh_pending = set()
+refresh_lock = threading.Lock()
+
+# pool resolving the independent sections of an endpoint concurrently.
+section_executor = ThreadPoolExecutor(
+    max_workers=get_config().CACHE_SECTION_WORKERS,
+    thread_name_prefix="cache_section",
+)
 
 
 class Caching:
     """Interact with Caching Service."""
 
+    @staticmethod
+    def get_local_key(cache_key: Union[dict, str]) -> Union[str, None]:
+        """Get the in-process cache key of a cache entry.
+
+        Args:
+            cache_key (dict, str): Cache key.
+
+        Returns:
+            Union[str, None]: Digest of the canonical cache key, None if the
+                key can not be serialized.
+        """
+
+        try:
+            return get_cache_key_digest(cache_key)
+        except TypeError:
+            logger.warning("Cache key can not be cached in process.")
+        return None
+
+    @staticmethod
+    def get_local_ttl(
+        cache_key: Union[dict, str],
+        expire_time: Union[datetime, None],
+        tagged: bool = False,
+    ) -> float:
+        """Get the seconds a cache entry is kept in the in-process cache,
+        based on its namespace and capped by the mongo entry expiry. Tagged
+        entries are capped by CACHE_L1_TAGGED_TTL, since tag invalidations
+        do not reach the in-process cache of other workers.
+
+        Args:
+            cache_key (dict, str): Cache key.
+            expire_time (Union[datetime, None]): Expiry of the mongo entry.
+            tagged (bool): The entry has tags.
+
+        Returns:
+            float: Seconds to keep the entry in process, 0 to skip it.
+        """
+
+        if expire_time is None:
+            return 0
+
+        endpoint = (
+            cache_key.get(api_c.ENDPOINT, "")
+            if isinstance(cache_key, dict)
+            else cache_key
+        )
+        ttl = api_c.CACHE_L1_NAMESPACE_TTLS.get(
+            str(endpoint).split(".", 1)[0], get_config().CACHE_L1_TTL
+        )
+        if tagged:
+            ttl = min(ttl, get_config().CACHE_L1_TAGGED_TTL)
+
+        return min(ttl, (expire_time - datetime.utcnow()).total_seconds())
+
+    @staticmethod
+    def wait_for_cache_document(
+        database, cache_key: Union[dict, str]
+    ) -> Union[dict, None]:
+        """Poll the cache collection for an entry being recomputed by
+        another worker.
+
+        Args:
+            database (DatabaseClient): A database client.
+            cache_key (dict, str): Cache key.
+
+        Returns:
+            Union[dict, None]: Cache document, None if it was not written
+                within CACHE_LEASE_WAIT_SECONDS.
+        """
+
+        deadline = time.monotonic() + get_config().CACHE_LEASE_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(LEASE_POLL_INTERVAL)
+            document = get_cache_document(database, cache_key)
+            if document and document.get(db_c.CONSTANT_VALUE):
+                return document
+        return None
+
+    @staticmethod
+    def store(
+        database,
+        cache_key: Union[dict, str],
+        data: Union[list, dict],
+        entry_options: dict = None,
+    ) -> None:
+        """Write a cache entry, recording the sizes of compressed values.
+
+        Args:
+            database (DatabaseClient): A database client.
+            cache_key (dict, str): Cache key.
+            data (Union[list, dict]): Data to be cached.
+            entry_options (dict): Keyword arguments for create_cache_entry,
+                such as stale_after_seconds and codec.
+        """
+
+        entry_options = entry_options or {}
+        sizes = create_cache_entry(
+            database=database,
+            cache_key=cache_key,
+            cache_value=data,
+            **entry_options,
+        )
+        if sizes:
+            record_cache_value_size(entry_options[CODEC], sizes)
+
+    @staticmethod
+    def recompute(
+        database,
+        cache_key: Union[dict, str],
+        method: Callable,
+        keyword_arguments: dict,
+        entry_options: dict = None,
+    ) -> Tuple[Union[list, dict], datetime]:
+        """Recompute a missing cache entry. Only the worker holding the
+        lease for the key calls the method, others wait for its result and
+        fall back to calling the method themselves if it takes too long.
+
+        Args:
+            database (DatabaseClient): A database client.
+            cache_key (dict, str): Cache key.
+            method (Callable): Method to retrieve data.
+            keyword_arguments (dict): Keyword arguments for method.
+            entry_options (dict): Keyword arguments for create_cache_entry.
+
+        Returns:
+            Tuple[Union[list, dict], datetime]: Data and the time it is
+                fresh until.
+        """
+
+        owner = uuid.uuid4().hex
+        leased = acquire_cache_lease(database, cache_key, owner)
+
+        if not leased:
+            logger.info("Cache entry is being recomputed, waiting for it.")
+            document = Caching.wait_for_cache_document(database, cache_key)
+            if document:
+                return document[db_c.CONSTANT_VALUE], document.get(
+                    db_c.CACHE_STALE_AT, document.get(db_c.EXPIRE_AT)
+                )
+            logger.warning(
+                "Timed out waiting for cache entry, retrieving actual data."
+            )
+
+        logger.info("No cache data available, retrieving actual data")
+        try:
+            data = method(**keyword_arguments)
+            Caching.store(database, cache_key, data, entry_options)
+        finally:
+            if leased:
+                release_cache_lease(database, cache_key, owner)
+
+        stale_after_seconds = (entry_options or {}).get(
+            STALE_AFTER_SECONDS, db_c.CACHE_EXPIRE_AFTER_SECONDS
+        )
+        return data, datetime.utcnow() + timedelta(
+            seconds=min(db_c.CACHE_EXPIRE_AFTER_SECONDS, stale_after_seconds)
+        )
+
+    @staticmethod
+    def refresh(
+        database,
+        cache_key: Union[dict, str],
+        method: Callable,
+        keyword_arguments: dict,
+        entry_options: dict = None,
+    ) -> None:
+        """Recompute a stale cache entry in the background, skipped if
+        another worker holds the lease for the key.
+
+        Args:
+            database (DatabaseClient): A database client.
+            cache_key (dict, str): Cache key.
+            method (Callable): Method to retrieve data.
+            keyword_arguments (dict): Keyword arguments for method.
+            entry_options (dict): Keyword arguments for create_cache_entry.
+        """
+
+        owner = uuid.uuid4().hex
+        if not acquire_cache_lease(database, cache_key, owner):
+            return
+
+        try:
+            data = method(**keyword_arguments)
+            if data:
+                Caching.store(database, cache_key, data, entry_options)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error("Failed to refresh cache entry: %s", exc)
+        finally:
+            release_cache_lease(database, cache_key, owner)
+
+    @staticmethod
+    def schedule_refresh(
+        database,
+        cache_key: Union[dict, str],
+        method: Callable,
+        keyword_arguments: dict,
+        entry_options: dict = None,
+    ) -> Union[Future, None]:
+        """Submit a background refresh of a stale cache entry, unless one is
+        already pending for the key or the refresh queue is full.
+
+        Args:
+            database (DatabaseClient): A database client.
+            cache_key (dict, str): Cache key.
+            method (Callable): Method to retrieve data.
+            keyword_arguments (dict): Keyword arguments for method.
+            entry_options (dict): Keyword arguments for create_cache_entry.
+
+        Returns:
+            Union[Future, None]: Future of the refresh, None if it was not
+                submitted.
+        """
+
+        pending_key = Caching.get_local_key(cache_key) or str(cache_key)
+
+        with refresh_lock:
+            if pending_key in refresh_pending:
+                return None
+            if len(refresh_pending) >= get_config().CACHE_REFRESH_QUEUE_SIZE:
+                logger.warning("Cache refresh queue is full, skipping.")
+                return None
+            refresh_pending.add(pending_key)
+
+        def _refresh() -> None:
+            try:
+                Caching.refresh(
+                    database,
+                    cache_key,
+                    method,
+                    keyword_arguments,
+                    entry_options,
+                )
+            finally:
+                with refresh_lock:
+                    refresh_pending.discard(pending_key)
+
+        return refresh_executor.submit(_refresh)
+
     @staticmethod
     def check_and_return_cache(
         cache_key: Union[dict, str],
         method: Callable,
         keyword_arguments: dict,
+        refresh_ahead: bool = False,
+        compress: bool = False,
+        tags: list = None,
     ) -> Union[list, dict]:
         """Checks for cache to return or creates an entry
         Args:
             cache_key (dict, str): Cache key
             method (Callable): Method to retrieve data if there is no cache
             keyword_arguments (dict): Keyword arguments for method
+            refresh_ahead (bool): Serve the entry after it becomes stale
+                while it is recomputed in the background, so callers only
+                block on the method when there is no entry at all.
+            compress (bool): Store the entry compressed with the CACHE_CODEC
+                codec, for large values.
+            tags (list): Tags of the documents the data depends on, the
+                entry is removed when any of them is updated.
 
         Returns:
             Union [list,dict]: Data to be retrieved
         """
 
+        entry_options = {}
+        if refresh_ahead:
+            entry_options[
+                STALE_AFTER_SECONDS
+            ] = get_config().CACHE_STALE_AFTER_SECONDS
+        if compress:
+            entry_options[CODEC] = get_config().CACHE_CODEC
+            entry_options[CHUNK_SIZE] = get_config().CACHE_CHUNK_SIZE
+        if tags:
+            entry_options[TAGS] = tags
+
+        local_key = (
+            Caching.get_local_key(cache_key)
+            if get_config().CACHE_L1_ENABLED
+            else None
+        )
+
+        if local_key is not None:
+            local_value = local_cache.get(local_key)
+            record_cache_lookup(Caches.CACHE_L1, local_value is not None)
+            if local_value is not None:
+                return bson.decode(local_value)[db_c.CONSTANT_VALUE]
+
         database = get_db_client()
-        data = get_cache_entry(database, cache_key)
+        document = get_cache_document(database, cache_key)
+        data = document.get(db_c.CONSTANT_VALUE) if document else None
 
         if not data:
-            logger.info("No cache data available, retrieving actual data")
-            data = method(**keyword_arguments)
-            create_cache_entry(
-                database=database,
-                cache_key=cache_key,
-                cache_value=data,
+            data, fresh_until = Caching.recompute(
+                database,
+                cache_key,
+                method,
+                keyword_arguments,
+                entry_options,
+            )
+        elif refresh_ahead and is_cache_document_stale(document):
+            logger.info("Cache data is stale, refreshing in the background.")
+            Caching.schedule_refresh(
+                database,
+                cache_key,
+                method,
+                keyword_arguments,
+                entry_options,
             )
+            fresh_until = None
         else:
             logger.info("Cache Data available, retrieving from the cache.")
+            fresh_until = document.get(
+                db_c.CACHE_STALE_AT, document.get(db_c.EXPIRE_AT)
+            )
+
+        if local_key is not None and data:
+            try:
+                local_value = bson.encode({db_c.CONSTANT_VALUE: data})
+                local_cache.set(
+                    local_key,
+                    local_value,
+                    Caching.get_local_ttl(
+                        cache_key, fresh_until, tagged=bool(tags)
+                    ),
+                    size=len(local_value),
+                )
+            except InvalidDocument:
+                logger.warning("Cache value can not be cached in process.")
 
         return data
+
+
+class CacheSections:
+    """Resolve independent cache-or-fetch sections of an endpoint
+    concurrently under one deadline, so the endpoint takes as long as its
+    slowest section instead of the sum of them.
+    """
+
+    def __init__(self, timeout: float = None):
+        """Initialize the sections, the deadline starts now.
+
+        Args:
+            timeout (float): Seconds to resolve all sections in, defaults to
+                CACHE_SECTION_TIMEOUT.
+        """
+
+        timeout = (
+            get_config().CACHE_SECTION_TIMEOUT if timeout is None else timeout
+        )
+        self.deadline = time.monotonic() + timeout
+        self.futures = {}
+        self.required = set()
+
+    def add(
+        self,
+        name: str,
+        cache_key: Union[dict, str],
+        method: Callable,
+        keyword_arguments: dict,
+        required: bool = False,
+        **cache_options,
+    ) -> None:
+        """Start resolving a section in the background.
+
+        Args:
+            name (str): Name of the section in the results.
+            cache_key (dict, str): Cache key.
+            method (Callable): Method to retrieve data if there is no cache.
+            keyword_arguments (dict): Keyword arguments for method.
+            required (bool): Fail the results if the section fails, other
+                sections are left out of the results when they fail.
+            **cache_options: Keyword arguments for check_and_return_cache,
+                such as refresh_ahead and tags.
+        """
+
+        if required:
+            self.required.add(name)
+        self.futures[name] = section_executor.submit(
+            Caching.check_and_return_cache,
+            cache_key,
+            method,
+            keyword_arguments,
+            **cache_options,
+        )
+
+    def results(self) -> dict:
+        """Wait for the sections until the deadline.
+
+        Returns:
+            dict: Section name to data of the resolved sections.
+
+        Raises:
+            FailedAPIDependencyError: A required section missed the deadline.
+        """
+
+        wait(
+            self.futures.values(),
+            timeout=max(0, self.deadline - time.monotonic()),
+        )
+
+        results = {}
+        for name, future in self.futures.items():
+            if not future.done():
+                future.cancel()
+                if name in self.required:
+                    raise iae.FailedAPIDependencyError(
+                        name, HTTPStatus.GATEWAY_TIMEOUT.value
+                    )
+                logger.warning("Section %s timed out, leaving it out.", name)
+                continue
+
+            exception = future.exception()
+            if exception is not None:
+                if name in self.required:
+                    raise exception
+                logger.error(
+                    "Failed to resolve section %s: %s", name, exception
+                )
+                continue
+
+            results[name] = future.result()
+
+        return results
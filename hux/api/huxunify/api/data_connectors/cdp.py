@@ -3,25 +3,64 @@
 # pylint:disable=too-many-lines
 import time
 import asyncio
-import random
-from typing import Tuple, Optional, List
+import inspect
+import weakref
+from copy import deepcopy
+from functools import partial, wraps
+from typing import Callable, Tuple, Optional, List, Union
 from datetime import datetime, timezone
 
-import requests
-import aiohttp
-import async_timeout
+import numpy as np
+import pandas as pd
 from aiohttp import ClientSession
 from bson import ObjectId
 from dateutil.parser import parse, ParserError
 from dateutil.relativedelta import relativedelta
 
 from huxunifylib.database import constants as db_c
+from huxunifylib.database.cache_management import get_cache_key_digest
 from huxunifylib.util.general.logging import logger
 
 from huxunify.api.config import get_config
 from huxunify.api.exceptions import integration_api_exceptions as iae
 from huxunify.api import constants as api_c
-from huxunify.api.prometheus import record_health_status, Connections
+from huxunify.api.prometheus import (
+    record_health_status,
+    record_cache_lookup,
+    Connections,
+    Caches,
+)
+from huxunify.api.data_connectors.memory_cache import MemoryCache
+from huxunify.api.data_connectors.time_series import (
+    reindex_by_day,
+    weighted_average,
+    to_records,
+)
+from huxunify.api.data_connectors.http_client import (
+    Upstreams,
+    get_session,
+    post_json,
+    run_batch,
+)
+
+# name of the audience count async batch in the progress metrics.
+AUDIENCE_COUNT_BATCH = "audience_count"
+# status codes of a CDP that does not support counting audiences in batch.
+COUNT_BATCH_UNSUPPORTED_STATUS_CODES = (404, 405, 501)
+# seconds before batched counts are tried again once the CDP reported them
+# as unsupported.
+COUNT_BATCH_RECHECK_SECONDS = 3600
+# monotonic time until which audiences are counted one request each.
+count_batch_state = {"unsupported_until": 0.0}
+
+# arguments of connector functions that do not change the response.
+CDP_CACHE_IGNORED_ARGUMENTS = ("session", "token")
+
+# memoized connector function and arguments digest -> response, shared
+# by all callers since the CDP responses do not depend on the user.
+cdp_cache = MemoryCache(Caches.CDP, max_entries=get_config().CDP_CACHE_SIZE)
+# event loop -> memoized digest -> in-flight task of the async functions.
+cdp_pending = weakref.WeakKeyDictionary()
 
 # fields to convert to datetime from the responses
 DEFAULT_DATETIME = datetime(1, 1, 1, 1, 00)
@@ -39,6 +78,133 @@ DATETIME_FIELDS = [
 ]
 
 
+def get_cdp_cache_key(function: Callable, *args, **kwargs) -> Union[str, None]:
+    """Get the memoization key of a call to a CDP connector function, the
+    canonicalized function name and arguments that change the response.
+
+    Args:
+        function (Callable): Connector function.
+        *args (object): Function arguments.
+        **kwargs (dict): Function keyword arguments.
+
+    Returns:
+        Union[str, None]: Digest of the call, None if the arguments can not
+            be serialized.
+    """
+
+    arguments = inspect.signature(function).bind(*args, **kwargs)
+    arguments.apply_defaults()
+
+    try:
+        return get_cache_key_digest(
+            {
+                api_c.ENDPOINT: function.__name__,
+                **{
+                    name: value
+                    for name, value in arguments.arguments.items()
+                    if name not in CDP_CACHE_IGNORED_ARGUMENTS
+                },
+            }
+        )
+    except TypeError:
+        return None
+
+
+def memoize_cdp_call(in_function: Callable) -> Callable:
+    """Purpose of this decorator is for sharing the responses of a CDP
+    connector function between callers asking with the same arguments for
+    CDP_CACHE_TTL seconds. Concurrent identical calls share one upstream
+    request, for coroutine functions within an event loop.
+
+    The session and token are left out of the key, see
+    CDP_CACHE_IGNORED_ARGUMENTS: the CDP responses do not depend on the
+    user, the token only authenticates the request. Errors and empty
+    responses are not cached, so the next call asks the CDP again.
+
+    Args:
+        in_function (Callable): Connector function.
+
+    Returns:
+        Callable: returns the wrapped decorated function.
+    """
+
+    if inspect.iscoroutinefunction(in_function):
+
+        @wraps(in_function)
+        async def async_decorator(*args, **kwargs) -> object:
+            """Decorator memoizing a connector coroutine function.
+
+            Args:
+                *args (object): function arguments.
+                **kwargs (dict): function keyword arguments.
+
+            Returns:
+               object: returns a copy of the response.
+            """
+
+            key = get_cdp_cache_key(in_function, *args, **kwargs)
+            if key is None:
+                return await in_function(*args, **kwargs)
+
+            value = cdp_cache.get(key)
+            record_cache_lookup(Caches.CDP, value is not None)
+            if value is not None:
+                return deepcopy(value)
+
+            pending = cdp_pending.setdefault(asyncio.get_event_loop(), {})
+            task = pending.get(key)
+            if task is None:
+                task = pending[key] = asyncio.ensure_future(
+                    in_function(*args, **kwargs)
+                )
+
+                def done(finished_task: asyncio.Future) -> None:
+                    pending.pop(key, None)
+                    if (
+                        not finished_task.cancelled()
+                        and finished_task.exception() is None
+                        and finished_task.result()
+                    ):
+                        cdp_cache.set(
+                            key,
+                            finished_task.result(),
+                            get_config().CDP_CACHE_TTL,
+                        )
+
+                task.add_done_callback(done)
+
+            # shielded so a cancelled caller does not cancel the others.
+            return deepcopy(await asyncio.shield(task))
+
+        return async_decorator
+
+    @wraps(in_function)
+    def decorator(*args, **kwargs) -> object:
+        """Decorator memoizing a connector function.
+
+        Args:
+            *args (object): function arguments.
+            **kwargs (dict): function keyword arguments.
+
+        Returns:
+           object: returns a copy of the response.
+        """
+
+        key = get_cdp_cache_key(in_function, *args, **kwargs)
+        if key is None:
+            return in_function(*args, **kwargs)
+
+        return deepcopy(
+            cdp_cache.get_or_load(
+                key,
+                lambda: in_function(*args, **kwargs),
+                get_config().CDP_CACHE_TTL,
+            )
+        )
+
+    return decorator
+
+
 @record_health_status(Connections.CDM_API)
 def check_cdm_api_connection() -> Tuple[bool, str]:
     """Validate the cdm api connection.
@@ -52,7 +218,7 @@ def check_cdm_api_connection() -> Tuple[bool, str]:
 
     # submit the post request to get documentation
     try:
-        response = requests.get(
+        response = get_session(Upstreams.CDP).get(
             f"{config.CDP_SERVICE}/healthcheck",
             timeout=5,
         )
@@ -94,7 +260,7 @@ def get_customer_profiles(token: str, batch_size: int, offset: int) -> dict:
     # get config
     config = get_config()
     logger.info("Getting Customer Profiles info from CDP API.")
-    response = requests.get(
+    response = get_session(Upstreams.CDP).get(
         f"{config.CDP_SERVICE}/customer-profiles?limit={batch_size}&offset={offset}",
         headers={
             api_c.CUSTOMERS_API_HEADER_KEY: token,
@@ -137,7 +303,7 @@ def get_customer_profile(token: str, hux_id: str) -> dict:
     # get config
     config = get_config()
     logger.info("Getting Customer Profile info for %s from CDP API.", hux_id)
-    response = requests.get(
+    response = get_session(Upstreams.CDP).get(
         f"{config.CDP_SERVICE}/customer-profiles/{hux_id}",
         headers={
             api_c.CUSTOMERS_API_HEADER_KEY: token,
@@ -163,6 +329,7 @@ def get_customer_profile(token: str, hux_id: str) -> dict:
     return clean_cdm_fields(response.json()[api_c.BODY])
 
 
+@memoize_cdp_call
 def get_customers_overview(
     token: str,
     filters: Optional[dict] = None,
@@ -184,7 +351,7 @@ def get_customers_overview(
     # get config
     config = get_config()
     logger.info("Getting Customer Profile Insights from CDP API.")
-    response = requests.post(
+    response = get_session(Upstreams.CDP).post(
         f"{config.CDP_SERVICE}/customer-profiles/insights",
         json=filters if filters else api_c.CUSTOMER_OVERVIEW_DEFAULT_FILTER,
         headers={
@@ -214,10 +381,13 @@ def get_customers_overview(
     return clean_cdm_gender_fields(response_body)
 
 
+# pylint: disable=too-many-locals
 def get_customers_count_async(
     token: str, audiences: list, default_size: int = 0
 ) -> dict:
-    """Retrieves audience size asynchronously.
+    """Retrieves audience size asynchronously. Audiences are counted in
+    batches of CDP_COUNT_BATCH_SIZE filter sets per request, audiences of a
+    failed batch or of a CDP without batched counts with one request each.
 
     Args:
         token (str): OKTA JWT Token.
@@ -229,68 +399,196 @@ def get_customers_count_async(
         dict: Audience ObjectId to Size mapping dict.
     """
 
+    config = get_config()
+
     # get the audience count URL.
-    url = f"{get_config().CDP_SERVICE}/customer-profiles/audience/count"
+    url = f"{config.CDP_SERVICE}/customer-profiles/audience/count"
 
-    # generate arg list for the async query
-    task_args = [
-        (
-            token,
-            x[db_c.ID],
-            {api_c.AUDIENCE_FILTERS: x[api_c.AUDIENCE_FILTERS]}
-            if x.get(api_c.AUDIENCE_FILTERS)
-            else api_c.CUSTOMER_OVERVIEW_DEFAULT_FILTER,
-            url,
-        )
+    # audiences sharing the same filters are counted once, by the digest of
+    # their filters.
+    audience_filters = {
+        x[db_c.ID]: {api_c.AUDIENCE_FILTERS: x[api_c.AUDIENCE_FILTERS]}
+        if x.get(api_c.AUDIENCE_FILTERS)
+        else api_c.CUSTOMER_OVERVIEW_DEFAULT_FILTER
         for x in audiences
-    ]
-
-    # set the event loop
-    asyncio.set_event_loop(asyncio.SelectorEventLoop())
+    }
+    audience_digests = {
+        audience_id: get_cache_key_digest(filters)
+        for audience_id, filters in audience_filters.items()
+    }
+    # each filter set is named by one of the audiences sharing it.
+    audience_ids_by_digest = {
+        digest: audience_id for audience_id, digest in audience_digests.items()
+    }
 
     # start timer
     timer = time.perf_counter()
 
-    # send all responses at once and wait until they are all done.
-    responses = asyncio.get_event_loop().run_until_complete(
-        asyncio.gather(*(get_async_customers(*x) for x in task_args))
+    counts = {}
+    if (
+        config.CDP_COUNT_BATCH_SIZE > 0
+        and time.monotonic() >= count_batch_state["unsupported_until"]
+    ):
+        counts = get_customers_count_batches(
+            token,
+            {
+                digest: audience_filters[audience_id]
+                for digest, audience_id in audience_ids_by_digest.items()
+            },
+            f"{url}/batch",
+            config.CDP_COUNT_BATCH_SIZE,
+        )
+
+    # generate a coroutine function for each filter set the batches did not
+    # count.
+    digests = [x for x in audience_ids_by_digest if x not in counts]
+    coroutine_functions = [
+        partial(
+            get_async_customers,
+            token,
+            audience_ids_by_digest[digest],
+            audience_filters[audience_ids_by_digest[digest]],
+            url,
+        )
+        for digest in digests
+    ]
+
+    # send the requests with bounded concurrency and wait until they are
+    # all done.
+    responses = (
+        run_batch(AUDIENCE_COUNT_BATCH, coroutine_functions)
+        if coroutine_functions
+        else []
     )
 
     # log execution time summary
     total_ticks = time.perf_counter() - timer
     logger.info(
-        "Executed %s requests to the customer API in %0.4f seconds. ~%0.4f requests per second.",
+        "Counted %s audiences with the customer API in %0.4f seconds, %s "
+        "filter sets of them with one request each.",
         len(audiences),
         total_ticks,
-        len(audiences) / total_ticks,
+        len(coroutine_functions),
     )
 
-    # create a dict for audience_id to get size
-    audience_size_dict = {}
-
-    # iterate each response.
-    for response in responses:
-
-        # get audience id from the response
-        audience_id = ObjectId(response[1])
+    # iterate each response, in the order of the digests.
+    for digest, response in zip(digests, responses):
 
         # get the response dict
         response = response[0]
 
-        # validate response code
-        if response["code"] != 200 or api_c.BODY not in response:
-            # invalid response set default
-            audience_size_dict[audience_id] = default_size
-            continue
-
-        # set the total count, otherwise set the default size if not found
-        audience_size_dict[audience_id] = response[api_c.BODY].get(
-            api_c.TOTAL_COUNT, default_size
+        # validate response code, invalid responses get the default size.
+        counts[digest] = (
+            response[api_c.BODY]
+            if response["code"] == 200 and api_c.BODY in response
+            else {}
         )
 
+    # create a dict for audience_id to get size, set the total count,
+    # otherwise set the default size if not found
+    audience_size_dict = {
+        audience_id: counts[digest].get(api_c.TOTAL_COUNT, default_size)
+        for audience_id, digest in audience_digests.items()
+    }
+
     return audience_size_dict
 
 
+def get_customers_count_batches(
+    token: str, filters_by_digest: dict, url: str, batch_size: int
+) -> dict:
+    """Count audience filter sets with batched requests to the CDP.
+
+    Args:
+        token (str): OKTA JWT Token.
+        filters_by_digest (dict): Digest to audience filters mapping dict.
+        url (str): url of the batched count service.
+        batch_size (int): Filter sets counted per request.
+
+    Returns:
+        dict: Digest to count body mapping dict, without the filter sets of
+            the batches that failed.
+    """
+
+    digests = list(filters_by_digest)
+    batches = [
+        digests[x : x + batch_size] for x in range(0, len(digests), batch_size)
+    ]
+
+    responses = run_batch(
+        AUDIENCE_COUNT_BATCH,
+        [
+            partial(
+                get_async_customers_batch,
+                token,
+                [filters_by_digest[x] for x in batch],
+                url,
+            )
+            for batch in batches
+        ],
+    )
+
+    counts = {}
+    for batch, bodies in zip(batches, responses):
+        if bodies is not None:
+            counts.update(zip(batch, bodies))
+
+    return counts
+
+
+async def get_async_customers_batch(
+    token: str, audience_filters: list, url: str
+) -> Optional[list]:
+    """Asynchronously count many audiences with one request. The CDP gets
+    the list of the filters it gets for single counts and responds with the
+    list of their count bodies, in the same order.
+
+    Args:
+        token (str): OKTA JWT Token.
+        audience_filters (list): list of audience filters.
+        url (str): url of the batched count service.
+
+    Returns:
+       Optional[list]: count body of each audience filters, None if the
+            request failed or the CDP does not support batched counts.
+    """
+
+    status, body = await post_json(
+        Upstreams.CDP,
+        url,
+        audience_filters,
+        headers={
+            api_c.CUSTOMERS_API_HEADER_KEY: token,
+        },
+        name=AUDIENCE_COUNT_BATCH,
+    )
+
+    if status in COUNT_BATCH_UNSUPPORTED_STATUS_CODES:
+        logger.warning(
+            "CDM does not support batched audience counts, counting each "
+            "audience with its own request."
+        )
+        count_batch_state["unsupported_until"] = (
+            time.monotonic() + COUNT_BATCH_RECHECK_SECONDS
+        )
+        return None
+
+    if (
+        status != 200
+        or not isinstance(body, dict)
+        or not isinstance(body.get(api_c.BODY), list)
+        or len(body[api_c.BODY]) != len(audience_filters)
+    ):
+        logger.error(
+            "CDM batch post request failed for %s audiences, status %s.",
+            len(audience_filters),
+            status,
+        )
+        return None
+
+    return [x if isinstance(x, dict) else {} for x in body[api_c.BODY]]
+
+
 async def get_async_customers(
     token: str, audience_id: ObjectId, audience_filters, url
 ) -> dict:
@@ -306,24 +604,24 @@ async def get_async_customers(
        dict: audience id to size mapping dict.
     """
 
-    # setup the aiohttp session so we can process the calls asynchronously
-    async with aiohttp.ClientSession() as session, async_timeout.timeout(10):
-        # run the async post request
-        async with session.post(
-            url,
-            json=audience_filters,
-            headers={
-                api_c.CUSTOMERS_API_HEADER_KEY: token,
-            },
-        ) as response:
-            # await the responses, and return them as they come in.
-            try:
-                return await response.json(), str(audience_id)
-            except aiohttp.client.ContentTypeError:
-                logger.error(
-                    "CDM post request failed for audience id %s.", audience_id
-                )
-                return {"code": 500}, str(audience_id)
+    # run the async post request, retried on throttling and failures.
+    _, body = await post_json(
+        Upstreams.CDP,
+        url,
+        audience_filters,
+        headers={
+            api_c.CUSTOMERS_API_HEADER_KEY: token,
+        },
+        name=AUDIENCE_COUNT_BATCH,
+    )
+
+    if not isinstance(body, dict):
+        logger.error(
+            "CDM post request failed for audience id %s.", audience_id
+        )
+        return {"code": 500}, str(audience_id)
+
+    return body, str(audience_id)
 
 
 def fill_empty_customer_events(
@@ -408,9 +706,8 @@ def fill_customer_events_missing_dates(
             if (
                 curr_date.date() > prev_date.date()
             ):  # curr_date > prev_date and (curr_date - prev_date).days >= 1:
-                customer_events_dates_filled = (
-                    customer_events_dates_filled
-                    + fill_empty_customer_events(
+                customer_events_dates_filled.extend(
+                    fill_empty_customer_events(
                         prev_date - relativedelta(**time_diff),
                         prev_date + relativedelta(**time_diff),
                         time_diff,
@@ -423,20 +720,16 @@ def fill_customer_events_missing_dates(
         if (
             curr_date.date() > prev_date.date()
         ):  # and (curr_date - prev_date).days > 1:
-            data_to_fill = fill_empty_customer_events(
-                prev_date, curr_date, time_diff
-            )
-            customer_events_dates_filled = (
-                customer_events_dates_filled + data_to_fill
+            customer_events_dates_filled.extend(
+                fill_empty_customer_events(prev_date, curr_date, time_diff)
             )
         prev_date = curr_date
 
     if (
         end_date.date() > prev_date.date()
     ):  # and (end_date - prev_date).days >= 1:
-        customer_events_dates_filled = (
-            customer_events_dates_filled
-            + fill_empty_customer_events(
+        customer_events_dates_filled.extend(
+            fill_empty_customer_events(
                 prev_date, end_date + relativedelta(**time_diff), time_diff
             )
         )
@@ -473,7 +766,7 @@ def get_customer_events_data(
     config = get_config()
 
     logger.info("Getting customer events info from CDP API.")
-    response = requests.post(
+    response = get_session(Upstreams.CDP).post(
         f"{config.CDP_SERVICE}/customer-profiles/{hux_id}/events",
         headers={
             api_c.CUSTOMERS_API_HEADER_KEY: token,
@@ -557,6 +850,7 @@ def get_spending_by_cities(token: str, filters: Optional[dict] = None) -> list:
     ]
 
 
+@memoize_cdp_call
 def get_customer_count_by_state(
     token: str, filters: Optional[dict] = None
 ) -> list:
@@ -577,7 +871,7 @@ def get_customer_count_by_state(
     # get config
     config = get_config()
     logger.info("Retrieving demographic insights by state.")
-    response = requests.post(
+    response = get_session(Upstreams.CDP).post(
         f"{config.CDP_SERVICE}/customer-profiles/insights/count-by-state",
         json=filters if filters else {},
         headers={
@@ -621,7 +915,7 @@ def get_customer_count_by_country(
     # get config
     config = get_config()
     logger.info("Retrieving demographic insights by country.")
-    response = requests.post(
+    response = get_session(Upstreams.CDP).post(
         f"{config.CDP_SERVICE}/customer-profiles/countries",
         json=filters if filters else {},
         headers={
@@ -661,7 +955,7 @@ def get_customer_product_categories(token: str) -> dict:
     # get config
     config = get_config()
     logger.info("Retrieving product categories.")
-    response = requests.post(
+    response = get_session(Upstreams.CDP).post(
         f"{config.CDP_SERVICE}/customer-profiles/products-by-categories",
         headers={
             api_c.CUSTOMERS_API_HEADER_KEY: token,
@@ -761,7 +1055,7 @@ def get_customers_insights_count_by_day(
     if audience_filter:
         filters.update({api_c.AUDIENCE_FILTERS: audience_filter})
 
-    response = requests.post(
+    response = get_session(Upstreams.CDP).post(
         f"{config.CDP_SERVICE}/customer-profiles/insights/count-by-day",
         json=filters,
         headers={
@@ -804,6 +1098,7 @@ def get_customers_insights_count_by_day(
     )
 
 
+@memoize_cdp_call
 def get_city_ltvs(
     token: str,
     filters: Optional[dict] = None,
@@ -828,7 +1123,7 @@ def get_city_ltvs(
     # get config
     config = get_config()
     logger.info("Retrieving spending insights by city.")
-    response = requests.post(
+    response = get_session(Upstreams.CDP).post(
         f"{config.CDP_SERVICE}/customer-profiles/insights/city-ltvs",
         json=filters if filters else {},
         params=dict(offset=offset, limit=limit),
@@ -961,6 +1256,7 @@ def get_geographic_customers_data(customer_count_by_state: list) -> list:
     ]
 
 
+@memoize_cdp_call
 def get_spending_by_gender(
     token: str,
     start_date: str,
@@ -991,7 +1287,7 @@ def get_spending_by_gender(
     # get config
     config = get_config()
     logger.info("Retrieving spending insights by gender.")
-    response = requests.post(
+    response = get_session(Upstreams.CDP).post(
         f"{config.CDP_SERVICE}/customer-profiles/insights/spending-by-month",
         json=request_payload,
         headers={
@@ -1049,7 +1345,7 @@ def get_revenue_by_day(
     logger.info("Retrieving spending by day.")
 
     # TODO: Update the API call to CDM with correct endpoint when available
-    response = requests.post(
+    response = get_session(Upstreams.CDP).post(
         f"{config.CDP_SERVICE}/customer-profiles/insights/spending-by-day",
         json=request_payload,
         headers={
@@ -1069,52 +1365,35 @@ def get_revenue_by_day(
 
     logger.info("Successfully retrieved spending insights by day.")
 
-    spending_by_day = []
-
-    for day_data in sorted(
-        clean_cdm_fields(response.json()[api_c.BODY]),
-        key=lambda x: x[api_c.DATE],
-    ):
-        spending_by_day.append(
-            {
-                api_c.DATE: parse(day_data.get(api_c.DATE)),
-                api_c.LTV: (
-                    (
-                        (
-                            day_data[api_c.AVG_SPENT_MEN]
-                            * day_data[api_c.GENDER_MEN]
-                        )
-                        if day_data[api_c.GENDER_MEN]
-                        else 0
-                    )
-                    + (
-                        (
-                            day_data[api_c.AVG_SPENT_WOMEN]
-                            * day_data[api_c.GENDER_WOMEN]
-                        )
-                        if day_data[api_c.GENDER_WOMEN]
-                        else 0
-                    )
-                    + (
-                        (
-                            day_data.get(api_c.AVG_SPENT_OTHER, 0)
-                            * day_data[api_c.GENDER_OTHER]
-                        )
-                        if day_data[api_c.GENDER_OTHER]
-                        else 0
-                    )
-                )
-                / (
-                    day_data[api_c.GENDER_MEN]
-                    + day_data[api_c.GENDER_WOMEN]
-                    + day_data[api_c.GENDER_OTHER]
-                ),
-            }
-        )
-        spending_by_day[-1][api_c.REVENUE] = round(
-            (spending_by_day[-1][api_c.LTV] * random.choice([0.8, 1.0, 1.2])),
-            2,
-        )
+    spending = pd.DataFrame(
+        response.json()[api_c.BODY],
+        columns=[
+            api_c.DATE,
+            api_c.AVG_SPENT_MEN,
+            api_c.AVG_SPENT_WOMEN,
+            api_c.AVG_SPENT_OTHER,
+            api_c.GENDER_MEN,
+            api_c.GENDER_WOMEN,
+            api_c.GENDER_OTHER,
+        ],
+    )
+    # LTV of a day is the average spent per gender weighted by the count
+    # of the gender, revenue is the LTV with a random factor.
+    ltv = weighted_average(
+        spending[
+            [api_c.AVG_SPENT_MEN, api_c.AVG_SPENT_WOMEN, api_c.AVG_SPENT_OTHER]
+        ],
+        spending[[api_c.GENDER_MEN, api_c.GENDER_WOMEN, api_c.GENDER_OTHER]],
+    )
+    spending_by_day = pd.DataFrame(
+        {
+            api_c.DATE: spending[api_c.DATE],
+            api_c.LTV: ltv,
+            api_c.REVENUE: np.round(
+                ltv * np.random.choice([0.8, 1.0, 1.2], len(ltv)), 2
+            ),
+        }
+    )
 
     return add_missing_revenue_data_by_day(
         spending_by_day, start_date, end_date
@@ -1122,19 +1401,18 @@ def get_revenue_by_day(
 
 
 def add_missing_revenue_data_by_day(
-    spending_by_day: list, start_date: str, end_date: str
+    spending_by_day: Union[list, pd.DataFrame], start_date: str, end_date: str
 ) -> list:
     """Add revenue data for missing dates.
 
     Args:
-        spending_by_day (list): list of revenue data.
+        spending_by_day (Union[list, pd.DataFrame]): revenue data.
         start_date (dict): start_date from which revenue data is being fetched
         end_date (dict): end_date to which revenue data is being fetched
 
     Returns:
         list: list of revenue data for all days from start_date to end_date
     """
-    revenue_data_by_day = []
 
     start_date = datetime.strptime(
         start_date, api_c.DEFAULT_DATE_FORMAT
@@ -1152,24 +1430,62 @@ def add_missing_revenue_data_by_day(
         0 if get_config().ENV_NAME == api_c.STAGING_ENV else 27
     )
 
-    for num_day in range(int((end_date - start_date).days) + 1):
-        current_date = start_date + relativedelta(days=num_day)
-
-        if spending_by_day and current_date == spending_by_day[0].get(
-            api_c.DATE
-        ):
-            revenue_data_by_day.append(spending_by_day.pop(0))
-        else:
-            revenue_data_by_day.append(
-                {
-                    api_c.DATE: current_date,
-                    api_c.LTV: sample_ltv
-                    + (sample_ltv * random.uniform(-0.2, 0.3)),
-                    api_c.REVENUE: sample_revenue
-                    + (sample_revenue * random.uniform(-0.2, 0.3)),
-                }
-            )
-    return revenue_data_by_day
+    revenue_data_by_day = reindex_by_day(
+        pd.DataFrame(
+            spending_by_day, columns=[api_c.DATE, api_c.LTV, api_c.REVENUE]
+        ),
+        api_c.DATE,
+        start_date,
+        end_date,
+    )
+    missing = revenue_data_by_day[api_c.LTV].isna().to_numpy()
+    revenue_data_by_day.loc[missing, api_c.LTV] = sample_ltv * (
+        1 + np.random.uniform(-0.2, 0.3, missing.sum())
+    )
+    revenue_data_by_day.loc[missing, api_c.REVENUE] = sample_revenue * (
+        1 + np.random.uniform(-0.2, 0.3, missing.sum())
+    )
+
+    return to_records(revenue_data_by_day, api_c.DATE)
+
+
+def get_customer_count_outside_range(
+    response_body: list, start_date: datetime
+) -> int:
+    """Get the customer count of the range from the nearest recorded day
+    outside of it, for a range without any recorded day: the count of the
+    last day recorded before the range, else the count of the first day
+    recorded after it before its difference.
+
+    Args:
+        response_body (list): list of customer count data.
+        start_date (datetime): First day of the range.
+
+    Returns:
+        int: Customer count, 0 if no day has a count.
+    """
+
+    recorded = pd.DataFrame(response_body).reindex(
+        columns=[api_c.RECORDED, api_c.TOTAL_COUNT, api_c.DIFFERENCE_COUNT]
+    )
+    recorded[api_c.RECORDED] = pd.to_datetime(
+        recorded[api_c.RECORDED],
+        utc=start_date.tzinfo is not None,
+        errors="coerce",
+    )
+    recorded = (
+        recorded.dropna(subset=[api_c.RECORDED, api_c.TOTAL_COUNT])
+        .fillna({api_c.DIFFERENCE_COUNT: 0})
+        .sort_values(api_c.RECORDED)
+    )
+
+    before = recorded[recorded[api_c.RECORDED] < start_date]
+    if not before.empty:
+        return int(before[api_c.TOTAL_COUNT].iloc[-1])
+    if not recorded.empty:
+        first = recorded.iloc[0]
+        return int(first[api_c.TOTAL_COUNT] - first[api_c.DIFFERENCE_COUNT])
+    return 0
 
 
 def add_missing_customer_count_by_day(
@@ -1187,7 +1503,8 @@ def add_missing_customer_count_by_day(
             start_date and end_date.
     """
 
-    customer_data_by_day = []
+    if not response_body:
+        return []
 
     start_date = datetime.strptime(
         date_filters[api_c.START_DATE], api_c.DEFAULT_DATE_FORMAT
@@ -1196,30 +1513,40 @@ def add_missing_customer_count_by_day(
         date_filters[api_c.END_DATE], api_c.DEFAULT_DATE_FORMAT
     )
 
-    for num_day in range(int((end_date - start_date).days) + 1):
-        current_date = start_date + relativedelta(days=num_day)
-
-        if response_body and current_date == response_body[0].get(
-            api_c.RECORDED
-        ):
-            customer_data_by_day.append(response_body.pop(0))
-        else:
-            customer_data_by_day.append(
-                {
-                    api_c.RECORDED: current_date,
-                    api_c.TOTAL_COUNT: response_body[0].get(api_c.TOTAL_COUNT)
-                    - response_body[0].get(api_c.DIFFERENCE_COUNT)
-                    if response_body
-                    else customer_data_by_day[-1][api_c.TOTAL_COUNT],
-                }
-            )
-        # TODO: Fetch this data from CDP once it is ready
-        customer_data_by_day[-1][api_c.CUSTOMERS_LEFT] = random.randint(
-            -57000, 0
+    customer_data_by_day = reindex_by_day(
+        pd.DataFrame(response_body),
+        api_c.RECORDED,
+        start_date,
+        end_date,
+    )
+
+    total_count = customer_data_by_day[api_c.TOTAL_COUNT]
+    difference_count = customer_data_by_day.get(
+        api_c.DIFFERENCE_COUNT, pd.Series(np.nan, customer_data_by_day.index)
+    )
+    # a missing day has the count of the next recorded day before its
+    # difference, or the count of the last recorded day if none follows.
+    total_count = total_count.fillna(
+        (total_count - difference_count.fillna(0)).bfill()
+    ).ffill()
+    if total_count.isna().any():
+        total_count = total_count.fillna(
+            get_customer_count_outside_range(response_body, start_date)
         )
-    return customer_data_by_day
+    customer_data_by_day[api_c.TOTAL_COUNT] = total_count.astype("int64")
+    customer_data_by_day[api_c.DIFFERENCE_COUNT] = difference_count.fillna(
+        0
+    ).astype("int64")
+
+    # TODO: Fetch this data from CDP once it is ready
+    customer_data_by_day[api_c.CUSTOMERS_LEFT] = np.random.randint(
+        -57000, 1, len(customer_data_by_day)
+    )
+
+    return to_records(customer_data_by_day, api_c.RECORDED)
 
 
+@memoize_cdp_call
 async def get_customer_count_by_state_async(
     session: ClientSession, token: str, filters: Optional[dict] = None
 ) -> list:
@@ -1284,6 +1611,7 @@ async def get_demographic_by_state_async(
     )
 
 
+@memoize_cdp_call
 async def get_city_ltvs_async(
     session: ClientSession,
     token: str,
@@ -1336,6 +1664,7 @@ async def get_city_ltvs_async(
         return [clean_cdm_fields(data) for data in response_body[api_c.BODY]]
 
 
+@memoize_cdp_call
 async def get_spending_by_gender_async(
     session: ClientSession,
     token: str,
@@ -1393,6 +1722,7 @@ async def get_spending_by_gender_async(
         )
 
 
+@memoize_cdp_call
 async def get_customers_overview_async(
     session: ClientSession,
     token: str,
@@ -1461,7 +1791,7 @@ def get_customer_event_types(token: str) -> list:
     config = get_config()
 
     logger.info("Getting customer events info from CDP API.")
-    response = requests.get(
+    response = get_session(Upstreams.CDP).get(
         f"{config.CDP_SERVICE}/customer-profiles/event-types",
         headers={
             api_c.CUSTOMERS_API_HEADER_KEY: token,
@@ -1500,7 +1830,7 @@ def get_histogram_data(token: str, field_name: str) -> list:
 
     logger.info("Getting data for histogram from CDP API.")
     # TODO Remove start and end date when CDM supports it.
-    response = requests.post(
+    response = get_session(Upstreams.CDP).post(
         f"{config.CDP_SERVICE}/customer-profiles/insights/counts/by-float-field",
         json={
             "filters": [],
@@ -1542,7 +1872,7 @@ def get_age_histogram_data(token: str):
 
     logger.info("Getting age data for histogram from CDP API.")
     # TODO Remove start and end date when CDM supports it.
-    response = requests.post(
+    response = get_session(Upstreams.CDP).post(
         f"{config.CDP_SERVICE}/customer-profiles/insights/count-by-age",
         json={
             "filters": [],
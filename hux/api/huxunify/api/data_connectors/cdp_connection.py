@@ -6,7 +6,6 @@ import statistics
 from typing import Tuple, Optional
 from datetime import datetime, timedelta
 
-import requests
 from dateutil.parser import parse
 
 from huxunifylib.util.general.logging import logger
@@ -15,6 +14,7 @@ from huxunify.api.prometheus import record_health_status, Connections
 from huxunify.api import constants as api_c
 from huxunify.api.config import get_config
 from huxunify.api.data_connectors.cdp import clean_cdm_fields, DEFAULT_DATETIME
+from huxunify.api.data_connectors.http_client import Upstreams, get_session
 from huxunify.api.exceptions import integration_api_exceptions as iae
 
 
@@ -31,7 +31,7 @@ def check_cdp_connections_api_connection() -> Tuple[int, str]:
 
     # submit the post request to get documentation
     try:
-        response = requests.get(
+        response = get_session(Upstreams.CDP_CONNECTIONS).get(
             f"{config.CDP_CONNECTION_SERVICE}/healthcheck",
             timeout=5,
         )
@@ -75,7 +75,7 @@ def get_identity_overview(
     # get config
     config = get_config()
     logger.info("Getting Identity Insights from CDP API.")
-    response = requests.post(
+    response = get_session(Upstreams.CDP_CONNECTIONS).post(
         f"{config.CDP_CONNECTION_SERVICE}/{api_c.CDM_IDENTITY_ENDPOINT}/"
         f"{api_c.INSIGHTS}",
         json=filters if filters else {},
@@ -124,7 +124,7 @@ def get_idr_data_feeds(token: str, start_date: str, end_date: str) -> list:
         "Retrieving data-feeds for within %s and %s.", start_date, end_date
     )
 
-    response = requests.post(
+    response = get_session(Upstreams.CDP_CONNECTIONS).post(
         f"{config.CDP_CONNECTION_SERVICE}/{api_c.CDM_IDENTITY_ENDPOINT}/"
         f"{api_c.DATAFEEDS}",
         json={api_c.START_DATE: start_date, api_c.END_DATE: end_date},
@@ -169,7 +169,7 @@ def get_idr_data_feed_details(token: str, datafeed_id: int) -> dict:
         datafeed_id,
     )
 
-    response = requests.get(
+    response = get_session(Upstreams.CDP_CONNECTIONS).get(
         f"{config.CDP_CONNECTION_SERVICE}/{api_c.CDM_IDENTITY_ENDPOINT}/"
         f"{api_c.DATAFEEDS}/{datafeed_id}",
         headers={api_c.CUSTOMERS_API_HEADER_KEY: token},
@@ -211,7 +211,7 @@ def get_data_sources(token: str) -> list:
     config = get_config()
     logger.info("Retrieving data-sources.")
 
-    response = requests.get(
+    response = get_session(Upstreams.CDP_CONNECTIONS).get(
         f"{config.CDP_CONNECTION_SERVICE}/{api_c.CDM_CONNECTIONS_ENDPOINT}/"
         f"{api_c.DATASOURCES}",
         headers={api_c.CUSTOMERS_API_HEADER_KEY: token},
@@ -254,7 +254,7 @@ def get_data_source_data_feeds(token: str, data_source_type: str) -> list:
         "Retrieving data-feeds for data source with type %s.", data_source_type
     )
 
-    response = requests.get(
+    response = get_session(Upstreams.CDP_CONNECTIONS).get(
         f"{config.CDP_CONNECTION_SERVICE}/{api_c.CDM_CONNECTIONS_ENDPOINT}/"
         f"{data_source_type}/{api_c.DATA_FEEDS}",
         headers={api_c.CUSTOMERS_API_HEADER_KEY: token},
@@ -400,7 +400,7 @@ def get_idr_matching_trends(
 
     config = get_config()
     logger.info("Getting IDR matching trends from CDP API.")
-    response = requests.post(
+    response = get_session(Upstreams.CDP_CONNECTIONS).post(
         f"{config.CDP_CONNECTION_SERVICE}/identity/id-count-by-day",
         json=filters,
         headers={
@@ -452,7 +452,7 @@ def get_data_source_data_feed_details(
         datafeed_name,
     )
 
-    response = requests.post(
+    response = get_session(Upstreams.CDP_CONNECTIONS).post(
         f"{config.CDP_CONNECTION_SERVICE}/{api_c.CDM_CONNECTIONS_ENDPOINT}/"
         f"{api_c.DATASOURCES}/{data_source_type}/feeds/{datafeed_name}/files",
         json=query_json,
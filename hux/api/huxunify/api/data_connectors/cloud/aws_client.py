@@ -1,7 +1,7 @@
 """Module for AWS cloud operations"""
 import logging
 from pathlib import PurePath
-from typing import Tuple
+from typing import BinaryIO, Iterable, Tuple, Union
 from enum import Enum
 
 import boto3
@@ -157,6 +157,87 @@ class AWSClient(CloudClient):
         logging.info("Uploaded %s file to %s", file_name, bucket)
         return True
 
+    def upload_stream(
+        self,
+        stream: Union[BinaryIO, Iterable[bytes]],
+        file_name: str,
+        file_type: str,
+        user_name: str,
+        **kwargs,
+    ) -> bool:
+        """Upload a stream to AWS S3 as a multipart upload, uploading the
+        parts concurrently while the stream is being read.
+
+        Args:
+            stream (Union[BinaryIO, Iterable[bytes]]): Readable stream or
+                iterable of byte chunks to upload.
+            file_name (str): Name of the file to upload.
+            file_type (str): Type of the file to upload.
+            user_name (str): Name of the user uploading the file.
+            **kwargs (dict): function keyword arguments.
+
+        Returns:
+            bool: indication that upload was successful.
+        """
+        bucket = self.config.S3_DATASET_BUCKET
+        object_name = PurePath(file_name).name
+
+        logging.info("Streaming %s file to AWS bucket %s", file_name, bucket)
+        s3_client = self.get_aws_client(ClientType.S3)
+        upload_id = None
+        try:
+            upload_id = s3_client.create_multipart_upload(
+                Bucket=bucket,
+                Key=object_name,
+                Metadata={
+                    api_c.CREATED_BY: user_name if user_name else "",
+                    api_c.TYPE: file_type if file_type else "",
+                },
+            )["UploadId"]
+
+            parts = self.upload_parts(
+                stream,
+                lambda number, data: {
+                    "ETag": s3_client.upload_part(
+                        Bucket=bucket,
+                        Key=object_name,
+                        UploadId=upload_id,
+                        PartNumber=number,
+                        Body=data,
+                    )["ETag"],
+                    "PartNumber": number,
+                },
+            )
+
+            s3_client.complete_multipart_upload(
+                Bucket=bucket,
+                Key=object_name,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except Exception as exception:  # pylint: disable=broad-except
+            logging.error(
+                "Failed to stream file %s to %s : %s",
+                file_name,
+                bucket,
+                exception,
+            )
+            if upload_id:
+                # do not keep the uploaded parts of a failed upload.
+                try:
+                    s3_client.abort_multipart_upload(
+                        Bucket=bucket, Key=object_name, UploadId=upload_id
+                    )
+                except ClientError as abort_exception:
+                    logging.error(
+                        "Failed to abort upload of %s : %s",
+                        file_name,
+                        abort_exception,
+                    )
+            return False
+        logging.info("Streamed %s file to %s", file_name, bucket)
+        return True
+
     def download_file(self, file_name: str, user_name: str, **kwargs) -> bool:
         """Download a file from AWS S3.
 
@@ -1,11 +1,11 @@
 """Module for Azure cloud operations."""
 import logging
-from typing import Tuple
+from typing import BinaryIO, Iterable, Tuple, Union
 from pathlib import Path
 
 from azure.identity import ManagedIdentityCredential
 from azure.keyvault.secrets import SecretClient
-from azure.storage.blob import ContainerClient
+from azure.storage.blob import BlobBlock, ContainerClient
 
 from huxunify.api.data_connectors.cloud.cloud_client import (
     CloudClient,
@@ -159,13 +159,17 @@ class AzureClient(CloudClient):
                 api_c.CREATED_BY: user_name if user_name else "",
                 api_c.TYPE: file_type if file_type else "",
             }
-            with open(Path(file_name).name, "rb") as data:
-                blob_client.upload_blob(data=data, metadata=metadata)
-                logging.info(
-                    "Finished uploading %s to Azure blob container: %s",
-                    file_name,
-                    container_name,
-                )
+            file_obj = kwargs.get(api_c.FILE_OBJ, None)
+            if file_obj:
+                blob_client.upload_blob(data=file_obj, metadata=metadata)
+            else:
+                with open(Path(file_name).name, "rb") as data:
+                    blob_client.upload_blob(data=data, metadata=metadata)
+            logging.info(
+                "Finished uploading %s to Azure blob container: %s",
+                file_name,
+                container_name,
+            )
         except Exception as exc:
             logging.error(
                 "Failed to upload %s to blob container: %s",
@@ -177,6 +181,83 @@ class AzureClient(CloudClient):
 
         return True
 
+    # pylint:disable=broad-except
+    def upload_stream(
+        self,
+        stream: Union[BinaryIO, Iterable[bytes]],
+        file_name: str,
+        file_type: str,
+        user_name: str,
+        **kwargs,
+    ) -> bool:
+        """Uploads a stream to Azure Blob as staged blocks, staging the
+        blocks concurrently while the stream is being read.
+
+        Args:
+            stream (Union[BinaryIO, Iterable[bytes]]): readable stream or
+                iterable of byte chunks to upload.
+            file_name (str): name of the file to upload.
+            file_type (str): type of the file to upload.
+            user_name (str): name of the user uploading the file.
+            **kwargs (dict): function keyword arguments.
+
+        Returns:
+            bool: bool indicator if the upload was successful.
+        """
+
+        container_name = self.config.AZURE_STORAGE_CONTAINER_NAME
+
+        try:
+            logging.info(
+                "Streaming %s to Azure blob container: %s",
+                file_name,
+                container_name,
+            )
+            blob_client = self.get_container_client().get_blob_client(
+                Path(file_name).name
+            )
+
+            def stage_block(number: int, data: bytes) -> BlobBlock:
+                """Stage a block of the blob.
+
+                Args:
+                    number (int): Number of the block.
+                    data (bytes): Bytes of the block.
+
+                Returns:
+                    BlobBlock: The staged block.
+                """
+
+                # block ids of a blob must all have the same length.
+                block_id = f"{number:08d}"
+                blob_client.stage_block(block_id=block_id, data=data)
+                return BlobBlock(block_id=block_id)
+
+            # uncommitted blocks are discarded by Azure, so a failed
+            # upload leaves no blob behind.
+            blob_client.commit_block_list(
+                self.upload_parts(stream, stage_block),
+                metadata={
+                    api_c.CREATED_BY: user_name if user_name else "",
+                    api_c.TYPE: file_type if file_type else "",
+                },
+            )
+            logging.info(
+                "Finished streaming %s to Azure blob container: %s",
+                file_name,
+                container_name,
+            )
+        except Exception as exc:
+            logging.error(
+                "Failed to stream %s to blob container: %s",
+                file_name,
+                container_name,
+            )
+            logging.error(exc)
+            return False
+
+        return True
+
     # pylint:disable=broad-except
     def download_file(self, file_name: str, user_name: str, **kwargs) -> bool:
         """Download a file from the cloud.
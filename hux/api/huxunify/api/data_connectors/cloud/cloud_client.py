@@ -1,5 +1,8 @@
 """ Module for base class for cloud operations"""
-from typing import Tuple, TypeVar
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, List
+from typing import Tuple, TypeVar, Union
 
 from huxunify.api.config import get_config, Config
 
@@ -78,6 +81,100 @@ class CloudClient:
         """
         raise NotImplementedError()
 
+    def upload_stream(
+        self,
+        stream: Union[BinaryIO, Iterable[bytes]],
+        file_name: str,
+        file_type: str,
+        user_name: str,
+        **kwargs,
+    ) -> bool:
+        """Upload a stream to the cloud in parts while it is being read,
+        holding at most CLOUD_UPLOAD_CONCURRENCY parts in memory.
+
+        Args:
+            stream (Union[BinaryIO, Iterable[bytes]]): Readable stream or
+                iterable of byte chunks to upload.
+            file_name (str): Name of the file to upload.
+            file_type (str): Type of the file to upload.
+            user_name (str): Name of the user uploading the file.
+            **kwargs (dict): function keyword arguments.
+
+        Returns:
+            bool: indication that upload was successful.
+        """
+        raise NotImplementedError()
+
+    def iter_parts(
+        self, stream: Union[BinaryIO, Iterable[bytes]]
+    ) -> Iterator[bytes]:
+        """Regroup a stream into parts of CLOUD_UPLOAD_PART_SIZE bytes, the
+        last part may be smaller and an empty stream is one empty part.
+
+        Args:
+            stream (Union[BinaryIO, Iterable[bytes]]): Readable stream or
+                iterable of byte chunks.
+
+        Yields:
+            Iterator[bytes]: Parts of the stream.
+        """
+
+        part_size = self.config.CLOUD_UPLOAD_PART_SIZE
+        if hasattr(stream, "read"):
+            chunks = iter(lambda: stream.read(part_size), b"")
+        else:
+            chunks = stream
+
+        part = bytearray()
+        yielded = False
+        for chunk in chunks:
+            part += chunk
+            while len(part) >= part_size:
+                yield bytes(part[:part_size])
+                del part[:part_size]
+                yielded = True
+
+        if part or not yielded:
+            yield bytes(part)
+
+    def upload_parts(
+        self,
+        stream: Union[BinaryIO, Iterable[bytes]],
+        upload_part: Callable[[int, bytes], Any],
+    ) -> List[Any]:
+        """Upload the parts of a stream concurrently, reading the next part
+        only once fewer than CLOUD_UPLOAD_CONCURRENCY parts are in flight.
+
+        Args:
+            stream (Union[BinaryIO, Iterable[bytes]]): Readable stream or
+                iterable of byte chunks.
+            upload_part (Callable[[int, bytes], Any]): Function uploading a
+                part given its number, starting at 1, and its bytes.
+
+        Returns:
+            List[Any]: Results of upload_part, in part order.
+        """
+
+        concurrency = max(self.config.CLOUD_UPLOAD_CONCURRENCY, 1)
+        results = []
+        in_flight = deque()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            try:
+                for number, part in enumerate(self.iter_parts(stream), 1):
+                    if len(in_flight) >= concurrency:
+                        results.append(in_flight.popleft().result())
+                    in_flight.append(
+                        executor.submit(upload_part, number, part)
+                    )
+                while in_flight:
+                    results.append(in_flight.popleft().result())
+            finally:
+                # do not upload the remaining parts of a failed upload.
+                for future in in_flight:
+                    future.cancel()
+
+        return results
+
     def download_file(self, file_name: str, user_name: str, **kwargs) -> bool:
         """Download a file from the cloud.
 
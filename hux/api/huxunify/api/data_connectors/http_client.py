@@ -0,0 +1,355 @@
+"""Purpose of this file is for housing the pooled HTTP clients of the
+connectors, so calls to an upstream reuse its open keep-alive connections
+instead of doing a TCP and TLS handshake each time.
+"""
+import asyncio
+import atexit
+import random
+import threading
+from enum import Enum
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Awaitable, Callable, Coroutine, List, Tuple, Union
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from huxunifylib.util.general.logging import logger
+
+from huxunify.api.config import get_config
+from huxunify.api.prometheus import (
+    record_async_request,
+    record_async_batch_remaining,
+)
+
+# status codes of upstream responses that are retried.
+RETRY_STATUS_CODES = (502, 503, 504)
+# async batches also retry throttled and failed requests, backing off so
+# a struggling upstream is not flooded.
+ASYNC_RETRY_STATUS_CODES = (429, 500) + RETRY_STATUS_CODES
+
+
+class Upstreams(Enum):
+    """Upstream services of the pooled HTTP clients"""
+
+    CDP = "cdp"
+    CDP_CONNECTIONS = "cdp_connections"
+    OKTA = "okta"
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTP adapter that sends requests without a timeout with a default
+    one, so a hung upstream does not hold a pooled connection forever."""
+
+    def __init__(self, timeout: float, *args, **kwargs):
+        """Initialize the adapter.
+
+        Args:
+            timeout (float): Default timeout of requests in seconds.
+            *args: Positional arguments of HTTPAdapter.
+            **kwargs: Keyword arguments of HTTPAdapter.
+        """
+
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    # pylint: disable=arguments-differ
+    def send(self, request, **kwargs) -> requests.Response:
+        """Send a prepared request, with the default timeout if it was sent
+        without one.
+
+        Args:
+            request (requests.PreparedRequest): Request to send.
+            **kwargs: Keyword arguments of HTTPAdapter.send.
+
+        Returns:
+            requests.Response: Response of the request.
+        """
+
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+# upstream -> requests session, shared by all threads of the worker.
+sessions = {}
+sessions_lock = threading.Lock()
+
+# event loop -> upstream -> aiohttp session, an aiohttp session can only be
+# used on the event loop it was created on.
+async_sessions = {}
+async_sessions_lock = threading.Lock()
+
+# long-lived event loop of each thread running connector coroutines.
+thread_state = threading.local()
+
+
+def create_session() -> requests.Session:
+    """Create a pooled requests session with retries and a default timeout.
+
+    Returns:
+        requests.Session: Requests session.
+    """
+
+    config = get_config()
+    adapter = TimeoutHTTPAdapter(
+        config.HTTP_TIMEOUT,
+        pool_maxsize=config.HTTP_POOL_SIZE,
+        max_retries=Retry(
+            total=config.HTTP_RETRIES,
+            backoff_factor=config.HTTP_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUS_CODES,
+            # return the last response once retries are exhausted, callers
+            # handle the status code themselves.
+            raise_on_status=False,
+        ),
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # sessions are shared across requests of different users, so cookies
+    # set by an upstream must not be sent on later calls.
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    return session
+
+
+def get_session(upstream: Upstreams) -> requests.Session:
+    """Get the pooled requests session of an upstream.
+
+    Args:
+        upstream (Upstreams): Upstream service.
+
+    Returns:
+        requests.Session: Requests session.
+    """
+
+    session = sessions.get(upstream)
+    if session is None:
+        with sessions_lock:
+            session = sessions.get(upstream)
+            if session is None:
+                session = sessions[upstream] = create_session()
+    return session
+
+
+def get_async_session(upstream: Upstreams) -> aiohttp.ClientSession:
+    """Get the aiohttp session of an upstream for the running event loop.
+    Must be called from a coroutine.
+
+    Args:
+        upstream (Upstreams): Upstream service.
+
+    Returns:
+        aiohttp.ClientSession: Aiohttp session.
+    """
+
+    loop = asyncio.get_event_loop()
+
+    with async_sessions_lock:
+        # drop the sessions of event loops that were closed since.
+        for closed_loop in [x for x in async_sessions if x.is_closed()]:
+            del async_sessions[closed_loop]
+
+        loop_sessions = async_sessions.setdefault(loop, {})
+        session = loop_sessions.get(upstream)
+        if session is None or session.closed:
+            config = get_config()
+            session = loop_sessions[upstream] = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=config.HTTP_ASYNC_POOL_SIZE
+                ),
+                timeout=aiohttp.ClientTimeout(total=config.HTTP_TIMEOUT),
+                cookie_jar=aiohttp.DummyCookieJar(),
+            )
+
+    return session
+
+
+def close_async_sessions() -> None:
+    """Close the aiohttp sessions of the event loops that are not running."""
+
+    with async_sessions_lock:
+        for loop, loop_sessions in list(async_sessions.items()):
+            if loop.is_closed() or loop.is_running():
+                continue
+            for session in loop_sessions.values():
+                loop.run_until_complete(session.close())
+            del async_sessions[loop]
+
+
+# the aiohttp sessions live as long as the worker.
+atexit.register(close_async_sessions)
+
+
+def run_async(coroutine: Coroutine) -> Any:
+    """Run a coroutine to completion on the long-lived event loop of the
+    calling thread, so its aiohttp sessions are reused across calls.
+
+    Args:
+        coroutine (Coroutine): Coroutine to run.
+
+    Returns:
+        Any: Result of the coroutine.
+    """
+
+    loop = getattr(thread_state, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = thread_state.loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    return loop.run_until_complete(coroutine)
+
+
+def get_retry_delay(attempt: int, retry_after: str = None) -> float:
+    """Get the seconds to wait before retrying a request, exponential in the
+    attempt with full jitter, or the Retry-After of the upstream if given,
+    capped at ASYNC_REQUEST_TIMEOUT so a batch finishes in bounded time.
+
+    Args:
+        attempt (int): Number of the failed attempt, starting at zero.
+        retry_after (str): Retry-After header of the response.
+
+    Returns:
+        float: Seconds to wait.
+    """
+
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), get_config().ASYNC_REQUEST_TIMEOUT)
+
+    return random.uniform(
+        0, get_config().HTTP_BACKOFF_FACTOR * 2 ** (attempt + 1)
+    )
+
+
+async def post_json(
+    upstream: Upstreams,
+    url: str,
+    json: Union[dict, list],
+    headers: dict = None,
+    name: str = None,
+) -> Tuple[int, Union[dict, list, None]]:
+    """Post a JSON body with the pooled aiohttp session of an upstream.
+    Each attempt is bounded by ASYNC_REQUEST_TIMEOUT, timeouts, connection
+    errors and 429/5xx responses are retried ASYNC_REQUEST_RETRIES times.
+    Must be called from a coroutine.
+
+    Args:
+        upstream (Upstreams): Upstream service.
+        url (str): URL to post to.
+        json (Union[dict, list]): Body of the request.
+        headers (dict): Headers of the request.
+        name (str): Name of the batch the request is recorded against.
+
+    Returns:
+        Tuple[int, Union[dict, list, None]]: Status code and decoded body of
+            the response, None if it is not JSON. The status code is 0 if no
+            response was received.
+    """
+
+    config = get_config()
+    name = name or upstream.value
+    status, body = 0, None
+
+    for attempt in range(config.ASYNC_REQUEST_RETRIES + 1):
+        retry_after = None
+        try:
+            async with get_async_session(upstream).post(
+                url,
+                json=json,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(
+                    total=config.ASYNC_REQUEST_TIMEOUT
+                ),
+            ) as response:
+                status, retry_after = response.status, response.headers.get(
+                    "Retry-After"
+                )
+                try:
+                    body = await response.json()
+                except aiohttp.ContentTypeError:
+                    body = None
+        except (asyncio.TimeoutError, aiohttp.ClientError) as exc:
+            logger.warning("Request to %s failed: %s", url, repr(exc))
+            status, body = 0, None
+
+        if status and status not in ASYNC_RETRY_STATUS_CODES:
+            break
+        if attempt < config.ASYNC_REQUEST_RETRIES:
+            record_async_request(name, "retried")
+            await asyncio.sleep(get_retry_delay(attempt, retry_after))
+
+    record_async_request(name, "ok" if 200 <= status < 300 else "failed")
+    return status, body
+
+
+def run_batch(
+    name: str,
+    coroutine_functions: List[Callable[[], Awaitable]],
+    concurrency: int = None,
+) -> list:
+    """Run a batch of coroutine functions with a bounded number in flight,
+    on the long-lived event loop of the calling thread. A failing coroutine
+    does not cancel the others, the batch runs to the end before the first
+    error is raised.
+
+    Args:
+        name (str): Name of the batch, used for the progress metrics.
+        coroutine_functions (List[Callable[[], Awaitable]]): Functions
+            returning the coroutines to run.
+        concurrency (int): Coroutines in flight at most, defaults to
+            ASYNC_BATCH_CONCURRENCY.
+
+    Returns:
+        list: Results of the coroutines, in the order of the functions.
+
+    Raises:
+        Exception: The error of the first failed coroutine, in the order of
+            the functions.
+    """
+
+    concurrency = concurrency or get_config().ASYNC_BATCH_CONCURRENCY
+    remaining = len(coroutine_functions)
+    record_async_batch_remaining(name, remaining)
+
+    async def run_all() -> list:
+        """Run the coroutines of the batch.
+
+        Returns:
+            list: Results or errors of the coroutines.
+        """
+
+        # created on the running loop, asyncio primitives bind to a loop.
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_one(coroutine_function: Callable[[], Awaitable]):
+            """Run a coroutine once the semaphore lets it in.
+
+            Args:
+                coroutine_function (Callable[[], Awaitable]): Function
+                    returning the coroutine to run.
+
+            Returns:
+                object: Result of the coroutine.
+            """
+
+            nonlocal remaining
+            async with semaphore:
+                try:
+                    return await coroutine_function()
+                finally:
+                    remaining -= 1
+                    record_async_batch_remaining(name, remaining)
+
+        return await asyncio.gather(
+            *(run_one(x) for x in coroutine_functions), return_exceptions=True
+        )
+
+    results = run_async(run_all())
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+
+    return results
@@ -0,0 +1,158 @@
+"""Purpose of this file is for housing a bounded in-process cache that is
+used in front of slower lookups (OKTA, database, etc.).
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Union
+
+from huxunify.api.prometheus import record_cache_lookup, Caches
+
+
+class MemoryCache:
+    """Bounded, thread-safe in-process cache with per entry expiry.
+
+    Entries are evicted least recently used first once the cache holds
+    max_entries items, or once their sizes add up to more than max_bytes.
+    Concurrent loads of the same key are coalesced so only one caller runs
+    the loader while the others wait for its result.
+    Cached values are shared between callers and must not be mutated.
+    """
+
+    def __init__(
+        self, cache: Caches, max_entries: int = 1024, max_bytes: int = None
+    ):
+        """Initialize the cache.
+
+        Args:
+            cache (Caches): Cache enum, used for recording metrics.
+            max_entries (int): Maximum number of entries held in the cache.
+            max_bytes (int): Maximum total size of the entries held in the
+                cache, unbounded if not set.
+        """
+
+        self.cache = cache
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading = {}
+
+    def get(self, key: Any) -> Any:
+        """Get an unexpired value from the cache.
+
+        Args:
+            key (Any): Hashable cache key.
+
+        Returns:
+            Any: Cached value, None if not cached or expired.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Any, value: Any, ttl: float, size: int = 0) -> None:
+        """Set a value in the cache.
+
+        Args:
+            key (Any): Hashable cache key.
+            value (Any): Value to be cached.
+            ttl (float): Seconds until the entry expires, values less than
+                or equal to zero are not cached.
+            size (int): Size of the value in bytes, counted against
+                max_bytes.
+        """
+
+        if ttl <= 0 or (self.max_bytes is not None and size > self.max_bytes):
+            return
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, size)
+            self.size += size
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self.size > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key: Any) -> None:
+        """Remove a value from the cache.
+
+        Args:
+            key (Any): Hashable cache key.
+        """
+
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Remove all values from the cache."""
+
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _remove(self, key: Any) -> None:
+        """Remove an entry, the lock must be held by the caller.
+
+        Args:
+            key (Any): Hashable cache key.
+        """
+
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[2]
+
+    def get_or_load(
+        self,
+        key: Any,
+        loader: Callable[[], Any],
+        ttl: Union[float, Callable[[Any], float]],
+    ) -> Any:
+        """Get a value from the cache, or load and cache it on a miss.
+
+        Only truthy values returned by the loader are cached.
+
+        Args:
+            key (Any): Hashable cache key.
+            loader (Callable[[], Any]): Function returning the value to cache.
+            ttl (Union[float, Callable[[Any], float]]): Seconds until the
+                entry expires, or a function computing it from the value.
+
+        Returns:
+            Any: Cached or freshly loaded value.
+        """
+
+        value = self.get(key)
+        if value is not None:
+            record_cache_lookup(self.cache, True)
+            return value
+
+        with self._lock:
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # another caller may have loaded the value while we waited.
+            value = self.get(key)
+            if value is not None:
+                record_cache_lookup(self.cache, True)
+                return value
+
+            record_cache_lookup(self.cache, False)
+            try:
+                value = loader()
+                if value:
+                    self.set(key, value, ttl(value) if callable(ttl) else ttl)
+            finally:
+                with self._lock:
+                    self._loading.pop(key, None)
+
+        return value
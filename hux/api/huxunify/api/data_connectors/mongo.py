@@ -0,0 +1,19 @@
+"""Purpose of this file is to house the MongoDB client of the API, apart
+from the route package so the data connectors can use it without importing
+the routes.
+"""
+from pymongo import MongoClient
+
+from huxunifylib.database.util.client import db_client_factory
+
+from huxunify.api.config import get_config
+
+
+def get_db_client() -> MongoClient:
+    """Get DB client.
+
+    Returns:
+        MongoClient: MongoDB client.
+    """
+
+    return db_client_factory.get_resource(**get_config().MONGO_DB_CONFIG)
@@ -1,20 +1,142 @@
 """Purpose of this file is for holding methods to query and pull data from
 OKTA.
 """
+import base64
+import hashlib
 import json
 import re
 import ssl
+import threading
+import time
 import urllib
-from typing import Tuple, Union
+from typing import Callable, Tuple, Union
 
 import certifi
+import jwt
 import requests
 from flask import request
 from huxunifylib.util.general.logging import logger
+from huxunifylib.database.cache_management import (
+    get_cache_entry,
+    create_cache_entry,
+)
+from huxunifylib.database.util.client import db_client_factory
 
 from huxunify.api.config import get_config
 from huxunify.api import constants as api_c
-from huxunify.api.prometheus import record_health_status, Connections
+from huxunify.api.data_connectors.http_client import Upstreams, get_session
+from huxunify.api.data_connectors.memory_cache import MemoryCache
+from huxunify.api.prometheus import (
+    record_health_status,
+    Connections,
+    Caches,
+)
+
+# token hash -> introspection/userinfo results, bounded per worker.
+token_cache = MemoryCache(
+    Caches.OKTA_TOKEN, max_entries=get_config().OKTA_TOKEN_CACHE_SIZE
+)
+
+
+class JwksCache:
+    """Cache of the OKTA issuer signing keys (JWKS), keyed by kid.
+
+    Keys are fetched on first use and refreshed in a background thread once
+    older than the refresh interval. An unknown kid triggers a synchronous
+    refresh, at most once a minute, to pick up rotated keys.
+    """
+
+    MIN_REFRESH_INTERVAL = 60
+
+    def __init__(self, refresh_interval: int):
+        """Initialize the JWKS cache.
+
+        Args:
+            refresh_interval (int): Seconds after which keys are refreshed.
+        """
+
+        self.refresh_interval = refresh_interval
+        self._keys = {}
+        self._fetched_at = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def get_signing_key(self, key_id: str) -> Union[jwt.PyJWK, None]:
+        """Get the signing key for a kid.
+
+        Args:
+            key_id (str): Key ID from the token header.
+
+        Returns:
+            Union[jwt.PyJWK, None]: Signing key, None if it is unknown.
+        """
+
+        signing_key = self._keys.get(key_id)
+
+        if self._fetched_at is None:
+            self.refresh()
+            signing_key = self._keys.get(key_id)
+        elif signing_key is None:
+            if time.monotonic() - self._fetched_at > self.MIN_REFRESH_INTERVAL:
+                self.refresh()
+                signing_key = self._keys.get(key_id)
+        elif time.monotonic() - self._fetched_at > self.refresh_interval:
+            self.refresh_in_background()
+
+        return signing_key
+
+    def refresh(self) -> None:
+        """Fetch the signing keys from the OKTA issuer. Callers waiting on a
+        refresh that started after them reuse its result.
+        """
+
+        requested_at = time.monotonic()
+
+        with self._lock:
+            if (
+                self._fetched_at is not None
+                and self._fetched_at > requested_at
+            ):
+                return
+
+            config = get_config()
+            try:
+                response = get_session(Upstreams.OKTA).get(
+                    f"{config.OKTA_ISSUER}"
+                    f"/oauth2/v1/keys?client_id="
+                    f"{config.OKTA_CLIENT_ID}"
+                )
+                response.raise_for_status()
+                self._keys = {
+                    key.key_id: key
+                    for key in jwt.PyJWKSet.from_dict(response.json()).keys
+                }
+                logger.info("Refreshed %s OKTA signing keys.", len(self._keys))
+            except (
+                requests.exceptions.RequestException,
+                ValueError,
+                jwt.PyJWTError,
+            ):
+                logger.exception("Failed to refresh OKTA signing keys.")
+            finally:
+                # back off failed refreshes the same as successful ones.
+                self._fetched_at = time.monotonic()
+                self._refreshing = False
+
+    def refresh_in_background(self) -> None:
+        """Refresh the signing keys in a background thread, serving the
+        current keys until the refresh completes.
+        """
+
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        threading.Thread(target=self.refresh, daemon=True).start()
+
+
+jwks_cache = JwksCache(get_config().OKTA_JWKS_REFRESH_INTERVAL)
 
 
 @record_health_status(Connections.OKTA)
@@ -30,7 +152,7 @@ def check_okta_connection() -> Tuple[bool, str]:
 
     # submit the get request to test if we can talk to OKTA.
     try:
-        response = requests.get(
+        response = get_session(Upstreams.OKTA).get(
             f"{config.OKTA_ISSUER}"
             f"/oauth2/v1/keys?client_id="
             f"{config.OKTA_CLIENT_ID}"
@@ -55,7 +177,188 @@ def check_okta_connection() -> Tuple[bool, str]:
         return False, getattr(exception, "message", repr(exception))
 
 
+def get_token_hash(access_token: str) -> str:
+    """Get the hash of an access token, used to key cached token results so
+    raw tokens are never stored.
+
+    Args:
+        access_token (str): The encoded JWT access token, provided by Okta.
+
+    Returns:
+        str: SHA-256 hex digest of the access token.
+    """
+
+    return hashlib.sha256(str(access_token).encode()).hexdigest()
+
+
+def get_token_expiry(access_token: str) -> Union[int, None]:
+    """Read the exp claim of an access token without verifying it, the token
+    is still verified by OKTA before any result is cached.
+
+    Args:
+        access_token (str): The encoded JWT access token, provided by Okta.
+
+    Returns:
+        Union[int, None]: Token expiry as epoch seconds, None if the token
+            is not a JWT carrying an exp claim.
+    """
+
+    try:
+        claims = str(access_token).split(".")[1]
+        claims = base64.urlsafe_b64decode(claims + "=" * (-len(claims) % 4))
+        expiry = json.loads(claims).get(api_c.OKTA_TOKEN_EXPIRY)
+        return int(expiry) if expiry else None
+    except (IndexError, ValueError, TypeError, AttributeError):
+        return None
+
+
+def get_cached_token_lookup(
+    access_token: str, lookup: str, method: Callable[[str], dict]
+) -> Union[dict, None]:
+    """Return the result of an OKTA token lookup, serving it from the token
+    cache when available. Results are cached per token hash in process and,
+    if configured, in the mongo cache shared across workers. Entries never
+    outlive the token expiry, and concurrent lookups of the same token
+    within a worker are coalesced into a single OKTA call.
+
+    Args:
+        access_token (str): The encoded JWT access token, provided by Okta.
+        lookup (str): Name of the lookup, i.e. introspect or userinfo.
+        method (Callable[[str], dict]): Function calling OKTA for the token.
+
+    Returns:
+        Union[dict, None]: Result of the lookup.
+    """
+
+    config = get_config()
+    expiry = get_token_expiry(access_token)
+
+    # only cache tokens with a known, future expiry.
+    ttl = (
+        min(config.OKTA_TOKEN_CACHE_TTL, expiry - time.time()) if expiry else 0
+    )
+    if ttl <= 0:
+        return method(access_token)
+
+    cache_key = {
+        api_c.OKTA_TOKEN_HASH: get_token_hash(access_token),
+        api_c.OKTA_TOKEN_LOOKUP: lookup,
+    }
+
+    def load() -> Union[dict, None]:
+        """Load the lookup from the shared cache or OKTA.
+
+        Returns:
+            Union[dict, None]: Result of the lookup.
+        """
+
+        database = (
+            db_client_factory.get_resource(**config.MONGO_DB_CONFIG)
+            if config.OKTA_TOKEN_CACHE_SHARED
+            else None
+        )
+        if database is not None:
+            entry = get_cache_entry(database, cache_key)
+            if (
+                entry
+                and entry.get(api_c.OKTA_TOKEN_EXPIRES_AT, 0) > time.time()
+            ):
+                return entry.get(api_c.OKTA_TOKEN_PAYLOAD)
+
+        payload = method(access_token)
+        if payload and database is not None:
+            create_cache_entry(
+                database=database,
+                cache_key=cache_key,
+                cache_value={
+                    api_c.OKTA_TOKEN_PAYLOAD: payload,
+                    api_c.OKTA_TOKEN_EXPIRES_AT: time.time() + ttl,
+                },
+                expire_after_seconds=max(1, int(ttl)),
+            )
+        return payload
+
+    return token_cache.get_or_load(
+        (cache_key[api_c.OKTA_TOKEN_HASH], lookup), load, ttl
+    )
+
+
 def introspect_token(access_token: str) -> dict:
+    """Calls Okta's introspect endpoint and returns the token's payload when
+    the token is valid and active. Results are served from the token cache
+    when available. If jwks token validation is configured, the token is
+    verified locally instead.
+    Args:
+        access_token (str): The encoded JWT access token, provided by Okta.
+    Returns:
+        payload (dict): The decoded payload data from the Okta access token.
+    """
+
+    if get_config().OKTA_TOKEN_VALIDATION == api_c.OKTA_VALIDATION_JWKS:
+        return verify_token(access_token)
+
+    return get_cached_token_lookup(
+        access_token, api_c.OKTA_INTROSPECT_LOOKUP, call_introspect_token
+    )
+
+
+def verify_token(access_token: str) -> Union[dict, None]:
+    """Verifies the signature, issuer, audience and expiry of an access token
+    locally against the cached OKTA signing keys, without calling OKTA.
+    Args:
+        access_token (str): The encoded JWT access token, provided by Okta.
+    Returns:
+        Union[dict, None]: The user data from the Okta access token, None if
+            the token is invalid.
+    """
+
+    claims = decode_token(access_token)
+    if claims is None:
+        return None
+
+    # extract user info
+    return {
+        "user_name": claims.get(api_c.OKTA_ID_SUB),
+        "user_id": claims.get(api_c.OKTA_UID),
+    }
+
+
+def decode_token(access_token: str) -> Union[dict, None]:
+    """Decodes an access token verified locally against the cached OKTA
+    signing keys, see verify_token.
+    Args:
+        access_token (str): The encoded JWT access token, provided by Okta.
+    Returns:
+        Union[dict, None]: The claims of the Okta access token, None if the
+            token is invalid.
+    """
+
+    config = get_config()
+
+    try:
+        signing_key = jwks_cache.get_signing_key(
+            jwt.get_unverified_header(access_token).get(api_c.OKTA_JWKS_KEY_ID)
+        )
+        if signing_key is None:
+            logger.warning(
+                "Failure during verification of token, unknown kid."
+            )
+            return None
+
+        return jwt.decode(
+            access_token,
+            key=signing_key.key,
+            algorithms=api_c.OKTA_JWKS_ALGORITHMS,
+            audience=config.OKTA_AUDIENCE,
+            issuer=config.OKTA_ISSUER,
+            options={"require": ["exp", "iss", "aud"]},
+        )
+    except jwt.PyJWTError as exc:
+        logger.warning("Failure during verification of token: %s.", exc)
+        return None
+
+
+def call_introspect_token(access_token: str) -> dict:
     """Calls Okta's introspect endpoint and returns the token's payload when
     the token is valid and active.
     Args:
@@ -69,15 +372,19 @@ def introspect_token(access_token: str) -> dict:
     # get config
     config = get_config()
 
-    payload = requests.post(
-        url=f"{config.OKTA_ISSUER}"
-        f"/oauth2/v1/introspect?client_id="
-        f"{config.OKTA_CLIENT_ID}",
-        data={
-            api_c.AUTHENTICATION_TOKEN: access_token,
-            api_c.AUTHENTICATION_TOKEN_TYPE_HINT: api_c.AUTHENTICATION_ACCESS_TOKEN,
-        },
-    ).json()
+    payload = (
+        get_session(Upstreams.OKTA)
+        .post(
+            url=f"{config.OKTA_ISSUER}"
+            f"/oauth2/v1/introspect?client_id="
+            f"{config.OKTA_CLIENT_ID}",
+            data={
+                api_c.AUTHENTICATION_TOKEN: access_token,
+                api_c.AUTHENTICATION_TOKEN_TYPE_HINT: api_c.AUTHENTICATION_ACCESS_TOKEN,
+            },
+        )
+        .json()
+    )
 
     # check if a valid token
     if "active" in payload and not payload["active"]:
@@ -91,7 +398,10 @@ def introspect_token(access_token: str) -> dict:
 
 
 def get_user_info(access_token: str) -> dict:
-    """Calls Okta's user_info endpoint and returns user_info object
+    """Calls Okta's user_info endpoint and returns user_info object. Results
+    are served from the token cache when available. If jwks token validation
+    is configured, the user info is read from the claims of the verified
+    token instead, when the token carries them.
 
     Args:
         access_token (str): The encoded JWT access token, provided by Okta.
@@ -103,16 +413,56 @@ def get_user_info(access_token: str) -> dict:
     if access_token is None:
         return {}
 
+    if get_config().OKTA_TOKEN_VALIDATION == api_c.OKTA_VALIDATION_JWKS:
+        claims = decode_token(access_token)
+        if claims is None:
+            return {}
+        # the email and name claims are only in the access token if the
+        # authorization server is configured to add them.
+        if all(
+            claim in claims
+            for claim in (api_c.OKTA_ID_SUB, api_c.EMAIL, api_c.NAME)
+        ):
+            return {
+                claim: claims[claim]
+                for claim in (
+                    api_c.OKTA_ID_SUB,
+                    api_c.EMAIL,
+                    api_c.NAME,
+                    api_c.ROLE,
+                )
+                if claim in claims
+            }
+
+    return get_cached_token_lookup(
+        access_token, api_c.OKTA_USER_INFO_LOOKUP, call_user_info
+    )
+
+
+def call_user_info(access_token: str) -> dict:
+    """Calls Okta's user_info endpoint and returns user_info object
+
+    Args:
+        access_token (str): The encoded JWT access token, provided by Okta.
+
+    Returns:
+        payload (dict): The decoded payload user info data from Okta.
+    """
+
     # replace invalid header characters
     access_token = str(access_token).replace("\r", "")
 
     try:
-        return requests.get(
-            url=f"{get_config().OKTA_ISSUER}/oauth2/v1/userinfo",
-            headers={
-                "Authorization": f"Bearer {access_token}",
-            },
-        ).json()
+        return (
+            get_session(Upstreams.OKTA)
+            .get(
+                url=f"{get_config().OKTA_ISSUER}/oauth2/v1/userinfo",
+                headers={
+                    "Authorization": f"Bearer {access_token}",
+                },
+            )
+            .json()
+        )
     except requests.exceptions.InvalidHeader:
         return {}
 
@@ -178,7 +528,7 @@ def get_env_okta_user_bearer_token() -> Union[str, None]:
         env_okta_user_pw = config.OKTA_TEST_USER_PW
 
         # call the auth url to get the session token
-        response = requests.post(
+        response = get_session(Upstreams.OKTA).post(
             f"{okta_org_url}/api/v1/authn",
             headers=headers,
             data=json.dumps(
@@ -1,12 +1,17 @@
 """Purpose of this module is to park schedule modules for delivery schedule."""
 import asyncio
+import uuid
 from datetime import datetime
+from bson import ObjectId
 from pymongo import MongoClient
 
 from huxunifylib.database import constants as db_c, collection_management
 from huxunifylib.database.cache_management import (
     create_cache_entry,
     get_cache_entry,
+    acquire_cache_lease,
+    release_cache_lease,
+    get_cache_tag,
 )
 from huxunifylib.database.collection_management import get_documents
 from huxunifylib.database.notification_management import create_notification
@@ -29,6 +34,7 @@ from huxunifylib.connectors.util.selector import (
 )
 from huxunifylib.util.general.logging import logger
 from huxunify.api import constants as api_c
+from huxunify.api.config import get_config
 from huxunify.api.data_connectors.cdp import (
     get_customers_count_async,
     get_customers_overview,
@@ -515,7 +521,10 @@ def run_scheduled_customer_profile_audience_count(
 
 
 async def cache_customer_overview_audience_insights(
-    database: MongoClient, okta_access_token: str, audience_filters: dict
+    database: MongoClient,
+    okta_access_token: str,
+    audience_filters: dict,
+    audience_id: ObjectId = None,
 ) -> None:
     """Fetch and cache customer overview audience insights for the audience
     filters.
@@ -524,6 +533,8 @@ async def cache_customer_overview_audience_insights(
         database (MongoClient): The mongo database client.
         okta_access_token (str): OKTA JWT Token.
         audience_filters (dict): Audience filters of an audience.
+        audience_id (ObjectId): ID of the audience, the entry is keyed and
+            tagged with it so updating the audience invalidates it.
     """
 
     data = get_customers_overview(
@@ -534,12 +545,16 @@ async def cache_customer_overview_audience_insights(
     cache_key = {
         api_c.ENDPOINT: f"{api_c.CUSTOMERS_ENDPOINT}.{api_c.OVERVIEW}",
         **{api_c.AUDIENCE_FILTERS: audience_filters},
+        api_c.AUDIENCE_ID: audience_id,
     }
 
     create_cache_entry(
         database=database,
         cache_key=cache_key,
         cache_value=data,
+        tags=[get_cache_tag(db_c.CACHE_TAG_AUDIENCE, audience_id)]
+        if audience_id
+        else None,
     )
 
 
@@ -565,8 +580,8 @@ def run_scheduled_customer_overview_audience_insights(
         audiences = get_all_audiences(database=database)
 
         # iterate through the audiences to refresh the cache for customer
-        # overview audience insights for each unique type of filters in each
-        # audience document of audiences collection
+        # overview audience insights of each audience document of audiences
+        # collection
         for audience in audiences:
             cache_key = {
                 api_c.ENDPOINT: f"{api_c.CUSTOMERS_ENDPOINT}.{api_c.OVERVIEW}",
@@ -575,6 +590,7 @@ def run_scheduled_customer_overview_audience_insights(
                         api_c.AUDIENCE_FILTERS, None
                     )
                 },
+                api_c.AUDIENCE_ID: audience.get(db_c.ID),
             }
 
             # check if cache data for matching key is not expired and present
@@ -584,15 +600,23 @@ def run_scheduled_customer_overview_audience_insights(
             )
 
             if not cache_data:
-                # fire and forget task
-                task = loop.create_task(
-                    cache_customer_overview_audience_insights(
-                        database,
-                        okta_access_token,
-                        audience.get(api_c.AUDIENCE_FILTERS, None),
+                # skip entries another worker is already recomputing
+                owner = uuid.uuid4().hex
+                if not acquire_cache_lease(database, cache_key, owner):
+                    continue
+                try:
+                    # fire and forget task
+                    task = loop.create_task(
+                        cache_customer_overview_audience_insights(
+                            database,
+                            okta_access_token,
+                            audience.get(api_c.AUDIENCE_FILTERS, None),
+                            audience.get(db_c.ID),
+                        )
                     )
-                )
-                loop.run_until_complete(task)
+                    loop.run_until_complete(task)
+                finally:
+                    release_cache_lease(database, cache_key, owner)
     else:
         logger.error(
             "Failed to run scheduled customer overview audience insights cache"
@@ -625,6 +649,8 @@ async def cache_trust_id_comparison_insights(
         database=database,
         cache_key=cache_key,
         cache_value=comparison_data,
+        codec=get_config().CACHE_CODEC,
+        chunk_size=get_config().CACHE_CHUNK_SIZE,
     )
 
 
@@ -664,11 +690,18 @@ def run_scheduled_trust_id_comparison_insights(
         cache_data = get_cache_entry(database=database, cache_key=cache_key)
 
         if not cache_data:
-            # fire and forget task
-            task = loop.create_task(
-                cache_trust_id_comparison_insights(
-                    database,
-                    segment_filter,
+            # skip entries another worker is already recomputing
+            owner = uuid.uuid4().hex
+            if not acquire_cache_lease(database, cache_key, owner):
+                continue
+            try:
+                # fire and forget task
+                task = loop.create_task(
+                    cache_trust_id_comparison_insights(
+                        database,
+                        segment_filter,
+                    )
                 )
-            )
-            loop.run_until_complete(task)
+                loop.run_until_complete(task)
+            finally:
+                release_cache_lease(database, cache_key, owner)
@@ -0,0 +1,234 @@
+"""Purpose of this file is for housing the byte streams used to respond
+with and upload files while they are being generated, holding a bounded
+part of them in memory at a time.
+"""
+import io
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, BinaryIO
+
+from huxunifylib.util.general.logging import logger
+
+# chunks written to a stream upload that are buffered until the upload
+# reads them, the writer waits once the buffer is full.
+STREAM_UPLOAD_BUFFER_CHUNKS = 8
+# seconds a writer waits at a time for buffer space, so it notices an
+# upload that stopped reading.
+STREAM_UPLOAD_WAIT = 1
+# seconds a writer waits at most for an upload to read a chunk.
+STREAM_UPLOAD_TIMEOUT = 300
+
+
+class ChunkBuffer(io.RawIOBase):
+    """Unseekable write-only buffer, e.g. the output of a streamed zip, whose
+    bytes are handed out as they are written."""
+
+    def __init__(self):
+        """Initialize the buffer."""
+
+        super().__init__()
+        self.chunks = []
+
+    # io.RawIOBase override, the result does not depend on the instance.
+    def writable(self) -> bool:  # pylint: disable=no-self-use
+        """Whether the buffer can be written to.
+
+        Returns:
+            bool: Always True.
+        """
+
+        return True
+
+    def write(self, data: bytes) -> int:
+        """Buffer bytes.
+
+        Args:
+            data (bytes): Bytes to buffer.
+
+        Returns:
+            int: Number of bytes buffered.
+        """
+
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        """Take the bytes written since the last drain.
+
+        Returns:
+            bytes: Buffered bytes.
+        """
+
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+class StreamReader(io.RawIOBase):
+    """Readable end of a bounded stream written to by another thread."""
+
+    # marks the end of the stream in the buffer.
+    END = b""
+
+    def __init__(self, max_chunks: int):
+        """Initialize the reader.
+
+        Args:
+            max_chunks (int): Chunks buffered at most.
+        """
+
+        super().__init__()
+        self.chunks = queue.Queue(max_chunks)
+        self.pending = b""
+        self.aborted = False
+        self.finished = threading.Event()
+
+    # io.RawIOBase override, the result does not depend on the instance.
+    def readable(self) -> bool:  # pylint: disable=no-self-use
+        """Whether the stream can be read from.
+
+        Returns:
+            bool: Always True.
+        """
+
+        return True
+
+    def readinto(self, buffer: memoryview) -> int:
+        """Read bytes of the stream into a buffer, waiting for the writer.
+
+        Args:
+            buffer (memoryview): Writable buffer to read into.
+
+        Returns:
+            int: Number of bytes read, 0 at the end of the stream.
+
+        Raises:
+            OSError: The writer aborted the stream.
+        """
+
+        while not self.pending:
+            chunk = self.chunks.get()
+            if self.aborted:
+                raise OSError("Stream was aborted by its writer.")
+            if not chunk:
+                # keep the end of the stream for further reads.
+                self.chunks.put(self.END)
+                return 0
+            self.pending = chunk
+
+        size = min(len(buffer), len(self.pending))
+        buffer[:size] = self.pending[:size]
+        self.pending = self.pending[size:]
+        return size
+
+    def put(self, chunk: bytes) -> None:
+        """Buffer a chunk for the reader, waiting for buffer space. The
+        chunk is dropped if the reader finished.
+
+        Args:
+            chunk (bytes): Chunk of the stream, END to end it.
+
+        Raises:
+            OSError: The reader did not read for STREAM_UPLOAD_TIMEOUT
+                seconds.
+        """
+
+        deadline = time.monotonic() + STREAM_UPLOAD_TIMEOUT
+        while not self.finished.is_set():
+            try:
+                self.chunks.put(chunk, timeout=STREAM_UPLOAD_WAIT)
+                return
+            except queue.Full:
+                if time.monotonic() >= deadline:
+                    raise OSError(
+                        "Stream upload did not read for "
+                        f"{STREAM_UPLOAD_TIMEOUT} seconds."
+                    ) from None
+
+
+class StreamUpload:
+    """Upload of the bytes written to it, read by the upload on a thread of
+    its own while they are being written. Each upload has its own thread,
+    so a writer never waits on an upload that has not started."""
+
+    def __init__(
+        self,
+        upload: Callable[[BinaryIO], bool],
+        max_chunks: int = STREAM_UPLOAD_BUFFER_CHUNKS,
+    ):
+        """Start the upload.
+
+        Args:
+            upload (Callable[[BinaryIO], bool]): Function uploading a
+                readable stream, returning whether the upload succeeded.
+            max_chunks (int): Chunks buffered at most.
+        """
+
+        self.reader = StreamReader(max_chunks)
+        self.ended = False
+        self.result = Future()
+        threading.Thread(
+            target=self.run, args=(upload,), name="stream-upload", daemon=True
+        ).start()
+
+    def run(self, upload: Callable[[BinaryIO], bool]) -> None:
+        """Run the upload, reading the stream until it ends, and set its
+        result to whether it succeeded.
+
+        Args:
+            upload (Callable[[BinaryIO], bool]): Function uploading a
+                readable stream.
+        """
+
+        try:
+            success = bool(upload(self.reader))
+        # pylint: disable=broad-except
+        except Exception as exc:
+            logger.error("Stream upload failed: %s", repr(exc))
+            success = False
+        finally:
+            # do not make the writer wait for an upload that stopped.
+            self.reader.finished.set()
+
+        self.result.set_result(success)
+
+    def write(self, data: bytes) -> None:
+        """Write bytes to upload.
+
+        Args:
+            data (bytes): Bytes to upload.
+        """
+
+        if data:
+            self.reader.put(bytes(data))
+
+    def end(self) -> None:
+        """End the stream, the upload finishes in the background."""
+
+        if not self.ended:
+            self.ended = True
+            self.reader.put(StreamReader.END)
+
+    def close(self) -> bool:
+        """End the stream and wait for the upload to finish.
+
+        Returns:
+            bool: Whether the upload succeeded.
+        """
+
+        self.end()
+        return self.result.result()
+
+    def abort(self) -> None:
+        """Abort the upload, so a partial stream is not stored."""
+
+        self.reader.aborted = True
+        if not self.ended:
+            self.ended = True
+            # the reader fails at its next chunk, do not wait for space.
+            try:
+                self.reader.chunks.put_nowait(StreamReader.END)
+            except queue.Full:
+                pass
@@ -0,0 +1,94 @@
+"""Purpose of this file is for housing pandas helpers shaping daily time
+series returned by the connectors into complete date ranges.
+"""
+from datetime import datetime
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+
+def reindex_by_day(
+    frame: pd.DataFrame,
+    date_column: str,
+    start_date: datetime,
+    end_date: datetime,
+) -> pd.DataFrame:
+    """Align rows onto every day from start_date to end_date inclusive, in
+    one operation. Days without a row are NaN, rows outside of the range or
+    not at midnight are dropped, the first row of a day is kept.
+
+    Args:
+        frame (pd.DataFrame): Rows with a date column.
+        date_column (str): Name of the date column.
+        start_date (datetime): First day of the range.
+        end_date (datetime): Last day of the range.
+
+    Returns:
+        pd.DataFrame: One row per day, indexed by date.
+    """
+
+    dates = pd.date_range(start_date, end_date, freq="D")
+    if date_column not in frame:
+        return pd.DataFrame(index=dates, columns=frame.columns)
+
+    frame = frame.assign(
+        **{
+            date_column: pd.to_datetime(
+                frame[date_column],
+                utc=start_date.tzinfo is not None,
+                errors="coerce",
+            )
+        }
+    )
+
+    return (
+        frame.dropna(subset=[date_column])
+        .drop_duplicates(date_column)
+        .set_index(date_column)
+        .reindex(dates)
+    )
+
+
+def weighted_average(
+    values: pd.DataFrame, weights: pd.DataFrame
+) -> np.ndarray:
+    """Average the values of each row weighted by the weights of the row,
+    missing values and weights count as 0.
+
+    Args:
+        values (pd.DataFrame): Values, one column per weight.
+        weights (pd.DataFrame): Weights in the same column order.
+
+    Returns:
+        np.ndarray: Weighted average of each row, 0 for rows without
+            weight.
+    """
+
+    weights = weights.fillna(0).to_numpy(dtype=float)
+    totals = weights.sum(axis=1)
+    sums = (values.fillna(0).to_numpy(dtype=float) * weights).sum(axis=1)
+
+    return np.divide(sums, totals, out=np.zeros_like(sums), where=totals != 0)
+
+
+def to_records(frame: pd.DataFrame, date_column: str) -> List[dict]:
+    """Serialize a frame indexed by date to response records, with Python
+    datetimes and numbers and None for missing values.
+
+    Args:
+        frame (pd.DataFrame): Frame indexed by date.
+        date_column (str): Name of the date field of the records.
+
+    Returns:
+        List[dict]: One record per row.
+    """
+
+    columns = {date_column: frame.index.to_pydatetime().tolist()}
+    for column in frame.columns:
+        values = frame[column]
+        if values.hasnans:
+            values = values.astype(object).where(values.notna(), None)
+        columns[column] = values.tolist()
+
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
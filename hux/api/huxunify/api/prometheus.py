@@ -4,7 +4,7 @@ from enum import Enum
 from functools import wraps
 
 from flask import Flask, request, Request
-from prometheus_client import Gauge
+from prometheus_client import Counter, Gauge, Histogram
 from prometheus_flask_exporter import PrometheusMetrics
 
 from huxunifylib.util.general.logging import logger
@@ -16,6 +16,31 @@ health_check_metrics = Gauge(
     registry=prometheus_metrics.registry,
     labelnames=["name"],
 )
+cache_lookup_metrics = Counter(
+    name="hux_unified_cache_lookups",
+    documentation="in-process cache lookups by cache name and result",
+    registry=prometheus_metrics.registry,
+    labelnames=["name", "result"],
+)
+cache_value_size_metrics = Histogram(
+    name="hux_unified_cache_value_bytes",
+    documentation="raw and stored sizes of compressed cache values",
+    registry=prometheus_metrics.registry,
+    labelnames=["codec", "size"],
+    buckets=tuple(2**power for power in range(10, 26, 2)),
+)
+async_request_metrics = Counter(
+    name="hux_unified_async_requests",
+    documentation="async batch requests by batch name and result",
+    registry=prometheus_metrics.registry,
+    labelnames=["name", "result"],
+)
+async_batch_remaining_metrics = Gauge(
+    name="hux_unified_async_batch_remaining",
+    documentation="requests of an async batch not completed yet",
+    registry=prometheus_metrics.registry,
+    labelnames=["name"],
+)
 
 
 def monitor_app(flask_app: Flask) -> None:
@@ -100,6 +125,62 @@ class Connections(Enum):
     DECISIONING = "hux_unified_decisioning_connection_health"
 
 
+class Caches(Enum):
+    """In-process cache name enum"""
+
+    OKTA_TOKEN = "okta_token"
+    USER = "user"
+    CACHE_L1 = "cache_l1"
+    CDP = "cdp"
+
+
+def record_cache_lookup(cache: Caches, hit: bool) -> None:
+    """Record a hit or a miss against an in-process cache.
+
+    Args:
+        cache (Caches): Cache enum.
+        hit (bool): True if the lookup was served from the cache.
+    """
+
+    cache_lookup_metrics.labels(
+        name=cache.value, result="hit" if hit else "miss"
+    ).inc()
+
+
+def record_cache_value_size(codec: str, sizes: dict) -> None:
+    """Record the raw and stored sizes of a compressed cache value.
+
+    Args:
+        codec (str): Compression codec of the value.
+        sizes (dict): Raw and stored sizes in bytes of the value.
+    """
+
+    for size, value in sizes.items():
+        cache_value_size_metrics.labels(codec=codec, size=size).observe(value)
+
+
+def record_async_request(name: str, result: str) -> None:
+    """Record a completed or retried request of an async batch.
+
+    Args:
+        name (str): Name of the batch.
+        result (str): Result of the request, ok, retried or failed.
+    """
+
+    async_request_metrics.labels(name=name, result=result).inc()
+
+
+def record_async_batch_remaining(name: str, remaining: int) -> None:
+    """Record the requests of an async batch not completed yet.
+
+    Args:
+        name (str): Name of the batch.
+        remaining (int): Number of requests not completed yet.
+    """
+
+    async_batch_remaining_metrics.labels(name=name).set(remaining)
+
+
 def record_health_status(connection: Connections) -> object:
     """Purpose of this decorator is for recording the health status
     metrics for the various services
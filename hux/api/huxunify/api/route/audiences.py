@@ -1,18 +1,22 @@
 # pylint: disable=unused-argument,too-many-lines
 """Paths for Orchestration API."""
-import zipfile
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from http import HTTPStatus
-from itertools import repeat
-from pathlib import Path
 from typing import Tuple, Union, Iterator, Optional
 
 import pandas as pd
 from pandas import DataFrame
 from flasgger import SwaggerView
 from bson import ObjectId
-from flask import Blueprint, Response, request, jsonify
+from flask import (
+    Blueprint,
+    Response,
+    request,
+    jsonify,
+    stream_with_context,
+)
 
 from huxunifylib.database.delivery_platform_management import (
     get_delivery_platform,
@@ -77,7 +81,7 @@ from huxunify.api.route.utils import (
     logger,
     Validation,
     get_start_end_dates,
-    generate_audience_file,
+    generate_audience_zip,
     convert_cdp_buckets_to_histogram,
 )
 
@@ -124,8 +128,8 @@ def get_audience_data_async(
     location_details: dict,
     batch_size: int = api_c.CUSTOMERS_DEFAULT_BATCH_SIZE,
 ) -> Iterator[Optional[DataFrame]]:
-    """Creates a list of tasks, this is useful for asynchronous batch wise
-    calls to a task.
+    """Retrieves the batches of an audience concurrently, yielding them in
+    order with at most one batch per worker fetched ahead.
 
     Args:
         cdp_connector (connector_cdp): Instance of CDP connector.
@@ -133,16 +137,15 @@ def get_audience_data_async(
         location_details (dict): Audience filters to be passed.
         batch_size (int, Optional): Size of batch to be retrieved.
 
-    Returns:
-        list: list of each batch's data.
+    Yields:
+        Iterator[Optional[DataFrame]]: each batch's data.
     """
     offset = 0
     if actual_size <= batch_size:
-        return [
-            get_batch_customers(
-                cdp_connector, location_details, actual_size, offset
-            )
-        ]
+        yield get_batch_customers(
+            cdp_connector, location_details, actual_size, offset
+        )
+        return
     batch_sizes = []
     offsets = []
     while offset + batch_size <= actual_size:
@@ -155,13 +158,23 @@ def get_audience_data_async(
     with ThreadPoolExecutor(
         max_workers=api_c.MAX_WORKERS_THREAD_POOL
     ) as executor:
-        return executor.map(
-            get_batch_customers,
-            repeat(cdp_connector),
-            repeat(location_details),
-            batch_sizes,
-            offsets,
-        )
+        # fetch ahead at most one batch per worker, so the batches are
+        # held in memory only until they are consumed, in order.
+        batches = deque()
+        for batch_size_, offset_ in zip(batch_sizes, offsets):
+            if len(batches) >= api_c.MAX_WORKERS_THREAD_POOL:
+                yield batches.popleft().result()
+            batches.append(
+                executor.submit(
+                    get_batch_customers,
+                    cdp_connector,
+                    location_details,
+                    batch_size_,
+                    offset_,
+                )
+            )
+        while batches:
+            yield batches.popleft().result()
 
 
 @add_view_to_blueprint(
@@ -274,23 +287,16 @@ class AudienceDownload(SwaggerView):
                 config.RETURN_EMPTY_AUDIENCE_FILE,
                 ",".join(download_types),
             )
-            for download_type in download_types:
-                data_batches = [
-                    pd.DataFrame(
-                        columns=applicable_download_types.get(download_type)[1]
-                    )
-                ]
-                # change transform function to not transform any fields if config
-                # is set to download empty audience file
-                transform_function = do_not_transform_fields
-                generate_audience_file(
-                    database=database,
-                    user_name=user[db_c.USER_NAME],
-                    download_type=download_type,
-                    audience_id=audience_id,
-                    data_batches=data_batches,
-                    transform_function=transform_function,
-                )
+            # change transform function to return an empty audience file with
+            # the default columns of the download type if config is set to
+            # download empty audience file
+            data_batches = [pd.DataFrame()]
+            transform_functions = {
+                download_type: lambda _, columns=applicable_download_types.get(
+                    download_type
+                )[1]: pd.DataFrame(columns=columns)
+                for download_type in download_types
+            }
         else:
             logger.info(
                 "%s config set to %s, will generate %s type audience files with content.",
@@ -300,6 +306,7 @@ class AudienceDownload(SwaggerView):
             )
             cdp = connector_cdp.ConnectorCDP(access_token=token_response[0])
 
+            # the batches are read once from the CDP for all download types.
             data_batches = get_audience_data_async(
                 cdp,
                 audience.get(api_c.SIZE),
@@ -310,52 +317,30 @@ class AudienceDownload(SwaggerView):
                     )
                 },
             )
-
-            for download_type in download_types:
-                # set transform function based on download type in request
-                transform_function = applicable_download_types.get(
-                    download_type
-                )[0]
-                generate_audience_file(
-                    database=database,
-                    user_name=user[db_c.USER_NAME],
-                    download_type=download_type,
-                    audience_id=audience_id,
-                    data_batches=data_batches,
-                    transform_function=transform_function,
-                )
-
-        create_notification(
-            database,
-            db_c.NOTIFICATION_TYPE_INFORMATIONAL,
-            f'{user[api_c.USER_NAME]} downloaded the audience, "{audience[db_c.NAME]}"'
-            f" with formats {','.join(download_types)}",
-            db_c.NOTIFICATION_CATEGORY_AUDIENCES,
-            user[api_c.USER_NAME],
-        )
+            # set transform function based on download type in request
+            transform_functions = {
+                download_type: applicable_download_types.get(download_type)[0]
+                for download_type in download_types
+            }
 
         zipfile_name = (
             f"{datetime.now().strftime('%Y%m%d%H%M%S')}_"
             f"{audience_id}_audience_data.zip"
         )
-        folder_name = "downloadaudiences"
-        # zip all the audiences which are inside in the folder
-        with zipfile.ZipFile(
-            zipfile_name, "w", compression=zipfile.ZIP_STORED
-        ) as zipfolder:
-
-            folder = Path(__file__).parent.parent.joinpath(folder_name)
-            for file in folder.rglob("**/*.csv"):
-                zipfolder.write(file, arcname=file.name)
-                file.unlink()
-
-        zip_file = Path(zipfile_name)
-        data = zip_file.read_bytes()
-        zip_file.unlink()
 
+        # stream the zip while the audience files are generated into it.
         return (
             Response(
-                data,
+                stream_with_context(
+                    generate_audience_zip(
+                        data_batches=data_batches,
+                        transform_functions=transform_functions,
+                        audience_id=audience_id,
+                        user_name=user[db_c.USER_NAME],
+                        database=database,
+                        audience_name=audience[db_c.NAME],
+                    )
+                ),
                 headers={
                     "Content-Type": "application/zip",
                     "Access-Control-Expose-Headers": "Content-Disposition",
@@ -36,7 +36,7 @@ from huxunify.api.route.decorators import (
     api_error_handler,
     requires_access_levels,
 )
-from huxunify.api.data_connectors.cache import Caching
+from huxunify.api.data_connectors.cache import Caching, CacheSections
 from huxunify.api.data_connectors.okta import (
     get_token_from_request,
 )
@@ -131,25 +131,26 @@ class CustomerOverview(SwaggerView):
             Tuple[dict, int]: dict of Customer data overview, HTTP status code.
         """
 
-        # check if cache entry
+        # check if cache entry, resolving the sections concurrently.
         token_response = get_token_from_request(request)
-        customers_overview = Caching.check_and_return_cache(
+        sections = CacheSections()
+        sections.add(
+            api_c.OVERVIEW,
             f"{api_c.CUSTOMERS_ENDPOINT}.{api_c.OVERVIEW}",
             get_customers_overview,
             {"token": token_response[0]},
+            required=True,
+            refresh_ahead=True,
         )
-
-        customers_overview[
-            api_c.IDR_INSIGHTS
-        ] = Caching.check_and_return_cache(
+        sections.add(
+            api_c.IDR_INSIGHTS,
             f"{api_c.IDR_ENDPOINT}.{api_c.OVERVIEW}",
             get_identity_overview,
             {"token": token_response[0]},
+            refresh_ahead=True,
         )
-
-        customers_overview[
-            api_c.GEOGRAPHICAL
-        ] = Caching.check_and_return_cache(
+        sections.add(
+            api_c.GEOGRAPHICAL,
             f"{api_c.CUSTOMERS_ENDPOINT}.{api_c.GEOGRAPHICAL}",
             get_demographic_by_state,
             {
@@ -158,8 +159,13 @@ class CustomerOverview(SwaggerView):
                     api_c.AUDIENCE_FILTERS
                 ],
             },
+            refresh_ahead=True,
         )
 
+        results = sections.results()
+        customers_overview = results.pop(api_c.OVERVIEW)
+        customers_overview.update(results)
+
         return (
             CustomerOverviewSchema().dump(customers_overview),
             HTTPStatus.OK,
@@ -282,26 +288,25 @@ class CustomerPostOverview(SwaggerView):
                         HTTPStatus.OK,
                     )
 
-        customers_overview = Caching.check_and_return_cache(
+        sections = CacheSections()
+        sections.add(
+            api_c.OVERVIEW,
             {
                 "endpoint": f"{api_c.CUSTOMERS_ENDPOINT}.{api_c.OVERVIEW}",
                 **filters,
             },
             get_customers_overview,
             {"token": token_response[0], api_c.AUDIENCE_FILTERS: filters},
+            required=True,
         )
-
-        customers_overview[
-            api_c.IDR_INSIGHTS
-        ] = Caching.check_and_return_cache(
+        sections.add(
+            api_c.IDR_INSIGHTS,
             {"endpoint": f"{api_c.IDR_ENDPOINT}.{api_c.OVERVIEW}", **filters},
             get_identity_overview,
             {"token": token_response[0], api_c.AUDIENCE_FILTERS: filters},
         )
-
-        customers_overview[
-            api_c.GEOGRAPHICAL
-        ] = Caching.check_and_return_cache(
+        sections.add(
+            api_c.GEOGRAPHICAL,
             {
                 "endpoint": f"{api_c.CUSTOMERS_ENDPOINT}.{api_c.GEOGRAPHICAL}",
                 **filters,
@@ -313,6 +318,10 @@ class CustomerPostOverview(SwaggerView):
             },
         )
 
+        results = sections.results()
+        customers_overview = results.pop(api_c.OVERVIEW)
+        customers_overview.update(results)
+
         return (
             CustomerOverviewSchema().dump(customers_overview),
             HTTPStatus.OK,
@@ -1223,6 +1232,7 @@ class TotalCustomersGraphView(SwaggerView):
             f"{api_c.CUSTOMERS_INSIGHTS}.{api_c.TOTAL}.{start_date}.{end_date}",
             get_customers_insights_count_by_day,
             {"token": token_response[0], "date_filters": date_filters},
+            refresh_ahead=True,
         )
 
         return (
@@ -1513,6 +1523,7 @@ class CustomersInsightsCities(SwaggerView):
                 "offset": batch_size * (batch_number - 1),
                 "limit": batch_size,
             },
+            compress=True,
         )
 
         return (
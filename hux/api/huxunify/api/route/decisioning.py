@@ -116,6 +116,8 @@ class ModelsView(SwaggerView):
             "all_models.info",
             Decisioning(token).get_all_models,
             {},
+            refresh_ahead=True,
+            compress=True,
         )
 
         all_models = list(
@@ -8,7 +8,6 @@ import time
 from http import HTTPStatus
 from typing import Tuple, Union
 from datetime import datetime, timedelta
-import aiohttp
 from flasgger import SwaggerView
 from bson import ObjectId
 from flask import Blueprint, request, Response
@@ -25,6 +24,7 @@ from huxunifylib.connectors import (
 from huxunifylib.database.user_management import (
     delete_favorite_from_all_users,
 )
+from huxunifylib.database.cache_management import get_cache_tag
 import huxunifylib.database.constants as db_c
 from huxunifylib.database.delete_util import delete_lookalike_audience
 from huxunifylib.database.notification_management import create_notification
@@ -65,7 +65,12 @@ from huxunify.api.data_connectors.cdp import (
     get_customer_count_by_country,
     get_customer_product_categories,
 )
-from huxunify.api.data_connectors.cache import Caching
+from huxunify.api.data_connectors.cache import Caching, CacheSections
+from huxunify.api.data_connectors.http_client import (
+    Upstreams,
+    get_async_session,
+    run_async,
+)
 from huxunify.api.data_connectors.okta import (
     get_token_from_request,
 )
@@ -149,31 +154,31 @@ async def get_audience_insights_async(token: str, audience_filters: dict):
         if audience_filters
         else api_c.CUSTOMER_OVERVIEW_DEFAULT_FILTER
     )
-    async with aiohttp.ClientSession() as session:
-        responses = await asyncio.gather(
-            get_demographic_by_state_async(
-                session,
-                token,
-                filters,
-            ),
-            get_city_ltvs_async(
-                session,
-                token,
-                filters,
-            ),
-            get_spending_by_gender_async(
-                session,
-                token,
-                filters=filters,
-                start_date=str(datetime.utcnow().date() - timedelta(days=180)),
-                end_date=str(datetime.utcnow().date()),
-            ),
-            get_customers_overview_async(
-                session,
-                token,
-                filters,
-            ),
-        )
+    session = get_async_session(Upstreams.CDP)
+    responses = await asyncio.gather(
+        get_demographic_by_state_async(
+            session,
+            token,
+            filters,
+        ),
+        get_city_ltvs_async(
+            session,
+            token,
+            filters,
+        ),
+        get_spending_by_gender_async(
+            session,
+            token,
+            filters=filters,
+            start_date=str(datetime.utcnow().date() - timedelta(days=180)),
+            end_date=str(datetime.utcnow().date()),
+        ),
+        get_customers_overview_async(
+            session,
+            token,
+            filters,
+        ),
+    )
     audience_insights[api_c.DEMOGRAPHIC] = responses[0]
     audience_insights[api_c.INCOME] = responses[1]
     audience_insights[api_c.SPEND] = group_gender_spending(responses[2])
@@ -901,6 +906,33 @@ class AudienceGetView(SwaggerView):
             # set audience to lookalike
             audience = lookalike
 
+        # fetch the insights while the engagements are processed, they are
+        # left out of the response if the fetch fails.
+        sections = CacheSections()
+        sections.add(
+            api_c.AUDIENCE_INSIGHTS,
+            {
+                api_c.ENDPOINT: f"{api_c.CUSTOMERS_ENDPOINT}.{api_c.OVERVIEW}",
+                **{
+                    api_c.AUDIENCE_FILTERS: audience.get(
+                        api_c.AUDIENCE_FILTERS, None
+                    )
+                },
+                # keyed per audience so the entry carries only its tag.
+                api_c.AUDIENCE_ID: audience[db_c.ID],
+            },
+            get_customers_overview,
+            {
+                api_c.AUTHENTICATION_TOKEN: token_response[0],
+                api_c.AUDIENCE_FILTERS: {
+                    api_c.AUDIENCE_FILTERS: audience.get(
+                        api_c.AUDIENCE_FILTERS, None
+                    )
+                },
+            },
+            tags=[get_cache_tag(db_c.CACHE_TAG_AUDIENCE, audience[db_c.ID])],
+        )
+
         # get the audience insights
         engagement_deliveries = orchestration_management.get_audience_insights(
             database,
@@ -997,25 +1029,7 @@ class AudienceGetView(SwaggerView):
         )
 
         # add insights
-        audience[api_c.AUDIENCE_INSIGHTS] = Caching.check_and_return_cache(
-            {
-                api_c.ENDPOINT: f"{api_c.CUSTOMERS_ENDPOINT}.{api_c.OVERVIEW}",
-                **{
-                    api_c.AUDIENCE_FILTERS: audience.get(
-                        api_c.AUDIENCE_FILTERS, None
-                    )
-                },
-            },
-            get_customers_overview,
-            {
-                api_c.AUTHENTICATION_TOKEN: token_response[0],
-                api_c.AUDIENCE_FILTERS: {
-                    api_c.AUDIENCE_FILTERS: audience.get(
-                        api_c.AUDIENCE_FILTERS, None
-                    )
-                },
-            },
-        )
+        audience.update(sections.results())
 
         # query DB and populate lookalike audiences in audience dict only if
         # the audience is not a lookalike audience since lookalike audience
@@ -1227,7 +1241,7 @@ class AudienceInsightsGetView(SwaggerView):
 
         # check if the source audience exists.
         if audience:
-            audience_insights = asyncio.run(
+            audience_insights = run_async(
                 get_audience_insights_async(
                     token_response[0],
                     audience[api_c.AUDIENCE_FILTERS],
@@ -283,6 +283,7 @@ class TrustIdAttributeComparison(SwaggerView):
                         api_c.TRUST_ID_SEGMENT_FILTERS
                     ],
                 },
+                compress=True,
             )
         time2 = time.perf_counter()
         logging.info(
@@ -484,6 +485,7 @@ class TrustIdAddSegment(SwaggerView):
                         api_c.TRUST_ID_SEGMENT_FILTERS
                     ],
                 },
+                compress=True,
             )
         logging.info(
             "Comparison data fetched in %s secs.",
@@ -598,6 +600,7 @@ class TrustIdRemoveSegment(SwaggerView):
                         api_c.TRUST_ID_SEGMENT_FILTERS
                     ],
                 },
+                compress=True,
             )
         logging.info(
             "Comparison data fetched in %s secs.",
@@ -1,15 +1,28 @@
 """Purpose of this file is to house route utilities."""
 # pylint: disable=too-many-lines
+import copy
 import statistics
 from collections import defaultdict, namedtuple
+from contextlib import ExitStack
 from datetime import datetime, timedelta
 import re
 from itertools import groupby
-from pathlib import Path
-from typing import Tuple, Union, Generator, Callable, List
+import tempfile
+import zipfile
+from functools import partial
+from typing import (
+    Tuple,
+    Union,
+    Callable,
+    List,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    BinaryIO,
+)
 from http import HTTPStatus
 
-import pandas as pd
 from bson import ObjectId
 
 from dateutil.parser import parse
@@ -20,12 +33,11 @@ from pandas import DataFrame
 from healthcheck import HealthCheck
 from decouple import config
 from connexion.exceptions import ProblemException
-from pymongo import MongoClient
 
 from huxunifylib.util.general.logging import logger
 
 from huxunifylib.database.audit_management import create_audience_audit
-from huxunifylib.database.util.client import db_client_factory
+from huxunifylib.database.notification_management import create_notification
 from huxunifylib.database import (
     constants as db_c,
 )
@@ -34,6 +46,7 @@ from huxunifylib.database.user_management import (
     get_user,
     get_all_users,
     set_user,
+    add_user_change_listener,
 )
 from huxunifylib.database.client import DatabaseClient
 
@@ -51,14 +64,30 @@ from huxunify.api.data_connectors.cdp_connection import (
     check_cdp_connections_api_connection,
 )
 from huxunify.api.data_connectors.jira import JiraConnection
+from huxunify.api.data_connectors.mongo import get_db_client
+from huxunify.api.data_connectors.streaming import ChunkBuffer, StreamUpload
+from huxunify.api.data_connectors.memory_cache import MemoryCache
 from huxunify.api.exceptions import (
     unified_exceptions as ue,
 )
-from huxunify.api.prometheus import record_health_status, Connections
+from huxunify.api.prometheus import (
+    record_health_status,
+    Connections,
+    Caches,
+)
 from huxunify.api.stubbed_data.stub_shap_data import shap_data
 from huxunify.api.schema.user import RequestedUserSchema
 
 
+# okta_id -> user document, invalidated by user writes in this worker.
+user_cache = MemoryCache(Caches.USER, max_entries=get_config().USER_CACHE_SIZE)
+add_user_change_listener(
+    lambda okta_id: user_cache.clear()
+    if okta_id is None
+    else user_cache.delete(okta_id)
+)
+
+
 def handle_api_exception(exc: Exception, description: str = "") -> None:
     """Purpose of this function is to handle general api exceptions,
     and reduce code in the route.
@@ -84,16 +113,6 @@ def handle_api_exception(exc: Exception, description: str = "") -> None:
     )
 
 
-def get_db_client() -> MongoClient:
-    """Get DB client.
-
-    Returns:
-        MongoClient: MongoDB client.
-    """
-
-    return db_client_factory.get_resource(**get_config().MONGO_DB_CONFIG)
-
-
 @record_health_status(Connections.DB)
 def check_mongo_connection() -> Tuple[bool, str]:
     """Validate mongo DB connection.
@@ -536,6 +555,33 @@ def get_user_favorites(
     return user[0].get(api_c.FAVORITES, {}).get(component_name, [])
 
 
+def get_cached_user(
+    database: DatabaseClient, okta_id: str
+) -> Union[dict, None]:
+    """Get a user document by okta_id, serving it from the user cache when
+    available. Cached documents are invalidated by user writes and expire
+    after the configured user cache TTL.
+
+    Args:
+        database (DatabaseClient): A database client.
+        okta_id (str): Okta ID of the user.
+
+    Returns:
+        Union[dict, None]: A copy of the user document, None if not found.
+    """
+
+    ttl = get_config().USER_CACHE_TTL
+    if ttl <= 0:
+        return get_user(database, okta_id)
+
+    user = user_cache.get_or_load(
+        okta_id, lambda: get_user(database, okta_id), ttl
+    )
+
+    # callers decorate the returned user, never hand out the cached document.
+    return copy.deepcopy(user)
+
+
 def get_user_from_db(access_token: str) -> Union[dict, Tuple[dict, int]]:
     """Get the corresponding user matching the okta access token from the DB.
     Create/Set a new user in DB if an user matching the valid okta access token
@@ -577,7 +623,7 @@ def get_user_from_db(access_token: str) -> Union[dict, Tuple[dict, int]]:
     database = get_db_client()
     logger.info("Successfully got database client.")
 
-    user = get_user(database, user_info[api_c.OKTA_ID_SUB])
+    user = get_cached_user(database, user_info[api_c.OKTA_ID_SUB])
 
     if user is None:
         # since a valid okta_id is extracted from the okta issuer, use the user
@@ -1235,27 +1281,6 @@ def parse_seconds_to_duration_string(duration: int):
     return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
 
 
-def generate_cache_key_string(data: Union[dict, list]) -> Generator:
-    """Generates cache key strings for dicts and lists.
-
-    Args:
-        data (Union[dict,list]): Input data to get cache key.
-
-    Yields:
-        Generator: String Generator.
-    """
-
-    for item in data:
-        if isinstance(item, list):
-            generate_cache_key_string(item)
-        elif isinstance(item, dict):
-            yield " ".join(
-                [x for key, value in item.items() for x in [key, str(value)]]
-            )
-        else:
-            yield item
-
-
 def set_destination_authentication_secrets(
     authentication_details: dict,
     destination_id: str,
@@ -1305,72 +1330,317 @@ def set_destination_authentication_secrets(
     return ssm_params
 
 
-def generate_audience_file(
-    data_batches: pd.DataFrame,
-    transform_function: Callable,
+def start_audience_upload(
+    cloud_client: CloudClient, file_name: str, user_name: str
+) -> StreamUpload:
+    """Starts the cloud upload of an audience file read as it is written.
+
+    Args:
+        cloud_client (CloudClient): Cloud client to upload with.
+        file_name (str): Name of the audience file.
+        user_name (str): User name
+
+    Returns:
+        StreamUpload: Upload of the audience file.
+    """
+
+    return StreamUpload(
+        lambda file_obj: cloud_client.upload_stream(
+            file_obj,
+            file_name=file_name,
+            file_type=api_c.AUDIENCE,
+            user_name=user_name,
+        )
+    )
+
+
+class AudienceUploads:
+    """Cloud uploads of the audience files of a download. The first
+    AUDIENCE_STREAM_UPLOADS audience files are uploaded while they are
+    written, each started at its first write, the others from their spool
+    once it is complete."""
+
+    def __init__(self, audience_file_names: Dict[str, str], user_name: str):
+        """Initialize the uploads.
+
+        Args:
+            audience_file_names (Dict[str, str]): Download type to audience
+                file name mapping dict, in download order.
+            user_name (str): User name
+        """
+
+        self.cloud_client = CloudClient()
+        self.audience_file_names = audience_file_names
+        self.user_name = user_name
+        self.streamed_types = list(audience_file_names)[
+            : api_c.AUDIENCE_STREAM_UPLOADS
+        ]
+        self.stream_uploads = {}
+        self.uploaded = {}
+
+        logger.info(
+            "Uploading generated %s audience files to %s cloud storage",
+            ",".join(audience_file_names.values()),
+            self.cloud_client.config.CLOUD_PROVIDER,
+        )
+
+    def write(self, download_type: str, data: bytes) -> None:
+        """Write bytes of an audience file uploaded while it is written.
+
+        Args:
+            download_type (str): Download type of the audience file.
+            data (bytes): Bytes of the audience file.
+        """
+
+        if download_type not in self.streamed_types:
+            return
+
+        if download_type not in self.stream_uploads:
+            self.stream_uploads[download_type] = start_audience_upload(
+                self.cloud_client,
+                self.audience_file_names[download_type],
+                self.user_name,
+            )
+        self.stream_uploads[download_type].write(data)
+
+    def end(self) -> None:
+        """End the audience files uploaded while they are written."""
+
+        for stream_upload in self.stream_uploads.values():
+            stream_upload.end()
+
+    def upload_spool(self, download_type: str, spool: BinaryIO) -> None:
+        """Upload a complete audience file from its spool, unless it was
+        uploaded while it was written.
+
+        Args:
+            download_type (str): Download type of the audience file.
+            spool (BinaryIO): Spool of the audience file.
+        """
+
+        if download_type in self.streamed_types:
+            return
+
+        spool.seek(0)
+        self.uploaded[download_type] = self.cloud_client.upload_stream(
+            spool,
+            file_name=self.audience_file_names[download_type],
+            file_type=api_c.AUDIENCE,
+            user_name=self.user_name,
+        )
+
+    def abort(self) -> None:
+        """Abort the uploads, so no partial audience file is stored."""
+
+        for stream_upload in self.stream_uploads.values():
+            stream_upload.abort()
+
+    def close(self) -> List[str]:
+        """Wait for the uploads to finish.
+
+        Returns:
+            List[str]: Download types of the uploaded audience files.
+        """
+
+        for download_type, stream_upload in self.stream_uploads.items():
+            self.uploaded[download_type] = stream_upload.close()
+
+        return [
+            download_type
+            for download_type in self.audience_file_names
+            if self.uploaded.get(download_type)
+        ]
+
+
+def write_audience_batches(
+    data_batches: Iterable[Optional[DataFrame]],
+    transform_functions: Dict[str, Callable],
+    writers: Dict[str, BinaryIO],
+    uploads: AudienceUploads,
+    output: ChunkBuffer,
+) -> Iterator[bytes]:
+    """Writes each data batch, transformed into the audience file of every
+    download type, as the data batches are read.
+
+    Args:
+        data_batches (Iterable[Optional[DataFrame]]): Data batches retrieved
+            from cdp
+        transform_functions (Dict[str, Callable]): Download type to
+            transform function mapping dict.
+        writers (Dict[str, BinaryIO]): Download type to audience file
+            mapping dict.
+        uploads (AudienceUploads): Cloud uploads of the audience files.
+        output (ChunkBuffer): Buffer of the zip.
+
+    Yields:
+        Iterator[bytes]: Bytes of the zip.
+    """
+
+    header = True
+    for dataframe_batch in data_batches:
+        if dataframe_batch is None:
+            continue
+        for download_type, transform_function in transform_functions.items():
+            data = (
+                transform_function(dataframe_batch)
+                .to_csv(index=False, header=header)
+                .encode("utf-8")
+            )
+            writers[download_type].write(data)
+            uploads.write(download_type, data)
+        header = False
+        yield output.drain()
+
+
+def write_audience_zip(
+    data_batches: Iterable[Optional[DataFrame]],
+    transform_functions: Dict[str, Callable],
+    audience_file_names: Dict[str, str],
+    uploads: AudienceUploads,
+) -> Iterator[bytes]:
+    """Writes the zip of the audience file of each download type. The first
+    audience file is streamed into the zip while the batches are read, the
+    others are spooled until it is done.
+
+    Args:
+        data_batches (Iterable[Optional[DataFrame]]): Data batches retrieved
+            from cdp
+        transform_functions (Dict[str, Callable]): Download type to
+            transform function mapping dict.
+        audience_file_names (Dict[str, str]): Download type to audience
+            file name mapping dict.
+        uploads (AudienceUploads): Cloud uploads of the audience files.
+
+    Yields:
+        Iterator[bytes]: Bytes of the zip.
+    """
+
+    output = ChunkBuffer()
+    download_types = list(transform_functions)
+
+    with ExitStack() as spools_stack, zipfile.ZipFile(
+        output, "w", compression=zipfile.ZIP_DEFLATED
+    ) as zip_file:
+        spools = {
+            download_type: spools_stack.enter_context(
+                tempfile.SpooledTemporaryFile(
+                    max_size=api_c.AUDIENCE_FILE_SPOOL_SIZE
+                )
+            )
+            for download_type in download_types[1:]
+        }
+        with zip_file.open(
+            audience_file_names[download_types[0]], "w", force_zip64=True
+        ) as audience_file:
+            yield from write_audience_batches(
+                data_batches,
+                transform_functions,
+                {download_types[0]: audience_file, **spools},
+                uploads,
+                output,
+            )
+
+        uploads.end()
+        yield output.drain()
+
+        for download_type, spool in spools.items():
+            spool.seek(0)
+            with zip_file.open(
+                audience_file_names[download_type], "w", force_zip64=True
+            ) as audience_file:
+                for data in iter(
+                    partial(spool.read, api_c.AUDIENCE_FILE_CHUNK_SIZE), b""
+                ):
+                    audience_file.write(data)
+                    yield output.drain()
+            uploads.upload_spool(download_type, spool)
+
+    yield output.drain()
+
+
+def generate_audience_zip(  # pylint: disable=too-many-arguments
+    data_batches: Iterable[Optional[DataFrame]],
+    transform_functions: Dict[str, Callable],
     audience_id: ObjectId,
-    download_type: str,
     user_name: str,
     database: DatabaseClient,
-) -> None:
-    """Generates Audience File
+    audience_name: str = "",
+) -> Iterator[bytes]:
+    """Generates a zip of the audience file of each download type, streamed
+    as the data batches are read, see write_audience_zip.
+
+    Each audience file is uploaded to the cloud, see AudienceUploads, and
+    audited once uploaded. The user is notified once the whole zip is
+    streamed. If the zip fails, the uploads are aborted and the user is
+    notified of the failure.
 
     Args:
-        database(DatabaseClient): MongoDB Client
-        user_name(str): User name
-        download_type(str): Download Type selected
-        audience_id(ObjectId): Audience Id
-        data_batches(pd.Dataframe): Data batches retrieved from cdp
-        transform_function(Callable): Transform Function
+        data_batches (Iterable[Optional[DataFrame]]): Data batches retrieved
+            from cdp
+        transform_functions (Dict[str, Callable]): Download type to
+            transform function mapping dict.
+        audience_id (ObjectId): Audience Id
+        user_name (str): User name
+        database (DatabaseClient): MongoDB Client
+        audience_name (str): Audience name used in the notifications.
 
-    Returns:
+    Yields:
+        Iterator[bytes]: Bytes of the zip.
 
+    Raises:
+        BaseException: Any error reading the batches or writing the zip,
+            raised again once the uploads are aborted.
     """
-    folder_name = "downloadaudiences"
-    audience_file_name = (
-        f"{datetime.now().strftime('%m%d%Y%H%M%S')}"
+
+    download_types = ",".join(transform_functions)
+    audience_file_names = {
+        download_type: f"{datetime.now().strftime('%m%d%Y%H%M%S')}"
         f"_{audience_id}_{download_type}.csv"
-    )
-    with open(
-        Path(__file__).parent.parent.joinpath(folder_name)
-        / audience_file_name,
-        "w",
-        newline="",
-        encoding="utf-8",
-    ) as csvfile:
-        for dataframe_batch in data_batches:
-            transform_function(dataframe_batch).to_csv(
-                csvfile,
-                mode="a",
-                index=False,
-            )
+        for download_type in transform_functions
+    }
+    uploads = AudienceUploads(audience_file_names, user_name)
 
-    logger.info(
-        "Uploading generated %s audience file to %s S3 bucket",
-        audience_file_name,
-        get_config().S3_DATASET_BUCKET,
-    )
-    filename = (
-        Path(__file__).parent.parent.joinpath(folder_name)
-        / audience_file_name,
-    )
-    if CloudClient().upload_file(
-        file_name=str(filename[0]),
-        file_type=api_c.AUDIENCE,
-        user_name=user_name,
-    ):
+    try:
+        yield from write_audience_zip(
+            data_batches, transform_functions, audience_file_names, uploads
+        )
+    except BaseException:
+        uploads.abort()
+        logger.error(
+            "Failed to generate the download zip of audience %s.", audience_id
+        )
+        create_notification(
+            database,
+            db_c.NOTIFICATION_TYPE_CRITICAL,
+            f'{user_name} failed to download the audience, "{audience_name}"'
+            f" with formats {download_types}",
+            db_c.NOTIFICATION_CATEGORY_AUDIENCES,
+            user_name,
+        )
+        raise
+
+    for download_type in uploads.close():
         create_audience_audit(
             database=database,
             audience_id=audience_id,
             download_type=download_type,
-            file_name=audience_file_name,
+            file_name=audience_file_names[download_type],
             user_name=user_name,
         )
         logger.info(
             "Created an audit log for %s audience file creation",
-            audience_file_name,
+            audience_file_names[download_type],
         )
 
+    create_notification(
+        database,
+        db_c.NOTIFICATION_TYPE_INFORMATIONAL,
+        f'{user_name} downloaded the audience, "{audience_name}"'
+        f" with formats {download_types}",
+        db_c.NOTIFICATION_CATEGORY_AUDIENCES,
+        user_name,
+    )
+
 
 def convert_filters_for_events(filters: dict, event_types: List[dict]) -> None:
     """Method to convert filters for events.
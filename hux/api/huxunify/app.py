@@ -24,9 +24,11 @@ from huxunify.api.route.utils import get_db_client
 
 from huxunify.api import constants as api_c
 from huxunify.api.route.utils import get_health_check
+from huxunifylib.database import constants as db_c
 from huxunifylib.database.delivery_platform_management import (
     update_pending_delivery_jobs,
 )
+from huxunifylib.database.index_management import ensure_all_indexes
 
 # set config variables
 SWAGGER_CONFIG = {
@@ -119,6 +121,14 @@ def create_app() -> Flask:
     if flask_app.env != api_c.TEST_MODE:
         monitor_app(flask_app)
 
+        # apply the index registry once, write paths do not create indexes.
+        ensure_all_indexes(
+            get_db_client(),
+            platform=db_c.AZURE_COSMOS_DB
+            if get_config().CLOUD_PROVIDER == api_c.AZURE
+            else db_c.AWS_DOCUMENT_DB,
+        )
+
     # initialize scheduler
     scheduler = APScheduler(app=flask_app)
     scheduler.start()
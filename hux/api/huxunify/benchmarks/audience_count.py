@@ -0,0 +1,93 @@
+"""Purpose of this file is to benchmark counting audiences in batches
+against counting each audience with its own request, on the local CDP stub
+server.
+
+Run with: python -m huxunify.benchmarks.audience_count
+"""
+import time
+from unittest import mock
+
+from bson import ObjectId
+
+import huxunifylib.database.constants as db_c
+
+from huxunify.api import constants as api_c
+from huxunify.api.config import get_config
+from huxunify.api.data_connectors.cdp import get_customers_count_async
+from huxunify.test.cdp_stub_server import CdpStubServer
+
+AUDIENCE_COUNTS = (100, 1000)
+# seconds each request to the stub takes.
+LATENCY = 0.05
+
+
+def get_audiences(audience_count: int) -> list:
+    """Get audiences with unique filters.
+
+    Args:
+        audience_count (int): Number of audiences.
+
+    Returns:
+        list: Audience docs.
+    """
+
+    return [
+        {
+            db_c.ID: ObjectId(),
+            api_c.AUDIENCE_FILTERS: [
+                {
+                    api_c.AUDIENCE_SECTION_AGGREGATOR: "ALL",
+                    api_c.AUDIENCE_SECTION_FILTERS: [
+                        {
+                            api_c.AUDIENCE_FILTER_FIELD: "age",
+                            api_c.AUDIENCE_FILTER_TYPE: "range",
+                            api_c.AUDIENCE_FILTER_VALUE: [x, x + 10],
+                        }
+                    ],
+                }
+            ],
+        }
+        for x in range(audience_count)
+    ]
+
+
+def benchmark(audience_count: int) -> None:
+    """Print the runtime of batched and per-audience counts.
+
+    Args:
+        audience_count (int): Number of audiences to count.
+    """
+
+    audiences = get_audiences(audience_count)
+    seconds = {}
+
+    with CdpStubServer(latency=LATENCY) as stub_server, mock.patch.object(
+        get_config(), "CDP_SERVICE", stub_server.url
+    ):
+        for name, batch_size in (
+            ("per audience", 0),
+            ("batched", get_config().CDP_COUNT_BATCH_SIZE),
+        ):
+            stub_server.requests.clear()
+            with mock.patch.object(
+                get_config(), "CDP_COUNT_BATCH_SIZE", batch_size
+            ):
+                timer = time.perf_counter()
+                get_customers_count_async("token", audiences)
+                seconds[name] = time.perf_counter() - timer
+
+            print(
+                f"{audience_count:>5} audiences {name:>12}: "
+                f"{len(stub_server.requests):>5} requests, "
+                f"{seconds[name] * 1000:8.1f} ms"
+            )
+
+    print(
+        f"{audience_count:>5} audiences: batched is "
+        f"{seconds['per audience'] / seconds['batched']:.1f}x faster"
+    )
+
+
+if __name__ == "__main__":
+    for count in AUDIENCE_COUNTS:
+        benchmark(count)
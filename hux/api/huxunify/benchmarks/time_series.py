@@ -0,0 +1,247 @@
+"""Purpose of this file is to benchmark the gap filling of the daily CDP
+time series against the day by day loops it replaced.
+
+Run with: python -m huxunify.benchmarks.time_series
+"""
+import random
+import timeit
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from dateutil.parser import parse
+from dateutil.relativedelta import relativedelta
+
+from huxunify.api import constants as api_c
+from huxunify.api.data_connectors import cdp
+
+# share of the days of the range the CDP returns data for.
+DENSITY = 0.8
+YEARS = (1, 3, 5)
+REPEAT = 5
+
+
+def loop_get_revenue_by_day(
+    response_body: list, start_date: str, end_date: str
+) -> list:
+    """Get revenue details from the spending by day of the CDP, one day at a
+    time.
+
+    Args:
+        response_body (list): Spending by day of the CDP.
+        start_date (str): start_date from which revenue data is fetched.
+        end_date (str): end_date to which revenue data is fetched.
+
+    Returns:
+        list: list of revenue data for all days from start_date to end_date
+    """
+
+    spending_by_day = []
+    for day_data in sorted(response_body, key=lambda x: x[api_c.DATE]):
+        genders = [api_c.GENDER_MEN, api_c.GENDER_WOMEN, api_c.GENDER_OTHER]
+        spent = [
+            api_c.AVG_SPENT_MEN,
+            api_c.AVG_SPENT_WOMEN,
+            api_c.AVG_SPENT_OTHER,
+        ]
+        spending_by_day.append(
+            {
+                api_c.DATE: parse(day_data.get(api_c.DATE)),
+                api_c.LTV: sum(
+                    day_data.get(x, 0) * day_data[y] if day_data[y] else 0
+                    for x, y in zip(spent, genders)
+                )
+                / sum(day_data[x] for x in genders),
+            }
+        )
+        spending_by_day[-1][api_c.REVENUE] = round(
+            (spending_by_day[-1][api_c.LTV] * random.choice([0.8, 1.0, 1.2])),
+            2,
+        )
+
+    revenue_data_by_day = []
+    start_date = datetime.strptime(
+        start_date, api_c.DEFAULT_DATE_FORMAT
+    ).replace(tzinfo=timezone.utc)
+    end_date = datetime.strptime(end_date, api_c.DEFAULT_DATE_FORMAT).replace(
+        tzinfo=timezone.utc
+    )
+
+    for num_day in range(int((end_date - start_date).days) + 1):
+        current_date = start_date + relativedelta(days=num_day)
+
+        if spending_by_day and current_date == spending_by_day[0].get(
+            api_c.DATE
+        ):
+            revenue_data_by_day.append(spending_by_day.pop(0))
+        else:
+            revenue_data_by_day.append(
+                {
+                    api_c.DATE: current_date,
+                    api_c.LTV: 27 + (27 * random.uniform(-0.2, 0.3)),
+                    api_c.REVENUE: 27 + (27 * random.uniform(-0.2, 0.3)),
+                }
+            )
+    return revenue_data_by_day
+
+
+def vectorized_get_revenue_by_day(
+    response_body: list, start_date: str, end_date: str
+) -> list:
+    """Get revenue details from the spending by day of the CDP, with the
+    request to the CDP mocked out.
+
+    Args:
+        response_body (list): Spending by day of the CDP.
+        start_date (str): start_date from which revenue data is fetched.
+        end_date (str): end_date to which revenue data is fetched.
+
+    Returns:
+        list: list of revenue data for all days from start_date to end_date
+    """
+
+    response = mock.Mock(status_code=200)
+    response.json.return_value = {api_c.BODY: response_body}
+    with mock.patch.object(cdp, "get_session") as get_session:
+        get_session.return_value.post.return_value = response
+        return cdp.get_revenue_by_day("token", start_date, end_date, {})
+
+
+def loop_add_missing_customer_count_by_day(
+    response_body: list, date_filters: dict
+) -> list:
+    """Add customer data for missing dates, one day at a time.
+
+    Args:
+        response_body (list): list of customer count data.
+        date_filters (dict): start_date and end_date for which customer data
+            is fetched.
+
+    Returns:
+        list: customer count data for all days within start_date and
+            end_date.
+    """
+
+    customer_data_by_day = []
+    start_date = datetime.strptime(
+        date_filters[api_c.START_DATE], api_c.DEFAULT_DATE_FORMAT
+    )
+    end_date = datetime.strptime(
+        date_filters[api_c.END_DATE], api_c.DEFAULT_DATE_FORMAT
+    )
+
+    for num_day in range(int((end_date - start_date).days) + 1):
+        current_date = start_date + relativedelta(days=num_day)
+
+        if response_body and current_date == response_body[0].get(
+            api_c.RECORDED
+        ):
+            customer_data_by_day.append(response_body.pop(0))
+        else:
+            customer_data_by_day.append(
+                {
+                    api_c.RECORDED: current_date,
+                    api_c.TOTAL_COUNT: response_body[0].get(api_c.TOTAL_COUNT)
+                    - response_body[0].get(api_c.DIFFERENCE_COUNT)
+                    if response_body
+                    else customer_data_by_day[-1][api_c.TOTAL_COUNT],
+                }
+            )
+        customer_data_by_day[-1][api_c.CUSTOMERS_LEFT] = random.randint(
+            -57000, 0
+        )
+    return customer_data_by_day
+
+
+def get_days(years: int) -> list:
+    """Get the days of a range of years the CDP returns data for.
+
+    Args:
+        years (int): Length of the range in years.
+
+    Returns:
+        list: Sorted days, DENSITY of the days of the range.
+    """
+
+    start_date = datetime(2019, 1, 1)
+    days = (start_date + relativedelta(years=years) - start_date).days
+    return [
+        start_date + timedelta(days=x)
+        for x in sorted(random.sample(range(days), int(days * DENSITY)))
+    ]
+
+
+def benchmark(years: int) -> None:
+    """Print the runtime of both implementations over a range of years.
+
+    Args:
+        years (int): Length of the range in years.
+    """
+
+    days = get_days(years)
+    date_filters = {
+        api_c.START_DATE: "2019-01-01",
+        api_c.END_DATE: (
+            datetime(2019, 1, 1) + relativedelta(years=years, days=-1)
+        ).strftime(api_c.DEFAULT_DATE_FORMAT),
+    }
+    spending = [
+        {
+            api_c.DATE: x.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            api_c.AVG_SPENT_MEN: 25.5,
+            api_c.AVG_SPENT_WOMEN: 30.0,
+            api_c.AVG_SPENT_OTHER: 28.25,
+            api_c.GENDER_MEN: 400,
+            api_c.GENDER_WOMEN: 550,
+            api_c.GENDER_OTHER: 50,
+        }
+        for x in days
+    ]
+    counts = [
+        {
+            api_c.RECORDED: x,
+            api_c.TOTAL_COUNT: 100000 + i,
+            api_c.DIFFERENCE_COUNT: 1,
+        }
+        for i, x in enumerate(days)
+    ]
+
+    cases = [
+        (
+            "revenue",
+            loop_get_revenue_by_day,
+            vectorized_get_revenue_by_day,
+            spending,
+            date_filters.values(),
+        ),
+        (
+            "customer count",
+            loop_add_missing_customer_count_by_day,
+            cdp.add_missing_customer_count_by_day,
+            counts,
+            [date_filters],
+        ),
+    ]
+    for name, loop_function, function, records, arguments in cases:
+        loop_seconds, seconds = (
+            min(
+                timeit.repeat(
+                    # the loops consume the records, copy them each run.
+                    lambda x=x, records=records, arguments=arguments: x(
+                        [dict(r) for r in records], *arguments
+                    ),
+                    number=1,
+                    repeat=REPEAT,
+                )
+            )
+            for x in (loop_function, function)
+        )
+        print(
+            f"{name:>15} {years} year(s): loop {loop_seconds * 1000:8.1f} ms,"
+            f" vectorized {seconds * 1000:8.1f} ms,"
+            f" {loop_seconds / seconds:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    for year_count in YEARS:
+        benchmark(year_count)
@@ -0,0 +1,172 @@
+"""Purpose of this file is to house a local stand-in of the CDP audience
+count service, so batched and per-audience counts can be tested and
+benchmarked without the real service.
+
+Run standalone with: python -m huxunify.test.cdp_stub_server --port 8080
+"""
+import argparse
+import asyncio
+import json
+import zlib
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from huxunify.api import constants as api_c
+from huxunify.api.data_connectors.http_client import run_async
+
+AUDIENCE_COUNT_PATH = "/customer-profiles/audience/count"
+AUDIENCE_COUNT_BATCH_PATH = f"{AUDIENCE_COUNT_PATH}/batch"
+
+
+def get_stub_count(audience_filters: dict) -> int:
+    """Get the deterministic count the stub returns for audience filters.
+
+    Args:
+        audience_filters (dict): Audience filters posted to the stub.
+
+    Returns:
+        int: Count of the audience filters.
+    """
+
+    return zlib.crc32(
+        json.dumps(audience_filters, sort_keys=True).encode()
+    ) % (10**6)
+
+
+class CdpStubServer:
+    """Local CDP audience count service running on the event loop of the
+    calling thread, serving requests while the connectors run on it."""
+
+    def __init__(self, batch_supported: bool = True, latency: float = 0):
+        """Initialize the stub server.
+
+        Args:
+            batch_supported (bool): Whether batched counts are served, a
+                404 is returned otherwise.
+            latency (float): Seconds each request takes.
+        """
+
+        self.batch_supported = batch_supported
+        self.latency = latency
+        # path and body of each request received.
+        self.requests = []
+        self.server = TestServer(self.create_app())
+
+    def create_app(self) -> web.Application:
+        """Create the aiohttp application of the stub.
+
+        Returns:
+            web.Application: Application of the stub.
+        """
+
+        app = web.Application()
+        app.router.add_post(AUDIENCE_COUNT_PATH, self.count)
+        app.router.add_post(AUDIENCE_COUNT_BATCH_PATH, self.count_batch)
+        return app
+
+    async def count(self, request: web.Request) -> web.Response:
+        """Count one audience.
+
+        Args:
+            request (web.Request): Request with the audience filters.
+
+        Returns:
+            web.Response: Count body of the audience.
+        """
+
+        audience_filters = await request.json()
+        self.requests.append((AUDIENCE_COUNT_PATH, audience_filters))
+        await asyncio.sleep(self.latency)
+
+        return web.json_response(
+            {
+                "code": 200,
+                api_c.BODY: {
+                    api_c.TOTAL_COUNT: get_stub_count(audience_filters)
+                },
+                "message": "ok",
+            }
+        )
+
+    async def count_batch(self, request: web.Request) -> web.Response:
+        """Count many audiences.
+
+        Args:
+            request (web.Request): Request with a list of audience filters.
+
+        Returns:
+            web.Response: Count bodies of the audiences, in order.
+        """
+
+        audience_filters = await request.json()
+        self.requests.append((AUDIENCE_COUNT_BATCH_PATH, audience_filters))
+        if not self.batch_supported:
+            return web.json_response({"message": "Not Found"}, status=404)
+
+        await asyncio.sleep(self.latency)
+
+        return web.json_response(
+            {
+                "code": 200,
+                api_c.BODY: [
+                    {api_c.TOTAL_COUNT: get_stub_count(x)}
+                    for x in audience_filters
+                ],
+                "message": "ok",
+            }
+        )
+
+    @property
+    def url(self) -> str:
+        """URL to use as the CDP_SERVICE of the connectors.
+
+        Returns:
+            str: Base URL of the stub.
+        """
+
+        return str(self.server.make_url("")).rstrip("/")
+
+    def start(self) -> "CdpStubServer":
+        """Start serving on a free local port.
+
+        Returns:
+            CdpStubServer: The started stub server.
+        """
+
+        run_async(self.server.start_server())
+        return self
+
+    def close(self) -> None:
+        """Stop serving."""
+
+        run_async(self.server.close())
+
+    def __enter__(self) -> "CdpStubServer":
+        """Start serving when entering the context.
+
+        Returns:
+            CdpStubServer: The started stub server.
+        """
+
+        return self.start()
+
+    def __exit__(self, *_) -> None:
+        """Stop serving when leaving the context."""
+
+        self.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0)
+    parser.add_argument("--no-batch", action="store_true")
+    arguments = parser.parse_args()
+
+    web.run_app(
+        CdpStubServer(
+            batch_supported=not arguments.no_batch, latency=arguments.latency
+        ).create_app(),
+        port=arguments.port,
+    )
@@ -1,6 +1,8 @@
 """Purpose of this module is to host all AWSClient tests."""
 import tempfile
 import string
+from io import BytesIO
+from typing import Iterator
 from unittest import TestCase, mock
 
 import boto3
@@ -8,6 +10,7 @@ from hypothesis import given, settings, strategies
 from moto import mock_ssm, mock_s3
 
 from huxunify.api.config import get_config
+from huxunify.api import constants as api_c
 from huxunify.api.data_connectors.cloud.cloud_client import CloudClient
 
 
@@ -82,6 +85,64 @@ class AWSClientTests(TestCase):
                 )
             )
 
+    @mock_s3
+    def test_upload_stream(self):
+        """Test upload of a stream as a multipart upload to mocked S3
+        dataset bucket."""
+
+        # S3 parts other than the last are at least 5 MiB.
+        part_size = 5 * 1024 * 1024
+        mock.patch.object(
+            self.aws_client.config, "CLOUD_UPLOAD_PART_SIZE", part_size
+        ).start()
+        s3_client = boto3.client("s3", region_name=self.config.AWS_REGION)
+        s3_client.create_bucket(Bucket=self.config.S3_DATASET_BUCKET)
+        data = bytes(range(256)) * (part_size // 256) * 2 + b"end"
+
+        self.assertTrue(
+            self.aws_client.upload_stream(
+                BytesIO(data), "/tmp/audience.csv", "audience", "user"
+            )
+        )
+
+        s3_object = s3_client.get_object(
+            Bucket=self.config.S3_DATASET_BUCKET, Key="audience.csv"
+        )
+        self.assertEqual(data, s3_object["Body"].read())
+        self.assertEqual("user", s3_object["Metadata"][api_c.CREATED_BY])
+        self.assertEqual(3, int(s3_object["ETag"].strip('"').split("-")[1]))
+
+    @mock_s3
+    def test_upload_stream_failure(self):
+        """Test a failed stream upload is aborted."""
+
+        s3_client = boto3.client("s3", region_name=self.config.AWS_REGION)
+        s3_client.create_bucket(Bucket=self.config.S3_DATASET_BUCKET)
+
+        def stream() -> Iterator[bytes]:
+            """Stream a chunk, then fail.
+
+            Yields:
+                Iterator[bytes]: Chunk of the file.
+
+            Raises:
+                OSError: Reading the second chunk.
+            """
+
+            yield b"abc"
+            raise OSError("stream failed")
+
+        self.assertFalse(
+            self.aws_client.upload_stream(
+                stream(), "audience.csv", "audience", "user"
+            )
+        )
+        self.assertFalse(
+            s3_client.list_multipart_uploads(
+                Bucket=self.config.S3_DATASET_BUCKET
+            ).get("Uploads")
+        )
+
     @mock_s3
     def test_download_file(self):
         """Test download of file to mocked S3 dataset bucket."""
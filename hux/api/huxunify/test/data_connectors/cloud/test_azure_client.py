@@ -1,4 +1,5 @@
 """Purpose of this module is to host all AzureClient tests."""
+from io import BytesIO
 from unittest import TestCase, mock
 
 from huxunify.api.config import get_config
@@ -40,6 +41,60 @@ class AzureClientTests(TestCase):
         # TODO HUS-2615
         pass
 
+    def test_upload_stream(self):
+        """Test upload stream stages the blocks and commits them in order."""
+
+        mock.patch.object(
+            self.azure_client.config, "CLOUD_UPLOAD_PART_SIZE", 4
+        ).start()
+        blob_client = mock.Mock()
+        mock.patch.object(
+            self.azure_client,
+            "get_container_client",
+            return_value=mock.Mock(
+                get_blob_client=mock.Mock(return_value=blob_client)
+            ),
+        ).start()
+
+        self.assertTrue(
+            self.azure_client.upload_stream(
+                BytesIO(b"abcdefghij"), "audience.csv", "audience", "user"
+            )
+        )
+
+        self.assertCountEqual(
+            [
+                mock.call(block_id="00000001", data=b"abcd"),
+                mock.call(block_id="00000002", data=b"efgh"),
+                mock.call(block_id="00000003", data=b"ij"),
+            ],
+            blob_client.stage_block.call_args_list,
+        )
+        blob_client.commit_block_list.assert_called_once()
+        self.assertEqual(
+            3, len(blob_client.commit_block_list.call_args.args[0])
+        )
+
+    def test_upload_stream_failure(self):
+        """Test upload stream does not commit a blob if a block fails."""
+
+        blob_client = mock.Mock()
+        blob_client.stage_block.side_effect = IOError("block failed")
+        mock.patch.object(
+            self.azure_client,
+            "get_container_client",
+            return_value=mock.Mock(
+                get_blob_client=mock.Mock(return_value=blob_client)
+            ),
+        ).start()
+
+        self.assertFalse(
+            self.azure_client.upload_stream(
+                [b"abc"], "audience.csv", "audience", "user"
+            )
+        )
+        blob_client.commit_block_list.assert_not_called()
+
     def test_download_file(self):
         """Test download file."""
         # TODO HUS-2615
@@ -1,4 +1,7 @@
 """Purpose of this file is to house all cloud connector unit tests."""
+import threading
+import time
+from io import BytesIO
 from unittest import TestCase, mock
 
 from huxunify.api.data_connectors.cloud.cloud_client import CloudClient
@@ -28,3 +31,69 @@ class CloudClientTests(TestCase):
 
         with mock.patch("huxunify.api.config.get_config", return_value=config):
             self.assertIsInstance(CloudClient(), AzureClient)
+
+    def test_upload_parts(self) -> None:
+        """Test a stream is uploaded in numbered parts of the part size with
+        a bounded number of parts in flight."""
+
+        cloud_client = CloudClient(
+            mock.Mock(
+                CLOUD_PROVIDER="",
+                CLOUD_UPLOAD_PART_SIZE=4,
+                CLOUD_UPLOAD_CONCURRENCY=2,
+            )
+        )
+        lock = threading.Lock()
+        in_flight = []
+        max_in_flight = []
+
+        def upload_part(number: int, data: bytes) -> tuple:
+            """Upload a part, keeping the parts in flight.
+
+            Args:
+                number (int): Number of the part.
+                data (bytes): Data of the part.
+
+            Returns:
+                tuple: Number and data of the part.
+            """
+
+            with lock:
+                in_flight.append(number)
+                max_in_flight.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.remove(number)
+            return number, data
+
+        for stream in [
+            BytesIO(b"abcdefghij"),
+            iter([b"ab", b"cdefg", b"", b"hij"]),
+        ]:
+            self.assertListEqual(
+                [(1, b"abcd"), (2, b"efgh"), (3, b"ij")],
+                cloud_client.upload_parts(stream, upload_part),
+            )
+        self.assertLessEqual(max(max_in_flight), 2)
+
+        # an empty stream is uploaded as one empty part.
+        self.assertListEqual(
+            [(1, b"")], cloud_client.upload_parts(BytesIO(), upload_part)
+        )
+
+    def test_upload_parts_failure(self) -> None:
+        """Test a failed part fails the upload."""
+
+        cloud_client = CloudClient(
+            mock.Mock(
+                CLOUD_PROVIDER="",
+                CLOUD_UPLOAD_PART_SIZE=4,
+                CLOUD_UPLOAD_CONCURRENCY=2,
+            )
+        )
+
+        with self.assertRaises(IOError):
+            cloud_client.upload_parts(
+                BytesIO(b"abcdefghij"),
+                mock.Mock(side_effect=IOError("part failed")),
+            )
@@ -0,0 +1,290 @@
+"""Purpose of this file is to house all the caching tests."""
+from unittest import TestCase, mock
+
+import threading
+
+import mongomock
+from huxunifylib.database import constants as db_c
+from huxunifylib.database.cache_management import (
+    get_cache_document,
+    create_cache_entry,
+    acquire_cache_lease,
+    get_cache_tag,
+    invalidate_tags,
+)
+from huxunifylib.database.client import DatabaseClient
+
+from huxunify.api import constants as api_c
+from huxunify.api.config import get_config
+from huxunify.api.data_connectors.cache import (
+    Caching,
+    CacheSections,
+    local_cache,
+)
+from huxunify.api.exceptions import integration_api_exceptions as iae
+
+
+class CachingTest(TestCase):
+    """Tests for the caching service."""
+
+    def setUp(self) -> None:
+        """Setup tests."""
+
+        mongomock.patch(servers=(("localhost", 27017),)).start()
+        self.database = DatabaseClient(
+            "localhost", 27017, None, None
+        ).connect()
+        mock.patch(
+            "huxunify.api.data_connectors.cache.get_db_client",
+            return_value=self.database,
+        ).start()
+        mock.patch.object(get_config(), "CACHE_L1_ENABLED", True).start()
+
+        local_cache.clear()
+        self.addCleanup(local_cache.clear)
+        self.addCleanup(mock.patch.stopall)
+
+    def test_check_and_return_cache_local(self) -> None:
+        """Test cached values are served in process after the first read."""
+
+        method = mock.Mock(return_value={"countries": ["US"]})
+        cache_key = f"{api_c.CUSTOMERS_ENDPOINT}.{api_c.COUNTRIES}"
+
+        for _ in range(3):
+            data = Caching.check_and_return_cache(cache_key, method, {})
+            self.assertDictEqual({"countries": ["US"]}, data)
+
+            # mutating the returned value does not touch the cache.
+            data["countries"].append("CA")
+
+        method.assert_called_once()
+        self.assertTrue(get_cache_document(self.database, cache_key))
+
+        # in process hits do not read the mongo cache.
+        with mock.patch(
+            "huxunify.api.data_connectors.cache.get_cache_document"
+        ) as get_cache_document_mock:
+            Caching.check_and_return_cache(cache_key, method, {})
+            get_cache_document_mock.assert_not_called()
+
+    def test_local_ttl(self) -> None:
+        """Test the in process ttl never outlives the mongo entry."""
+
+        cache_key = {api_c.ENDPOINT: f"{api_c.IDR_ENDPOINT}.{api_c.OVERVIEW}"}
+        Caching.check_and_return_cache(
+            cache_key, mock.Mock(return_value=[1]), {}
+        )
+        expire_time = get_cache_document(self.database, cache_key)[
+            db_c.EXPIRE_AT
+        ]
+
+        self.assertEqual(
+            api_c.CACHE_L1_NAMESPACE_TTLS[api_c.IDR_ENDPOINT],
+            round(Caching.get_local_ttl(cache_key, expire_time)),
+        )
+        self.assertEqual(
+            get_config().CACHE_L1_TTL,
+            round(Caching.get_local_ttl("model_overview.1", expire_time)),
+        )
+        self.assertEqual(
+            get_config().CACHE_L1_TAGGED_TTL,
+            round(Caching.get_local_ttl(cache_key, expire_time, tagged=True)),
+        )
+        self.assertEqual(0, Caching.get_local_ttl(cache_key, None))
+        self.assertLessEqual(
+            Caching.get_local_ttl(
+                cache_key, expire_time.replace(year=expire_time.year - 1)
+            ),
+            0,
+        )
+
+    def test_check_and_return_cache_leased(self) -> None:
+        """Test a leased cache key waits on the lease holder's result and
+        falls back to the method when it is not written in time."""
+
+        cache_key = f"{api_c.CUSTOMERS_ENDPOINT}.{api_c.COUNTRIES}"
+        method = mock.Mock(return_value={"countries": ["CA"]})
+        self.assertTrue(acquire_cache_lease(self.database, cache_key, "other"))
+
+        # the lease holder writes the entry while the caller waits.
+        with mock.patch(
+            "huxunify.api.data_connectors.cache.time.sleep",
+            side_effect=lambda _: create_cache_entry(
+                self.database, cache_key, {"countries": ["US"]}
+            ),
+        ):
+            data = Caching.check_and_return_cache(cache_key, method, {})
+
+        self.assertDictEqual({"countries": ["US"]}, data)
+        method.assert_not_called()
+
+        # the lease holder never writes the entry.
+        local_cache.clear()
+        self.database[db_c.DATA_MANAGEMENT_DATABASE][
+            db_c.CACHE_COLLECTION
+        ].delete_many({})
+        with mock.patch.object(get_config(), "CACHE_LEASE_WAIT_SECONDS", 0):
+            data = Caching.check_and_return_cache(cache_key, method, {})
+
+        self.assertDictEqual({"countries": ["CA"]}, data)
+        method.assert_called_once()
+
+    def test_check_and_return_cache_refresh_ahead(self) -> None:
+        """Test stale entries are served while refreshed in the background."""
+
+        cache_key = f"{api_c.CUSTOMERS_ENDPOINT}.{api_c.OVERVIEW}"
+        method = mock.Mock(return_value={"total_customers": 2})
+        create_cache_entry(
+            self.database,
+            cache_key,
+            {"total_customers": 1},
+            stale_after_seconds=0,
+        )
+
+        futures = []
+        schedule_refresh = Caching.schedule_refresh
+        with mock.patch.object(
+            Caching,
+            "schedule_refresh",
+            side_effect=lambda *args: futures.append(schedule_refresh(*args)),
+        ):
+            data = Caching.check_and_return_cache(
+                cache_key, method, {}, refresh_ahead=True
+            )
+        self.assertDictEqual({"total_customers": 1}, data)
+
+        # wait for the background refresh to finish.
+        self.assertEqual(1, len(futures))
+        futures[0].result()
+
+        method.assert_called_once()
+        self.assertDictEqual(
+            {"total_customers": 2},
+            get_cache_document(self.database, cache_key)[db_c.CONSTANT_VALUE],
+        )
+        self.assertDictEqual(
+            {"total_customers": 2},
+            Caching.check_and_return_cache(
+                cache_key, method, {}, refresh_ahead=True
+            ),
+        )
+        method.assert_called_once()
+
+    def test_check_and_return_cache_compressed(self) -> None:
+        """Test compressed entries are stored encoded and read back as is."""
+
+        cache_key = f"{api_c.CUSTOMERS_INSIGHTS}.{api_c.CITIES}.1.100"
+        cities = [{api_c.CITY: f"city {i}", api_c.LTV: i} for i in range(100)]
+
+        with mock.patch(
+            "huxunify.api.data_connectors.cache.record_cache_value_size"
+        ) as record_cache_value_size:
+            data = Caching.check_and_return_cache(
+                cache_key, mock.Mock(return_value=cities), {}, compress=True
+            )
+        self.assertListEqual(cities, data)
+        record_cache_value_size.assert_called_once()
+
+        document = self.database[db_c.DATA_MANAGEMENT_DATABASE][
+            db_c.CACHE_COLLECTION
+        ].find_one({db_c.CONSTANT_KEY: cache_key})
+        self.assertEqual(get_config().CACHE_CODEC, document[db_c.CACHE_CODEC])
+        self.assertNotIn(db_c.CONSTANT_VALUE, document)
+
+        local_cache.clear()
+        self.assertListEqual(
+            cities, Caching.check_and_return_cache(cache_key, mock.Mock(), {})
+        )
+
+    def test_check_and_return_cache_tags(self) -> None:
+        """Test tagged entries are invalidated in mongo and in process."""
+
+        method = mock.Mock(return_value={"total_customers": 5})
+        cache_key = {
+            api_c.ENDPOINT: f"{api_c.CUSTOMERS_ENDPOINT}.{api_c.OVERVIEW}"
+        }
+        tag = get_cache_tag(db_c.CACHE_TAG_AUDIENCE, "audience_id")
+
+        Caching.check_and_return_cache(cache_key, method, {}, tags=[tag])
+        Caching.check_and_return_cache(cache_key, method, {}, tags=[tag])
+        method.assert_called_once()
+
+        self.assertEqual(1, invalidate_tags(self.database, [tag]))
+        self.assertFalse(get_cache_document(self.database, cache_key))
+
+        # the in process copy is dropped too, so the method is called again.
+        Caching.check_and_return_cache(cache_key, method, {}, tags=[tag])
+        self.assertEqual(2, method.call_count)
+
+    def test_cache_sections(self) -> None:
+        """Test sections resolve concurrently and failed optional sections
+        are left out."""
+
+        # each section waits on the others, so they only finish when they
+        # are resolved concurrently.
+        barrier = threading.Barrier(2, timeout=5)
+
+        def get_section(name: str) -> dict:
+            """Get a section once the other section is being resolved.
+
+            Args:
+                name (str): Name of the section.
+
+            Returns:
+                dict: Section data.
+            """
+
+            barrier.wait()
+            return {"name": name}
+
+        sections = CacheSections()
+        sections.add("first", "section.first", get_section, {"name": "a"})
+        sections.add("second", "section.second", get_section, {"name": "b"})
+        sections.add(
+            "failed",
+            "section.failed",
+            mock.Mock(side_effect=iae.FailedAPIDependencyError("failed", 500)),
+            {},
+        )
+
+        self.assertDictEqual(
+            {"first": {"name": "a"}, "second": {"name": "b"}},
+            sections.results(),
+        )
+
+    def test_cache_sections_required(self) -> None:
+        """Test a failed or timed out required section fails the results."""
+
+        sections = CacheSections()
+        sections.add(
+            "failed",
+            "section.failed",
+            mock.Mock(side_effect=iae.FailedAPIDependencyError("failed", 500)),
+            {},
+            required=True,
+        )
+        with self.assertRaises(iae.FailedAPIDependencyError):
+            sections.results()
+
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        sections = CacheSections(timeout=0.1)
+        sections.add(
+            "slow",
+            "section.slow",
+            lambda: release.wait(5) and [1],
+            {},
+        )
+        self.assertDictEqual({}, sections.results())
+
+        sections = CacheSections(timeout=0.1)
+        sections.add(
+            "slow",
+            "section.slow.required",
+            lambda: release.wait(5) and [1],
+            {},
+            required=True,
+        )
+        with self.assertRaises(iae.FailedAPIDependencyError):
+            sections.results()
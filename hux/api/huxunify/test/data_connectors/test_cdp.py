@@ -1,16 +1,20 @@
+# pylint: disable=too-many-lines
 """Purpose of this file is to house all the cdp tests."""
 from datetime import datetime
+import asyncio
 import string
 from unittest import TestCase, mock
 from http import HTTPStatus
 import requests_mock
 import mongomock
+from bson import ObjectId
 from dateutil.relativedelta import relativedelta
 from hypothesis import given, strategies as st, settings
 
 import huxunifylib.database.constants as db_c
 from huxunifylib.database.client import DatabaseClient
 from huxunify.api import constants as api_c
+from huxunify.api.config import get_config
 from huxunify.api.exceptions.integration_api_exceptions import (
     FailedAPIDependencyError,
 )
@@ -30,12 +34,24 @@ from huxunify.api.data_connectors.cdp import (
     get_customers_insights_count_by_day,
     get_spending_by_gender,
     get_revenue_by_day,
+    add_missing_customer_count_by_day,
     get_customer_event_types,
     get_customer_product_categories,
+    memoize_cdp_call,
+    cdp_cache,
+    count_batch_state,
+    get_customers_count_async,
 )
+from huxunify.api.data_connectors.http_client import run_async
 from huxunify.api.data_connectors.cdp_connection import get_identity_overview
 from huxunify.app import create_app
 from huxunify.test import constants as t_c
+from huxunify.test.cdp_stub_server import (
+    CdpStubServer,
+    get_stub_count,
+    AUDIENCE_COUNT_PATH,
+    AUDIENCE_COUNT_BATCH_PATH,
+)
 from huxunify.test.route.route_test_util.test_data_loading.users import (
     load_users,
 )
@@ -736,3 +752,309 @@ class CdpFieldTests(TestCase):
             clean_cdm_gender_fields(partial_none_response),
             partial_none_response,
         )
+
+    def test_add_missing_customer_count_by_day(self):
+        """Test add_missing_customer_count_by_day function."""
+
+        customer_count_by_day = add_missing_customer_count_by_day(
+            [
+                {
+                    api_c.RECORDED: datetime(2021, 1, 2),
+                    api_c.TOTAL_COUNT: 100,
+                    api_c.DIFFERENCE_COUNT: 10,
+                },
+                {
+                    api_c.RECORDED: datetime(2021, 1, 4),
+                    api_c.TOTAL_COUNT: 130,
+                    api_c.DIFFERENCE_COUNT: 20,
+                },
+            ],
+            {api_c.START_DATE: "2021-01-01", api_c.END_DATE: "2021-01-05"},
+        )
+
+        self.assertListEqual(
+            [datetime(2021, 1, x) for x in range(1, 6)],
+            [x[api_c.RECORDED] for x in customer_count_by_day],
+        )
+        self.assertListEqual(
+            [90, 100, 110, 130, 130],
+            [x[api_c.TOTAL_COUNT] for x in customer_count_by_day],
+        )
+        self.assertListEqual(
+            [0, 10, 0, 20, 0],
+            [x[api_c.DIFFERENCE_COUNT] for x in customer_count_by_day],
+        )
+        for customer_count in customer_count_by_day:
+            self.assertTrue(
+                -57000 <= customer_count[api_c.CUSTOMERS_LEFT] <= 0
+            )
+
+    def test_add_missing_customer_count_by_day_outside_range(self):
+        """Test add_missing_customer_count_by_day function with every
+        recorded day outside of the date range."""
+
+        response_body = [
+            {
+                api_c.RECORDED: datetime(2021, 1, 2),
+                api_c.TOTAL_COUNT: 100,
+                api_c.DIFFERENCE_COUNT: 10,
+            },
+            {
+                api_c.RECORDED: datetime(2021, 1, 4),
+                api_c.TOTAL_COUNT: 130,
+                api_c.DIFFERENCE_COUNT: 20,
+            },
+        ]
+
+        # after the recorded days, the last recorded count carries over.
+        customer_count_by_day = add_missing_customer_count_by_day(
+            response_body,
+            {api_c.START_DATE: "2022-01-01", api_c.END_DATE: "2022-01-03"},
+        )
+        self.assertListEqual(
+            [130, 130, 130],
+            [x[api_c.TOTAL_COUNT] for x in customer_count_by_day],
+        )
+        self.assertListEqual(
+            [0, 0, 0],
+            [x[api_c.DIFFERENCE_COUNT] for x in customer_count_by_day],
+        )
+
+        # before the recorded days, the first count before its difference.
+        customer_count_by_day = add_missing_customer_count_by_day(
+            response_body,
+            {api_c.START_DATE: "2020-12-01", api_c.END_DATE: "2020-12-03"},
+        )
+        self.assertListEqual(
+            [90, 90, 90],
+            [x[api_c.TOTAL_COUNT] for x in customer_count_by_day],
+        )
+        for customer_count in customer_count_by_day:
+            self.assertIsInstance(customer_count[api_c.TOTAL_COUNT], int)
+
+
+class CdpMemoizationTests(TestCase):
+    """Test memoization of the CDP connector functions."""
+
+    def setUp(self) -> None:
+        """Setup tests."""
+
+        mock.patch.object(get_config(), "CDP_CACHE_TTL", 60).start()
+        self.addCleanup(mock.patch.stopall)
+        self.addCleanup(cdp_cache.clear)
+
+    def test_memoize_cdp_call(self) -> None:
+        """Test calls with the same arguments share the response, regardless
+        of the token and of how the arguments are passed."""
+
+        fetch = mock.Mock(side_effect=lambda _, filters: {"filters": filters})
+
+        @memoize_cdp_call
+        def get_insights(token: str, filters: dict = None) -> dict:
+            """Fetch insights for the filters.
+
+            Args:
+                token (str): OKTA JWT Token, left out of the cache key.
+                filters (dict): Filters of the insights.
+
+            Returns:
+                dict: Insights response.
+            """
+
+            return fetch(token, filters)
+
+        response = get_insights("token-a", {"age": [1, 2]})
+        # callers get their own copy of the response.
+        response["filters"]["age"].append(3)
+
+        self.assertDictEqual(
+            {"filters": {"age": [1, 2]}},
+            get_insights(token="token-b", filters={"age": [1, 2]}),
+        )
+        fetch.assert_called_once_with("token-a", {"age": [1, 2]})
+
+        get_insights("token-a")
+        self.assertEqual(2, fetch.call_count)
+
+    def test_memoize_cdp_call_async(self) -> None:
+        """Test concurrent identical coroutine calls share one request."""
+
+        calls = []
+
+        @memoize_cdp_call
+        async def get_insights_async(
+            _session: object, token: str, filters: dict
+        ) -> dict:
+            """Fetch insights for the filters.
+
+            Args:
+                token (str): OKTA JWT Token, left out of the cache key.
+                filters (dict): Filters of the insights.
+
+            Returns:
+                dict: Insights response.
+            """
+
+            calls.append((token, filters))
+            await asyncio.sleep(0.01)
+            return {"filters": filters}
+
+        async def get_all() -> list:
+            """Fetch the insights concurrently with different tokens.
+
+            Returns:
+                list: Insights responses.
+            """
+
+            return await asyncio.gather(
+                *(
+                    get_insights_async(None, str(x), {"age": 1})
+                    for x in range(5)
+                )
+            )
+
+        responses = run_async(get_all())
+
+        self.assertEqual(1, len(calls))
+        self.assertListEqual([{"filters": {"age": 1}}] * 5, responses)
+
+        # finished responses are served from the cache.
+        run_async(get_insights_async(None, "", {"age": 1}))
+        self.assertEqual(1, len(calls))
+
+    def test_memoize_cdp_call_empty_or_error(self) -> None:
+        """Test empty and failed responses are not cached."""
+
+        responses = [{}, FailedAPIDependencyError("cdp", 500), [1]]
+
+        @memoize_cdp_call
+        async def get_insights_async(_token: str, _filters: dict) -> list:
+            """Fetch the next response.
+
+            Returns:
+                list: Next response.
+
+            Raises:
+                FailedAPIDependencyError: The next response is an error.
+            """
+
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        self.assertEqual({}, run_async(get_insights_async("", {"age": 1})))
+        with self.assertRaises(FailedAPIDependencyError):
+            run_async(get_insights_async("", {"age": 1}))
+        for _ in range(2):
+            self.assertListEqual(
+                [1], run_async(get_insights_async("", {"age": 1}))
+            )
+        self.assertListEqual([], responses)
+
+
+class CdpAudienceCountTests(TestCase):
+    """Test audience counts against the local CDP stub server."""
+
+    def setUp(self) -> None:
+        """Setup tests."""
+
+        self.audiences = [
+            {
+                db_c.ID: ObjectId(),
+                api_c.AUDIENCE_FILTERS: [
+                    {
+                        api_c.AUDIENCE_SECTION_AGGREGATOR: "ALL",
+                        api_c.AUDIENCE_SECTION_FILTERS: [
+                            {
+                                api_c.AUDIENCE_FILTER_FIELD: "age",
+                                api_c.AUDIENCE_FILTER_TYPE: "range",
+                                api_c.AUDIENCE_FILTER_VALUE: [x, 100],
+                            }
+                        ],
+                    }
+                ],
+            }
+            for x in range(5)
+        ]
+        # audiences without filters share the default filters.
+        self.audiences += [{db_c.ID: ObjectId()}, {db_c.ID: ObjectId()}]
+
+        mock.patch.object(get_config(), "CDP_COUNT_BATCH_SIZE", 2).start()
+        mock.patch.dict(count_batch_state, {"unsupported_until": 0.0}).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def start_stub_server(self, batch_supported: bool) -> CdpStubServer:
+        """Start a CDP stub server used as the CDP_SERVICE.
+
+        Args:
+            batch_supported (bool): Whether batched counts are served.
+
+        Returns:
+            CdpStubServer: Started CDP stub server.
+        """
+
+        stub_server = CdpStubServer(batch_supported=batch_supported).start()
+        self.addCleanup(stub_server.close)
+        mock.patch.object(get_config(), "CDP_SERVICE", stub_server.url).start()
+
+        return stub_server
+
+    def get_expected_sizes(self) -> dict:
+        """Get the sizes the stub server counts for the audiences.
+
+        Returns:
+            dict: Audience ObjectId to Size mapping dict.
+        """
+
+        return {
+            x[db_c.ID]: get_stub_count(
+                {api_c.AUDIENCE_FILTERS: x[api_c.AUDIENCE_FILTERS]}
+                if x.get(api_c.AUDIENCE_FILTERS)
+                else api_c.CUSTOMER_OVERVIEW_DEFAULT_FILTER
+            )
+            for x in self.audiences
+        }
+
+    def test_get_customers_count_batched(self) -> None:
+        """Test audiences are counted in batches of unique filters."""
+
+        stub_server = self.start_stub_server(batch_supported=True)
+
+        self.assertDictEqual(
+            self.get_expected_sizes(),
+            get_customers_count_async(t_c.TEST_AUTH_TOKEN, self.audiences),
+        )
+
+        # 6 unique filters in batches of 2.
+        self.assertListEqual(
+            [AUDIENCE_COUNT_BATCH_PATH] * 3,
+            [x[0] for x in stub_server.requests],
+        )
+
+    def test_get_customers_count_fallback(self) -> None:
+        """Test audiences are counted one request each when the CDP does not
+        support batched counts, without trying batches again."""
+
+        stub_server = self.start_stub_server(batch_supported=False)
+
+        self.assertDictEqual(
+            self.get_expected_sizes(),
+            get_customers_count_async(t_c.TEST_AUTH_TOKEN, self.audiences),
+        )
+        # 6 unique filters, one request each.
+        self.assertEqual(
+            6,
+            [x[0] for x in stub_server.requests].count(AUDIENCE_COUNT_PATH),
+        )
+
+        stub_server.requests.clear()
+
+        self.assertDictEqual(
+            self.get_expected_sizes(),
+            get_customers_count_async(t_c.TEST_AUTH_TOKEN, self.audiences),
+        )
+        self.assertListEqual(
+            [AUDIENCE_COUNT_PATH] * 6,
+            [x[0] for x in stub_server.requests],
+        )
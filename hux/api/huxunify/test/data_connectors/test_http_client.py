@@ -0,0 +1,229 @@
+"""Purpose of this file is to house all the pooled HTTP client tests."""
+import asyncio
+from functools import partial
+from unittest import TestCase, mock
+
+import aiohttp
+import requests_mock
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from huxunify.api.config import get_config
+from huxunify.api.data_connectors import http_client
+from huxunify.api.data_connectors.http_client import (
+    Upstreams,
+    get_session,
+    get_async_session,
+    close_async_sessions,
+    post_json,
+    run_async,
+    run_batch,
+)
+
+
+class HttpClientTest(TestCase):
+    """Tests for the pooled HTTP clients."""
+
+    def setUp(self) -> None:
+        """Setup tests."""
+
+        self.addCleanup(http_client.sessions.clear)
+        self.addCleanup(close_async_sessions)
+
+    def test_get_session(self) -> None:
+        """Test each upstream gets one shared session."""
+
+        session = get_session(Upstreams.CDP)
+
+        self.assertIs(session, get_session(Upstreams.CDP))
+        self.assertIsNot(session, get_session(Upstreams.OKTA))
+
+        adapter = session.get_adapter(get_config().CDP_SERVICE)
+        self.assertEqual(get_config().HTTP_TIMEOUT, adapter.timeout)
+        self.assertEqual(get_config().HTTP_RETRIES, adapter.max_retries.total)
+
+    @requests_mock.Mocker()
+    def test_session_ignores_cookies(self, request_mocker) -> None:
+        """Test cookies set by an upstream are not sent on later calls.
+
+        Args:
+            request_mocker (Mocker): Request mocker object.
+        """
+
+        request_mocker.get(
+            f"{get_config().CDP_SERVICE}/healthcheck",
+            headers={"Set-Cookie": "session=user-a"},
+        )
+
+        session = get_session(Upstreams.CDP)
+        session.get(f"{get_config().CDP_SERVICE}/healthcheck")
+        session.get(f"{get_config().CDP_SERVICE}/healthcheck")
+
+        self.assertFalse(session.cookies)
+        self.assertNotIn("Cookie", request_mocker.last_request.headers)
+
+    def test_default_timeout(self) -> None:
+        """Test requests sent without a timeout get the default timeout."""
+
+        adapter = http_client.TimeoutHTTPAdapter(5)
+
+        with mock.patch("requests.adapters.HTTPAdapter.send") as send_mock:
+            adapter.send(mock.Mock())
+            self.assertEqual(5, send_mock.call_args[1]["timeout"])
+
+            adapter.send(mock.Mock(), timeout=1)
+            self.assertEqual(1, send_mock.call_args[1]["timeout"])
+
+    def test_async_session_per_loop(self) -> None:
+        """Test the aiohttp session is reused across runs on a thread."""
+
+        async def get_cdp_session() -> aiohttp.ClientSession:
+            """Get the CDP session of the running loop.
+
+            Returns:
+                aiohttp.ClientSession: CDP session.
+            """
+
+            return get_async_session(Upstreams.CDP)
+
+        session = run_async(get_cdp_session())
+
+        self.assertIs(session, run_async(get_cdp_session()))
+        self.assertFalse(session.closed)
+
+        run_async(session.close())
+
+    def start_server(self, handler) -> str:
+        """Start a local server posting to the handler.
+
+        Args:
+            handler (Callable): aiohttp request handler.
+
+        Returns:
+            str: URL of the handler.
+        """
+
+        app = web.Application()
+        app.router.add_post("/count", handler)
+        server = TestServer(app)
+        run_async(server.start_server())
+        self.addCleanup(lambda: run_async(server.close()))
+
+        # retry immediately.
+        mock.patch(
+            "huxunify.api.data_connectors.http_client.get_retry_delay",
+            return_value=0,
+        ).start()
+        self.addCleanup(mock.patch.stopall)
+
+        return str(server.make_url("/count"))
+
+    def test_post_json_retries(self) -> None:
+        """Test throttled and failed requests are retried."""
+
+        statuses = [429, 503, 200]
+
+        async def count(_) -> web.Response:
+            """Respond with the next status.
+
+            Returns:
+                web.Response: Count response.
+            """
+
+            return web.json_response({"count": 1}, status=statuses.pop(0))
+
+        url = self.start_server(count)
+
+        self.assertTupleEqual(
+            (200, {"count": 1}),
+            run_async(post_json(Upstreams.CDP, url, {})),
+        )
+        self.assertFalse(statuses)
+
+    def test_post_json_retries_exhausted(self) -> None:
+        """Test the last response is returned once retries are exhausted."""
+
+        calls = []
+
+        async def count(_) -> web.Response:
+            """Respond as unavailable.
+
+            Returns:
+                web.Response: Unavailable response.
+            """
+
+            calls.append(1)
+            return web.Response(text="unavailable", status=503)
+
+        url = self.start_server(count)
+
+        self.assertTupleEqual(
+            (503, None), run_async(post_json(Upstreams.CDP, url, {}))
+        )
+        self.assertEqual(get_config().ASYNC_REQUEST_RETRIES + 1, len(calls))
+
+    def test_run_batch_concurrency(self) -> None:
+        """Test a batch keeps at most its concurrency in flight and returns
+        the results in order."""
+
+        in_flight = []
+        max_in_flight = []
+
+        async def count(request: web.Request) -> web.Response:
+            """Echo the request body, keeping the requests in flight.
+
+            Args:
+                request (web.Request): Count request.
+
+            Returns:
+                web.Response: Response with the request body.
+            """
+
+            in_flight.append(1)
+            max_in_flight.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            return web.json_response(await request.json())
+
+        url = self.start_server(count)
+
+        results = run_batch(
+            "test",
+            [partial(post_json, Upstreams.CDP, url, [x]) for x in range(6)],
+            concurrency=2,
+        )
+
+        self.assertListEqual([(200, [x]) for x in range(6)], results)
+        self.assertEqual(2, max(max_in_flight))
+
+    def test_run_batch_failure(self) -> None:
+        """Test a failing coroutine lets the others finish before its error
+        is raised."""
+
+        finished = []
+
+        async def run(value: int) -> int:
+            """Return the value after a delay, failing for 0.
+
+            Args:
+                value (int): Value to return.
+
+            Returns:
+                int: The value.
+
+            Raises:
+                ValueError: The value is 0.
+            """
+
+            await asyncio.sleep(0.01 * value)
+            if value == 0:
+                raise ValueError("failed")
+            finished.append(value)
+            return value
+
+        with self.assertRaises(ValueError):
+            run_batch(
+                "test", [partial(run, x) for x in range(4)], concurrency=2
+            )
+
+        self.assertListEqual([1, 2, 3], finished)
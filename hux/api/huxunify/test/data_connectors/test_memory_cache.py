@@ -0,0 +1,116 @@
+"""Purpose of this file is to house all the memory cache tests."""
+import threading
+import time
+from unittest import TestCase, mock
+
+from huxunify.api.data_connectors.memory_cache import MemoryCache
+from huxunify.api.prometheus import Caches
+
+
+class MemoryCacheTest(TestCase):
+    """Tests for the in-process memory cache."""
+
+    def setUp(self) -> None:
+        """Setup tests."""
+
+        self.cache = MemoryCache(Caches.OKTA_TOKEN, max_entries=2)
+
+    def test_set_get_delete(self) -> None:
+        """Test setting, getting and deleting a value."""
+
+        self.cache.set("key", {"value": 1}, 60)
+        self.assertDictEqual({"value": 1}, self.cache.get("key"))
+
+        self.cache.delete("key")
+        self.assertIsNone(self.cache.get("key"))
+
+        # non positive ttl values are not cached.
+        self.cache.set("key", {"value": 1}, 0)
+        self.assertIsNone(self.cache.get("key"))
+
+    def test_expiry(self) -> None:
+        """Test values expire after their ttl."""
+
+        with mock.patch(
+            "huxunify.api.data_connectors.memory_cache.time.monotonic",
+            return_value=100,
+        ) as monotonic:
+            self.cache.set("key", "value", 10)
+            self.assertEqual("value", self.cache.get("key"))
+
+            monotonic.return_value = 110
+            self.assertIsNone(self.cache.get("key"))
+
+    def test_lru_eviction(self) -> None:
+        """Test the least recently used value is evicted."""
+
+        self.cache.set("first", 1, 60)
+        self.cache.set("second", 2, 60)
+
+        # touch first so second is the least recently used.
+        self.assertEqual(1, self.cache.get("first"))
+        self.cache.set("third", 3, 60)
+
+        self.assertEqual(1, self.cache.get("first"))
+        self.assertIsNone(self.cache.get("second"))
+        self.assertEqual(3, self.cache.get("third"))
+
+    def test_size_eviction(self) -> None:
+        """Test values are evicted once the size limit is exceeded."""
+
+        cache = MemoryCache(Caches.CACHE_L1, max_entries=10, max_bytes=10)
+
+        cache.set("first", "1", 60, size=4)
+        cache.set("second", "2", 60, size=4)
+        self.assertEqual(8, cache.size)
+
+        cache.set("third", "3", 60, size=4)
+        self.assertIsNone(cache.get("first"))
+        self.assertEqual(8, cache.size)
+
+        # values larger than the cache are never stored.
+        cache.set("large", "4", 60, size=11)
+        self.assertIsNone(cache.get("large"))
+        self.assertEqual("2", cache.get("second"))
+
+        cache.clear()
+        self.assertEqual(0, cache.size)
+
+    def test_get_or_load(self) -> None:
+        """Test loading a value on a miss and serving it on a hit."""
+
+        loader = mock.Mock(return_value={"value": 1})
+
+        for _ in range(3):
+            self.assertDictEqual(
+                {"value": 1}, self.cache.get_or_load("key", loader, 60)
+            )
+        loader.assert_called_once()
+
+        # falsy values are not cached.
+        loader = mock.Mock(return_value=None)
+        self.cache.get_or_load("empty", loader, 60)
+        self.cache.get_or_load("empty", loader, 60)
+        self.assertEqual(2, loader.call_count)
+
+    def test_get_or_load_coalesced(self) -> None:
+        """Test concurrent loads of the same key call the loader once."""
+
+        loader = mock.Mock(side_effect=lambda: time.sleep(0.2) or "value")
+        results = []
+
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    self.cache.get_or_load("key", loader, 60)
+                )
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        loader.assert_called_once()
+        self.assertListEqual(["value"] * 5, results)
@@ -1,11 +1,16 @@
 """Purpose of this file is to house all the okta tests."""
 # pylint: disable=too-many-public-methods
 import unittest
+import base64
 import json
+import time
+from datetime import datetime
 from http import HTTPStatus
 from unittest import TestCase
+import jwt
 import requests_mock
 import mongomock
+from cryptography.hazmat.primitives.asymmetric import rsa
 from requests_mock import Mocker
 from flask import Flask
 from bson import json_util
@@ -23,6 +28,10 @@ from huxunify.api.data_connectors.okta import (
     get_token_from_request,
     introspect_token,
     check_okta_connection,
+    get_token_expiry,
+    token_cache,
+    verify_token,
+    JwksCache,
 )
 from huxunify.test import constants as t_c
 
@@ -55,6 +64,22 @@ INVALID_USER_RESPONSE = {
 INVALID_RESPONSE = {"active": False}
 
 
+def build_jwt(expiry: int) -> str:
+    """Build an unsigned JWT carrying an exp claim.
+
+    Args:
+        expiry (int): Token expiry as epoch seconds.
+
+    Returns:
+        str: Encoded JWT.
+    """
+
+    claims = base64.urlsafe_b64encode(
+        json.dumps({"exp": expiry}).encode()
+    ).decode()
+    return f"eyJhbGciOiJSUzI1NiJ9.{claims.rstrip('=')}.signature"
+
+
 class OktaTest(TestCase):
     """Test Okta request methods."""
 
@@ -62,6 +87,11 @@ class OktaTest(TestCase):
         """Setup tests."""
 
         self.config = get_config()
+        self.keys_call = (
+            f"{self.config.OKTA_ISSUER}"
+            f"/oauth2/v1/keys?client_id="
+            f"{self.config.OKTA_CLIENT_ID}"
+        )
         self.introspect_call = (
             f"{self.config.OKTA_ISSUER}"
             f"/oauth2/v1/introspect?client_id="
@@ -90,6 +120,8 @@ class OktaTest(TestCase):
             return_value=self.database,
         ).start()
 
+        token_cache.clear()
+        self.addCleanup(token_cache.clear)
         self.addCleanup(unittest.mock.patch.stopall)
 
     @requests_mock.Mocker()
@@ -199,6 +231,240 @@ class OktaTest(TestCase):
         expected_response = {"user_id": "1234567", "user_name": "davesmith"}
         self.assertDictEqual(response, expected_response)
 
+    def test_get_token_expiry(self):
+        """Test reading the expiry of a JWT and of a non JWT token."""
+
+        expiry = int(time.time()) + 600
+        self.assertEqual(expiry, get_token_expiry(build_jwt(expiry)))
+        self.assertIsNone(get_token_expiry("12345678"))
+        self.assertIsNone(get_token_expiry("a.b.c"))
+
+    @requests_mock.Mocker()
+    def test_introspection_cached(self, request_mocker: Mocker):
+        """Test token introspection is served from the token cache.
+
+        Args:
+            request_mocker (Mocker): Request mock object.
+        """
+
+        unittest.mock.patch.object(
+            self.config, "OKTA_TOKEN_CACHE_TTL", 300
+        ).start()
+        request_mocker.post(self.introspect_call, json=VALID_RESPONSE)
+        request_mocker.get(self.user_info_call, json=VALID_USER_RESPONSE)
+
+        access_token = build_jwt(int(time.time()) + 600)
+        expected_response = {"user_id": "1234567", "user_name": "davesmith"}
+        for _ in range(3):
+            self.assertDictEqual(
+                expected_response, introspect_token(access_token)
+            )
+            self.assertDictEqual(
+                VALID_USER_RESPONSE, get_user_info(access_token)
+            )
+
+        # one introspect and one userinfo call.
+        self.assertEqual(request_mocker.call_count, 2)
+
+    @requests_mock.Mocker()
+    def test_introspection_not_cached(self, request_mocker: Mocker):
+        """Test inactive and expired tokens are not cached.
+
+        Args:
+            request_mocker (Mocker): Request mock object.
+        """
+
+        unittest.mock.patch.object(
+            self.config, "OKTA_TOKEN_CACHE_TTL", 300
+        ).start()
+        request_mocker.post(self.introspect_call, json=INVALID_RESPONSE)
+
+        access_token = build_jwt(int(time.time()) + 600)
+        self.assertIsNone(introspect_token(access_token))
+        self.assertIsNone(introspect_token(access_token))
+        self.assertEqual(request_mocker.call_count, 2)
+
+        request_mocker.post(self.introspect_call, json=VALID_RESPONSE)
+        access_token = build_jwt(int(time.time()) - 1)
+        self.assertTrue(introspect_token(access_token))
+        self.assertTrue(introspect_token(access_token))
+        self.assertEqual(request_mocker.call_count, 4)
+
+    @requests_mock.Mocker()
+    def test_introspection_shared_cache_expiry(self, request_mocker: Mocker):
+        """Test shared token cache entries expire with the token.
+
+        Args:
+            request_mocker (Mocker): Request mock object.
+        """
+
+        unittest.mock.patch.object(
+            self.config, "OKTA_TOKEN_CACHE_TTL", 300
+        ).start()
+        unittest.mock.patch.object(
+            self.config, "OKTA_TOKEN_CACHE_SHARED", True
+        ).start()
+        unittest.mock.patch(
+            "huxunify.api.data_connectors.okta.db_client_factory.get_resource",
+            return_value=self.database,
+        ).start()
+        request_mocker.post(self.introspect_call, json=VALID_RESPONSE)
+
+        expiry = int(time.time()) + 120
+        self.assertTrue(introspect_token(build_jwt(expiry)))
+
+        entries = list(
+            self.database[db_c.DATA_MANAGEMENT_DATABASE][
+                db_c.CACHE_COLLECTION
+            ].find({db_c.EXPIRE_AT: {"$exists": True}})
+        )
+        self.assertTrue(entries)
+        for entry in entries:
+            self.assertLessEqual(
+                entry[db_c.EXPIRE_AT], datetime.utcfromtimestamp(expiry)
+            )
+
+    def build_signed_token(self, signing_key: object, **claims) -> str:
+        """Build an access token signed with a local key.
+
+        Args:
+            signing_key (object): RSA private key.
+            **claims (dict): Claims overriding the default token claims.
+
+        Returns:
+            str: Encoded and signed JWT.
+        """
+
+        return jwt.encode(
+            {
+                "iss": self.config.OKTA_ISSUER,
+                "aud": self.config.OKTA_AUDIENCE,
+                "exp": int(time.time()) + 600,
+                "sub": "davesmith",
+                "uid": "1234567",
+                **claims,
+            },
+            signing_key,
+            algorithm="RS256",
+            headers={"kid": "test-kid"},
+        )
+
+    def mock_jwks_validation(self, request_mocker: Mocker) -> object:
+        """Configure jwks token validation against a JWKS fixture.
+
+        Args:
+            request_mocker (Mocker): Request mock object.
+
+        Returns:
+            object: RSA private key of the JWKS fixture.
+        """
+
+        signing_key = rsa.generate_private_key(
+            public_exponent=65537, key_size=2048
+        )
+        jwks = {
+            "keys": [
+                {
+                    **json.loads(
+                        jwt.algorithms.RSAAlgorithm.to_jwk(
+                            signing_key.public_key()
+                        )
+                    ),
+                    "kid": "test-kid",
+                    "alg": "RS256",
+                    "use": "sig",
+                }
+            ]
+        }
+        request_mocker.get(self.keys_call, json=jwks)
+        unittest.mock.patch(
+            "huxunify.api.data_connectors.okta.jwks_cache",
+            JwksCache(refresh_interval=3600),
+        ).start()
+        unittest.mock.patch.object(
+            self.config, "OKTA_TOKEN_VALIDATION", api_c.OKTA_VALIDATION_JWKS
+        ).start()
+        return signing_key
+
+    @requests_mock.Mocker()
+    def test_verify_token_jwks(self, request_mocker: Mocker):
+        """Test local token verification against a JWKS fixture.
+
+        Args:
+            request_mocker (Mocker): Request mock object.
+        """
+
+        signing_key = self.mock_jwks_validation(request_mocker)
+        other_key = rsa.generate_private_key(
+            public_exponent=65537, key_size=2048
+        )
+
+        expected_response = {"user_id": "1234567", "user_name": "davesmith"}
+        for _ in range(3):
+            self.assertDictEqual(
+                expected_response,
+                introspect_token(self.build_signed_token(signing_key)),
+            )
+
+        # keys fetched once, no introspection calls.
+        self.assertEqual(request_mocker.call_count, 1)
+
+        # invalid signature, audience, issuer and expiry.
+        self.assertIsNone(verify_token(self.build_signed_token(other_key)))
+        self.assertIsNone(
+            verify_token(self.build_signed_token(signing_key, aud="other"))
+        )
+        self.assertIsNone(
+            verify_token(self.build_signed_token(signing_key, iss="other"))
+        )
+        self.assertIsNone(
+            verify_token(
+                self.build_signed_token(
+                    signing_key, exp=int(time.time()) - 600
+                )
+            )
+        )
+        self.assertIsNone(verify_token("12345678"))
+
+    @requests_mock.Mocker()
+    def test_get_user_info_jwks(self, request_mocker: Mocker):
+        """Test the user info is read from the verified token claims with
+        jwks token validation.
+
+        Args:
+            request_mocker (Mocker): Request mock object.
+        """
+
+        signing_key = self.mock_jwks_validation(request_mocker)
+        request_mocker.get(self.user_info_call, json=VALID_USER_RESPONSE)
+
+        access_token = self.build_signed_token(
+            signing_key,
+            email=VALID_USER_RESPONSE[api_c.EMAIL],
+            name=VALID_USER_RESPONSE[api_c.NAME],
+        )
+        self.assertDictEqual(
+            {
+                api_c.OKTA_ID_SUB: "davesmith",
+                api_c.EMAIL: VALID_USER_RESPONSE[api_c.EMAIL],
+                api_c.NAME: VALID_USER_RESPONSE[api_c.NAME],
+            },
+            get_user_info(access_token),
+        )
+        # keys fetched once, no userinfo calls.
+        self.assertEqual(request_mocker.call_count, 1)
+
+        # invalid tokens have no user info.
+        self.assertDictEqual({}, get_user_info("12345678"))
+        self.assertEqual(request_mocker.call_count, 1)
+
+        # tokens without the email and name claims call userinfo.
+        self.assertDictEqual(
+            VALID_USER_RESPONSE,
+            get_user_info(self.build_signed_token(signing_key)),
+        )
+        self.assertEqual(request_mocker.call_count, 2)
+
     def test_secured_decorator_invalid_header(self):
         """Test secured decorator with an invalid header."""
 
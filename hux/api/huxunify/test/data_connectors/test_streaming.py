@@ -0,0 +1,141 @@
+"""Purpose of this file is to house all the byte stream tests."""
+import io
+import threading
+from unittest import TestCase, mock
+
+import huxunify.api.constants as api_c
+from huxunify.api.data_connectors import streaming
+from huxunify.api.data_connectors.streaming import ChunkBuffer, StreamUpload
+
+
+class StreamingTest(TestCase):
+    """Tests for the byte streams."""
+
+    def test_chunk_buffer(self) -> None:
+        """Test written bytes are handed out once."""
+
+        buffer = ChunkBuffer()
+        buffer.write(b"audience,")
+        buffer.write(memoryview(b"file"))
+
+        self.assertEqual(b"audience,file", buffer.drain())
+        self.assertEqual(b"", buffer.drain())
+
+    def test_stream_upload(self) -> None:
+        """Test the upload reads the bytes while they are written."""
+
+        uploaded = []
+
+        def upload(file_obj: io.RawIOBase) -> bool:
+            """Upload the stream, keeping the bytes read.
+
+            Args:
+                file_obj (io.RawIOBase): Stream to upload.
+
+            Returns:
+                bool: Success flag.
+            """
+
+            uploaded.append(file_obj.read())
+            return True
+
+        stream_upload = StreamUpload(upload, max_chunks=1)
+        for index in range(10):
+            stream_upload.write(f"{index},".encode())
+
+        self.assertTrue(stream_upload.close())
+        self.assertListEqual(
+            [b"".join(f"{x},".encode() for x in range(10))], uploaded
+        )
+
+    @mock.patch.object(streaming, "STREAM_UPLOAD_WAIT", 0.01)
+    def test_stream_upload_stopped(self) -> None:
+        """Test writes do not wait for an upload that stopped reading."""
+
+        stream_upload = StreamUpload(lambda file_obj: False, max_chunks=1)
+        for _ in range(10):
+            stream_upload.write(b"data")
+
+        self.assertFalse(stream_upload.close())
+
+    def test_stream_upload_abort(self) -> None:
+        """Test an aborted upload fails instead of storing partial data."""
+
+        def upload(file_obj: io.RawIOBase) -> bool:
+            """Upload the stream.
+
+            Args:
+                file_obj (io.RawIOBase): Stream to upload.
+
+            Returns:
+                bool: Success flag.
+            """
+
+            file_obj.read()
+            return True
+
+        stream_upload = StreamUpload(upload)
+        stream_upload.write(b"partial")
+        stream_upload.abort()
+
+        self.assertFalse(stream_upload.result.result())
+
+    def test_stream_uploads_outnumber_workers(self) -> None:
+        """Test writes to more uploads than thread pool workers do not wait
+        on uploads that have not started."""
+
+        uploaded = []
+
+        def upload(file_obj: io.RawIOBase) -> bool:
+            """Upload the stream, keeping the bytes read.
+
+            Args:
+                file_obj (io.RawIOBase): Stream to upload.
+
+            Returns:
+                bool: Success flag.
+            """
+
+            uploaded.append(file_obj.read())
+            return True
+
+        stream_uploads = [
+            StreamUpload(upload, max_chunks=1)
+            for _ in range(api_c.MAX_WORKERS_THREAD_POOL + 2)
+        ]
+        for index in range(5):
+            for stream_upload in stream_uploads:
+                stream_upload.write(f"{index},".encode())
+
+        self.assertTrue(all(x.close() for x in stream_uploads))
+        self.assertListEqual([b"0,1,2,3,4,"] * len(stream_uploads), uploaded)
+
+    @mock.patch.object(streaming, "STREAM_UPLOAD_WAIT", 0.01)
+    @mock.patch.object(streaming, "STREAM_UPLOAD_TIMEOUT", 0.05)
+    def test_stream_upload_timeout(self) -> None:
+        """Test writes to an upload that does not read fail after the
+        timeout instead of waiting forever."""
+
+        release = threading.Event()
+
+        def upload(file_obj: io.RawIOBase) -> bool:
+            """Upload the stream once released, without reading it.
+
+            Args:
+                file_obj (io.RawIOBase): Stream to upload.
+
+            Returns:
+                bool: Success flag.
+            """
+
+            release.wait()
+            return bool(file_obj)
+
+        stream_upload = StreamUpload(upload, max_chunks=1)
+        stream_upload.write(b"buffered")
+        with self.assertRaises(OSError):
+            stream_upload.write(b"waiting")
+
+        stream_upload.abort()
+        release.set()
+        self.assertTrue(stream_upload.result.result())
@@ -0,0 +1,74 @@
+"""Purpose of this file is to house all the time series helper tests."""
+from datetime import datetime, timezone
+from unittest import TestCase
+
+import pandas as pd
+
+from huxunify.api.data_connectors.time_series import (
+    reindex_by_day,
+    weighted_average,
+    to_records,
+)
+
+
+class TimeSeriesTest(TestCase):
+    """Tests for the time series helpers."""
+
+    def test_reindex_by_day(self) -> None:
+        """Test rows are aligned onto every day of the range."""
+
+        frame = reindex_by_day(
+            pd.DataFrame(
+                {
+                    "date": [
+                        "2021-01-03T00:00:00Z",
+                        "2021-01-01T00:00:00Z",
+                        "2021-01-01T00:00:00Z",
+                        "2021-01-02T12:00:00Z",
+                        "2021-02-01T00:00:00Z",
+                        None,
+                    ],
+                    "count": [3, 1, 10, 2, 4, 5],
+                }
+            ),
+            "date",
+            datetime(2021, 1, 1, tzinfo=timezone.utc),
+            datetime(2021, 1, 4, tzinfo=timezone.utc),
+        )
+
+        self.assertEqual(4, len(frame))
+        self.assertListEqual(
+            [1, None, 3, None],
+            [None if pd.isna(x) else x for x in frame["count"]],
+        )
+
+    def test_weighted_average(self) -> None:
+        """Test rows are averaged by their weights, zero without weight."""
+
+        self.assertListEqual(
+            [15.0, 0.0, 4.0],
+            weighted_average(
+                pd.DataFrame({"a": [10, 5, 10], "b": [20, 5, None]}),
+                pd.DataFrame({"a": [1, 0, 2], "b": [1, None, 3]}),
+            ).tolist(),
+        )
+
+    def test_to_records(self) -> None:
+        """Test frames are serialized with Python values."""
+
+        records = to_records(
+            pd.DataFrame(
+                {"count": [1, None], "ltv": [2.5, 3.5]},
+                index=pd.date_range("2021-01-01", periods=2),
+            ),
+            "date",
+        )
+
+        self.assertListEqual(
+            [
+                {"date": datetime(2021, 1, 1), "count": 1.0, "ltv": 2.5},
+                {"date": datetime(2021, 1, 2), "count": None, "ltv": 3.5},
+            ],
+            records,
+        )
+        self.assertIs(datetime, type(records[0]["date"]))
@@ -92,6 +92,11 @@ class AudienceDownloadsTest(RouteTestCase):
                 "upload_file",
                 return_value=True,
             ).start()
+            mock.patch.object(
+                subclass,
+                "upload_stream",
+                return_value=True,
+            ).start()
 
     def test_download_google_ads(self) -> None:
         """Test to check download google_ads customers hashed data."""
@@ -209,6 +214,8 @@ class AudienceDownloadsTest(RouteTestCase):
 
         self.assertEqual(HTTPStatus.OK, response.status_code)
         self.assertEqual("application/zip", response.content_type)
+        with ZipFile(BytesIO(response.data)) as zipfile:
+            self.assertEqual(3, len(zipfile.namelist()))
 
     def test_download_empty_google_ads(self) -> None:
         """Test to check download empty google_ads audience file."""
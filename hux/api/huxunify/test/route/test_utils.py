@@ -1,17 +1,28 @@
 # pylint: disable=too-many-public-methods
 """Purpose of this file is to house all the route/utils tests."""
 from datetime import datetime, timedelta
+from io import BytesIO
+from zipfile import ZipFile
 from http import HTTPStatus
+from typing import Iterator
 from unittest import TestCase, mock
 
 import mongomock
+import pandas as pd
 from bson import ObjectId
 
 from huxunifylib.database.util.client import db_client_factory
 from huxunifylib.database.client import DatabaseClient
+from huxunifylib.database import constants as db_c
+from huxunifylib.database.user_management import (
+    get_user,
+    set_user,
+    update_user,
+)
 from hypothesis import given, strategies as st
 
 from huxunify.api.data_connectors.cloud.cloud_client import CloudClient
+from huxunify.api.data_connectors.streaming import StreamUpload
 from huxunify.api.exceptions.unified_exceptions import (
     InputParamsValidationError,
 )
@@ -28,7 +39,12 @@ from huxunify.api.route.utils import (
     convert_filters_for_events,
     convert_cdp_buckets_to_histogram,
     convert_filters_for_contact_preference,
+    get_cached_user,
+    user_cache,
+    generate_audience_zip,
+    start_audience_upload,
 )
+from huxunify.api.config import get_config
 import huxunify.test.constants as t_c
 from huxunify.api import constants as api_c
 
@@ -94,6 +110,38 @@ class TestRouteUtils(TestCase):
         self.assertFalse(status)
         self.assertEqual("Mongo not available.", message)
 
+    def test_get_cached_user(self):
+        """Test getting a cached user and invalidating it on update."""
+
+        mongomock.patch(servers=(("localhost", 27017),)).start()
+        database = DatabaseClient("localhost", 27017, None, None).connect()
+        mock.patch.object(get_config(), "USER_CACHE_TTL", 30).start()
+        user_cache.clear()
+        self.addCleanup(user_cache.clear)
+        self.addCleanup(mock.patch.stopall)
+
+        okta_id = "8548bfh8d"
+        set_user(database, okta_id, "davesmith@fake.com")
+
+        with mock.patch(
+            "huxunify.api.route.utils.get_user",
+            wraps=get_user,
+        ) as get_user_mock:
+            user = get_cached_user(database, okta_id)
+            self.assertEqual(okta_id, user[db_c.OKTA_ID])
+
+            # mutating the returned user does not touch the cache.
+            user[api_c.IS_USER_NEW] = True
+            user = get_cached_user(database, okta_id)
+            self.assertNotIn(api_c.IS_USER_NEW, user)
+            get_user_mock.assert_called_once()
+
+            # updates invalidate the cached user.
+            update_user(database, okta_id, {db_c.USER_LOGIN_COUNT: 5})
+            user = get_cached_user(database, okta_id)
+            self.assertEqual(5, user[db_c.USER_LOGIN_COUNT])
+            self.assertEqual(2, get_user_mock.call_count)
+
     def test_health_check(self):
         """Test health check."""
 
@@ -656,3 +704,172 @@ class TestRouteUtils(TestCase):
         self.assertEqual(
             t_c.COUNTS_BY_FLOAT_HISTOGRAM_DATA, histogram_data.values
         )
+
+    def test_generate_audience_zip(self):
+        """Test audience files of several download types are streamed into
+        a zip and uploaded from one read of the batches."""
+
+        uploads = {}
+
+        def upload_stream(stream: BytesIO, file_name: str, **_) -> bool:
+            """Read the whole stream as an upload, keeping its data.
+
+            Args:
+                stream (BytesIO): Stream to upload.
+                file_name (str): Name of the uploaded file.
+                **_ (dict): File type and user name of the upload.
+
+            Returns:
+                bool: True once the stream is read.
+            """
+
+            uploads[file_name] = stream.read()
+            return True
+
+        cloud_client = mock.Mock(upload_stream=upload_stream)
+        mock.patch(
+            "huxunify.api.route.utils.CloudClient", return_value=cloud_client
+        ).start()
+        audit_mock = mock.patch(
+            "huxunify.api.route.utils.create_audience_audit"
+        ).start()
+        notification_mock = mock.patch(
+            "huxunify.api.route.utils.create_notification"
+        ).start()
+        self.addCleanup(mock.patch.stopall)
+
+        read_batches = []
+
+        def data_batches() -> Iterator[pd.DataFrame]:
+            """Read the data batches, keeping the batches read.
+
+            Yields:
+                Iterator[pd.DataFrame]: Data batch.
+            """
+
+            for first_id in range(0, 6, 2):
+                read_batches.append(first_id)
+                yield pd.DataFrame({"id": [first_id, first_id + 1]})
+
+        zip_data = b"".join(
+            generate_audience_zip(
+                data_batches(),
+                {
+                    api_c.GOOGLE_ADS: lambda x: x,
+                    api_c.AMAZON_ADS: lambda x: x.assign(type="amazon"),
+                    api_c.GENERIC_ADS: lambda x: x.assign(type="generic"),
+                },
+                ObjectId(),
+                "user",
+                None,
+            )
+        )
+
+        # each batch is read once for all download types.
+        self.assertListEqual([0, 2, 4], read_batches)
+        with ZipFile(BytesIO(zip_data)) as zip_file:
+            self.assertEqual(3, len(zip_file.namelist()))
+            for file_name in zip_file.namelist():
+                # the header is written once, before the first batch.
+                lines = zip_file.read(file_name).decode().splitlines()
+                self.assertEqual(7, len(lines))
+                self.assertTrue(lines[0].startswith("id"))
+                self.assertEqual(zip_file.read(file_name), uploads[file_name])
+
+        self.assertEqual(3, audit_mock.call_count)
+        # the user is notified once the zip is streamed.
+        notification_mock.assert_called_once()
+        self.assertEqual(
+            db_c.NOTIFICATION_TYPE_INFORMATIONAL,
+            notification_mock.call_args[0][1],
+        )
+
+    def test_generate_audience_zip_failure(self):
+        """Test a failure reading the batches aborts the uploads and
+        notifies the user of the failure instead of the download."""
+
+        def upload_stream(stream: BytesIO, **_) -> bool:
+            """Read the whole stream as an upload.
+
+            Args:
+                stream (BytesIO): Stream to upload.
+                **_ (dict): File name, type and user name of the upload.
+
+            Returns:
+                bool: True once the stream is read.
+            """
+
+            stream.read()
+            return True
+
+        mock.patch(
+            "huxunify.api.route.utils.CloudClient",
+            return_value=mock.Mock(upload_stream=upload_stream),
+        ).start()
+        started_uploads = []
+
+        def start_upload(*args) -> StreamUpload:
+            """Start an audience upload, keeping the uploads started.
+
+            Args:
+                *args (tuple): Arguments of start_audience_upload.
+
+            Returns:
+                StreamUpload: Started upload.
+            """
+
+            started_uploads.append(start_audience_upload(*args))
+            return started_uploads[-1]
+
+        mock.patch(
+            "huxunify.api.route.utils.start_audience_upload",
+            side_effect=start_upload,
+        ).start()
+        audit_mock = mock.patch(
+            "huxunify.api.route.utils.create_audience_audit"
+        ).start()
+        notification_mock = mock.patch(
+            "huxunify.api.route.utils.create_notification"
+        ).start()
+        self.addCleanup(mock.patch.stopall)
+
+        def data_batches() -> Iterator[pd.DataFrame]:
+            """Read a data batch, then fail.
+
+            Yields:
+                Iterator[pd.DataFrame]: Data batch.
+
+            Raises:
+                ConnectionError: Reading the second batch.
+            """
+
+            yield pd.DataFrame({"id": [0, 1]})
+            raise ConnectionError("CDP failed mid-stream.")
+
+        zip_stream = generate_audience_zip(
+            data_batches(),
+            {
+                api_c.GOOGLE_ADS: lambda x: x,
+                api_c.AMAZON_ADS: lambda x: x,
+                api_c.GENERIC_ADS: lambda x: x,
+            },
+            ObjectId(),
+            "user",
+            None,
+        )
+        next(zip_stream)
+        # uploads are started at their first write, up to the bound.
+        self.assertEqual(api_c.AUDIENCE_STREAM_UPLOADS, len(started_uploads))
+
+        with self.assertRaises(ConnectionError):
+            list(zip_stream)
+
+        # the aborted uploads fail instead of storing a partial file.
+        for stream_upload in started_uploads:
+            self.assertFalse(stream_upload.result.result())
+        audit_mock.assert_not_called()
+        notification_mock.assert_called_once()
+        self.assertEqual(
+            db_c.NOTIFICATION_TYPE_CRITICAL,
+            notification_mock.call_args[0][1],
+        )
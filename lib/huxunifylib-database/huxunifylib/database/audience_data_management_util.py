@@ -1,7 +1,6 @@
 """Audience and Data management utils."""
 
 import logging
-from collections import defaultdict
 from typing import Union
 
 from bson import ObjectId
@@ -10,6 +9,7 @@ import pandas as pd
 from tenacity import retry, wait_fixed, retry_if_exception_type
 
 import huxunifylib.database.constants as db_c
+from huxunifylib.database import stats_sketches as sketches
 from huxunifylib.database.db_exceptions import DuplicateDataSourceFieldType
 from huxunifylib.database.client import DatabaseClient
 
@@ -53,7 +53,10 @@ def add_stats_to_update_dict(
     old_stats_doc: dict,
     custom_breakdown_fields: list = None,
 ) -> dict:
-    """A function to add statistics to an update dict.
+    """A function to add statistics to an update dict. Counts are updated
+    with $inc and breakdowns are merged from sketches of each breakdown
+    field, so an update takes time of the new data rather than of the
+    distinct values seen so far.
 
     Args:
         update_dict (dict): A dict for updating a statistics/insights document.
@@ -63,7 +66,8 @@ def add_stats_to_update_dict(
             breakdowns should be calculated.
 
     Returns:
-        dict: Updated dict.
+        dict: MongoDB update of the statistics/insights document, setting
+            the updated dict.
     """
 
     new_count = new_data.shape[0]
@@ -94,11 +98,6 @@ def add_stats_to_update_dict(
     if custom_breakdown_fields is not None:
         breakdown_fields += custom_breakdown_fields
 
-    # Getting invert of the count as it is needed for coverage calculation
-    new_count_inv = 0.0
-    if new_count > 0:
-        new_count_inv = 1.0 / new_count
-
     # Casting age from integers to string as MongoDB only accepts strings
     if db_c.S_TYPE_AGE in col_list:
         new_data[db_c.S_TYPE_AGE] = (
@@ -127,103 +126,135 @@ def add_stats_to_update_dict(
     # Get the total count and its inverse
     tot_count = old_count + new_count
 
-    tot_count_inv = tot_count
-    if tot_count_inv > 0:
-        tot_count_inv = 1.0 / tot_count_inv
+    tot_count_inv = 0.0
+    if tot_count > 0:
+        tot_count_inv = 1.0 / tot_count
+
+    old_sketches = old_stats_doc.get(db_c.STATS_SKETCHES, {})
 
-    # Set count
-    update_dict[db_c.DATA_COUNT] = tot_count
+    # Increment count
+    inc_dict = {db_c.DATA_COUNT: new_count}
 
     # Loop through all the fields in the ingested data
     for item in col_list:
 
-        col_count = new_data[item].count()
-
-        col_count_inv = 0.0
-        if col_count > 0:
-            col_count_inv = 1.0 / col_count
+        col_count = int(new_data[item].count())
+        sketch_path = f"{db_c.STATS_SKETCHES}.{item}"
+        old_sketch = old_sketches.get(item)
+        old_item = old_stats_doc.get(item, {})
 
-        if item not in breakdown_fields:
-
-            # Calculate the coverage ratio from new data
-            new_cov_ratio = col_count * new_count_inv
+        # Get the count of the field from its sketch, or from its coverage
+        # for documents stored before the sketches
+        if old_sketch is not None:
+            old_col_count = int(old_sketch[db_c.DATA_COUNT])
+            inc_dict[f"{sketch_path}.{db_c.DATA_COUNT}"] = col_count
+        else:
+            old_col_count = int(
+                round(old_count * old_item.get(db_c.STATS_COVERAGE, 0.0))
+            )
+            update_dict[f"{sketch_path}.{db_c.DATA_COUNT}"] = (
+                old_col_count + col_count
+            )
 
-            # Get the coverage ratio from the existig doc
-            if (
-                item in old_stats_doc
-                and db_c.STATS_COVERAGE in old_stats_doc[item]
-            ):
-                old_cov_ratio = old_stats_doc[item][db_c.STATS_COVERAGE]
-            else:
-                old_cov_ratio = 0.0
+        tot_col_count = old_col_count + col_count
 
-            # Compute the overall coverage ratio of the new and old data
-            cov_ratio = tot_count_inv * (
-                old_count * old_cov_ratio + new_count * new_cov_ratio
-            )
+        # Compute the overall coverage ratio of the new and old data
+        cov_ratio = tot_col_count * tot_count_inv
 
+        if item not in breakdown_fields:
             update_dict[item] = {
                 db_c.STATS_COVERAGE: cov_ratio,
             }
+            continue
 
+        # Load the sketches of the existing doc, seeding them from the
+        # breakdown for documents stored before the sketches
+        registers = sketches.load_distinct_sketch(
+            (old_sketch or {}).get(db_c.STATS_DISTINCT_SKETCH)
+        )
+        if old_sketch is not None:
+            top_values = old_sketch.get(db_c.STATS_TOP_VALUES, [])
         else:
-            # Calculate the coverage and breakdown from new data
-            new_cov_ratio = col_count * new_count_inv
-            new_break_dict = dict(
-                new_data[item].value_counts() * col_count_inv
+            old_break_dict = old_item.get(db_c.STATS_BREAKDOWN, {})
+            top_values = sketches.top_values_from_breakdown(
+                old_break_dict, old_col_count
+            )
+            sketches.update_distinct_sketch(
+                registers, pd.Series(list(old_break_dict), dtype=object)
             )
-            new_break_dict = defaultdict(float, new_break_dict)
 
-            # Calculate the coverage from the existing doc
-            if (
-                item in old_stats_doc
-                and db_c.STATS_COVERAGE in old_stats_doc[item]
-            ):
-                old_cov_ratio = old_stats_doc[item][db_c.STATS_COVERAGE]
-            else:
-                old_cov_ratio = 0.0
+        # Merge the new data into the sketches
+        values = new_data[item].dropna()
+        sketches.update_distinct_sketch(registers, values)
+        top_values = sketches.merge_top_values(
+            top_values, values.value_counts(), db_c.STATS_TOP_VALUES_SIZE
+        )
 
-            # Calculate the breakdown from the existing doc
-            if (
-                item in old_stats_doc
-                and db_c.STATS_BREAKDOWN in old_stats_doc[item]
-            ):
-                old_break_dict = old_stats_doc[item][db_c.STATS_BREAKDOWN]
-            else:
-                old_break_dict = defaultdict(float)
+        update_dict[
+            f"{sketch_path}.{db_c.STATS_DISTINCT_SKETCH}"
+        ] = sketches.dump_distinct_sketch(registers)
+        update_dict[f"{sketch_path}.{db_c.STATS_TOP_VALUES}"] = top_values
+        update_dict[item] = {
+            db_c.STATS_COVERAGE: cov_ratio,
+            db_c.STATS_BREAKDOWN: sketches.get_breakdown(
+                top_values, tot_col_count
+            ),
+        }
 
-            old_break_dict = defaultdict(float, old_break_dict)
+    return {"$set": update_dict, "$inc": inc_dict}
 
-            # Calculate the coverage from new and old data. It can be
-            # shown that the overal coverage is the weighted average
-            # of the new and old data
-            cov_ratio = tot_count_inv * (
-                old_count * old_cov_ratio + new_count * new_cov_ratio
-            )
 
-            tmp_inv = old_count * old_cov_ratio + new_count * new_cov_ratio
-            if tmp_inv > 0:
-                tmp_inv = 1.0 / tmp_inv
+def merge_stats_updates(update_doc: dict, other_update_doc: dict) -> dict:
+    """A function to merge two updates of a statistics/insights document
+    into one, with the other update applied after the first.
 
-            # Calculate the overal breakdown from old and new data
-            # breakdowns. We loop through teh union of keys of old and
-            # new breakdown dicts and calculate the overal breakdown.
-            break_dict = {}
-            all_vals = set(new_break_dict.keys()).union(
-                set(old_break_dict.keys())
-            )
-            for val in all_vals:
-                break_dict[val] = tmp_inv * (
-                    old_count * old_cov_ratio * old_break_dict[val]
-                    + new_count * new_cov_ratio * new_break_dict[val]
-                )
+    Args:
+        update_doc (dict): MongoDB update of the document.
+        other_update_doc (dict): MongoDB update applied after it.
 
-            update_dict[item] = {
-                db_c.STATS_COVERAGE: cov_ratio,
-                db_c.STATS_BREAKDOWN: break_dict,
-            }
+    Returns:
+        dict: Merged MongoDB update.
+    """
+
+    set_dict = dict(update_doc.get("$set", {}))
+    inc_dict = dict(update_doc.get("$inc", {}))
+
+    for path, value in other_update_doc.get("$set", {}).items():
+        inc_dict.pop(path, None)
+        set_dict[path] = value
+
+    for path, value in other_update_doc.get("$inc", {}).items():
+        if path in set_dict:
+            set_dict[path] += value
+        else:
+            inc_dict[path] = inc_dict.get(path, 0) + value
+
+    return {"$set": set_dict, "$inc": inc_dict}
+
+
+def apply_stats_update(stats_doc: dict, update_doc: dict) -> dict:
+    """A function to apply an update of a statistics/insights document to
+    the document in memory, as MongoDB would.
+
+    Args:
+        stats_doc (dict): Statistics/insights document, updated in place.
+        update_doc (dict): MongoDB update of the document.
+
+    Returns:
+        dict: Updated statistics/insights document.
+    """
+
+    for operator, fields in update_doc.items():
+        for path, value in fields.items():
+            *parents, name = path.split(".")
+            doc = stats_doc
+            for parent in parents:
+                doc = doc.setdefault(parent, {})
+            doc[name] = (
+                doc.get(name, 0) + value if operator == "$inc" else value
+            )
 
-    return update_dict
+    return stats_doc
 
 
 def validate_data_source_fields(fields: list) -> None:
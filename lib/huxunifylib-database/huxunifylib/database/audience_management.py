@@ -4,8 +4,8 @@
 import time
 import logging
 import datetime
-from collections import defaultdict
-from typing import Tuple, Generator, Union, Optional
+from itertools import chain, islice
+from typing import Dict, List, Tuple, Generator, Union, Optional
 import pandas as pd
 from bson import ObjectId
 import pymongo
@@ -14,6 +14,7 @@ from tenacity import retry, wait_fixed, retry_if_exception_type
 import huxunifylib.database.db_exceptions as de
 import huxunifylib.database.constants as db_c
 import huxunifylib.database.data_management as dm
+import huxunifylib.database.ingested_data_reader as idr
 from huxunifylib.database.client import DatabaseClient
 from huxunifylib.database.audience_data_management_util import (
     add_stats_to_update_dict,
@@ -92,7 +93,6 @@ def create_audience(
 
     try:
         audience_id = collection.insert_one(audience_doc).inserted_id
-        collection.create_index([(db_c.JOB_ID, pymongo.ASCENDING)])
         if audience_id is not None:
             ret_doc = collection.find_one(
                 {db_c.ID: audience_id, db_c.DELETED: False}, {db_c.DELETED: 0}
@@ -107,11 +107,11 @@ def create_audience(
     wait=wait_fixed(db_c.CONNECT_RETRY_INTERVAL),
     retry=retry_if_exception_type(pymongo.errors.AutoReconnect),
 )
-# pylint: disable=R0914
 def get_ingested_data(
     database: DatabaseClient,
     query: dict,
     batch_size: int = 1000,
+    schema: Optional[Dict[str, type]] = None,
 ) -> Tuple[pd.DataFrame, Optional[ObjectId]]:
     """A function to get ingested data given a query (filters).
 
@@ -119,6 +119,8 @@ def get_ingested_data(
         database (DatabaseClient): A database client.
         query (dict): A query containing audience filters.
         batch_size (int): Batch size.
+        schema (Optional[Dict[str, type]]): Type of each ingested data field
+            to read from raw BSON batches, all fields are read if not set.
 
     Returns:
         Tuple[pd.DataFrame, ObjectId]:  A tuple of ingested data in
@@ -131,43 +133,44 @@ def get_ingested_data(
     # Get a cursor of ingested data
     dm_db = database[db_c.DATA_MANAGEMENT_DATABASE]
     data_collection = dm_db[db_c.INGESTED_DATA_COLLECTION]
-    data_dict = defaultdict(list)
     next_start_id = None
 
-    # TODO - per Greg Ronin, future we improve it to be a generator to avoid start_id
-    #  and next_start_id. Maybe we need a ticket to evaluate that.
+    if schema:
+        batches = idr.find_schema_batches(
+            data_collection, query, schema, batch_size
+        )
+        try:
+            return next(batches, (pd.DataFrame(), None))
+        except pymongo.errors.OperationFailure as exc:
+            logging.error(exc)
+            raise
+        finally:
+            batches.close()
 
-    # Read the audience documents and build a dict
+    # Read the audience documents
     try:
         cursor = (
             data_collection.find(
                 query,
+                {db_c.INGESTED_DATA: 1},
                 batch_size=batch_size,
             )
             .sort(db_c.ID, 1)
             .limit(batch_size)
         )
-
-        data_cols = []
-        for count, item in enumerate(cursor):
-            ingested_data = item[db_c.INGESTED_DATA]
-
-            for name in data_cols:
-                data_dict[name].append(ingested_data.get(name))
-
-            new_cols = list(set(ingested_data.keys()) - set(data_cols))
-            for name in new_cols:
-                data_dict[name] += count * [None] + [ingested_data[name]]
-
-            data_cols += new_cols
-            next_start_id = item[db_c.ID]
+        items = list(cursor)
 
     except pymongo.errors.OperationFailure as exc:
         logging.error(exc)
         raise
 
+    if items:
+        next_start_id = items[-1][db_c.ID]
+
     # Build a data frame
-    audience_data = pd.DataFrame(data_dict)
+    audience_data = build_ingested_dataframe(
+        [item[db_c.INGESTED_DATA] for item in items]
+    )
 
     return (audience_data, next_start_id)
 
@@ -176,12 +179,12 @@ def get_ingested_data(
     wait=wait_fixed(db_c.CONNECT_RETRY_INTERVAL),
     retry=retry_if_exception_type(pymongo.errors.AutoReconnect),
 )
-# pylint: disable=R0912,R0914,R0915
 def get_audience(
     database: DatabaseClient,
     audience_id: ObjectId,
     start_id: ObjectId = None,
     batch_size: int = 1000,
+    schema: Optional[Dict[str, type]] = None,
 ) -> Tuple[pd.DataFrame, Optional[ObjectId]]:
     """A function to get an audience.
 
@@ -190,6 +193,8 @@ def get_audience(
         audience_id (ObjectId): The Mongo DB ID of the audience.
         start_id (ObjectId): The start ID of the batch.
         batch_size (int): Batch size.
+        schema (Optional[Dict[str, type]]): Type of each ingested data field
+            to read from raw BSON batches, all fields are read if not set.
 
     Returns:
         Tuple[pd.DataFrame, ObjectId]:  A tuple of audience data in
@@ -202,9 +207,6 @@ def get_audience(
             has incorrect filters.
     """
 
-    # TODO - per Greg Ronin, future we improve it to be a generator to avoid start_id
-    #  and next_start_id. Maybe we need a ticket to evaluate that.
-
     doc = None
     am_db = database[db_c.DATA_MANAGEMENT_DATABASE]
     collection = am_db[db_c.AUDIENCES_COLLECTION]
@@ -218,17 +220,43 @@ def get_audience(
     if doc is None:
         raise de.InvalidID(audience_id)
 
+    mongo_query = get_audience_query(doc)
+
+    # Apply start_id is not None
+    if start_id is not None and ObjectId.is_valid(start_id):
+        mongo_query["$and"].insert(1, {db_c.ID: {"$gt": start_id}})
+
+    # Get the ingested data in data frame format
+    audience_data, next_start_id = get_ingested_data(
+        database, mongo_query, batch_size, schema
+    )
+
+    return (audience_data, next_start_id)
+
+
+# pylint: disable=R0912
+def get_audience_query(audience_doc: dict) -> dict:
+    """A function to compile the filters of an audience into a query of its
+    ingested data.
+
+    Args:
+        audience_doc (dict): Audience document.
+
+    Returns:
+        dict: MongoDB query of the ingested data of the audience.
+
+    Raises:
+        IncorrectFilterValue: If the filters associated with the audience doc
+            has incorrect filters.
+    """
+
     # Get ingestion job ID and filters associated with the audience
-    ingestion_job_id = doc[db_c.JOB_ID]
-    audience_filters = doc.get(db_c.AUDIENCE_FILTERS, [])
+    ingestion_job_id = audience_doc[db_c.JOB_ID]
+    audience_filters = audience_doc.get(db_c.AUDIENCE_FILTERS, [])
 
     # Initialize queries list
     filter_queries = [{db_c.JOB_ID: ingestion_job_id}]
 
-    # Apply start_id is not None
-    if start_id is not None and ObjectId.is_valid(start_id):
-        filter_queries.append({db_c.ID: {"$gt": start_id}})
-
     # Loop through the filters and apply them
     for item in audience_filters:
         if db_c.AUDIENCE_FILTER_FIELD not in item.keys():
@@ -310,45 +338,181 @@ def get_audience(
             continue
 
     # Build mongo query by applying AND between the queries
-    mongo_query = {"$and": filter_queries}
+    return {"$and": filter_queries}
 
-    # Get the ingested data in data frame format
-    audience_data, next_start_id = get_ingested_data(
-        database, mongo_query, batch_size
+
+def get_ingested_data_columns(
+    database: DatabaseClient, ingestion_job_id: ObjectId
+) -> list:
+    """A function to get the columns of ingested data from the fields of its
+    data source, a special type field is stored under its special type and
+    a custom field under its header.
+
+    Args:
+        database (DatabaseClient): A database client.
+        ingestion_job_id (ObjectId): MongoDB document ID of ingestion job.
+
+    Returns:
+        list: Column names, empty if the data source has no fields.
+    """
+
+    ingestion_job_doc = dm.get_ingestion_job(database, ingestion_job_id)
+    if not ingestion_job_doc:
+        return []
+
+    data_source_doc = dm.get_data_source(
+        database, ingestion_job_doc.get(db_c.DATA_SOURCE_ID)
     )
+    fields = (data_source_doc or {}).get(db_c.DATA_SOURCE_FIELDS) or []
 
-    return (audience_data, next_start_id)
+    columns = [db_c.S_TYPE_CUSTOMER_ID] + [
+        field.get(db_c.FIELD_SPECIAL_TYPE) or field.get(db_c.FIELD_HEADER)
+        for field in fields
+    ]
+    return list(dict.fromkeys(x for x in columns if x))
+
+
+def build_ingested_dataframe(
+    records: List[dict], columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """A function to build a data frame of ingested data records a column at
+    a time, a record without a column has None in it.
+
+    Args:
+        records (List[dict]): Ingested data records.
+        columns (Optional[List[str]]): Known columns, first in the data frame.
+            Known columns no record has are left out.
+
+    Returns:
+        pd.DataFrame: Ingested data.
+    """
+
+    # keys of all records in order of appearance, in one pass.
+    record_keys = dict.fromkeys(chain.from_iterable(records))
+    known_columns = [x for x in columns or [] if x in record_keys]
+    new_columns = [x for x in record_keys if x not in set(known_columns)]
+
+    return pd.DataFrame(
+        {
+            name: [record.get(name) for record in records]
+            for name in known_columns + new_columns
+        }
+    )
+
+
+def find_ingested_batches(
+    collection: pymongo.collection.Collection,
+    query: dict,
+    columns: List[str],
+    batch_size: int,
+    last_id: Optional[ObjectId] = None,
+) -> Generator[tuple, None, None]:
+    """A function to read ingested data documents from one cursor and yield
+    data frames of batch_size rows.
+
+    Args:
+        collection (pymongo.collection.Collection): Ingested data collection.
+        query (dict): Query of the ingested data documents.
+        columns (List[str]): Known columns, first in the data frames.
+        batch_size (int): Rows per data frame.
+        last_id (Optional[ObjectId]): Only read documents after this ID.
+
+    Yields:
+        Generator[tuple, None, None]: Data frames and the ID of their last
+            document.
+    """
+
+    if last_id:
+        query = {"$and": [query, {db_c.ID: {"$gt": last_id}}]}
+
+    cursor = collection.find(
+        query,
+        {db_c.INGESTED_DATA: 1},
+        batch_size=batch_size,
+        no_cursor_timeout=True,
+    ).sort(db_c.ID, 1)
+
+    try:
+        while True:
+            items = list(islice(cursor, batch_size))
+            if not items:
+                return
+
+            yield build_ingested_dataframe(
+                [item[db_c.INGESTED_DATA] for item in items], columns
+            ), items[-1][db_c.ID]
+    finally:
+        cursor.close()
 
 
 def get_audience_batches(
     database: DatabaseClient,
     audience_id: ObjectId,
     batch_size: int = 1000,
+    schema: Optional[Dict[str, type]] = None,
 ) -> Generator[pd.DataFrame, None, None]:
-    """A function to get batches of audience data.
+    """A function to get batches of audience data. The filters of the
+    audience are compiled once and the batches are read from one cursor.
+    With a schema, only its fields are read, from raw BSON batches decoded
+    into typed columns.
 
     Args:
         database (DatabaseClient): A database client.
         audience_id (ObjectId): The Mongo DB ID of the audience.
         batch_size (int): Batch size.
+        schema (Optional[Dict[str, type]]): Type of each ingested data field
+            to read, see ingested_data_reader.get_ingested_data_schema.
 
     Yields:
         Generator[pd.DataFrame, None, None]: A generator of audience data in
             pandas format.
+
+    Raises:
+        InvalidID: If the passed in audience_id did not fetch a doc from the
+            relevant db collection.
+        OperationFailure: If an exception occurs during mongo operation.
     """
 
-    start_id = None
+    audience_doc = get_audience_config(database, audience_id)
+    if audience_doc is None:
+        raise de.InvalidID(audience_id)
 
-    while True:
+    query = get_audience_query(audience_doc)
+    # columns are only read from the documents without a schema.
+    columns = (
+        None
+        if schema
+        else get_ingested_data_columns(database, audience_doc[db_c.JOB_ID])
+    )
+    data_collection = database[db_c.DATA_MANAGEMENT_DATABASE][
+        db_c.INGESTED_DATA_COLLECTION
+    ]
+    last_id = None
 
-        audience_data_batch, start_id = get_audience(
-            database, audience_id, start_id, batch_size
+    while True:
+        batches = (
+            idr.find_schema_batches(
+                data_collection, query, schema, batch_size, last_id
+            )
+            if schema
+            else find_ingested_batches(
+                data_collection, query, columns, batch_size, last_id
+            )
         )
 
-        if start_id is None:
-            break
-
-        yield audience_data_batch
+        try:
+            for audience_data, last_id in batches:
+                yield audience_data
+            return
+        except pymongo.errors.AutoReconnect as exc:
+            # resume after the last batch read on a new cursor.
+            logging.warning(exc)
+            time.sleep(db_c.CONNECT_RETRY_INTERVAL)
+        except pymongo.errors.OperationFailure as exc:
+            logging.error(exc)
+            raise
+        finally:
+            batches.close()
 
 
 @retry(
@@ -516,7 +680,7 @@ def append_audience_insights(
     }
 
     # Add insights to update dict
-    update_dict = add_stats_to_update_dict(
+    update_doc = add_stats_to_update_dict(
         update_dict,
         audience_data,
         old_insights_doc,
@@ -527,11 +691,10 @@ def append_audience_insights(
     try:
         doc = collection.find_one_and_update(
             {db_c.AUDIENCE_ID: audience_id},
-            {"$set": update_dict},
+            update_doc,
             upsert=True,
             return_document=pymongo.ReturnDocument.AFTER,
         )
-        collection.create_index([(db_c.AUDIENCE_ID, pymongo.ASCENDING)])
         tot_time = time.time() - beg_time
         logging.info(
             "Appending insights for %d records took %0.2f seconds",
@@ -603,10 +766,15 @@ def refresh_audience_insights(
     )
 
     if success_flag:
+        # only the data source fields are read, into typed columns.
+        audience_doc = get_audience_config(database, audience_id)
         data_batches = get_audience_batches(
             database,
             audience_id,
             batch_size,
+            idr.get_ingested_data_schema(database, audience_doc[db_c.JOB_ID])
+            if audience_doc
+            else None,
         )
 
         for audience_data in data_batches:
@@ -0,0 +1 @@
+"""Purpose of this script is for storing benchmarks of the database lib."""
@@ -0,0 +1,106 @@
+"""Purpose of this file is to benchmark appending ingested data in batches
+against building the documents row by row and inserting them at once, on
+an in-memory mongomock database.
+
+Run with: python -m huxunifylib.database.benchmarks.ingested_data
+"""
+import timeit
+
+import mongomock
+import pandas as pd
+from bson import ObjectId
+
+import huxunifylib.database.constants as db_c
+from huxunifylib.database import data_management as dm
+from huxunifylib.database.audience_data_management_util import (
+    clean_dataframe_types,
+)
+from huxunifylib.database.client import DatabaseClient
+
+ROWS = (10000, 100000)
+REPEAT = 3
+
+
+def row_wise_append_ingested_data(
+    database: DatabaseClient,
+    ingestion_job_id: ObjectId,
+    ingested_data: pd.DataFrame,
+) -> None:
+    """Store ingested data with the documents built row by row and inserted
+    with one insert_many.
+
+    Args:
+        database (DatabaseClient): A database client.
+        ingestion_job_id (ObjectId): MongoDB document ID of ingestion job.
+        ingested_data (pd.DataFrame): Ingested data.
+    """
+
+    ingested_data = clean_dataframe_types(ingested_data)
+    ingested_data[db_c.S_TYPE_CUSTOMER_ID] = ingested_data[
+        db_c.S_TYPE_CUSTOMER_ID
+    ].apply(lambda x: ObjectId() if x is None else x)
+
+    database[db_c.DATA_MANAGEMENT_DATABASE][
+        db_c.INGESTED_DATA_COLLECTION
+    ].insert_many(
+        [
+            {db_c.JOB_ID: ingestion_job_id, db_c.INGESTED_DATA: dict(x)}
+            for _, x in ingested_data.iterrows()
+        ],
+        ordered=False,
+    )
+
+
+def get_ingested_data(rows: int) -> pd.DataFrame:
+    """Get ingested data without customer IDs.
+
+    Args:
+        rows (int): Number of rows.
+
+    Returns:
+        pd.DataFrame: Ingested data.
+    """
+
+    return pd.DataFrame(
+        {
+            db_c.S_TYPE_FIRST_NAME: [f"first_name_{x}" for x in range(rows)],
+            db_c.S_TYPE_EMAIL: [f"email_{x}@example.com" for x in range(rows)],
+            db_c.S_TYPE_CITY: ["city"] * rows,
+            db_c.S_TYPE_CUSTOMER_ID: [None] * rows,
+        }
+    )
+
+
+@mongomock.patch(servers=(("localhost", 27017),))
+def benchmark(rows: int) -> None:
+    """Print the throughput of both implementations.
+
+    Args:
+        rows (int): Number of rows ingested.
+    """
+
+    database = DatabaseClient(host="localhost", port=27017).connect()
+
+    for name, function in [
+        ("row-wise", row_wise_append_ingested_data),
+        ("batched", dm.append_ingested_data),
+    ]:
+        seconds = min(
+            timeit.repeat(
+                lambda x=function: x(
+                    database, ObjectId(), get_ingested_data(rows)
+                ),
+                number=1,
+                repeat=REPEAT,
+            )
+        )
+        database.drop_database(db_c.DATA_MANAGEMENT_DATABASE)
+        print(
+            f"{rows:>7} rows {name:>8}: {seconds * 1000:8.1f} ms,"
+            f" {rows / seconds:9.0f} rows/s"
+        )
+
+
+if __name__ == "__main__":
+    for row_count in ROWS:
+        benchmark(row_count)
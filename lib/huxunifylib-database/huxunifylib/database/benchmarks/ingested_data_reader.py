@@ -0,0 +1,150 @@
+"""Purpose of this file is to benchmark building audience data frames from
+raw BSON batches with a schema against building them from decoded documents
+with every ingested field.
+
+The server side of the reads is left out, the raw batches are encoded up
+front as find and find_raw_batches would return them.
+
+Run with: python -m huxunifylib.database.benchmarks.ingested_data_reader
+"""
+import random
+import timeit
+import tracemalloc
+
+import bson
+from bson import ObjectId
+from bson.codec_options import CodecOptions
+
+import huxunifylib.database.constants as db_c
+from huxunifylib.database import ingested_data_reader as idr
+from huxunifylib.database.audience_management import build_ingested_dataframe
+
+ROWS = 100000
+BATCH_SIZE = 1000
+REPEAT = 3
+SCHEMA = {
+    db_c.S_TYPE_CUSTOMER_ID: ObjectId,
+    db_c.S_TYPE_AGE: int,
+    db_c.S_TYPE_CITY: str,
+    db_c.S_TYPE_GENDER: str,
+}
+
+
+def get_documents(rows: int) -> list:
+    """Get ingested data documents with more fields than the schema.
+
+    Args:
+        rows (int): Number of documents.
+
+    Returns:
+        list: Ingested data documents.
+    """
+
+    return [
+        {
+            db_c.ID: ObjectId(),
+            db_c.INGESTED_DATA: {
+                db_c.S_TYPE_CUSTOMER_ID: ObjectId(),
+                db_c.S_TYPE_FIRST_NAME: f"first_name_{x}",
+                db_c.S_TYPE_LAST_NAME: f"last_name_{x}",
+                db_c.S_TYPE_EMAIL: f"email_{x}@example.com",
+                db_c.S_TYPE_AGE: random.randint(18, 90),
+                db_c.S_TYPE_CITY: random.choice(["New York", "Chicago", None]),
+                db_c.S_TYPE_STATE_OR_PROVINCE: "NY",
+                db_c.S_TYPE_COUNTRY_CODE: "US",
+                db_c.S_TYPE_GENDER: random.choice(["m", "f"]),
+                "custom_field": random.random(),
+            },
+        }
+        for x in range(rows)
+    ]
+
+
+def get_raw_batches(documents: list, fields: list = None) -> list:
+    """Encode documents into raw batches of BATCH_SIZE documents.
+
+    Args:
+        documents (list): Ingested data documents.
+        fields (list): Ingested data fields kept, as a projection would.
+
+    Returns:
+        list: Raw batches.
+    """
+
+    if fields:
+        documents = [
+            {
+                db_c.ID: x[db_c.ID],
+                db_c.INGESTED_DATA: {
+                    key: x[db_c.INGESTED_DATA][key] for key in fields
+                },
+            }
+            for x in documents
+        ]
+    encoded = [bson.encode(x) for x in documents]
+
+    return [
+        b"".join(encoded[start : start + BATCH_SIZE])
+        for start in range(0, len(encoded), BATCH_SIZE)
+    ]
+
+
+def read_documents(raw_batches: list) -> None:
+    """Build data frames from decoded documents with every field.
+
+    Args:
+        raw_batches (list): Raw batches of all fields.
+    """
+
+    for raw_batch in raw_batches:
+        build_ingested_dataframe(
+            [x[db_c.INGESTED_DATA] for x in bson.decode_all(raw_batch)]
+        )
+
+
+def read_schema(raw_batches: list) -> None:
+    """Build data frames from raw batches of the schema fields.
+
+    Args:
+        raw_batches (list): Raw batches of the schema fields.
+    """
+
+    for raw_batch in raw_batches:
+        idr.build_schema_dataframe(
+            [
+                x[db_c.INGESTED_DATA]
+                for x in idr.decode_raw_batch(raw_batch, CodecOptions())
+            ],
+            SCHEMA,
+        )
+
+
+def benchmark() -> None:
+    """Print the runtime and peak memory of both readers."""
+
+    documents = get_documents(ROWS)
+    cases = [
+        ("documents", read_documents, get_raw_batches(documents)),
+        ("schema", read_schema, get_raw_batches(documents, list(SCHEMA))),
+    ]
+
+    for name, function, raw_batches in cases:
+        seconds = min(
+            timeit.repeat(
+                lambda x=function, y=raw_batches: x(y),
+                number=1,
+                repeat=REPEAT,
+            )
+        )
+        tracemalloc.start()
+        function(raw_batches)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(
+            f"{ROWS} rows {name:>9}: {seconds * 1000:8.1f} ms,"
+            f" {ROWS / seconds:9.0f} rows/s, peak {peak / 2**20:6.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,161 @@
+"""Purpose of this file is to benchmark ingesting batches of synthetic data
+through the ingestion pipeline against appending the data and statistics of
+each batch one after another, on an in-memory mongomock database.
+
+mongomock writes are pure Python, so each write also waits SERVER_LATENCY
+seconds to stand in for the round trip and the work of a MongoDB server,
+during which a real client releases the GIL.
+
+Run with: python -m huxunifylib.database.benchmarks.ingestion_pipeline
+"""
+import time
+from typing import Callable, Iterator
+from unittest import mock
+
+import mongomock
+import numpy as np
+import pandas as pd
+from bson import ObjectId
+
+import huxunifylib.database.constants as db_c
+from huxunifylib.database import data_management as dm
+from huxunifylib.database.client import DatabaseClient
+from huxunifylib.database.ingestion_pipeline import run_ingestion_pipeline
+
+BATCHES = 20
+BATCH_SIZE = 5000
+SERVER_LATENCY = 0.05
+FIELDS = [
+    db_c.S_TYPE_EMAIL,
+    db_c.S_TYPE_CITY,
+    db_c.S_TYPE_GENDER,
+    db_c.S_TYPE_AGE,
+    "zip",
+]
+
+
+def with_latency(function: Callable) -> Callable:
+    """Wrap a collection method to wait SERVER_LATENCY before it runs.
+
+    Args:
+        function (Callable): Collection method.
+
+    Returns:
+        Callable: Wrapped collection method.
+    """
+
+    def wrapper(*args, **kwargs):
+        """Wait SERVER_LATENCY, then run the collection method.
+
+        Args:
+            *args (object): Collection method arguments.
+            **kwargs (dict): Collection method keyword arguments.
+
+        Returns:
+            object: Result of the collection method.
+        """
+
+        time.sleep(SERVER_LATENCY)
+        return function(*args, **kwargs)
+
+    return wrapper
+
+
+def get_batches() -> Iterator[pd.DataFrame]:
+    """Get synthetic ingested data batches without customer IDs.
+
+    Yields:
+        Iterator[pd.DataFrame]: Ingested data batches.
+    """
+
+    rng = np.random.default_rng(0)
+    for batch in range(BATCHES):
+        rows = range(batch * BATCH_SIZE, (batch + 1) * BATCH_SIZE)
+        yield pd.DataFrame(
+            {
+                db_c.S_TYPE_EMAIL: [f"email_{x}@example.com" for x in rows],
+                db_c.S_TYPE_CITY: rng.choice(
+                    ["New York", "Chicago", "Boston", None], BATCH_SIZE
+                ),
+                db_c.S_TYPE_GENDER: rng.choice(["m", "f"], BATCH_SIZE),
+                db_c.S_TYPE_AGE: rng.integers(18, 90, BATCH_SIZE),
+                "zip": [
+                    f"{x:05d}" for x in rng.integers(0, 50000, BATCH_SIZE)
+                ],
+            }
+        )
+
+
+def sequential_ingestion(
+    database: DatabaseClient, ingestion_job_id: ObjectId
+) -> None:
+    """Append the data and then the statistics of each batch in turn.
+
+    Args:
+        database (DatabaseClient): A database client.
+        ingestion_job_id (ObjectId): MongoDB document ID of ingestion job.
+    """
+
+    for batch in get_batches():
+        dm.append_ingested_data(database, ingestion_job_id, batch)
+        dm.append_ingested_data_stats(
+            database, ingestion_job_id, batch, ["zip"]
+        )
+
+
+def pipeline_ingestion(
+    database: DatabaseClient, ingestion_job_id: ObjectId
+) -> None:
+    """Ingest the batches through the ingestion pipeline.
+
+    Args:
+        database (DatabaseClient): A database client.
+        ingestion_job_id (ObjectId): MongoDB document ID of ingestion job.
+    """
+
+    run_ingestion_pipeline(database, ingestion_job_id, get_batches(), ["zip"])
+
+
+@mongomock.patch(servers=(("localhost", 27017),))
+def benchmark() -> None:
+    """Print the throughput of both ways of ingesting."""
+
+    database = DatabaseClient(host="localhost", port=27017).connect()
+    data_source_id = dm.set_data_source(
+        database,
+        "Benchmark data source",
+        1,
+        "CSV",
+        "S3",
+        None,
+        [{"header": x, "special_type": x} for x in FIELDS],
+    )[db_c.ID]
+
+    for method in ["insert_many", "find_one_and_update"]:
+        mock.patch.object(
+            mongomock.collection.Collection,
+            method,
+            with_latency(getattr(mongomock.collection.Collection, method)),
+        ).start()
+
+    rows = BATCHES * BATCH_SIZE
+    for name, function in [
+        ("sequential", sequential_ingestion),
+        ("pipeline", pipeline_ingestion),
+    ]:
+        ingestion_job_id = dm.set_ingestion_job(database, data_source_id)[
+            db_c.ID
+        ]
+        start = time.perf_counter()
+        function(database, ingestion_job_id)
+        seconds = time.perf_counter() - start
+        print(
+            f"{rows:>7} rows {name:>10}: {seconds:6.2f} s,"
+            f" {rows / seconds:8.0f} rows/s"
+        )
+
+    mock.patch.stopall()
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,74 @@
+"""Purpose of this file is to benchmark merging batches of ingested data into
+a statistics document with a high cardinality breakdown field, printing the
+time of each update and the size of the document as batches accumulate.
+
+The updates are applied to the document in memory, leaving out the server.
+
+Run with: python -m huxunifylib.database.benchmarks.stats_sketches
+"""
+import time
+
+import bson
+import numpy as np
+import pandas as pd
+
+import huxunifylib.database.constants as db_c
+from huxunifylib.database.audience_data_management_util import (
+    add_stats_to_update_dict,
+    apply_stats_update,
+)
+
+BATCHES = 20
+BATCH_SIZE = 10000
+DISTINCT_ZIPS = 100000
+PRINT_EVERY = 5
+
+
+def get_batch(rng: np.random.Generator) -> pd.DataFrame:
+    """Get a batch of ingested data with a zip field of skewed values.
+
+    Args:
+        rng (np.random.Generator): Random number generator.
+
+    Returns:
+        pd.DataFrame: Ingested data.
+    """
+
+    zips = rng.zipf(1.2, BATCH_SIZE) % DISTINCT_ZIPS
+
+    return pd.DataFrame(
+        {
+            "zip": [f"{x:05d}" for x in zips],
+            db_c.S_TYPE_GENDER: rng.choice(["m", "f", "other"], BATCH_SIZE),
+            db_c.S_TYPE_EMAIL: [f"email_{x}" for x in range(BATCH_SIZE)],
+        }
+    )
+
+
+def benchmark() -> None:
+    """Print the time of each update and the size of the document."""
+
+    rng = np.random.default_rng(0)
+    stats_doc = None
+
+    for batch in range(1, BATCHES + 1):
+        ingested_data = get_batch(rng)
+
+        start = time.perf_counter()
+        update_doc = add_stats_to_update_dict(
+            {}, ingested_data, stats_doc, ["zip"]
+        )
+        seconds = time.perf_counter() - start
+
+        stats_doc = apply_stats_update(stats_doc or {}, update_doc)
+        if batch == 1 or batch % PRINT_EVERY == 0:
+            print(
+                f"batch {batch:>3}: {seconds * 1000:8.1f} ms,"
+                f" document {len(bson.encode(stats_doc)) / 1024:8.1f} KiB,"
+                f" {len(stats_doc['zip'][db_c.STATS_BREAKDOWN]):>6}"
+                " zips in breakdown"
+            )
+
+
+if __name__ == "__main__":
+    benchmark()
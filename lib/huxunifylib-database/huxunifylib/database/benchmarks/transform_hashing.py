@@ -0,0 +1,100 @@
+"""Purpose of this file is to benchmark hashing a PII column row-wise, as
+the transformers are applied to a dataframe, against hashing it as a whole
+column.
+
+Run with: python -m huxunifylib.database.benchmarks.transform_hashing
+"""
+import os
+import random
+import string
+import timeit
+
+import pandas as pd
+
+from huxunifylib.database.transform import bypass_if_any_empty, hashed
+from huxunifylib.database.transform.columnar import (
+    hash_series,
+    strip_space_lower_case,
+)
+
+ROWS = (100000, 1000000)
+# share of the rows without an email.
+EMPTY_SHARE = 0.1
+REPEAT = 3
+
+
+@bypass_if_any_empty
+@hashed
+def email_hashed(value):
+    """Normalize and hash an email or a column of emails.
+
+    Args:
+        value (Union[str, pd.Series]): Email or column of emails.
+
+    Returns:
+        Union[str, pd.Series]: Hashed email or column of hashed emails.
+    """
+
+    if isinstance(value, pd.Series):
+        return strip_space_lower_case(value)
+    return value.strip().lower()
+
+
+def get_dataframe(rows: int) -> pd.DataFrame:
+    """Get a dataframe with a column of emails.
+
+    Args:
+        rows (int): Number of rows.
+
+    Returns:
+        pd.DataFrame: Dataframe with an email column, EMPTY_SHARE empty.
+    """
+
+    return pd.DataFrame(
+        {
+            "email": [
+                None
+                if random.random() < EMPTY_SHARE
+                else f" {''.join(random.choices(string.ascii_letters, k=10))}"
+                "@Example.com "
+                for _ in range(rows)
+            ]
+        }
+    )
+
+
+def benchmark(rows: int) -> None:
+    """Print the runtime of hashing a column row-wise and as a whole.
+
+    Args:
+        rows (int): Number of rows of the column.
+    """
+
+    dataframe = get_dataframe(rows)
+    cases = {
+        "row-wise": lambda: dataframe.apply(
+            lambda x: email_hashed(x["email"]), axis=1
+        ),
+        "columnar": lambda: email_hashed(dataframe["email"]),
+        f"columnar {os.cpu_count()} worker(s)": lambda: hash_series(
+            strip_space_lower_case(dataframe["email"]),
+            max_workers=os.cpu_count(),
+        ),
+    }
+
+    seconds = {
+        name: min(timeit.repeat(case, number=1, repeat=REPEAT))
+        for name, case in cases.items()
+    }
+    print(
+        f"{rows:>8} rows: "
+        + ", ".join(
+            f"{name} {x * 1000:8.1f} ms" f" ({seconds['row-wise'] / x:5.1f}x)"
+            for name, x in seconds.items()
+        )
+    )
+
+
+if __name__ == "__main__":
+    for row_count in ROWS:
+        benchmark(row_count)
@@ -1,14 +1,261 @@
 """Purpose of this file is for storing the cache management."""
 import datetime
+import hashlib
 import logging
-from typing import Union
+import uuid
+import zlib
+from typing import Any, Callable, List, Tuple, Union
+import bson
 import pymongo
+from bson import json_util
 from tenacity import retry, wait_fixed, retry_if_exception_type
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 import huxunifylib.database.constants as db_c
 from huxunifylib.database.client import DatabaseClient
 
+# functions called with the invalidated tags, used to drop values cached
+# in process on top of the cache collection.
+CACHE_INVALIDATION_LISTENERS = []
+
+# errors of decoding a corrupt cache value, zstandard raises its own type.
+CORRUPT_CACHE_VALUE_ERRORS = (zlib.error, bson.errors.InvalidBSON) + (
+    (zstandard.ZstdError,) if zstandard is not None else ()
+)
+
+
+def canonicalize_cache_key(cache_key: Union[dict, str]) -> str:
+    """A function that serializes a cache key so logically identical keys
+    produce the same string, regardless of the order of dict fields.
+
+    Args:
+        cache_key (Union[dict, str]): cache key string or dict.
+
+    Returns:
+        str: canonical serialization of the cache key.
+    """
+
+    return json_util.dumps(cache_key, sort_keys=True, separators=(",", ":"))
+
+
+def get_cache_key_digest(cache_key: Union[dict, str]) -> str:
+    """A function that gets the fixed length digest cache entries are
+    stored and looked up by.
+
+    Args:
+        cache_key (Union[dict, str]): cache key string or dict.
+
+    Returns:
+        str: sha256 hex digest of the canonical cache key.
+    """
+
+    return hashlib.sha256(
+        canonicalize_cache_key(cache_key).encode("utf-8")
+    ).hexdigest()
+
+
+def get_cache_tag(tag_type: str, document_id: Any) -> str:
+    """A function that gets the tag of a document cache entries depend on.
+
+    Args:
+        tag_type (str): Type of the document, e.g. audience.
+        document_id (Any): ID of the document.
+
+    Returns:
+        str: cache tag, e.g. audience:<id>.
+    """
+
+    return f"{tag_type}:{document_id}"
+
+
+def add_cache_invalidation_listener(listener: Callable) -> None:
+    """A function to register a listener for cache tag invalidations.
+
+    Args:
+        listener (Callable): Function called with the list of invalidated
+            tags.
+    """
+
+    if listener not in CACHE_INVALIDATION_LISTENERS:
+        CACHE_INVALIDATION_LISTENERS.append(listener)
+
+
+def encode_cache_value(cache_value: Any, codec: str) -> Tuple[str, int, bytes]:
+    """A function that serializes and compresses a cache value.
+
+    Args:
+        cache_value (Any): Value to be cached.
+        codec (str): Compression codec, zstd falls back to zlib if the
+            zstandard package is not installed.
+
+    Returns:
+        Tuple[str, int, bytes]: Codec used, raw size in bytes and the
+            compressed value.
+
+    Raises:
+        ValueError: Unsupported codec.
+    """
+
+    raw_value = bson.encode({db_c.CONSTANT_VALUE: cache_value})
+
+    if codec == db_c.CACHE_CODEC_ZSTD and zstandard is None:
+        logging.warning("zstandard is not installed, falling back to zlib.")
+        codec = db_c.CACHE_CODEC_ZLIB
+
+    if codec == db_c.CACHE_CODEC_ZSTD:
+        return (
+            codec,
+            len(raw_value),
+            zstandard.ZstdCompressor().compress(raw_value),
+        )
+    if codec == db_c.CACHE_CODEC_ZLIB:
+        return codec, len(raw_value), zlib.compress(raw_value)
+
+    raise ValueError(f"Unsupported cache codec {codec}.")
+
+
+def decode_cache_value(codec: str, encoded_value: bytes) -> Any:
+    """A function that decompresses and deserializes a cache value encoded
+    by encode_cache_value.
+
+    Args:
+        codec (str): Compression codec.
+        encoded_value (bytes): Compressed value.
+
+    Returns:
+        Any: Cached value.
+
+    Raises:
+        ValueError: Unsupported codec or corrupt value.
+    """
+
+    try:
+        if codec == db_c.CACHE_CODEC_ZSTD and zstandard is not None:
+            raw_value = zstandard.ZstdDecompressor().decompress(encoded_value)
+        elif codec == db_c.CACHE_CODEC_ZLIB:
+            raw_value = zlib.decompress(encoded_value)
+        else:
+            raise ValueError(f"Unsupported cache codec {codec}.")
+        return bson.decode(raw_value)[db_c.CONSTANT_VALUE]
+    except CORRUPT_CACHE_VALUE_ERRORS as exc:
+        raise ValueError(f"Corrupt cache value: {exc}") from exc
+
+
+# pylint: disable=too-many-arguments
+def build_cache_document(
+    cache_key: Union[dict, str],
+    cache_value: Union[dict, str],
+    expire_after_seconds: int,
+    platform: str,
+    stale_after_seconds: int = None,
+    tags: List[str] = None,
+) -> dict:
+    """A function that builds the document of a cache entry.
+
+    Args:
+        cache_key (Union(dict,str)): cache key string or dict.
+        cache_value (Union(dict, str)): Value to be cached.
+        expire_after_seconds (int): Time for the document to expire in
+            seconds.
+        platform (str): Underlying DB on which Mongo DB API is based.
+        stale_after_seconds (int, Optional): Time for the document to become
+            stale in seconds, defaults to the expiry time.
+        tags (List[str], Optional): Tags of the documents the value depends
+            on.
+
+    Returns:
+        dict: Cache document.
+    """
+
+    create_time = datetime.datetime.utcnow()
+    expire_at = create_time + datetime.timedelta(seconds=expire_after_seconds)
+
+    # the original key is kept alongside the digest for debugging.
+    cache_data = {
+        db_c.CACHE_KEY_DIGEST: get_cache_key_digest(cache_key),
+        db_c.CONSTANT_KEY: cache_key,
+        db_c.CONSTANT_VALUE: cache_value,
+        db_c.EXPIRE_AT: expire_at,
+        db_c.CACHE_STALE_AT: expire_at
+        if stale_after_seconds is None
+        else min(
+            expire_at,
+            create_time + datetime.timedelta(seconds=stale_after_seconds),
+        ),
+    }
+    if platform == db_c.AZURE_COSMOS_DB:
+        cache_data[db_c.TTL] = expire_after_seconds
+    if tags:
+        cache_data[db_c.CACHE_TAGS] = tags
+
+    return cache_data
+
+
+def encode_cache_entry(
+    cache_data: dict, codec: str, chunk_size: int
+) -> Tuple[dict, List[dict]]:
+    """A function that replaces the value of a cache document with its
+    compressed value, split into chunk documents when it is larger than
+    chunk_size bytes.
+
+    Args:
+        cache_data (dict): Cache document, updated in place.
+        codec (str): Compression codec (zlib or zstd).
+        chunk_size (int): Compressed values larger than this many bytes are
+            split into chunks.
+
+    Returns:
+        Tuple[dict, List[dict]]: Raw and stored sizes in bytes of the value,
+            and the chunk documents to store in the cache chunks collection.
+    """
+
+    codec, raw_size, encoded_value = encode_cache_value(
+        cache_data.pop(db_c.CONSTANT_VALUE), codec
+    )
+    sizes = {
+        db_c.CACHE_RAW_SIZE: raw_size,
+        db_c.CACHE_STORED_SIZE: len(encoded_value),
+    }
+    cache_data.update({db_c.CACHE_CODEC: codec, **sizes})
+
+    if len(encoded_value) <= chunk_size:
+        cache_data[db_c.CACHE_ENCODED_VALUE] = encoded_value
+        return sizes, []
+
+    # chunks are versioned so readers never mix chunks of two writes.
+    version = uuid.uuid4().hex
+    chunks = [
+        {
+            db_c.CACHE_KEY_DIGEST: cache_data[db_c.CACHE_KEY_DIGEST],
+            db_c.CACHE_CHUNK_VERSION: version,
+            db_c.CACHE_CHUNK_INDEX: index,
+            db_c.CACHE_CHUNK_DATA: encoded_value[offset : offset + chunk_size],
+            # chunks expire with their entry.
+            **{
+                field: cache_data[field]
+                for field in [db_c.EXPIRE_AT, db_c.TTL]
+                if field in cache_data
+            },
+        }
+        for index, offset in enumerate(
+            range(0, len(encoded_value), chunk_size)
+        )
+    ]
+    cache_data.update(
+        {
+            db_c.CACHE_CHUNK_VERSION: version,
+            db_c.CACHE_CHUNK_COUNT: len(chunks),
+        }
+    )
 
+    return sizes, chunks
+
+
+# pylint: disable=too-many-locals
 @retry(
     wait=wait_fixed(db_c.CONNECT_RETRY_INTERVAL),
     retry=retry_if_exception_type(pymongo.errors.AutoReconnect),
@@ -17,43 +264,87 @@ def create_cache_entry(
     database: DatabaseClient,
     cache_key: Union[dict, str],
     cache_value: Union[dict, str],
-    expire_after_seconds: int = 86400,
+    expire_after_seconds: int = db_c.CACHE_EXPIRE_AFTER_SECONDS,
     platform: str = db_c.AWS_DOCUMENT_DB,
-) -> None:
+    stale_after_seconds: int = None,
+    codec: str = None,
+    chunk_size: int = db_c.CACHE_CHUNK_SIZE,
+    tags: List[str] = None,
+) -> Union[dict, None]:
     """A function that creates a new cache entry.
 
     Args:
         database (DatabaseClient): A database client.
         cache_key (Union(dict,str)): cache key string or dict.
         cache_value (Union(dict, str)): Value to be cached.
-        expire_after_seconds (int): Time for the document to expire in seconds.
+        expire_after_seconds (int): Time for the document to expire in seconds,
+            documents are removed at their expiry time by the TTL index of
+            the index registry.
         platform (str, Optional): Underlying DB on which Mongo DB API is based.
+        stale_after_seconds (int, Optional): Time for the document to become
+            stale in seconds, stale documents are still returned until they
+            expire so callers can serve them while refreshing. Defaults to
+            the expiry time.
+        codec (str, Optional): Compression codec (zlib or zstd) to store the
+            value with, stored as is if not set.
+        chunk_size (int, Optional): Compressed values larger than this many
+            bytes are split into chunks stored in the cache chunks
+            collection, keeping entries under the document size limit.
+        tags (List[str], Optional): Tags of the documents the value depends
+            on, see get_cache_tag. The entry is removed when any of them is
+            invalidated.
+
+    Returns:
+        Union[dict, None]: Raw and stored sizes in bytes of a compressed
+            value, None if the value is stored as is.
     """
 
     collection = database[db_c.DATA_MANAGEMENT_DATABASE][db_c.CACHE_COLLECTION]
-    index_field = db_c.CREATE_TIME
-
-    cache_data = {
-        db_c.CONSTANT_VALUE: cache_value,
-        db_c.CREATE_TIME: datetime.datetime.utcnow(),
-    }
+    chunks_collection = database[db_c.DATA_MANAGEMENT_DATABASE][
+        db_c.CACHE_CHUNKS_COLLECTION
+    ]
+    cache_data = build_cache_document(
+        cache_key,
+        cache_value,
+        expire_after_seconds,
+        platform,
+        stale_after_seconds,
+        tags,
+    )
+    sizes, chunks = (
+        encode_cache_entry(cache_data, codec, chunk_size)
+        if codec
+        else (None, [])
+    )
 
     try:
-        if platform == db_c.AZURE_COSMOS_DB:
-            index_field = db_c.TS
-            del cache_data[db_c.CREATE_TIME]
-            cache_data[db_c.TTL] = expire_after_seconds
+        if chunks:
+            chunks_collection.insert_many(chunks)
 
-        collection.ensure_index(
-            index_field, expireAfterSeconds=expire_after_seconds
-        )
-        collection.update_one(
-            {db_c.CONSTANT_KEY: cache_key},
-            {"$set": cache_data},
+        previous = collection.find_one_and_replace(
+            {db_c.CACHE_KEY_DIGEST: cache_data[db_c.CACHE_KEY_DIGEST]},
+            cache_data,
+            projection={db_c.CACHE_CHUNK_VERSION: 1},
             upsert=True,
+            return_document=pymongo.ReturnDocument.BEFORE,
         )
+
+        # remove only the chunks of the replaced value, chunks of concurrent
+        # writes to the key are removed by the write replacing them.
+        if previous and previous.get(db_c.CACHE_CHUNK_VERSION):
+            chunks_collection.delete_many(
+                {
+                    db_c.CACHE_KEY_DIGEST: cache_data[db_c.CACHE_KEY_DIGEST],
+                    db_c.CACHE_CHUNK_VERSION: previous[
+                        db_c.CACHE_CHUNK_VERSION
+                    ],
+                }
+            )
     except pymongo.errors.OperationFailure as exc:
         logging.error(exc)
+        return None
+
+    return sizes
 
 
 @retry(
@@ -61,24 +352,275 @@ def create_cache_entry(
     retry=retry_if_exception_type(pymongo.errors.AutoReconnect),
 )
 def get_cache_entry(
-    database: DatabaseClient, cache_key: Union[dict, str]
+    database: DatabaseClient,
+    cache_key: Union[dict, str],
+    allow_stale: bool = True,
 ) -> Union[dict, None]:
     """A function that creates a new cache entry.
 
     Args:
         database (DatabaseClient): A database client.
         cache_key (dict, str): name of the cache key.
+        allow_stale (bool, Optional): Return entries past their stale time.
 
     Returns:
         Union [dict, None]: mongoDB document for a cache entry.
     """
 
+    result = get_cache_document(database, cache_key)
+    if result is None:
+        return None
+
+    if not allow_stale and is_cache_document_stale(result):
+        return {}
+
+    return result[db_c.CONSTANT_VALUE] if result else {}
+
+
+@retry(
+    wait=wait_fixed(db_c.CONNECT_RETRY_INTERVAL),
+    retry=retry_if_exception_type(pymongo.errors.AutoReconnect),
+)
+def get_cache_document(
+    database: DatabaseClient, cache_key: Union[dict, str]
+) -> Union[dict, None]:
+    """A function that gets the full document of a cache entry, including
+    its value and expiry time.
+
+    Args:
+        database (DatabaseClient): A database client.
+        cache_key (dict, str): name of the cache key.
+
+    Returns:
+        Union [dict, None]: mongoDB document for a cache entry, an empty dict
+            if there is no entry, None if the lookup failed.
+    """
+
     collection = database[db_c.DATA_MANAGEMENT_DATABASE][db_c.CACHE_COLLECTION]
 
     try:
-        result = collection.find_one({db_c.CONSTANT_KEY: cache_key})
-        return result[db_c.CONSTANT_VALUE] if result else {}
+        document = (
+            collection.find_one(
+                {db_c.CACHE_KEY_DIGEST: get_cache_key_digest(cache_key)}
+            )
+            or {}
+        )
+
+        # the TTL index only removes documents periodically, so entries past
+        # their expiry may still be found.
+        expire_at = document.get(db_c.EXPIRE_AT)
+        if expire_at and expire_at <= datetime.datetime.utcnow():
+            return {}
+
+        if document.get(db_c.CACHE_CODEC):
+            document[db_c.CONSTANT_VALUE] = decode_cache_value(
+                document[db_c.CACHE_CODEC],
+                get_encoded_cache_value(database, document),
+            )
     except pymongo.errors.OperationFailure as exc:
         logging.error(exc)
+        return None
+    except ValueError as exc:
+        # treat entries that can not be decoded as missing.
+        logging.error(exc)
+        return {}
+
+    return document
+
+
+def get_encoded_cache_value(database: DatabaseClient, document: dict) -> bytes:
+    """A function that gets the compressed value of a cache document,
+    joining its chunks if it was chunked.
+
+    Args:
+        database (DatabaseClient): A database client.
+        document (dict): Cache document.
+
+    Returns:
+        bytes: Compressed value.
+
+    Raises:
+        ValueError: Chunks of the value are missing.
+    """
+
+    if db_c.CACHE_CHUNK_COUNT not in document:
+        return document[db_c.CACHE_ENCODED_VALUE]
+
+    chunks = list(
+        database[db_c.DATA_MANAGEMENT_DATABASE][db_c.CACHE_CHUNKS_COLLECTION]
+        .find(
+            {
+                db_c.CACHE_KEY_DIGEST: document[db_c.CACHE_KEY_DIGEST],
+                db_c.CACHE_CHUNK_VERSION: document[db_c.CACHE_CHUNK_VERSION],
+            },
+            {db_c.CACHE_CHUNK_DATA: 1},
+        )
+        .sort(db_c.CACHE_CHUNK_INDEX, pymongo.ASCENDING)
+    )
+
+    if len(chunks) != document[db_c.CACHE_CHUNK_COUNT]:
+        raise ValueError("Cache value chunks are missing.")
+
+    return b"".join(chunk[db_c.CACHE_CHUNK_DATA] for chunk in chunks)
+
+
+def is_cache_document_stale(document: dict) -> bool:
+    """A function that checks if a cache document is past its stale time
+    and should be refreshed.
+
+    Args:
+        document (dict): Cache document.
+
+    Returns:
+        bool: True if the document is stale.
+    """
+
+    stale_at = document.get(db_c.CACHE_STALE_AT)
+    return bool(stale_at) and stale_at <= datetime.datetime.utcnow()
+
+
+@retry(
+    wait=wait_fixed(db_c.CONNECT_RETRY_INTERVAL),
+    retry=retry_if_exception_type(pymongo.errors.AutoReconnect),
+)
+def acquire_cache_lease(
+    database: DatabaseClient,
+    cache_key: Union[dict, str],
+    owner: str,
+    lease_seconds: int = db_c.CACHE_LEASE_SECONDS,
+) -> bool:
+    """A function that acquires the lease to recompute a cache entry, so only
+    one caller across workers refreshes an expired entry at a time. The
+    lease is taken atomically and lapses after lease_seconds if the owner
+    never releases it.
+
+    Args:
+        database (DatabaseClient): A database client.
+        cache_key (dict, str): name of the cache key.
+        owner (str): unique id of the caller taking the lease.
+        lease_seconds (int): Time for the lease to expire in seconds.
+
+    Returns:
+        bool: True if the lease was acquired, False if another caller holds
+            an active lease.
+    """
+
+    collection = database[db_c.DATA_MANAGEMENT_DATABASE][
+        db_c.CACHE_LEASE_COLLECTION
+    ]
+    now = datetime.datetime.utcnow()
+
+    try:
+        # matches a missing or lapsed lease, an active lease makes the upsert
+        # collide on the _id and raise a duplicate key error.
+        collection.find_one_and_update(
+            {
+                db_c.ID: get_cache_key_digest(cache_key),
+                db_c.LEASE_EXPIRE_AT: {"$lte": now},
+            },
+            {
+                "$set": {
+                    db_c.LEASE_OWNER: owner,
+                    db_c.LEASE_EXPIRE_AT: now
+                    + datetime.timedelta(seconds=lease_seconds),
+                }
+            },
+            upsert=True,
+        )
+        return True
+    except pymongo.errors.DuplicateKeyError:
+        return False
+    except pymongo.errors.OperationFailure as exc:
+        logging.error(exc)
+
+    # do not block callers on lease failures.
+    return True
+
+
+@retry(
+    wait=wait_fixed(db_c.CONNECT_RETRY_INTERVAL),
+    retry=retry_if_exception_type(pymongo.errors.AutoReconnect),
+)
+def release_cache_lease(
+    database: DatabaseClient, cache_key: Union[dict, str], owner: str
+) -> bool:
+    """A function that releases a lease taken by acquire_cache_lease.
+
+    Args:
+        database (DatabaseClient): A database client.
+        cache_key (dict, str): name of the cache key.
+        owner (str): unique id of the caller holding the lease.
+
+    Returns:
+        bool: True if the lease was released.
+    """
+
+    collection = database[db_c.DATA_MANAGEMENT_DATABASE][
+        db_c.CACHE_LEASE_COLLECTION
+    ]
+
+    try:
+        return bool(
+            collection.delete_one(
+                {
+                    db_c.ID: get_cache_key_digest(cache_key),
+                    db_c.LEASE_OWNER: owner,
+                }
+            ).deleted_count
+        )
+    except pymongo.errors.OperationFailure as exc:
+        logging.error(exc)
+
+    return False
+
+
+@retry(
+    wait=wait_fixed(db_c.CONNECT_RETRY_INTERVAL),
+    retry=retry_if_exception_type(pymongo.errors.AutoReconnect),
+)
+def invalidate_tags(database: DatabaseClient, tags: List[str]) -> int:
+    """A function that removes the cache entries depending on any of the
+    tags, called by write paths of the tagged documents.
+
+    Args:
+        database (DatabaseClient): A database client.
+        tags (List[str]): Tags to invalidate, see get_cache_tag.
+
+    Returns:
+        int: Number of cache entries removed.
+    """
+
+    collection = database[db_c.DATA_MANAGEMENT_DATABASE][db_c.CACHE_COLLECTION]
+    chunks_collection = database[db_c.DATA_MANAGEMENT_DATABASE][
+        db_c.CACHE_CHUNKS_COLLECTION
+    ]
+    deleted_count = 0
+
+    try:
+        chunked_digests = [
+            document[db_c.CACHE_KEY_DIGEST]
+            for document in collection.find(
+                {
+                    db_c.CACHE_TAGS: {"$in": tags},
+                    db_c.CACHE_CHUNK_COUNT: {"$exists": True},
+                },
+                {db_c.CACHE_KEY_DIGEST: 1},
+            )
+        ]
+        deleted_count = collection.delete_many(
+            {db_c.CACHE_TAGS: {"$in": tags}}
+        ).deleted_count
+        if chunked_digests:
+            chunks_collection.delete_many(
+                {db_c.CACHE_KEY_DIGEST: {"$in": chunked_digests}}
+            )
+    except pymongo.errors.OperationFailure as exc:
+        logging.error(exc)
+
+    for listener in CACHE_INVALIDATION_LISTENERS:
+        try:
+            listener(tags)
+        except Exception as exc:  # pylint: disable=broad-except
+            logging.error(exc)
 
-    return None
+    return deleted_count
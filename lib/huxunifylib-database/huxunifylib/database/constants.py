@@ -55,6 +55,14 @@ ENGAGEMENTS_COLLECTION = "engagements"
 INGESTION_JOBS_COLLECTION = "ingestion_jobs"
 INGESTED_DATA_COLLECTION = "ingested_data"
 INGESTED_DATA_STATS_COLLECTION = "ingested_data_stats"
+# ingested data documents per insert_many, and insert_many calls in flight.
+INGESTED_DATA_INSERT_BATCH_SIZE = 10000
+INGESTED_DATA_INSERT_WORKERS = 4
+# processes transforming ingested data batches, batches queued between the
+# stages of an ingestion pipeline, and batches merged per stats write.
+INGESTION_PIPELINE_TRANSFORM_WORKERS = 2
+INGESTION_PIPELINE_QUEUE_SIZE = 4
+INGESTION_PIPELINE_STATS_FLUSH_BATCHES = 10
 AUDIENCES_COLLECTION = "audiences"
 AUDIENCE_CUSTOMERS_COLLECTION = "audience_customers"
 AUDIENCE_INSIGHTS_COLLECTION = "audience_insights"
@@ -72,6 +80,27 @@ APPLICATIONS = "applications"
 CLIENT_PROJECTS_COLLECTION = "client_projects"
 CLIENT_LOGO = "logo"
 CACHE_COLLECTION = "cache"
+CACHE_EXPIRE_AFTER_SECONDS = 86400
+CACHE_STALE_AT = "stale_at"
+CACHE_KEY_DIGEST = "key_digest"
+CACHE_CHUNKS_COLLECTION = "cache_chunks"
+CACHE_CHUNK_SIZE = 8 * 1024 * 1024
+CACHE_CODEC = "codec"
+CACHE_CODEC_ZLIB = "zlib"
+CACHE_CODEC_ZSTD = "zstd"
+CACHE_ENCODED_VALUE = "encoded_value"
+CACHE_RAW_SIZE = "raw_size"
+CACHE_STORED_SIZE = "stored_size"
+CACHE_CHUNK_COUNT = "chunk_count"
+CACHE_CHUNK_INDEX = "chunk_index"
+CACHE_CHUNK_VERSION = "chunk_version"
+CACHE_CHUNK_DATA = "data"
+CACHE_TAGS = "tags"
+CACHE_TAG_AUDIENCE = "audience"
+CACHE_LEASE_COLLECTION = "cache_leases"
+CACHE_LEASE_SECONDS = 60
+LEASE_OWNER = "lease_owner"
+LEASE_EXPIRE_AT = "lease_expire_at"
 AUDIENCE_AUDIT_COLLECTION = "audit_logs"
 MODELS_COLLECTION = "models"
 SURVEY_METRICS_COLLECTION = "survey_metrics"
@@ -197,6 +226,9 @@ STATUS_MESSAGE = "status_message"
 RECENT_INGESTION_JOB_STATUS = "recent_ingestion_job_status"
 EXPIRE_AT = "expireAt"
 TS = "_ts"
+# expireAfterSeconds of a _ts TTL index expiring documents by their ttl
+# field only, used for Azure Cosmos DB.
+COSMOS_TTL_PER_DOCUMENT = -1
 TTL = "ttl"
 CREATE_TIME = "create_time"
 UPDATE_TIME = "update_time"
@@ -283,6 +315,13 @@ TRANSFORMATIONS = "transformations"
 
 STATS_COVERAGE = "coverage"
 STATS_BREAKDOWN = "breakdown"
+STATS_SKETCHES = "sketches"
+STATS_DISTINCT_SKETCH = "distinct_sketch"
+STATS_TOP_VALUES = "top_values"
+# registers of a distinct count sketch are 2 ** precision bytes.
+STATS_DISTINCT_PRECISION = 12
+# values kept by a top values sketch, breakdowns are exact below it.
+STATS_TOP_VALUES_SIZE = 1000
 
 DATA_COUNT = "count"
 INDUSTRY = "industry"
@@ -3,6 +3,9 @@
 
 import logging
 import datetime
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Union, Optional
 import pandas as pd
 from bson import ObjectId
@@ -12,6 +15,7 @@ from tenacity import retry, wait_fixed, retry_if_exception_type
 import huxunifylib.database.db_exceptions as de
 import huxunifylib.database.constants as db_c
 from huxunifylib.database.client import DatabaseClient
+from huxunifylib.database.index_management import ensure_collection_indexes
 from huxunifylib.database.utils import name_exists
 from huxunifylib.database.audience_data_management_util import (
     add_stats_to_update_dict,
@@ -595,7 +599,6 @@ def set_ingestion_job(
 
     try:
         ingestion_job_id = collection.insert_one(doc).inserted_id
-        collection.create_index([(db_c.DATA_SOURCE_ID, pymongo.ASCENDING)])
         if ingestion_job_id is not None:
             ingestion_job_doc = collection.find_one(
                 {db_c.ID: ingestion_job_id, db_c.DELETED: False},
@@ -905,52 +908,169 @@ def append_ingested_data(
     database: DatabaseClient,
     ingestion_job_id: ObjectId,
     ingested_data: pd.DataFrame,
+    batch_size: int = db_c.INGESTED_DATA_INSERT_BATCH_SIZE,
+    max_workers: int = db_c.INGESTED_DATA_INSERT_WORKERS,
 ) -> bool:
-    """A function to store ingested data.
+    """A function to store ingested data. Documents are built and inserted
+    batch_size rows at a time, with up to max_workers batches in flight.
 
     Args:
         database (DatabaseClient): A database client.
         ingestion_job_id (ObjectId): MongoDB document ID of ingestion job.
         ingested_data (pd.DataFrame): Ingested data in Pandas DataFrame format.
+        batch_size (int): Rows inserted per batch.
+        max_workers (int): Batches inserted concurrently.
 
     Returns:
         bool: Success flag.
     """
 
-    ingested_data = clean_dataframe_types(ingested_data)
+    start_time = time.perf_counter()
+    ingested_data = prepare_ingested_data(ingested_data)
+
+    collection = _get_ingested_data_collection(database)
+
+    success = True
+    in_flight = deque()
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+        for start in range(0, len(ingested_data), max(batch_size, 1)):
+            # build the documents of a batch only once a slot is free.
+            if len(in_flight) >= max_workers:
+                success &= in_flight.popleft().result()
+            in_flight.append(
+                executor.submit(
+                    _insert_ingested_data,
+                    collection,
+                    [
+                        {db_c.JOB_ID: ingestion_job_id, db_c.INGESTED_DATA: x}
+                        for x in ingested_data.iloc[
+                            start : start + batch_size
+                        ].to_dict("records")
+                    ],
+                )
+            )
+        while in_flight:
+            success &= in_flight.popleft().result()
+
+    seconds = time.perf_counter() - start_time
+    logging.info(
+        "Appended %s ingested data rows in %.2f s, %.0f rows/s.",
+        len(ingested_data),
+        seconds,
+        len(ingested_data) / seconds if seconds else 0,
+    )
+
+    return success
 
-    dm_db = database[db_c.DATA_MANAGEMENT_DATABASE]
-    collection = dm_db[db_c.INGESTED_DATA_COLLECTION]
 
-    # Add internal customer IDs
+def prepare_ingested_data(ingested_data: pd.DataFrame) -> pd.DataFrame:
+    """A function to prepare ingested data for storing, resolving Mongo
+    unfriendly types and adding missing internal customer IDs.
+
+    Args:
+        ingested_data (pd.DataFrame): Ingested data in Pandas DataFrame format.
+
+    Returns:
+        pd.DataFrame: Prepared ingested data.
+    """
+
+    ingested_data = clean_dataframe_types(ingested_data)
+
+    # Add internal customer IDs, the IDs are set on the dataframe so a retry
+    # inserts the same documents and they are rejected as duplicates.
     if db_c.S_TYPE_CUSTOMER_ID not in ingested_data.columns:
         ingested_data[db_c.S_TYPE_CUSTOMER_ID] = None
 
-    ingested_data[db_c.S_TYPE_CUSTOMER_ID] = ingested_data[
-        db_c.S_TYPE_CUSTOMER_ID
-    ].apply(lambda x: ObjectId() if x is None else x)
+    missing_ids = ingested_data[db_c.S_TYPE_CUSTOMER_ID].isna()
+    if missing_ids.any():
+        ingested_data[db_c.S_TYPE_CUSTOMER_ID] = ingested_data[
+            db_c.S_TYPE_CUSTOMER_ID
+        ].astype(object)
+        ingested_data.loc[missing_ids, db_c.S_TYPE_CUSTOMER_ID] = [
+            ObjectId() for _ in range(missing_ids.sum())
+        ]
 
-    # Add docs to the batch
-    batch_docs = []
-    for _, row_item in ingested_data.iterrows():
-        batch_docs.append(
-            {
-                db_c.JOB_ID: ingestion_job_id,
-                db_c.INGESTED_DATA: dict(row_item),
-            }
+    return ingested_data
+
+
+def insert_ingested_data(
+    database: DatabaseClient,
+    ingestion_job_id: ObjectId,
+    ingested_data: pd.DataFrame,
+    batch_size: int = db_c.INGESTED_DATA_INSERT_BATCH_SIZE,
+) -> bool:
+    """A function to store prepared ingested data batch_size rows at a time
+    in the calling thread, leaving the data frame unchanged.
+
+    Args:
+        database (DatabaseClient): A database client.
+        ingestion_job_id (ObjectId): MongoDB document ID of ingestion job.
+        ingested_data (pd.DataFrame): Ingested data prepared with
+            prepare_ingested_data.
+        batch_size (int): Rows inserted per batch.
+
+    Returns:
+        bool: Success flag.
+    """
+
+    collection = _get_ingested_data_collection(database)
+
+    success = True
+    for start in range(0, len(ingested_data), max(batch_size, 1)):
+        success &= _insert_ingested_data(
+            collection,
+            [
+                {db_c.JOB_ID: ingestion_job_id, db_c.INGESTED_DATA: x}
+                for x in ingested_data.iloc[
+                    start : start + batch_size
+                ].to_dict("records")
+            ],
         )
 
+    return success
+
+
+def _get_ingested_data_collection(
+    database: DatabaseClient,
+) -> pymongo.collection.Collection:
+    """Get the ingested data collection, with its indexes ensured once per
+    client since inserts rely on its unique index to reject duplicates.
+
+    Args:
+        database (DatabaseClient): A database client.
+
+    Returns:
+        pymongo.collection.Collection: Ingested data collection.
+    """
+
+    ensure_collection_indexes(
+        database, db_c.DATA_MANAGEMENT_DATABASE, db_c.INGESTED_DATA_COLLECTION
+    )
+
+    return database[db_c.DATA_MANAGEMENT_DATABASE][
+        db_c.INGESTED_DATA_COLLECTION
+    ]
+
+
+def _insert_ingested_data(
+    collection: pymongo.collection.Collection, batch_docs: list
+) -> bool:
+    """Insert a batch of ingested data documents, ignoring duplicates.
+
+    Args:
+        collection (pymongo.collection.Collection): Ingested data collection.
+        batch_docs (list): Ingested data documents.
+
+    Returns:
+        bool: Success flag.
+    """
+
     # Insert the batch into the Mongo db
     try:
-        # Create a unique compound index on ingestion_job_id and nested field
-        # ingested_data.customer_id
-        field_str = f"{db_c.INGESTED_DATA}.{db_c.S_TYPE_CUSTOMER_ID}"
-        collection.create_index(
-            [(field_str, pymongo.ASCENDING), (db_c.JOB_ID, pymongo.ASCENDING)],
-            unique=True,
-        )
+        # duplicate customer ids are rejected by the unique compound index on
+        # ingested_data.customer_id and ingestion_job_id, ensured by
+        # _get_ingested_data_collection.
         collection.insert_many(batch_docs, ordered=False)
-        collection.create_index([(db_c.JOB_ID, pymongo.ASCENDING)])
         return True
     except pymongo.errors.BulkWriteError as exc:
         for err in exc.details["writeErrors"]:
@@ -1025,9 +1145,6 @@ def append_ingested_data_stats(
         dict: Stats MongoDB doc.
     """
 
-    dm_db = database[db_c.DATA_MANAGEMENT_DATABASE]
-    collection = dm_db[db_c.INGESTED_DATA_STATS_COLLECTION]
-
     # Get the existing doc (if applicable)
     old_stats_doc = get_ingested_data_stats(database, ingestion_job_id)
 
@@ -1050,26 +1167,52 @@ def append_ingested_data_stats(
         ingested_data_fields.append(field_name)
 
     # Add statistics to update dict
-    update_dict = add_stats_to_update_dict(
+    update_doc = add_stats_to_update_dict(
         update_dict,
         ingested_data[ingested_data_fields],
         old_stats_doc,
         custom_breakdown_fields,
     )
 
+    return update_ingested_data_stats(database, ingestion_job_id, update_doc)
+
+
+@retry(
+    wait=wait_fixed(db_c.CONNECT_RETRY_INTERVAL),
+    retry=retry_if_exception_type(pymongo.errors.AutoReconnect),
+)
+def update_ingested_data_stats(
+    database: DatabaseClient,
+    ingestion_job_id: ObjectId,
+    update_doc: dict,
+) -> Union[dict, None]:
+    """A function to apply an update of add_stats_to_update_dict to the
+    ingested data statistics of an ingestion job.
+
+    Args:
+        database (DatabaseClient): A database client.
+        ingestion_job_id (ObjectId): MongoDB document ID of ingestion job.
+        update_doc (dict): MongoDB update of the statistics document.
+
+    Returns:
+        Union[dict, None]: Stats MongoDB doc or None.
+    """
+
+    dm_db = database[db_c.DATA_MANAGEMENT_DATABASE]
+    collection = dm_db[db_c.INGESTED_DATA_STATS_COLLECTION]
+
     # Update the doc. If no doc exists, a new doc will be created.
     try:
-        doc = collection.find_one_and_update(
+        return collection.find_one_and_update(
             {db_c.JOB_ID: ingestion_job_id, db_c.DELETED: False},
-            {"$set": update_dict},
+            update_doc,
             upsert=True,
             return_document=pymongo.ReturnDocument.AFTER,
         )
-        collection.create_index([(db_c.JOB_ID, pymongo.ASCENDING)])
     except pymongo.errors.OperationFailure as exc:
         logging.error(exc)
 
-    return doc
+    return None
 
 
 @retry(
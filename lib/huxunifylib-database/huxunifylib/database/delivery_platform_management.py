@@ -1168,19 +1168,6 @@ def set_delivery_job(
 
     try:
         delivery_job_id = collection.insert_one(doc).inserted_id
-        collection.create_index(
-            [
-                (db_c.AUDIENCE_ID, pymongo.ASCENDING),
-                (db_c.DELIVERY_PLATFORM_ID, pymongo.ASCENDING),
-            ]
-        )
-        collection.create_index(
-            [
-                (db_c.AUDIENCE_ID, pymongo.ASCENDING),
-                (db_c.ENGAGEMENT_ID, pymongo.ASCENDING),
-            ],
-            name="audience_engagement_index",
-        )
 
         if delivery_job_id is not None:
             return collection.find_one(
@@ -2052,7 +2039,6 @@ def _set_performance_metrics(
 
     try:
         metrics_id = collection.insert_one(doc).inserted_id
-        collection.create_index([(db_c.DELIVERY_JOB_ID, pymongo.ASCENDING)])
         if metrics_id:
             return collection.find_one({db_c.ID: metrics_id})
     except pymongo.errors.OperationFailure as exc:
@@ -2093,8 +2079,6 @@ def _set_conversion_events(
         if result.acknowledged:
             insert_result["insert_status"] = True
 
-        collection.create_index([("event_id", pymongo.ASCENDING)])
-
         return insert_result
     except pymongo.errors.BulkWriteError as exc:
         for err in exc.details["writeErrors"]:
@@ -2163,9 +2147,6 @@ def set_deliverability_metrics(
                 db_c.STATUS_TRANSFERRED_FOR_REPORT: False,
             }
         ).inserted_id
-        collection.create_index(
-            [(db_c.DELIVERY_PLATFORM_ID, pymongo.ASCENDING)]
-        )
         if metrics_id:
             return collection.find_one({db_c.ID: metrics_id})
     except pymongo.errors.OperationFailure as exc:
@@ -2588,7 +2569,6 @@ def set_audience_customers(
         audience_customers_doc_id = collection.insert_one(
             audience_customers_doc
         ).inserted_id
-        collection.create_index([(db_c.DELIVERY_JOB_ID, pymongo.ASCENDING)])
         if audience_customers_doc_id is not None:
             ret_doc = collection.find_one({db_c.ID: audience_customers_doc_id})
     except pymongo.errors.OperationFailure as exc:
@@ -2664,8 +2644,6 @@ def _set_performance_metrics_bulk(
             insert_result["insert_status"] = True
             insert_result["inserted_ids"] = result.inserted_ids
 
-        collection.create_index([(db_c.DELIVERY_JOB_ID, pymongo.ASCENDING)])
-
         return insert_result
     except pymongo.errors.BulkWriteError as exc:
         for err in exc.details["writeErrors"]:
@@ -0,0 +1,415 @@
+"""Purpose of this file is for storing the index registry of the database.
+
+Indexes are declared once here and applied by ensure_all_indexes at
+startup or migration time, so write paths do not issue index DDL. Write
+paths that rely on an index, such as a unique index rejecting duplicates,
+apply the indexes of their collection once per client with
+ensure_collection_indexes.
+"""
+import logging
+import threading
+import weakref
+from datetime import timedelta
+from typing import List
+
+import pymongo
+from pymongo import ASCENDING, DESCENDING
+from tenacity import retry, wait_fixed, retry_if_exception_type
+
+import huxunifylib.database.constants as db_c
+from huxunifylib.database.client import DatabaseClient
+
+# each element is a tuple (database name, collection name, list of
+# field/order pairs to be indexed, index options).
+INDEXES = [
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.INGESTION_JOBS_COLLECTION,
+        [(db_c.DATA_SOURCE_ID, ASCENDING)],
+        {},
+    ),
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.INGESTED_DATA_COLLECTION,
+        [(db_c.JOB_ID, ASCENDING)],
+        {},
+    ),
+    # duplicate customer ids of an ingestion job are rejected by this index.
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.INGESTED_DATA_COLLECTION,
+        [
+            (f"{db_c.INGESTED_DATA}.{db_c.S_TYPE_CUSTOMER_ID}", ASCENDING),
+            (db_c.JOB_ID, ASCENDING),
+        ],
+        {"unique": True},
+    ),
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.INGESTED_DATA_STATS_COLLECTION,
+        [(db_c.JOB_ID, ASCENDING)],
+        {},
+    ),
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.AUDIENCES_COLLECTION,
+        [(db_c.JOB_ID, ASCENDING)],
+        {},
+    ),
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.AUDIENCES_COLLECTION,
+        [(db_c.NAME, DESCENDING)],
+        {},
+    ),
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.AUDIENCE_INSIGHTS_COLLECTION,
+        [(db_c.AUDIENCE_ID, ASCENDING)],
+        {},
+    ),
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.AUDIENCE_CUSTOMERS_COLLECTION,
+        [(db_c.DELIVERY_JOB_ID, ASCENDING)],
+        {},
+    ),
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.DELIVERY_JOBS_COLLECTION,
+        [
+            (db_c.AUDIENCE_ID, ASCENDING),
+            (db_c.DELIVERY_PLATFORM_ID, ASCENDING),
+        ],
+        {},
+    ),
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.DELIVERY_JOBS_COLLECTION,
+        [
+            (db_c.AUDIENCE_ID, ASCENDING),
+            (db_c.ENGAGEMENT_ID, ASCENDING),
+        ],
+        {"name": "audience_engagement_index"},
+    ),
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.DELIVERY_JOBS_COLLECTION,
+        [(db_c.CREATE_TIME, DESCENDING)],
+        {},
+    ),
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.PERFORMANCE_METRICS_COLLECTION,
+        [(db_c.DELIVERY_JOB_ID, ASCENDING)],
+        {},
+    ),
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.PERFORMANCE_METRICS_COLLECTION,
+        [(db_c.JOB_END_TIME, DESCENDING)],
+        {},
+    ),
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.CAMPAIGN_ACTIVITY_COLLECTION,
+        [(db_c.DELIVERY_JOB_ID, ASCENDING)],
+        {},
+    ),
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.CAMPAIGN_ACTIVITY_COLLECTION,
+        [(f"{db_c.EVENT_DETAILS}.{db_c.EVENT_DATE}", DESCENDING)],
+        {},
+    ),
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.DELIVERABILITY_METRICS_COLLECTION,
+        [(db_c.DELIVERY_PLATFORM_ID, ASCENDING)],
+        {},
+    ),
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.DELIVERABILITY_METRICS_COLLECTION,
+        [(db_c.JOB_END_TIME, DESCENDING)],
+        {},
+    ),
+    (
+        db_c.CONVERSIONS_DATABASE,
+        db_c.EVENTS_COLLECTION,
+        [("event_id", ASCENDING)],
+        {},
+    ),
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.USER_COLLECTION,
+        [(db_c.OKTA_ID, ASCENDING)],
+        {},
+    ),
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.NOTIFICATIONS_COLLECTION,
+        [(db_c.NOTIFICATION_FIELD_CREATE_TIME, DESCENDING)],
+        {},
+    ),
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.NOTIFICATIONS_COLLECTION,
+        [
+            (db_c.NOTIFICATION_FIELD_CREATE_TIME, DESCENDING),
+            (db_c.ID, ASCENDING),
+        ],
+        {},
+    ),
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.NOTIFICATIONS_COLLECTION,
+        [
+            (db_c.NOTIFICATION_FIELD_CREATE_TIME, DESCENDING),
+            (db_c.ID, DESCENDING),
+        ],
+        {},
+    ),
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.SURVEY_METRICS_COLLECTION,
+        [
+            (db_c.SURVEY_ID, ASCENDING),
+            (db_c.S_TYPE_SURVEY_CUSTOMER_ID, ASCENDING),
+        ],
+        {},
+    ),
+    # sparse since cache entries written before digests were added lack it.
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.CACHE_COLLECTION,
+        [(db_c.CACHE_KEY_DIGEST, ASCENDING)],
+        {"unique": True, "sparse": True},
+    ),
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.CACHE_COLLECTION,
+        [(db_c.CACHE_TAGS, ASCENDING)],
+        {"sparse": True},
+    ),
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.CACHE_CHUNKS_COLLECTION,
+        [
+            (db_c.CACHE_KEY_DIGEST, ASCENDING),
+            (db_c.CACHE_CHUNK_VERSION, ASCENDING),
+            (db_c.CACHE_CHUNK_INDEX, ASCENDING),
+        ],
+        {},
+    ),
+]
+
+# TTL indexes differ by platform, Azure Cosmos DB only supports expiring
+# documents by their _ts field. Cache entries expire at their own expiry time,
+# set per entry by create_cache_entry: at expireAt on AWS DocumentDB and
+# after their ttl field on Azure Cosmos DB.
+TTL_INDEXES = {
+    db_c.AWS_DOCUMENT_DB: [
+        (
+            db_c.DATA_MANAGEMENT_DATABASE,
+            db_c.CACHE_COLLECTION,
+            [(db_c.EXPIRE_AT, ASCENDING)],
+            {"expireAfterSeconds": 0},
+        ),
+        (
+            db_c.DATA_MANAGEMENT_DATABASE,
+            db_c.CACHE_CHUNKS_COLLECTION,
+            [(db_c.EXPIRE_AT, ASCENDING)],
+            {"expireAfterSeconds": 0},
+        ),
+        (
+            db_c.DATA_MANAGEMENT_DATABASE,
+            db_c.NOTIFICATIONS_COLLECTION,
+            [(db_c.EXPIRE_AT, ASCENDING)],
+            {"expireAfterSeconds": 0},
+        ),
+    ],
+    db_c.AZURE_COSMOS_DB: [
+        (
+            db_c.DATA_MANAGEMENT_DATABASE,
+            db_c.CACHE_COLLECTION,
+            [(db_c.TS, ASCENDING)],
+            {"expireAfterSeconds": db_c.COSMOS_TTL_PER_DOCUMENT},
+        ),
+        (
+            db_c.DATA_MANAGEMENT_DATABASE,
+            db_c.CACHE_CHUNKS_COLLECTION,
+            [(db_c.TS, ASCENDING)],
+            {"expireAfterSeconds": db_c.COSMOS_TTL_PER_DOCUMENT},
+        ),
+        (
+            db_c.DATA_MANAGEMENT_DATABASE,
+            db_c.NOTIFICATIONS_COLLECTION,
+            [(db_c.TS, ASCENDING)],
+            {"expireAfterSeconds": int(timedelta(weeks=1).total_seconds())},
+        ),
+    ],
+}
+
+# indexes created before the index registry, dropped by ensure_all_indexes.
+# Each element is a tuple (database name, collection name, list of
+# field/order pairs indexed). Cache entries were expired 24 h after their
+# create time, which would cut the expiry time of every entry short.
+OBSOLETE_INDEXES = [
+    (
+        db_c.DATA_MANAGEMENT_DATABASE,
+        db_c.CACHE_COLLECTION,
+        [(db_c.CREATE_TIME, ASCENDING)],
+    ),
+]
+
+# collections whose indexes were ensured, by id of the database client.
+_ensured_collections = {}
+_ensured_collections_lock = threading.Lock()
+
+
+def get_index_specs(platform: str = db_c.AWS_DOCUMENT_DB) -> List[tuple]:
+    """A function that gets all index specs of the database for a platform.
+
+    Args:
+        platform (str, Optional): Underlying DB on which Mongo DB API is based.
+
+    Returns:
+        List[tuple]: Tuples of (database name, collection name, list of
+            field/order pairs, index options).
+    """
+
+    return INDEXES + TTL_INDEXES.get(platform, [])
+
+
+@retry(
+    wait=wait_fixed(db_c.CONNECT_RETRY_INTERVAL),
+    retry=retry_if_exception_type(pymongo.errors.AutoReconnect),
+)
+def drop_obsolete_indexes(database: DatabaseClient) -> List[str]:
+    """A function that drops the obsolete indexes that exist in the database.
+
+    Args:
+        database (DatabaseClient): A database client.
+
+    Returns:
+        List[str]: Names of the indexes dropped.
+    """
+
+    index_names = []
+
+    for database_name, collection_name, keys in OBSOLETE_INDEXES:
+        collection = database[database_name][collection_name]
+        try:
+            for name, index in collection.index_information().items():
+                if list(index["key"]) == keys:
+                    collection.drop_index(name)
+                    index_names.append(name)
+        except pymongo.errors.OperationFailure as exc:
+            logging.error(
+                "Failed to drop index %s in collection %s: %s",
+                keys,
+                collection.full_name,
+                exc,
+            )
+
+    return index_names
+
+
+@retry(
+    wait=wait_fixed(db_c.CONNECT_RETRY_INTERVAL),
+    retry=retry_if_exception_type(pymongo.errors.AutoReconnect),
+)
+def ensure_all_indexes(
+    database: DatabaseClient, platform: str = db_c.AWS_DOCUMENT_DB
+) -> List[str]:
+    """A function that creates all indexes of the index registry, after
+    dropping the obsolete indexes. Indexes that already exist are left as
+    is, so it is safe to run on every start.
+
+    Args:
+        database (DatabaseClient): A database client.
+        platform (str, Optional): Underlying DB on which Mongo DB API is based.
+
+    Returns:
+        List[str]: Names of the indexes ensured.
+    """
+
+    drop_obsolete_indexes(database)
+
+    index_names = []
+
+    for database_name, collection_name, keys, options in get_index_specs(
+        platform
+    ):
+        collection = database[database_name][collection_name]
+        try:
+            index_names.append(collection.create_index(keys, **options))
+        except pymongo.errors.OperationFailure as exc:
+            # an existing index with different options is left in place.
+            logging.error(
+                "Failed to create index %s in collection %s: %s",
+                keys,
+                collection.full_name,
+                exc,
+            )
+
+    return index_names
+
+
+def ensure_collection_indexes(
+    database: DatabaseClient,
+    database_name: str,
+    collection_name: str,
+    platform: str = db_c.AWS_DOCUMENT_DB,
+) -> None:
+    """A function that creates the indexes of the index registry for a
+    collection, once per database client. Later calls with the same client
+    return without issuing index DDL.
+
+    Args:
+        database (DatabaseClient): A database client.
+        database_name (str): Name of the database of the collection.
+        collection_name (str): Name of the collection.
+        platform (str, Optional): Underlying DB on which Mongo DB API is based.
+    """
+
+    with _ensured_collections_lock:
+        client_ref, ensured = _ensured_collections.get(
+            id(database), (None, None)
+        )
+        # ids are reused once a client is collected, so the entry must
+        # belong to this client.
+        if client_ref is None or client_ref() is not database:
+            client_ref, ensured = weakref.ref(database), set()
+            _ensured_collections[id(database)] = (client_ref, ensured)
+            weakref.finalize(
+                database, _ensured_collections.pop, id(database), None
+            )
+        if (database_name, collection_name) in ensured:
+            return
+
+        collection = database[database_name][collection_name]
+        for (
+            spec_database_name,
+            spec_collection_name,
+            keys,
+            options,
+        ) in get_index_specs(platform):
+            if (spec_database_name, spec_collection_name) != (
+                database_name,
+                collection_name,
+            ):
+                continue
+            try:
+                collection.create_index(keys, **options)
+            except pymongo.errors.OperationFailure as exc:
+                # an existing index with different options is left in place.
+                logging.error(
+                    "Failed to create index %s in collection %s: %s",
+                    keys,
+                    collection.full_name,
+                    exc,
+                )
+
+        ensured.add((database_name, collection_name))
@@ -0,0 +1,207 @@
+"""This module enables reading ingested data straight from raw BSON batches
+into typed columns, for a schema of the ingested data fields."""
+
+from typing import Dict, Generator, List, Optional, Union
+
+import bson
+import numpy as np
+import pandas as pd
+from bson import ObjectId
+from bson.codec_options import CodecOptions
+from pymongo.collection import Collection
+
+import huxunifylib.database.constants as db_c
+import huxunifylib.database.data_management as dm
+from huxunifylib.database.client import DatabaseClient
+
+# types of the special type fields, other fields are read as objects.
+SPECIAL_TYPE_SCHEMA = {
+    db_c.S_TYPE_AGE: int,
+    db_c.S_TYPE_CUSTOMER_ID: ObjectId,
+    db_c.S_TYPE_DOB_DAY: int,
+    db_c.S_TYPE_DOB_MONTH: int,
+    db_c.S_TYPE_DOB_YEAR: int,
+}
+
+CUSTOM_TYPE_SCHEMA = {
+    db_c.CUSTOM_TYPE_BOOL: bool,
+    db_c.CUSTOM_TYPE_CAT: str,
+    db_c.CUSTOM_TYPE_INT: int,
+    db_c.CUSTOM_TYPE_FLOAT: float,
+}
+
+
+def get_ingested_data_schema(
+    database: DatabaseClient, ingestion_job_id: ObjectId
+) -> Dict[str, type]:
+    """A function to get the schema of ingested data from the fields of its
+    data source, e.g. {"age": int, "city": str}.
+
+    Args:
+        database (DatabaseClient): A database client.
+        ingestion_job_id (ObjectId): MongoDB document ID of ingestion job.
+
+    Returns:
+        Dict[str, type]: Type of each ingested data field, empty if the
+            data source has no fields.
+    """
+
+    ingestion_job_doc = dm.get_ingestion_job(database, ingestion_job_id)
+    data_source_doc = (
+        dm.get_data_source(
+            database, ingestion_job_doc.get(db_c.DATA_SOURCE_ID)
+        )
+        if ingestion_job_doc
+        else None
+    )
+    fields = (data_source_doc or {}).get(db_c.DATA_SOURCE_FIELDS) or []
+    if not fields:
+        return {}
+
+    schema = {db_c.S_TYPE_CUSTOMER_ID: ObjectId}
+    for field in fields:
+        special_type = field.get(db_c.FIELD_SPECIAL_TYPE)
+        if special_type:
+            schema[special_type] = SPECIAL_TYPE_SCHEMA.get(special_type, str)
+        elif field.get(db_c.FIELD_HEADER):
+            schema[field[db_c.FIELD_HEADER]] = CUSTOM_TYPE_SCHEMA.get(
+                field.get(db_c.FIELD_CUSTOM_TYPE), object
+            )
+
+    return schema
+
+
+def get_schema_projection(schema: Dict[str, type]) -> dict:
+    """A function to get the projection of ingested data documents reading
+    only the fields of a schema.
+
+    Args:
+        schema (Dict[str, type]): Type of each ingested data field.
+
+    Returns:
+        dict: MongoDB projection.
+    """
+
+    return {f"{db_c.INGESTED_DATA}.{name}": 1 for name in schema}
+
+
+def build_column(
+    values: list, value_type: type
+) -> Union[np.ndarray, pd.api.extensions.ExtensionArray]:
+    """A function to build a typed column buffer. Missing values are NA in
+    integer columns, NaN in float columns and None otherwise. Values that
+    do not convert to the type are kept in an object column.
+
+    Args:
+        values (list): Values of the column.
+        value_type (type): Type of the values.
+
+    Returns:
+        Union[np.ndarray, pd.api.extensions.ExtensionArray]: Column buffer.
+    """
+
+    try:
+        if value_type is int:
+            # nullable integers keep values above 2^53 exact.
+            column = pd.array(values, dtype="Int64")
+            if column.isna().any():
+                return column
+            return column.to_numpy(dtype=np.int64)
+        if value_type is float:
+            return np.array(values, dtype=float)
+    except (TypeError, ValueError):
+        pass
+
+    return pd.Series(values, dtype=object).to_numpy()
+
+
+def decode_raw_batch(
+    raw_batch: bytes, codec_options: CodecOptions
+) -> List[dict]:
+    """A function to decode a raw BSON batch of ingested data documents in
+    one call.
+
+    Args:
+        raw_batch (bytes): Concatenated BSON documents.
+        codec_options (CodecOptions): Codec options of the collection.
+
+    Returns:
+        List[dict]: Decoded documents.
+    """
+
+    return bson.decode_all(raw_batch, codec_options)
+
+
+def build_schema_dataframe(
+    records: List[dict], schema: Dict[str, type]
+) -> pd.DataFrame:
+    """A function to build a data frame of ingested data records with a
+    column buffer per schema field, leaving out fields no record has.
+
+    Args:
+        records (List[dict]): Ingested data records.
+        schema (Dict[str, type]): Type of each ingested data field.
+
+    Returns:
+        pd.DataFrame: Ingested data.
+    """
+
+    columns = {}
+    for name, value_type in schema.items():
+        values = [record.get(name) for record in records]
+        if any(value is not None for value in values):
+            columns[name] = build_column(values, value_type)
+
+    return pd.DataFrame(columns)
+
+
+def find_schema_batches(
+    collection: Collection,
+    query: dict,
+    schema: Dict[str, type],
+    batch_size: int,
+    last_id: Optional[ObjectId] = None,
+) -> Generator[tuple, None, None]:
+    """A function to read ingested data documents as raw BSON batches and
+    yield data frames of batch_size rows built from the schema fields.
+
+    Args:
+        collection (Collection): Ingested data collection.
+        query (dict): Query of the ingested data documents.
+        schema (Dict[str, type]): Type of each ingested data field.
+        batch_size (int): Rows per data frame.
+        last_id (Optional[ObjectId]): Only read documents after this ID.
+
+    Yields:
+        Generator[tuple, None, None]: Data frames and the ID of their last
+            document.
+    """
+
+    if last_id:
+        query = {"$and": [query, {db_c.ID: {"$gt": last_id}}]}
+
+    cursor = collection.find_raw_batches(
+        query,
+        get_schema_projection(schema),
+        batch_size=batch_size,
+        sort=[(db_c.ID, 1)],
+        no_cursor_timeout=True,
+    )
+
+    try:
+        pending = []
+        for raw_batch in cursor:
+            pending += decode_raw_batch(raw_batch, collection.codec_options)
+            while len(pending) >= batch_size:
+                items, pending = pending[:batch_size], pending[batch_size:]
+                yield build_schema_dataframe(
+                    [item.get(db_c.INGESTED_DATA, {}) for item in items],
+                    schema,
+                ), items[-1][db_c.ID]
+
+        if pending:
+            yield build_schema_dataframe(
+                [item.get(db_c.INGESTED_DATA, {}) for item in pending], schema
+            ), pending[-1][db_c.ID]
+    finally:
+        cursor.close()
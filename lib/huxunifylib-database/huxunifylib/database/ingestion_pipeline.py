@@ -0,0 +1,296 @@
+"""This module enables ingesting data batches through concurrent stages:
+batches are transformed on a process pool, then inserted by concurrent
+writers while their statistics are merged in memory and written
+periodically. The stages are connected by bounded queues, so reading
+batches waits for the slowest stage."""
+
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable
+
+import pandas as pd
+from bson import ObjectId
+
+import huxunifylib.database.constants as db_c
+import huxunifylib.database.data_management as dm
+from huxunifylib.database.audience_data_management_util import (
+    add_stats_to_update_dict,
+    apply_stats_update,
+    merge_stats_updates,
+)
+from huxunifylib.database.client import DatabaseClient
+
+# marks the end of the batches in a stage queue.
+END = None
+
+
+def drain_queue(stage_queue: queue.Queue) -> None:
+    """A function to take batches off a stage queue until its end, so a
+    failed stage does not block the stages feeding it.
+
+    Args:
+        stage_queue (queue.Queue): Queue of the stage.
+    """
+
+    while stage_queue.get() is not END:
+        continue
+
+
+def run_insert_stage(
+    database: DatabaseClient,
+    ingestion_job_id: ObjectId,
+    insert_queue: queue.Queue,
+) -> bool:
+    """A function to insert the batches of the insert queue until its end.
+
+    Args:
+        database (DatabaseClient): A database client.
+        ingestion_job_id (ObjectId): MongoDB document ID of ingestion job.
+        insert_queue (queue.Queue): Queue of prepared ingested data batches.
+
+    Returns:
+        bool: Success flag.
+    """
+
+    success = True
+    try:
+        while True:
+            ingested_data = insert_queue.get()
+            if ingested_data is END:
+                return success
+            success &= dm.insert_ingested_data(
+                database, ingestion_job_id, ingested_data
+            )
+    # pylint: disable=broad-except
+    except Exception as exc:
+        logging.error("Inserting ingested data failed: %s", repr(exc))
+        drain_queue(insert_queue)
+        return False
+
+
+# pylint: disable=too-many-arguments
+def run_stats_stage(
+    database: DatabaseClient,
+    ingestion_job_id: ObjectId,
+    stats_queue: queue.Queue,
+    custom_breakdown_fields: list = None,
+    flush_batches: int = db_c.INGESTION_PIPELINE_STATS_FLUSH_BATCHES,
+    failed: threading.Event = None,
+) -> bool:
+    """A function to merge the statistics of the batches of the stats queue
+    until its end. The statistics of the job are kept in memory and written
+    once every flush_batches batches and at the end, unless the run failed.
+
+    Args:
+        database (DatabaseClient): A database client.
+        ingestion_job_id (ObjectId): MongoDB document ID of ingestion job.
+        stats_queue (queue.Queue): Queue of prepared ingested data batches.
+        custom_breakdown_fields (list): A list of custom field names for which
+            breakdowns should be calculated.
+        flush_batches (int): Batches merged per write of the statistics.
+        failed (threading.Event): Set when the run failed before the end of
+            the stats queue, the statistics pending at the end are dropped.
+
+    Returns:
+        bool: Success flag.
+    """
+
+    success = True
+    try:
+        # the fields and the existing doc are read once for all batches.
+        data_source_fields = dm.get_ingestion_job_data_source_fields(
+            database, ingestion_job_id
+        )
+        stats_doc = dm.get_ingested_data_stats(database, ingestion_job_id)
+
+        pending_update, pending_batches = None, 0
+        while True:
+            ingested_data = stats_queue.get()
+
+            if ingested_data is END and failed is not None and failed.is_set():
+                logging.warning(
+                    "Ingestion failed, dropping %s pending batches of stats.",
+                    pending_batches,
+                )
+                return False
+
+            if ingested_data is not END:
+                update_doc = add_stats_to_update_dict(
+                    {db_c.JOB_ID: ingestion_job_id},
+                    ingested_data[
+                        [x for x in ingested_data if x in data_source_fields]
+                    ],
+                    stats_doc,
+                    custom_breakdown_fields,
+                )
+                stats_doc = apply_stats_update(stats_doc or {}, update_doc)
+                pending_update = (
+                    merge_stats_updates(pending_update, update_doc)
+                    if pending_update
+                    else update_doc
+                )
+                pending_batches += 1
+
+            if pending_update and (
+                ingested_data is END or pending_batches >= flush_batches
+            ):
+                success &= (
+                    dm.update_ingested_data_stats(
+                        database, ingestion_job_id, pending_update
+                    )
+                    is not None
+                )
+                pending_update, pending_batches = None, 0
+
+            if ingested_data is END:
+                return success
+    # pylint: disable=broad-except
+    except Exception as exc:
+        logging.error("Merging ingested data stats failed: %s", repr(exc))
+        drain_queue(stats_queue)
+        return False
+
+
+def hand_off(
+    ingested_data: pd.DataFrame,
+    insert_queue: queue.Queue,
+    stats_queue: queue.Queue,
+) -> int:
+    """A function to queue a prepared batch for the insert and stats stages,
+    waiting while their queues are full.
+
+    Args:
+        ingested_data (pd.DataFrame): Prepared ingested data batch.
+        insert_queue (queue.Queue): Queue of the insert stage.
+        stats_queue (queue.Queue): Queue of the stats stage.
+
+    Returns:
+        int: Number of rows of the batch.
+    """
+
+    insert_queue.put(ingested_data)
+    stats_queue.put(ingested_data)
+
+    return len(ingested_data)
+
+
+# pylint: disable=too-many-arguments,too-many-locals
+def run_ingestion_pipeline(
+    database: DatabaseClient,
+    ingestion_job_id: ObjectId,
+    batches: Iterable[pd.DataFrame],
+    custom_breakdown_fields: list = None,
+    transform_workers: int = db_c.INGESTION_PIPELINE_TRANSFORM_WORKERS,
+    insert_workers: int = db_c.INGESTED_DATA_INSERT_WORKERS,
+    queue_size: int = db_c.INGESTION_PIPELINE_QUEUE_SIZE,
+    stats_flush_batches: int = db_c.INGESTION_PIPELINE_STATS_FLUSH_BATCHES,
+) -> bool:
+    """A function to store ingested data batches and their statistics, with
+    the batches transformed on transform_workers processes, inserted by
+    insert_workers threads and merged into the statistics by one thread.
+
+    At most queue_size batches wait at each stage, the next batch is only
+    read once the transform stage has room for it. The statistics are
+    written every stats_flush_batches batches while the batches are read,
+    and the statistics pending at the end only once every batch is
+    inserted. When reading, transforming or inserting a batch failed, the
+    pending statistics are dropped, the ones written before are kept.
+
+    The transform processes are spawned rather than forked, since forking
+    copies the locks and connections of the database client and of the
+    stage threads.
+
+    Args:
+        database (DatabaseClient): A database client.
+        ingestion_job_id (ObjectId): MongoDB document ID of ingestion job.
+        batches (Iterable[pd.DataFrame]): Ingested data batches.
+        custom_breakdown_fields (list): A list of custom field names for which
+            breakdowns should be calculated.
+        transform_workers (int): Processes transforming batches.
+        insert_workers (int): Threads inserting batches.
+        queue_size (int): Batches waiting at each stage at most.
+        stats_flush_batches (int): Batches merged per write of the
+            statistics.
+
+    Returns:
+        bool: Success flag.
+
+    Raises:
+        BaseException: Any error reading or transforming the batches, raised
+            again once the stages end.
+    """
+
+    start_time = time.perf_counter()
+    insert_workers = max(insert_workers, 1)
+    queue_size = max(queue_size, 1)
+    insert_queue = queue.Queue(queue_size)
+    stats_queue = queue.Queue(queue_size)
+    failed = threading.Event()
+    rows = 0
+
+    with ProcessPoolExecutor(
+        max_workers=max(transform_workers, 1),
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as transform_executor, ThreadPoolExecutor(
+        max_workers=insert_workers + 1, thread_name_prefix="ingestion"
+    ) as stage_executor:
+        insert_results = [
+            stage_executor.submit(
+                run_insert_stage, database, ingestion_job_id, insert_queue
+            )
+            for _ in range(insert_workers)
+        ]
+        stats_result = stage_executor.submit(
+            run_stats_stage,
+            database,
+            ingestion_job_id,
+            stats_queue,
+            custom_breakdown_fields,
+            stats_flush_batches,
+            failed,
+        )
+
+        try:
+            in_flight = deque()
+            for batch in batches:
+                # read the next batch only once a transform is done.
+                if len(in_flight) >= queue_size:
+                    rows += hand_off(
+                        in_flight.popleft().result(), insert_queue, stats_queue
+                    )
+                in_flight.append(
+                    transform_executor.submit(dm.prepare_ingested_data, batch)
+                )
+            while in_flight:
+                rows += hand_off(
+                    in_flight.popleft().result(), insert_queue, stats_queue
+                )
+        except BaseException:
+            failed.set()
+            raise
+        finally:
+            # each insert worker ends at its own end marker.
+            for _ in range(insert_workers):
+                insert_queue.put(END)
+            # every insert worker is awaited before the stats stage ends.
+            insert_success = [x.result() for x in insert_results]
+            if not all(insert_success):
+                failed.set()
+            stats_queue.put(END)
+
+        success = stats_result.result() and all(insert_success)
+
+    seconds = time.perf_counter() - start_time
+    logging.info(
+        "Ingested %s rows through the pipeline in %.2f s, %.0f rows/s.",
+        rows,
+        seconds,
+        rows / seconds if seconds else 0,
+    )
+
+    return success
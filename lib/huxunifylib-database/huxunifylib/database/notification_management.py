@@ -90,15 +90,8 @@ def create_notification(
     }
 
     if platform == db_c.AZURE_COSMOS_DB:
-        collection.create_index(
-            [(db_c.TS, pymongo.ASCENDING)],
-            expireAfterSeconds=int(timedelta(weeks=1).total_seconds()),
-        )
         doc.update({db_c.TTL: ttl})
     else:
-        collection.create_index(
-            [(db_c.EXPIRE_AT, pymongo.ASCENDING)], expireAfterSeconds=0
-        )
         doc.update({db_c.EXPIRE_AT: expire_time})
 
     if category:
@@ -13,6 +13,10 @@ from tenacity import retry, wait_fixed, retry_if_exception_type
 import huxunifylib.database.db_exceptions as de
 import huxunifylib.database.constants as db_c
 from huxunifylib.database.client import DatabaseClient
+from huxunifylib.database.cache_management import (
+    get_cache_tag,
+    invalidate_tags,
+)
 from huxunifylib.database.user_management import USER_LOOKUP_PIPELINE
 from huxunifylib.database.utils import get_collection_count
 
@@ -465,12 +469,16 @@ def update_audience(
     updated_audience_doc[db_c.UPDATE_TIME] = curr_time
 
     try:
-        return collection.find_one_and_update(
+        updated_audience_doc = collection.find_one_and_update(
             {db_c.ID: audience_id},
             {"$set": updated_audience_doc},
             upsert=False,
             return_document=pymongo.ReturnDocument.AFTER,
         )
+        invalidate_tags(
+            database, [get_cache_tag(db_c.CACHE_TAG_AUDIENCE, audience_id)]
+        )
+        return updated_audience_doc
     except pymongo.errors.OperationFailure as exc:
         logging.error(exc)
 
@@ -0,0 +1,248 @@
+"""This module enables keeping mergeable sketches of ingested data fields in
+statistics/insights documents, i.e. HyperLogLog registers estimating the
+distinct values of a field and a space-saving summary of its top values."""
+
+import heapq
+from operator import itemgetter
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+import huxunifylib.database.constants as db_c
+
+# bits of the hashes added to distinct count sketches.
+HASH_BITS = 64
+
+
+def hash_values(values: pd.Series) -> np.ndarray:
+    """A function to hash values of a field to 64 bit integers.
+
+    Args:
+        values (pd.Series): Values of a field.
+
+    Returns:
+        np.ndarray: Hash of each value.
+    """
+
+    return pd.util.hash_pandas_object(
+        values.astype(str), index=False
+    ).to_numpy(dtype=np.uint64)
+
+
+def bit_length(values: np.ndarray) -> np.ndarray:
+    """A function to get the number of bits of 64 bit integers, computed on
+    their 32 bit halves which floats hold exactly.
+
+    Args:
+        values (np.ndarray): 64 bit integers.
+
+    Returns:
+        np.ndarray: Number of bits of each integer, 0 for 0.
+    """
+
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+
+    return np.where(high > 0, np.frexp(high)[1] + 32, np.frexp(low)[1])
+
+
+def load_distinct_sketch(
+    data: Optional[bytes], precision: int = db_c.STATS_DISTINCT_PRECISION
+) -> np.ndarray:
+    """A function to load the registers of a stored distinct count sketch,
+    empty registers are returned if none is stored for the precision.
+
+    Args:
+        data (Optional[bytes]): Stored registers.
+        precision (int): Bits of the register index.
+
+    Returns:
+        np.ndarray: Registers of the sketch.
+    """
+
+    if data and len(data) == 1 << precision:
+        return np.frombuffer(data, dtype=np.uint8).copy()
+
+    return np.zeros(1 << precision, dtype=np.uint8)
+
+
+def dump_distinct_sketch(registers: np.ndarray) -> bytes:
+    """A function to get the registers of a distinct count sketch to store,
+    one byte per register.
+
+    Args:
+        registers (np.ndarray): Registers of the sketch.
+
+    Returns:
+        bytes: Stored registers.
+    """
+
+    return registers.astype(np.uint8).tobytes()
+
+
+def update_distinct_sketch(registers: np.ndarray, values: pd.Series) -> None:
+    """A function to add values of a field to a distinct count sketch.
+
+    Args:
+        registers (np.ndarray): Registers of the sketch, updated in place.
+        values (pd.Series): Non-null values of the field.
+    """
+
+    if values.empty:
+        return
+
+    precision = int(registers.size).bit_length() - 1
+    hashes = hash_values(values)
+
+    index = (hashes >> np.uint64(HASH_BITS - precision)).astype(np.intp)
+    rest = hashes & np.uint64((1 << (HASH_BITS - precision)) - 1)
+    # position of the first set bit of the hash after the index bits.
+    rank = (HASH_BITS - precision + 1 - bit_length(rest)).astype(np.uint8)
+
+    np.maximum.at(registers, index, rank)
+
+
+def merge_distinct_sketches(
+    registers: np.ndarray, other_registers: np.ndarray
+) -> np.ndarray:
+    """A function to merge two distinct count sketches of the same precision.
+
+    Args:
+        registers (np.ndarray): Registers of a sketch.
+        other_registers (np.ndarray): Registers of the other sketch.
+
+    Returns:
+        np.ndarray: Registers of the merged sketch.
+    """
+
+    return np.maximum(registers, other_registers)
+
+
+def estimate_distinct(registers: np.ndarray) -> int:
+    """A function to estimate the number of distinct values added to a
+    distinct count sketch.
+
+    Args:
+        registers (np.ndarray): Registers of the sketch.
+
+    Returns:
+        int: Estimated number of distinct values.
+    """
+
+    size = registers.size
+    alpha = 0.7213 / (1 + 1.079 / size)
+    estimate = alpha * size * size / np.sum(np.exp2(-registers.astype(float)))
+
+    # small cardinalities are estimated from the empty registers.
+    empty = int(np.count_nonzero(registers == 0))
+    if estimate <= 2.5 * size and empty:
+        estimate = size * np.log(size / empty)
+
+    return int(round(estimate))
+
+
+def merge_top_values(
+    top_values: list,
+    value_counts: pd.Series,
+    size: int = db_c.STATS_TOP_VALUES_SIZE,
+) -> list:
+    """A function to merge value counts into a space-saving summary of top
+    values. The summary is exact until it holds more than size values, after
+    that each count overestimates by at most its error.
+
+    Args:
+        top_values (list): Summary of [value, count, error] lists, ordered
+            by count.
+        value_counts (pd.Series): Counts of values to merge.
+        size (int): Values kept by the summary.
+
+    Returns:
+        list: Merged summary of [value, count, error] lists, ordered by
+            count.
+    """
+
+    counts = {value: count for value, count, _ in top_values}
+    errors = {value: error for value, _, error in top_values}
+
+    # a full summary may have dropped up to its smallest count of a value.
+    floor = top_values[-1][1] if len(top_values) >= size else 0
+
+    for value, count in zip(
+        value_counts.index.tolist(), value_counts.tolist()
+    ):
+        if value in counts:
+            counts[value] += count
+        else:
+            counts[value] = count + floor
+            errors[value] = floor
+
+    return [
+        [value, count, errors[value]]
+        for value, count in heapq.nlargest(
+            size, counts.items(), key=itemgetter(1)
+        )
+    ]
+
+
+def top_values_from_breakdown(breakdown: dict, count: int) -> list:
+    """A function to get a summary of top values from a breakdown stored
+    before the sketches.
+
+    Args:
+        breakdown (dict): Fraction of each value.
+        count (int): Number of non-null values the breakdown is of.
+
+    Returns:
+        list: Summary of [value, count, error] lists, ordered by count.
+    """
+
+    return sorted(
+        (
+            [value, int(round(fraction * count)), 0]
+            for value, fraction in breakdown.items()
+        ),
+        key=itemgetter(1),
+        reverse=True,
+    )
+
+
+def get_breakdown(top_values: list, count: int) -> dict:
+    """A function to get the breakdown of a field from its top values.
+
+    Args:
+        top_values (list): Summary of [value, count, error] lists.
+        count (int): Number of non-null values of the field.
+
+    Returns:
+        dict: Fraction of each top value.
+    """
+
+    if count <= 0:
+        return {value: 0.0 for value, _, _ in top_values}
+
+    return {value: value_count / count for value, value_count, _ in top_values}
+
+
+def get_distinct_count(stats_doc: dict, field: str) -> Optional[int]:
+    """A function to get the estimated number of distinct values of a
+    breakdown field from a statistics/insights document.
+
+    Args:
+        stats_doc (dict): Statistics/insights document.
+        field (str): Name of the field.
+
+    Returns:
+        Optional[int]: Estimated number of distinct values, None if the
+            field has no distinct count sketch.
+    """
+
+    sketch = (
+        stats_doc.get(db_c.STATS_SKETCHES, {})
+        .get(field, {})
+        .get(db_c.STATS_DISTINCT_SKETCH)
+    )
+    if not sketch:
+        return None
+
+    return estimate_distinct(load_distinct_sketch(sketch))
@@ -2,6 +2,7 @@
 
 import unittest
 from typing import Union
+from unittest import mock
 
 import mongomock
 import pandas as pd
@@ -275,6 +276,47 @@ class TestAudienceManagement(unittest.TestCase):
         for audience_batch in fetch:
             self.assertEqual(audience_batch.shape[0], 2)
 
+    def test_get_audience_batches_single_query(self):
+        """Test audience batches are read with one compiled query."""
+
+        self._setup_ingestion_succeeded_and_audience()
+
+        with mock.patch.object(
+            am, "get_audience_query", wraps=am.get_audience_query
+        ) as get_audience_query:
+            batches = list(
+                am.get_audience_batches(
+                    self.database, self.audience_doc[db_c.ID], 1
+                )
+            )
+
+        get_audience_query.assert_called_once()
+        self.assertEqual(2, len(batches))
+        self.assertSetEqual(
+            {"New York", "Chicago"},
+            {x[db_c.S_TYPE_CITY].iloc[0] for x in batches},
+        )
+
+    def test_build_ingested_dataframe(self):
+        """Test records are assembled into columns, known columns first and
+        missing values as None."""
+
+        audience_data = am.build_ingested_dataframe(
+            [
+                {db_c.S_TYPE_CITY: "Chicago", "custom_field": "val_10"},
+                {db_c.S_TYPE_AGE: 33, db_c.S_TYPE_CITY: "New York"},
+            ],
+            [db_c.S_TYPE_AGE, db_c.S_TYPE_CITY, db_c.S_TYPE_EMAIL],
+        )
+
+        self.assertListEqual(
+            [db_c.S_TYPE_AGE, db_c.S_TYPE_CITY, "custom_field"],
+            audience_data.columns.tolist(),
+        )
+        self.assertListEqual(
+            ["val_10", None], audience_data["custom_field"].tolist()
+        )
+
     def test_delete_audience(self):
         """Test delete audiences."""
 
@@ -609,6 +651,10 @@ class TestAudienceManagement(unittest.TestCase):
             self.audience_doc[db_c.ID],
         )
         self.assertTrue(doc is not None)
+        # the data source fields read by schema give the same insights.
+        doc.pop(db_c.ID)
+        insights.pop(db_c.ID)
+        self.assertDictEqual(insights, doc)
 
     def test_get_all_recent_audiences(self):
         """Test get_all_recent_audiences."""
@@ -1,4 +1,5 @@
 """Purpose of this file is for storing the tests of cache_management.py"""
+import datetime
 import unittest
 from unittest import mock
 
@@ -9,6 +10,15 @@ from hypothesis import given, strategies as st
 from huxunifylib.database.cache_management import (
     create_cache_entry,
     get_cache_entry,
+    get_cache_document,
+    get_cache_key_digest,
+    get_cache_tag,
+    invalidate_tags,
+    add_cache_invalidation_listener,
+    CACHE_INVALIDATION_LISTENERS,
+    is_cache_document_stale,
+    acquire_cache_lease,
+    release_cache_lease,
 )
 from huxunifylib.database.client import DatabaseClient
 import huxunifylib.database.constants as db_c
@@ -54,3 +64,243 @@ class TestCacheManagement(unittest.TestCase):
         )
 
         mock.patch.stopall()
+
+    @mongomock.patch(servers=(("localhost", 27017),))
+    def test_get_cache_document(self):
+        """Test getting the full document of a cache entry."""
+
+        self.assertDictEqual({}, get_cache_document(self.database, "key"))
+
+        create_cache_entry(self.database, "key", "value")
+        document = get_cache_document(self.database, "key")
+
+        self.assertEqual("value", document[db_c.CONSTANT_VALUE])
+        self.assertAlmostEqual(
+            db_c.CACHE_EXPIRE_AFTER_SECONDS,
+            (
+                document[db_c.EXPIRE_AT] - datetime.datetime.utcnow()
+            ).total_seconds(),
+            delta=60,
+        )
+        # entries are only expired by their expiry time.
+        self.assertNotIn(db_c.CREATE_TIME, document)
+
+    @mongomock.patch(servers=(("localhost", 27017),))
+    def test_cache_key_digest(self):
+        """Test logically identical cache keys share a cache entry."""
+
+        cache_key = {
+            "endpoint": "customers.overview",
+            "audience_filters": [{"type": "equals", "field": "country"}],
+        }
+        reordered_key = {
+            "audience_filters": [{"field": "country", "type": "equals"}],
+            "endpoint": "customers.overview",
+        }
+
+        self.assertEqual(
+            get_cache_key_digest(cache_key),
+            get_cache_key_digest(reordered_key),
+        )
+        self.assertEqual(64, len(get_cache_key_digest(cache_key)))
+        self.assertNotEqual(
+            get_cache_key_digest("customers.overview"),
+            get_cache_key_digest({"endpoint": "customers.overview"}),
+        )
+
+        create_cache_entry(self.database, cache_key, "value")
+        self.assertEqual(
+            "value", get_cache_entry(self.database, reordered_key)
+        )
+
+        # the original key is kept on the entry.
+        self.assertDictEqual(
+            cache_key,
+            get_cache_document(self.database, reordered_key)[
+                db_c.CONSTANT_KEY
+            ],
+        )
+
+    @mongomock.patch(servers=(("localhost", 27017),))
+    def test_cache_entry_expiry(self):
+        """Test stale entries are returned until their hard expiry."""
+
+        create_cache_entry(
+            self.database, "key", "value", stale_after_seconds=0
+        )
+        self.assertTrue(
+            is_cache_document_stale(get_cache_document(self.database, "key"))
+        )
+        self.assertEqual("value", get_cache_entry(self.database, "key"))
+        self.assertDictEqual(
+            {}, get_cache_entry(self.database, "key", allow_stale=False)
+        )
+
+        create_cache_entry(self.database, "key", "value")
+        self.assertFalse(
+            is_cache_document_stale(get_cache_document(self.database, "key"))
+        )
+        self.assertEqual(
+            "value", get_cache_entry(self.database, "key", allow_stale=False)
+        )
+
+        # expired entries not yet removed by the TTL index are not returned.
+        self.database[db_c.DATA_MANAGEMENT_DATABASE][
+            db_c.CACHE_COLLECTION
+        ].update_one(
+            {db_c.CONSTANT_KEY: "key"},
+            {"$set": {db_c.EXPIRE_AT: datetime.datetime.utcnow()}},
+        )
+        self.assertDictEqual({}, get_cache_document(self.database, "key"))
+
+    @mongomock.patch(servers=(("localhost", 27017),))
+    def test_compressed_cache_entry(self):
+        """Test compressed and chunked cache values are read back as is."""
+
+        cache_value = [{"city": f"city {i}", "size": i} for i in range(500)]
+        chunks_collection = self.database[db_c.DATA_MANAGEMENT_DATABASE][
+            db_c.CACHE_CHUNKS_COLLECTION
+        ]
+
+        for codec in [db_c.CACHE_CODEC_ZLIB, db_c.CACHE_CODEC_ZSTD]:
+            sizes = create_cache_entry(
+                self.database, "key", cache_value, codec=codec
+            )
+            self.assertLess(
+                sizes[db_c.CACHE_STORED_SIZE], sizes[db_c.CACHE_RAW_SIZE]
+            )
+            self.assertListEqual(
+                cache_value, get_cache_entry(self.database, "key")
+            )
+            self.assertNotIn(
+                db_c.CONSTANT_VALUE,
+                self.database[db_c.DATA_MANAGEMENT_DATABASE][
+                    db_c.CACHE_COLLECTION
+                ].find_one({db_c.CONSTANT_KEY: "key"}),
+            )
+
+        sizes = create_cache_entry(
+            self.database,
+            "key",
+            cache_value,
+            codec=db_c.CACHE_CODEC_ZLIB,
+            chunk_size=100,
+        )
+        chunk_count = -(-sizes[db_c.CACHE_STORED_SIZE] // 100)
+        self.assertEqual(
+            chunk_count,
+            chunks_collection.count_documents({}),
+        )
+        self.assertListEqual(
+            cache_value, get_cache_entry(self.database, "key")
+        )
+
+        # rewriting the entry removes the previous chunks.
+        create_cache_entry(
+            self.database,
+            "key",
+            cache_value,
+            codec=db_c.CACHE_CODEC_ZLIB,
+            chunk_size=100,
+        )
+        self.assertEqual(chunk_count, chunks_collection.count_documents({}))
+
+        # chunks of a concurrent write not yet stored in the entry are kept.
+        chunks_collection.insert_one(
+            {
+                db_c.CACHE_KEY_DIGEST: get_cache_key_digest("key"),
+                db_c.CACHE_CHUNK_VERSION: "concurrent",
+                db_c.CACHE_CHUNK_INDEX: 0,
+            }
+        )
+        create_cache_entry(
+            self.database,
+            "key",
+            cache_value,
+            codec=db_c.CACHE_CODEC_ZLIB,
+            chunk_size=100,
+        )
+        self.assertEqual(
+            chunk_count + 1, chunks_collection.count_documents({})
+        )
+        chunks_collection.delete_one({db_c.CACHE_CHUNK_VERSION: "concurrent"})
+
+        # storing the value as is removes the previous chunks.
+        create_cache_entry(self.database, "key", cache_value)
+        self.assertEqual(0, chunks_collection.count_documents({}))
+        self.assertListEqual(
+            cache_value, get_cache_entry(self.database, "key")
+        )
+        create_cache_entry(
+            self.database,
+            "key",
+            cache_value,
+            codec=db_c.CACHE_CODEC_ZLIB,
+            chunk_size=100,
+        )
+
+        # entries with missing chunks are treated as missing.
+        chunks_collection.delete_one({db_c.CACHE_CHUNK_INDEX: 0})
+        self.assertDictEqual({}, get_cache_entry(self.database, "key"))
+
+        with self.assertRaises(ValueError):
+            create_cache_entry(self.database, "key", cache_value, codec="lz4")
+
+    @mongomock.patch(servers=(("localhost", 27017),))
+    def test_invalidate_tags(self):
+        """Test invalidating a tag removes the entries depending on it."""
+
+        audience_tag = get_cache_tag(db_c.CACHE_TAG_AUDIENCE, "1")
+        other_tag = get_cache_tag(db_c.CACHE_TAG_AUDIENCE, "2")
+        self.assertEqual("audience:1", audience_tag)
+
+        create_cache_entry(self.database, "audience", 1, tags=[audience_tag])
+        create_cache_entry(
+            self.database,
+            "both",
+            [1] * 100,
+            tags=[audience_tag, other_tag],
+            codec=db_c.CACHE_CODEC_ZLIB,
+            chunk_size=10,
+        )
+        create_cache_entry(self.database, "other", 2, tags=[other_tag])
+        create_cache_entry(self.database, "untagged", 3)
+
+        listener = mock.Mock()
+        add_cache_invalidation_listener(listener)
+        self.addCleanup(CACHE_INVALIDATION_LISTENERS.remove, listener)
+
+        self.assertEqual(2, invalidate_tags(self.database, [audience_tag]))
+        listener.assert_called_once_with([audience_tag])
+
+        self.assertFalse(get_cache_entry(self.database, "audience"))
+        self.assertFalse(get_cache_entry(self.database, "both"))
+        self.assertEqual(2, get_cache_entry(self.database, "other"))
+        self.assertEqual(3, get_cache_entry(self.database, "untagged"))
+        self.assertEqual(
+            0,
+            self.database[db_c.DATA_MANAGEMENT_DATABASE][
+                db_c.CACHE_CHUNKS_COLLECTION
+            ].count_documents({}),
+        )
+
+    @mongomock.patch(servers=(("localhost", 27017),))
+    def test_cache_lease(self):
+        """Test only one caller holds the lease of a cache key."""
+
+        cache_key = {"endpoint": "customers.overview"}
+
+        self.assertTrue(acquire_cache_lease(self.database, cache_key, "a"))
+        self.assertFalse(acquire_cache_lease(self.database, cache_key, "b"))
+
+        # only the owner can release the lease.
+        self.assertFalse(release_cache_lease(self.database, cache_key, "b"))
+        self.assertTrue(release_cache_lease(self.database, cache_key, "a"))
+        self.assertTrue(acquire_cache_lease(self.database, cache_key, "b"))
+
+        # a lapsed lease can be taken over.
+        self.assertTrue(
+            acquire_cache_lease(self.database, "key", "a", lease_seconds=0)
+        )
+        self.assertTrue(acquire_cache_lease(self.database, "key", "b"))
+        self.assertFalse(release_cache_lease(self.database, "key", "a"))
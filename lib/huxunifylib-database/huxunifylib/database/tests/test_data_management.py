@@ -477,6 +477,54 @@ class TestDataManagement(unittest.TestCase):
                 db_c.S_TYPE_CUSTOMER_ID in item[db_c.INGESTED_DATA]
             )
 
+    @mongomock.patch(servers=(("localhost", 27017),))
+    def test_append_ingested_job_data_batches(self):
+        """Test append_ingested_data in several batches in flight."""
+
+        ingested_data = pd.DataFrame(
+            {
+                db_c.S_TYPE_EMAIL: [f"email_{x}" for x in range(9)],
+                db_c.S_TYPE_AGE: list(range(9)),
+                # a duplicate in the same batch and one in a later batch.
+                db_c.S_TYPE_CUSTOMER_ID: [
+                    "1",
+                    "1",
+                    None,
+                    "4",
+                    None,
+                    "3",
+                    "7",
+                    "4",
+                    None,
+                ],
+            }
+        )
+
+        self.assertTrue(
+            dm.append_ingested_data(
+                self.database,
+                self.ingestion_job_doc[db_c.ID],
+                ingested_data,
+                batch_size=2,
+                max_workers=2,
+            )
+        )
+
+        docs = list(
+            self.database[db_c.DATA_MANAGEMENT_DATABASE][
+                db_c.INGESTED_DATA_COLLECTION
+            ].find()
+        )
+        self.assertEqual(7, len(docs))
+        self.assertTrue(
+            all(x[db_c.INGESTED_DATA][db_c.S_TYPE_CUSTOMER_ID] for x in docs)
+        )
+        # values are stored as native types.
+        self.assertSetEqual(
+            {0, 2, 3, 4, 5, 6, 8},
+            {x[db_c.INGESTED_DATA][db_c.S_TYPE_AGE] for x in docs},
+        )
+
     # pylint: disable=R0904,R0915
     @mongomock.patch(servers=(("localhost", 27017),))
     def test_append_ingested_job_data_stats(self):
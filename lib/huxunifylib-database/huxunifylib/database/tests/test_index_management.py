@@ -0,0 +1,125 @@
+"""Database client index management tests."""
+from unittest import TestCase, mock
+
+import mongomock
+from huxunifylib.database.client import DatabaseClient
+from huxunifylib.database import constants as db_c
+from huxunifylib.database.index_management import (
+    OBSOLETE_INDEXES,
+    ensure_all_indexes,
+    ensure_collection_indexes,
+    get_index_specs,
+)
+
+
+class IndexManagementTest(TestCase):
+    """Test index management."""
+
+    @mongomock.patch(servers=(("localhost", 27017),))
+    def setUp(self):
+        """Setup resources before each test."""
+
+        self.database = DatabaseClient(host="localhost", port=27017).connect()
+
+        self.database.drop_database(db_c.DATA_MANAGEMENT_DATABASE)
+
+    def test_ensure_all_indexes(self):
+        """Test all indexes of the registry are created idempotently."""
+
+        index_names = ensure_all_indexes(self.database)
+        self.assertEqual(len(get_index_specs()), len(index_names))
+
+        # running again leaves the existing indexes as is.
+        self.assertListEqual(index_names, ensure_all_indexes(self.database))
+
+        cache_indexes = self.database[db_c.DATA_MANAGEMENT_DATABASE][
+            db_c.CACHE_COLLECTION
+        ].index_information()
+        self.assertTrue(
+            any(
+                index.get("unique")
+                and index["key"] == [(db_c.CACHE_KEY_DIGEST, 1)]
+                for index in cache_indexes.values()
+            )
+        )
+        # entries expire at their own expiry time.
+        self.assertTrue(
+            any(
+                index.get("expireAfterSeconds") == 0
+                and index["key"] == [(db_c.EXPIRE_AT, 1)]
+                for index in cache_indexes.values()
+            )
+        )
+
+    def test_drop_obsolete_indexes(self):
+        """Test the obsolete cache TTL index on the create time is dropped."""
+
+        collection = self.database[db_c.DATA_MANAGEMENT_DATABASE][
+            db_c.CACHE_COLLECTION
+        ]
+        collection.create_index(db_c.CREATE_TIME, expireAfterSeconds=86400)
+
+        ensure_all_indexes(self.database)
+
+        index_keys = [
+            list(index["key"])
+            for index in collection.index_information().values()
+        ]
+        for _, _, keys in OBSOLETE_INDEXES:
+            self.assertNotIn(keys, index_keys)
+
+    def test_get_index_specs_platform(self):
+        """Test TTL indexes depend on the platform."""
+
+        cosmos_ttl_fields = {
+            keys[0][0]
+            for _, _, keys, options in get_index_specs(db_c.AZURE_COSMOS_DB)
+            if "expireAfterSeconds" in options
+        }
+        self.assertSetEqual({db_c.TS}, cosmos_ttl_fields)
+
+        self.assertFalse(
+            any(
+                keys[0][0] == db_c.TS
+                for _, _, keys, _ in get_index_specs(db_c.AWS_DOCUMENT_DB)
+            )
+        )
+
+    def test_ensure_collection_indexes(self):
+        """Test the indexes of a collection are created once per client."""
+
+        collection = self.database[db_c.DATA_MANAGEMENT_DATABASE][
+            db_c.INGESTED_DATA_COLLECTION
+        ]
+
+        with mock.patch.object(
+            type(collection),
+            "create_index",
+            autospec=True,
+            side_effect=type(collection).create_index,
+        ) as create_index:
+            for _ in range(2):
+                ensure_collection_indexes(
+                    self.database,
+                    db_c.DATA_MANAGEMENT_DATABASE,
+                    db_c.INGESTED_DATA_COLLECTION,
+                )
+
+        self.assertEqual(
+            create_index.call_count,
+            sum(
+                1
+                for database_name, collection_name, _, _ in get_index_specs()
+                if (database_name, collection_name)
+                == (
+                    db_c.DATA_MANAGEMENT_DATABASE,
+                    db_c.INGESTED_DATA_COLLECTION,
+                )
+            ),
+        )
+        self.assertTrue(
+            any(
+                index.get("unique")
+                for index in collection.index_information().values()
+            )
+        )
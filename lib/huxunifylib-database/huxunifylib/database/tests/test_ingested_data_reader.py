@@ -0,0 +1,195 @@
+"""Ingested data reader tests."""
+
+import unittest
+from typing import Iterator
+from unittest import mock
+
+import bson
+from bson.codec_options import CodecOptions
+import mongomock
+import numpy as np
+import pandas as pd
+
+import huxunifylib.database.audience_management as am
+import huxunifylib.database.constants as db_c
+import huxunifylib.database.data_management as dm
+import huxunifylib.database.ingested_data_reader as idr
+from huxunifylib.database.client import DatabaseClient
+
+
+def find_raw_batches(
+    collection: mongomock.collection.Collection,
+    query: dict,
+    projection: dict,
+    batch_size: int,
+    sort: list,
+    **_,
+) -> Iterator[bytes]:
+    """Stand-in of pymongo find_raw_batches, which mongomock lacks.
+
+    Args:
+        collection (mongomock.collection.Collection): Collection to read.
+        query (dict): Query of the documents.
+        projection (dict): Projection of the documents.
+        batch_size (int): Documents per raw batch.
+        sort (list): Sort of the documents.
+        **_ (dict): Cursor options of pymongo, such as no_cursor_timeout,
+            that do not apply to the stand-in.
+
+    Yields:
+        Iterator[bytes]: Raw batches of concatenated BSON documents.
+    """
+
+    docs = [
+        bson.encode(x) for x in collection.find(query, projection, sort=sort)
+    ]
+    for start in range(0, len(docs), batch_size):
+        yield b"".join(docs[start : start + batch_size])
+
+
+class TestIngestedDataReader(unittest.TestCase):
+    """Test reading ingested data from raw BSON batches."""
+
+    @mongomock.patch(servers=(("localhost", 27017),))
+    def setUp(self):
+
+        self.database = DatabaseClient(host="localhost", port=27017).connect()
+        self.database.drop_database(db_c.DATA_MANAGEMENT_DATABASE)
+
+        data_source_doc = dm.set_data_source(
+            self.database,
+            "My data source",
+            1,
+            "CSV",
+            "S3",
+            None,
+            [
+                {"header": "city", "special_type": db_c.S_TYPE_CITY},
+                {"header": "age", "special_type": db_c.S_TYPE_AGE},
+                {
+                    "header": "score",
+                    "special_type": None,
+                    "custom_type": db_c.CUSTOM_TYPE_INT,
+                    "field_mapping": None,
+                    "field_mapping_default": None,
+                },
+            ],
+        )
+        self.ingestion_job_id = dm.set_ingestion_job(
+            self.database, data_source_doc[db_c.ID]
+        )[db_c.ID]
+        dm.append_ingested_data(
+            self.database,
+            self.ingestion_job_id,
+            pd.DataFrame(
+                {
+                    db_c.S_TYPE_CITY: ["New York", "Chicago", None, "Boston"],
+                    db_c.S_TYPE_AGE: [33, 59, 41, 28],
+                    "score": [1, None, 3, 4],
+                    "not_in_schema": ["a", "b", "c", "d"],
+                }
+            ),
+        )
+        am.set_ingestion_job_status(
+            self.database, self.ingestion_job_id, db_c.STATUS_SUCCEEDED
+        )
+        self.audience_id = am.create_audience(
+            self.database,
+            "My Audience",
+            [
+                {
+                    "field": db_c.S_TYPE_AGE,
+                    "type": db_c.AUDIENCE_FILTER_MAX,
+                    "value": 60,
+                }
+            ],
+            self.ingestion_job_id,
+        )[db_c.ID]
+
+        mock.patch.object(
+            mongomock.collection.Collection,
+            "find_raw_batches",
+            find_raw_batches,
+            create=True,
+        ).start()
+        # mongomock has its own codec options type.
+        mock.patch.object(
+            mongomock.collection.Collection, "codec_options", CodecOptions()
+        ).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_get_ingested_data_schema(self):
+        """Test the schema is read from the data source fields."""
+
+        self.assertDictEqual(
+            {
+                db_c.S_TYPE_CUSTOMER_ID: bson.ObjectId,
+                db_c.S_TYPE_CITY: str,
+                db_c.S_TYPE_AGE: int,
+                "score": int,
+            },
+            idr.get_ingested_data_schema(self.database, self.ingestion_job_id),
+        )
+
+    def test_get_audience_batches_schema(self):
+        """Test audience batches read with a schema match the batches read
+        from documents for the schema fields."""
+
+        schema = idr.get_ingested_data_schema(
+            self.database, self.ingestion_job_id
+        )
+
+        batches = list(
+            am.get_audience_batches(self.database, self.audience_id, 3, schema)
+        )
+        audience_data = pd.concat(batches, ignore_index=True)
+        expected = pd.concat(
+            am.get_audience_batches(self.database, self.audience_id, 3),
+            ignore_index=True,
+        )
+
+        self.assertListEqual([3, 1], [len(x) for x in batches])
+        self.assertListEqual(list(schema), audience_data.columns.tolist())
+        self.assertNotIn("not_in_schema", audience_data.columns)
+        self.assertEqual(np.int64, audience_data[db_c.S_TYPE_AGE].dtype)
+        # integer columns with missing values are nullable integers rather
+        # than floats, so missing values are compared as None.
+        for column in schema:
+            self.assertListEqual(
+                expected[column]
+                .astype(object)
+                .where(expected[column].notna(), None)
+                .tolist(),
+                audience_data[column]
+                .astype(object)
+                .where(audience_data[column].notna(), None)
+                .tolist(),
+            )
+
+    def test_build_schema_dataframe(self):
+        """Test columns are typed and fields no record has are left out."""
+
+        audience_data = idr.build_schema_dataframe(
+            [{"age": 33, "city": "Chicago"}, {"city": None}],
+            {"age": int, "city": str, "score": float},
+        )
+
+        self.assertListEqual(["age", "city"], audience_data.columns.tolist())
+        self.assertEqual("Int64", audience_data["age"].dtype)
+        self.assertListEqual(["Chicago", None], audience_data["city"].tolist())
+
+    def test_build_column(self):
+        """Test integers stay exact and values that do not convert to the
+        type are kept as is."""
+
+        column = idr.build_column([2**53 + 1, None], int)
+        self.assertEqual(2**53 + 1, column[0])
+        self.assertTrue(pd.isna(column[1]))
+
+        column = idr.build_column([2**53 + 1, 3], int)
+        self.assertEqual(np.int64, column.dtype)
+        self.assertListEqual([2**53 + 1, 3], column.tolist())
+
+        column = idr.build_column([1, "n/a", None], float)
+        self.assertEqual(object, column.dtype)
+        self.assertListEqual([1, "n/a", None], column.tolist())
@@ -0,0 +1,229 @@
+"""Ingestion pipeline tests."""
+
+import threading
+import time
+import unittest
+from typing import Iterator
+from unittest import mock
+
+import mongomock
+import pandas as pd
+from bson import ObjectId
+
+import huxunifylib.database.constants as db_c
+import huxunifylib.database.data_management as dm
+from huxunifylib.database.client import DatabaseClient
+from huxunifylib.database.ingestion_pipeline import run_ingestion_pipeline
+
+BATCHES = 7
+BATCH_ROWS = 3
+
+
+def get_batches() -> Iterator[pd.DataFrame]:
+    """Get ingested data batches.
+
+    Yields:
+        Iterator[pd.DataFrame]: Ingested data batches.
+    """
+
+    cities = ["New York", "Chicago", None, "Boston"]
+    for batch in range(BATCHES):
+        rows = range(batch * BATCH_ROWS, (batch + 1) * BATCH_ROWS)
+        yield pd.DataFrame(
+            {
+                db_c.S_TYPE_EMAIL: [f"email_{x}" for x in rows],
+                db_c.S_TYPE_CITY: [cities[x % len(cities)] for x in rows],
+                db_c.S_TYPE_GENDER: ["m" if x % 3 else "f" for x in rows],
+                "not_in_data_source": rows,
+            }
+        )
+
+
+class TestIngestionPipeline(unittest.TestCase):
+    """Test storing ingested data through the ingestion pipeline."""
+
+    @mongomock.patch(servers=(("localhost", 27017),))
+    def setUp(self):
+
+        self.database = DatabaseClient(host="localhost", port=27017).connect()
+        self.database.drop_database(db_c.DATA_MANAGEMENT_DATABASE)
+
+        data_source_doc = dm.set_data_source(
+            self.database,
+            "My data source",
+            1,
+            "CSV",
+            "S3",
+            None,
+            [
+                {"header": "email", "special_type": db_c.S_TYPE_EMAIL},
+                {"header": "city", "special_type": db_c.S_TYPE_CITY},
+                {"header": "gender", "special_type": db_c.S_TYPE_GENDER},
+            ],
+        )
+        self.ingestion_job_id = dm.set_ingestion_job(
+            self.database, data_source_doc[db_c.ID]
+        )[db_c.ID]
+        self.other_ingestion_job_id = dm.set_ingestion_job(
+            self.database, data_source_doc[db_c.ID]
+        )[db_c.ID]
+
+    def test_run_ingestion_pipeline(self):
+        """Test the pipeline stores the data and statistics of every
+        batch, as appending them one after another does."""
+
+        self.assertTrue(
+            run_ingestion_pipeline(
+                self.database,
+                self.ingestion_job_id,
+                get_batches(),
+                transform_workers=1,
+                insert_workers=2,
+                queue_size=2,
+                stats_flush_batches=3,
+            )
+        )
+
+        for batch in get_batches():
+            dm.append_ingested_data_stats(
+                self.database, self.other_ingestion_job_id, batch
+            )
+
+        docs = list(
+            self.database[db_c.DATA_MANAGEMENT_DATABASE][
+                db_c.INGESTED_DATA_COLLECTION
+            ].find({db_c.JOB_ID: self.ingestion_job_id})
+        )
+        self.assertEqual(len(docs), BATCHES * BATCH_ROWS)
+        self.assertTrue(
+            all(x[db_c.INGESTED_DATA][db_c.S_TYPE_CUSTOMER_ID] for x in docs)
+        )
+
+        stats_doc = dm.get_ingested_data_stats(
+            self.database, self.ingestion_job_id
+        )
+        expected_stats_doc = dm.get_ingested_data_stats(
+            self.database, self.other_ingestion_job_id
+        )
+        self.assertEqual(stats_doc[db_c.DATA_COUNT], BATCHES * BATCH_ROWS)
+        self.assertNotIn("not_in_data_source", stats_doc)
+        for field in [
+            db_c.S_TYPE_EMAIL,
+            db_c.S_TYPE_CITY,
+            db_c.S_TYPE_GENDER,
+            db_c.STATS_SKETCHES,
+        ]:
+            self.assertEqual(stats_doc[field], expected_stats_doc[field])
+
+    def test_run_ingestion_pipeline_backpressure(self):
+        """Test batches are not read ahead of a blocked insert stage."""
+
+        batches_read = []
+        release = threading.Event()
+
+        def read_batches() -> Iterator[pd.DataFrame]:
+            """Read the batches, recording each batch read.
+
+            Yields:
+                Iterator[pd.DataFrame]: Ingested data batches.
+            """
+
+            for batch in get_batches():
+                batches_read.append(batch)
+                yield batch
+
+        def blocked_insert(
+            _database: DatabaseClient,
+            _ingestion_job_id: ObjectId,
+            _ingested_data: pd.DataFrame,
+        ) -> bool:
+            """Insert a batch once the insert stage is released.
+
+            Returns:
+                bool: Success flag.
+            """
+
+            release.wait()
+            return True
+
+        with mock.patch.object(
+            dm, "insert_ingested_data", side_effect=blocked_insert
+        ):
+            results = []
+            pipeline = threading.Thread(
+                target=lambda: results.append(
+                    run_ingestion_pipeline(
+                        self.database,
+                        self.ingestion_job_id,
+                        read_batches(),
+                        transform_workers=1,
+                        insert_workers=1,
+                        queue_size=1,
+                    )
+                )
+            )
+            pipeline.start()
+            time.sleep(1)
+
+            # one batch is inserted, one queued, one handed off and one
+            # transformed while the insert is blocked.
+            self.assertLessEqual(len(batches_read), 4)
+
+            release.set()
+            pipeline.join()
+
+        self.assertEqual(results, [True])
+        self.assertEqual(len(batches_read), BATCHES)
+
+    def test_run_ingestion_pipeline_insert_failure(self):
+        """Test a failing insert stage fails the pipeline without blocking
+        it, and the statistics are not stored."""
+
+        with mock.patch.object(
+            dm, "insert_ingested_data", side_effect=RuntimeError("failed")
+        ):
+            self.assertFalse(
+                run_ingestion_pipeline(
+                    self.database,
+                    self.ingestion_job_id,
+                    get_batches(),
+                    transform_workers=1,
+                    insert_workers=1,
+                    queue_size=1,
+                )
+            )
+
+        self.assertIsNone(
+            dm.get_ingested_data_stats(self.database, self.ingestion_job_id)
+        )
+
+    def test_run_ingestion_pipeline_read_failure(self):
+        """Test a failure reading the batches is raised once the stages
+        end, and the pending statistics are not stored."""
+
+        def read_batches() -> Iterator[pd.DataFrame]:
+            """Read two batches, then fail.
+
+            Yields:
+                Iterator[pd.DataFrame]: Ingested data batches.
+
+            Raises:
+                ValueError: Reading the third batch.
+            """
+
+            yield from list(get_batches())[:2]
+            raise ValueError("failed")
+
+        with self.assertRaises(ValueError):
+            run_ingestion_pipeline(
+                self.database,
+                self.ingestion_job_id,
+                read_batches(),
+                transform_workers=1,
+                insert_workers=1,
+                queue_size=1,
+            )
+
+        self.assertIsNone(
+            dm.get_ingested_data_stats(self.database, self.ingestion_job_id)
+        )
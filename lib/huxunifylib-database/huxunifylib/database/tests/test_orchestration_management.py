@@ -14,6 +14,11 @@ from huxunifylib.database.audience_management import (
 from huxunifylib.database.user_management import set_user
 import huxunifylib.database.constants as db_c
 from huxunifylib.database.client import DatabaseClient
+from huxunifylib.database.cache_management import (
+    create_cache_entry,
+    get_cache_entry,
+    get_cache_tag,
+)
 import huxunifylib.database.db_exceptions as de
 
 
@@ -217,6 +222,25 @@ class TestAudienceManagement(unittest.TestCase):
         self.assertTrue(db_c.AUDIENCE_NAME in doc)
         self.assertEqual(doc[db_c.AUDIENCE_NAME], new_name)
 
+    def test_update_audience_invalidates_cache(self):
+        """Test updating an audience removes the cache entries tagged with
+        it."""
+
+        set_audience = self._setup_audience()
+        audience_id = set_audience[0][db_c.ID]
+        create_cache_entry(
+            self.database,
+            "audience_insights",
+            {"size": 1},
+            tags=[get_cache_tag(db_c.CACHE_TAG_AUDIENCE, audience_id)],
+        )
+
+        am.update_audience(
+            self.database, audience_id, self.user_name, "New name"
+        )
+
+        self.assertFalse(get_cache_entry(self.database, "audience_insights"))
+
     def test_update_audience_name_unchanged(self):
         """Test update audience and check name remains unchanged"""
 
@@ -0,0 +1,233 @@
+"""Statistics sketches tests."""
+
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+import huxunifylib.database.constants as db_c
+import huxunifylib.database.stats_sketches as sketches
+from huxunifylib.database.audience_data_management_util import (
+    add_stats_to_update_dict,
+)
+
+
+class TestStatsSketches(unittest.TestCase):
+    """Test mergeable sketches of statistics/insights documents."""
+
+    def test_estimate_distinct(self):
+        """Test estimating distinct values of a distinct count sketch."""
+
+        registers = sketches.load_distinct_sketch(None)
+        self.assertEqual(sketches.estimate_distinct(registers), 0)
+
+        sketches.update_distinct_sketch(
+            registers, pd.Series([f"city_{x % 50000}" for x in range(100000)])
+        )
+        self.assertAlmostEqual(
+            sketches.estimate_distinct(registers), 50000, delta=50000 * 0.05
+        )
+
+        # stored registers load to the same estimate.
+        stored = sketches.dump_distinct_sketch(registers)
+        self.assertEqual(len(stored), 1 << db_c.STATS_DISTINCT_PRECISION)
+        self.assertEqual(
+            sketches.estimate_distinct(sketches.load_distinct_sketch(stored)),
+            sketches.estimate_distinct(registers),
+        )
+
+    def test_merge_distinct_sketches(self):
+        """Test merged distinct count sketches equal the sketch of all
+        values."""
+
+        values = pd.Series([f"zip_{x}" for x in range(20000)])
+
+        registers = sketches.load_distinct_sketch(None)
+        sketches.update_distinct_sketch(registers, values)
+
+        first = sketches.load_distinct_sketch(None)
+        sketches.update_distinct_sketch(first, values[:12000])
+        second = sketches.load_distinct_sketch(None)
+        sketches.update_distinct_sketch(second, values[8000:])
+
+        self.assertTrue(
+            (
+                sketches.merge_distinct_sketches(first, second) == registers
+            ).all()
+        )
+
+    def test_merge_top_values(self):
+        """Test merging value counts into top values, exact until the
+        summary is full."""
+
+        top_values = sketches.merge_top_values(
+            [], pd.Series(["a", "b", "a", "c"]).value_counts(), 3
+        )
+        top_values = sketches.merge_top_values(
+            top_values, pd.Series(["a", "c"]).value_counts(), 3
+        )
+        self.assertEqual(top_values, [["a", 3, 0], ["c", 2, 0], ["b", 1, 0]])
+
+        # a new value may have been dropped by the full summary.
+        top_values = sketches.merge_top_values(
+            top_values, pd.Series(["d", "d"]).value_counts(), 3
+        )
+        self.assertEqual(top_values, [["a", 3, 0], ["d", 3, 1], ["c", 2, 0]])
+
+    def test_add_stats_to_update_dict(self):
+        """Test statistics updates increment counts and keep sketches."""
+
+        new_data = pd.DataFrame(
+            {
+                db_c.S_TYPE_CITY: ["New York", "Chicago", None, "New York"],
+                db_c.S_TYPE_EMAIL: ["a", "b", "c", None],
+            }
+        )
+
+        update_doc = add_stats_to_update_dict({db_c.JOB_ID: 1}, new_data, None)
+
+        self.assertEqual(
+            update_doc["$inc"],
+            {db_c.DATA_COUNT: 4},
+        )
+        update_dict = update_doc["$set"]
+        self.assertEqual(update_dict[db_c.JOB_ID], 1)
+        self.assertEqual(
+            update_dict[db_c.S_TYPE_CITY],
+            {
+                db_c.STATS_COVERAGE: 0.75,
+                db_c.STATS_BREAKDOWN: {"New York": 2 / 3, "Chicago": 1 / 3},
+            },
+        )
+        self.assertEqual(
+            update_dict[db_c.S_TYPE_EMAIL], {db_c.STATS_COVERAGE: 0.75}
+        )
+        self.assertEqual(
+            update_dict[
+                f"{db_c.STATS_SKETCHES}.{db_c.S_TYPE_CITY}.{db_c.DATA_COUNT}"
+            ],
+            3,
+        )
+        self.assertEqual(
+            update_dict[
+                f"{db_c.STATS_SKETCHES}.{db_c.S_TYPE_CITY}."
+                f"{db_c.STATS_TOP_VALUES}"
+            ],
+            [["New York", 2, 0], ["Chicago", 1, 0]],
+        )
+        self.assertNotIn(
+            f"{db_c.STATS_SKETCHES}.{db_c.S_TYPE_EMAIL}."
+            f"{db_c.STATS_TOP_VALUES}",
+            update_dict,
+        )
+
+        # counts of fields with sketches are incremented.
+        old_stats_doc = {
+            db_c.DATA_COUNT: 4,
+            db_c.STATS_SKETCHES: {
+                db_c.S_TYPE_CITY: {
+                    db_c.DATA_COUNT: 3,
+                    db_c.STATS_DISTINCT_SKETCH: update_dict[
+                        f"{db_c.STATS_SKETCHES}.{db_c.S_TYPE_CITY}."
+                        f"{db_c.STATS_DISTINCT_SKETCH}"
+                    ],
+                    db_c.STATS_TOP_VALUES: [
+                        ["New York", 2, 0],
+                        ["Chicago", 1, 0],
+                    ],
+                }
+            },
+        }
+
+        update_doc = add_stats_to_update_dict(
+            {}, new_data[[db_c.S_TYPE_CITY]], old_stats_doc
+        )
+
+        self.assertEqual(
+            update_doc["$inc"],
+            {
+                db_c.DATA_COUNT: 4,
+                f"{db_c.STATS_SKETCHES}.{db_c.S_TYPE_CITY}.{db_c.DATA_COUNT}": 3,
+            },
+        )
+        self.assertEqual(
+            update_doc["$set"][db_c.S_TYPE_CITY][db_c.STATS_BREAKDOWN],
+            {"New York": 4 / 6, "Chicago": 2 / 6},
+        )
+
+    def test_add_stats_to_update_dict_legacy_doc(self):
+        """Test statistics documents stored before the sketches are merged
+        from their coverage and breakdown."""
+
+        old_stats_doc = {
+            db_c.DATA_COUNT: 4,
+            db_c.S_TYPE_GENDER: {
+                db_c.STATS_COVERAGE: 0.5,
+                db_c.STATS_BREAKDOWN: {"m": 0.5, "f": 0.5},
+            },
+        }
+
+        update_doc = add_stats_to_update_dict(
+            {},
+            pd.DataFrame({db_c.S_TYPE_GENDER: ["f", "f", "other", None]}),
+            old_stats_doc,
+        )
+
+        update_dict = update_doc["$set"]
+        self.assertEqual(
+            update_dict[db_c.S_TYPE_GENDER],
+            {
+                db_c.STATS_COVERAGE: 5 / 8,
+                db_c.STATS_BREAKDOWN: {"f": 0.6, "m": 0.2, "other": 0.2},
+            },
+        )
+        self.assertEqual(
+            update_dict[
+                f"{db_c.STATS_SKETCHES}.{db_c.S_TYPE_GENDER}.{db_c.DATA_COUNT}"
+            ],
+            5,
+        )
+        self.assertEqual(
+            sketches.estimate_distinct(
+                sketches.load_distinct_sketch(
+                    update_dict[
+                        f"{db_c.STATS_SKETCHES}.{db_c.S_TYPE_GENDER}."
+                        f"{db_c.STATS_DISTINCT_SKETCH}"
+                    ]
+                )
+            ),
+            3,
+        )
+
+    def test_add_stats_to_update_dict_high_cardinality(self):
+        """Test breakdowns of high cardinality fields keep the top values."""
+
+        new_data = pd.DataFrame(
+            {"zip": ["00001"] * 50 + [f"{x:05d}" for x in range(2, 202)]}
+        )
+
+        with mock.patch.object(db_c, "STATS_TOP_VALUES_SIZE", 10):
+            update_doc = add_stats_to_update_dict({}, new_data, None, ["zip"])
+
+        update_dict = update_doc["$set"]
+        self.assertEqual(len(update_dict["zip"][db_c.STATS_BREAKDOWN]), 10)
+        self.assertEqual(
+            update_dict["zip"][db_c.STATS_BREAKDOWN]["00001"], 0.2
+        )
+        self.assertAlmostEqual(
+            sketches.get_distinct_count(
+                {
+                    db_c.STATS_SKETCHES: {
+                        "zip": {
+                            db_c.STATS_DISTINCT_SKETCH: update_dict[
+                                f"{db_c.STATS_SKETCHES}.zip."
+                                f"{db_c.STATS_DISTINCT_SKETCH}"
+                            ]
+                        }
+                    }
+                },
+                "zip",
+            ),
+            201,
+            delta=201 * 0.05,
+        )
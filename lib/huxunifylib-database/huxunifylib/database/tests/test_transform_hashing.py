@@ -0,0 +1,150 @@
+"""Columnar normalizing and hashing of PII transforms unittests."""
+import hashlib
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from pandas._testing import assert_series_equal
+
+from huxunifylib.database.transform import bypass_if_any_empty, hashed
+from huxunifylib.database.transform import columnar
+
+
+@bypass_if_any_empty
+@hashed
+def strip_space_lower_case_hashed(value):
+    """Normalize and hash a value or a column, as the row-wise transforms
+    do.
+
+    Args:
+        value (Union[str, pd.Series]): Value or column to transform.
+
+    Returns:
+        Union[str, pd.Series]: Hashed value or column.
+    """
+
+    if isinstance(value, pd.Series):
+        return columnar.strip_space_lower_case(value)
+    return value.strip().lower()
+
+
+class TestTransformHashing(unittest.TestCase):
+    """Columns are normalized and hashed as a whole."""
+
+    def setUp(self):
+        """Setup values of the tests."""
+
+        self.values = pd.Series(
+            [" John@Example.com ", None, "jane@example.com", np.nan, "ANN"],
+            index=[10, 11, 12, 13, 14],
+            name="email",
+        )
+
+    def test_strip_space_lower_case(self):
+        """Values are normalized, empty values stay empty."""
+
+        assert_series_equal(
+            pd.Series(
+                ["john@example.com", None, "jane@example.com", None, "ann"],
+                index=self.values.index,
+                name="email",
+                dtype=object,
+            ),
+            columnar.strip_space_lower_case(self.values),
+        )
+
+    def test_hash_series(self):
+        """Chunks of values are hashed in order, empty values stay empty."""
+
+        expected = [
+            hashlib.sha256(x.encode()).hexdigest()
+            if isinstance(x, str)
+            else None
+            for x in self.values
+        ]
+
+        for max_workers in [None, 2]:
+            hashes = columnar.hash_series(
+                self.values, chunk_size=2, max_workers=max_workers
+            )
+            self.assertListEqual(expected, hashes.tolist())
+            self.assertListEqual(
+                self.values.index.tolist(), hashes.index.tolist()
+            )
+
+    def test_empty_mask(self):
+        """Rows with any empty column are masked."""
+
+        self.assertListEqual(
+            [False, True, False, True, True],
+            columnar.empty_mask(
+                self.values,
+                pd.Series([1, 2, 3, 4, None], index=[10, 11, 12, 13, 14]),
+            ).tolist(),
+        )
+
+    def test_decorators_match_row_wise(self):
+        """The decorated function gives the same result on a column as on
+        each of its values."""
+
+        self.assertListEqual(
+            [strip_space_lower_case_hashed(x) for x in self.values],
+            strip_space_lower_case_hashed(self.values).tolist(),
+        )
+
+    def test_hashed_max_workers(self):
+        """The workers of the hashed decorator hash the columns."""
+
+        @hashed(max_workers=2)
+        def lower_case_hashed(value):
+            """Lower case a column.
+
+            Args:
+                value (pd.Series): Column.
+
+            Returns:
+                pd.Series: Lower cased column.
+            """
+
+            return value.str.lower()
+
+        with mock.patch(
+            "huxunifylib.database.transform.hash_series",
+            wraps=columnar.hash_series,
+        ) as hash_series:
+            self.assertListEqual(
+                strip_space_lower_case_hashed(self.values.dropna()).tolist(),
+                lower_case_hashed(self.values.dropna().str.strip()).tolist(),
+            )
+
+        self.assertEqual(
+            2, hash_series.call_args_list[-1].kwargs["max_workers"]
+        )
+
+    def test_bypass_if_any_empty_list_result(self):
+        """A list result is aligned to the rows that have no empty field."""
+
+        @bypass_if_any_empty
+        def lower_case(value):
+            """Lower case a value or each value of a column.
+
+            Args:
+                value (Union[str, pd.Series]): Value or column.
+
+            Returns:
+                Union[str, list]: Lower cased value or values.
+            """
+
+            if isinstance(value, pd.Series):
+                return [x.lower() for x in value]
+            return value.lower()
+
+        assert_series_equal(
+            pd.Series(
+                [" john@example.com ", None, "jane@example.com", None, "ann"],
+                index=self.values.index,
+                dtype=object,
+            ),
+            lower_case(self.values),
+        )
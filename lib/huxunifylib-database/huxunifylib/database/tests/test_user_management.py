@@ -586,3 +586,30 @@ class TestUserManagement(unittest.TestCase):
 
         self.assertTrue(trust_id_segments)
         self.assertEqual([segment], trust_id_segments)
+
+    def test_user_change_listener(self):
+        """Test user change listeners are notified of user writes."""
+
+        changed_okta_ids = []
+        um.add_user_change_listener(changed_okta_ids.append)
+        self.addCleanup(
+            um.USER_CHANGE_LISTENERS.remove, changed_okta_ids.append
+        )
+
+        okta_id = self.user_doc[db_c.OKTA_ID]
+        um.update_user(self.database, okta_id, {db_c.USER_LOGIN_COUNT: 1})
+        um.manage_user_favorites(
+            self.database, okta_id, db_c.AUDIENCES, self.audience[db_c.ID]
+        )
+        um.manage_user_dashboard_config(
+            database=self.database,
+            okta_id=okta_id,
+            config_key="pin_key_perf_insights",
+            config_value=True,
+        )
+        um.update_all_users(self.database, {db_c.USER_LOGIN_COUNT: 2})
+        um.delete_user(self.database, okta_id)
+
+        self.assertListEqual(
+            [okta_id, okta_id, okta_id, None, okta_id], changed_okta_ids
+        )
@@ -1,19 +1,34 @@
 """Transform utilities."""
 
-from functools import wraps
-import hashlib
+from functools import partial, wraps
+from typing import Callable, Optional
+
 import pandas as pd
 
+from huxunifylib.database.transform.columnar import (
+    empty_mask,
+    hash_series,
+    hash_values,
+)
+from huxunifylib.database.transform.const import HASH_WORKERS
+
 
-def hashed(func):
-    """Hashing decorator.
+def hashed(func: Callable = None, max_workers: Optional[int] = HASH_WORKERS):
+    """Hashing decorator, columns returned by the function are hashed as a
+    whole. Used as @hashed, or as @hashed(max_workers=4) to hash the chunks
+    of large columns on a process pool.
     Args:
         func (func): function to be hashed.
+        max_workers (Optional[int]): Worker processes hashing the chunks of
+            a column, see columnar.hash_series.
 
     Returns:
         func: hashing wrapper decorator
     """
 
+    if func is None:
+        return partial(hashed, max_workers=max_workers)
+
     @wraps(func)
     def wrapper(*args, **kwargs):
         """Hashing function.
@@ -22,18 +37,21 @@ def hashed(func):
             kwargs (dict): function keyword arguments.
 
         Returns:
-            hex: hashed value
+            hex: hashed value, or pd.Series of hashed values
         """
         result = func(*args, **kwargs)
+        if isinstance(result, pd.Series):
+            return hash_series(result, max_workers=max_workers)
         if result is not None:
-            return hashlib.sha256(result.encode("utf-8")).hexdigest()
+            return hash_values([result])[0]
         return None
 
     return wrapper
 
 
 def bypass_if_any_empty(func):
-    """Decorator for bypassing empty fields.
+    """Decorator for bypassing empty fields. If any argument is a column, the
+    function is called once with the rows that have no empty field.
 
     Args:
         func (func): function with bypass of empty fields.
@@ -50,10 +68,31 @@ def bypass_if_any_empty(func):
             kwargs (dict): function keyword arguments.
 
         Returns:
-            func: decorated function result.
+            func: decorated function result, None for the bypassed rows.
         """
 
-        for arg_val in list(args) + list(kwargs.values()):
+        arg_vals = list(args) + list(kwargs.values())
+        columns = [x for x in arg_vals if isinstance(x, pd.Series)]
+        if columns:
+            keep = ~empty_mask(*arg_vals)
+            result = func(
+                *[x[keep] if isinstance(x, pd.Series) else x for x in args],
+                **{
+                    key: x[keep] if isinstance(x, pd.Series) else x
+                    for key, x in kwargs.items()
+                },
+            )
+            # results that are not columns, such as lists, are aligned to
+            # the rows kept.
+            if not isinstance(result, pd.Series):
+                result = pd.Series(result, index=columns[0].index[keep])
+            return (
+                result.astype(object)
+                .reindex(columns[0].index)
+                .where(keep, None)
+            )
+
+        for arg_val in arg_vals:
             if arg_val is pd.NA or arg_val is None or pd.isna(arg_val):
                 return None
 
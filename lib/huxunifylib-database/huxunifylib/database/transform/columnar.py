@@ -0,0 +1,99 @@
+"""Columnar transform utilities, normalizing and hashing whole columns
+instead of one value at a time."""
+
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from huxunifylib.database.transform.const import HASH_CHUNK_SIZE
+
+
+def empty_mask(*columns: Union[pd.Series, object]) -> np.ndarray:
+    """Mask rows where any of the columns is empty.
+
+    Args:
+        *columns (Union[pd.Series, object]): Columns of the same length,
+            scalars apply to every row.
+
+    Returns:
+        np.ndarray: Boolean mask, True where any column is empty.
+    """
+
+    series = [column for column in columns if isinstance(column, pd.Series)]
+    mask = np.zeros(len(series[0]) if series else 1, dtype=bool)
+    for column in columns:
+        mask |= np.asarray(pd.isna(column), dtype=bool)
+
+    return mask
+
+
+def strip_space_lower_case(series: pd.Series) -> pd.Series:
+    """Strip surrounding spaces of and lower case all values of a column,
+    empty values stay empty.
+
+    Args:
+        series (pd.Series): Column to normalize.
+
+    Returns:
+        pd.Series: Normalized column.
+    """
+
+    mask = series.isna()
+    normalized = series[~mask].astype(str).str.strip().str.lower()
+
+    return normalized.reindex(series.index).astype(object).where(~mask, None)
+
+
+def hash_values(values: List[str]) -> List[str]:
+    """Hash string values with SHA-256.
+
+    Args:
+        values (List[str]): Values to hash.
+
+    Returns:
+        List[str]: Hex digests of the values, in order.
+    """
+
+    sha256 = hashlib.sha256
+    return [sha256(value.encode("utf-8")).hexdigest() for value in values]
+
+
+def hash_series(
+    series: pd.Series,
+    chunk_size: int = HASH_CHUNK_SIZE,
+    max_workers: Optional[int] = None,
+) -> pd.Series:
+    """Hash all values of a column with SHA-256 in chunks, empty values
+    stay empty.
+
+    Args:
+        series (pd.Series): Column of string values to hash.
+        chunk_size (int): Values hashed per chunk.
+        max_workers (Optional[int]): Worker processes hashing the chunks,
+            the chunks are hashed in this process if not set or if there is
+            only one chunk.
+
+    Returns:
+        pd.Series: Column of hex digests with the index of the column.
+    """
+
+    mask = series.isna().to_numpy()
+    values = series.to_numpy(dtype=object)[~mask].astype(str).tolist()
+    chunks = [
+        values[start : start + chunk_size]
+        for start in range(0, len(values), chunk_size)
+    ]
+
+    if max_workers and max_workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            hashed_chunks = list(executor.map(hash_values, chunks))
+    else:
+        hashed_chunks = [hash_values(chunk) for chunk in chunks]
+
+    hashes = np.full(len(series), None, dtype=object)
+    hashes[~mask] = [value for chunk in hashed_chunks for value in chunk]
+
+    return pd.Series(hashes, index=series.index, name=series.name)
@@ -90,3 +90,11 @@ FILE_UPLOAD_AMAZON_FIELD_MAP = {
         dc.S_TYPE_ADDRESS: "address",
     },
 }
+
+# values hashed per chunk by the columnar hashing, each chunk is hashed by
+# one worker process when a process pool is used.
+HASH_CHUNK_SIZE = 100000
+
+# worker processes hashing the chunks of a column for the hashed decorator,
+# the chunks are hashed in the calling process if 1.
+HASH_WORKERS = 1
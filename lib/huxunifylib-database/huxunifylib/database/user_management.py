@@ -2,8 +2,10 @@
 
 import logging
 import datetime
+import inspect
 import re
-from typing import Any, Union
+from functools import wraps
+from typing import Any, Callable, Union
 from bson import ObjectId
 import pymongo
 from pymongo import ReturnDocument
@@ -53,6 +55,78 @@ USER_LOOKUP_PIPELINE = [
     {"$project": {"created_user": 0, "updated_user": 0}},
 ]
 
+# listeners called with the okta_id of a changed user, or None if any user
+# may have changed, so callers caching user documents can invalidate them.
+USER_CHANGE_LISTENERS = []
+
+
+def add_user_change_listener(listener: Callable) -> None:
+    """A function to register a listener for user document changes.
+
+    Args:
+        listener (Callable): Function called with the okta_id of a changed
+            user, or None if any user may have changed.
+    """
+
+    if listener not in USER_CHANGE_LISTENERS:
+        USER_CHANGE_LISTENERS.append(listener)
+
+
+def notify_user_change(okta_id: Union[str, None]) -> None:
+    """A function to notify the user change listeners.
+
+    Args:
+        okta_id (Union[str, None]): Okta ID of the changed user, None if any
+            user may have changed.
+    """
+
+    for listener in USER_CHANGE_LISTENERS:
+        try:
+            listener(okta_id)
+        except Exception as exc:  # pylint: disable=broad-except
+            logging.error(exc)
+
+
+def changes_user(in_function: Callable) -> Callable:
+    """Decorator notifying the user change listeners after a function
+    writing to the user collection, using its okta_id argument.
+
+    Args:
+        in_function (Callable): function writing to the user collection.
+
+    Returns:
+        Callable: wrapped function.
+    """
+
+    signature = inspect.signature(in_function)
+
+    @wraps(in_function)
+    def wrapper(*args, **kwargs) -> Any:
+        """Call the function and notify the user change listeners.
+
+        Args:
+            *args (object): function arguments.
+            **kwargs (dict): function keyword arguments.
+
+        Returns:
+            Any: result of the function.
+        """
+
+        try:
+            okta_id = signature.bind(*args, **kwargs).arguments.get(
+                db_c.OKTA_ID
+            )
+        except TypeError:
+            # invalid arguments, let the function raise.
+            return in_function(*args, **kwargs)
+
+        try:
+            return in_function(*args, **kwargs)
+        finally:
+            notify_user_change(okta_id)
+
+    return wrapper
+
 
 @retry(
     wait=wait_fixed(db_c.CONNECT_RETRY_INTERVAL),
@@ -229,6 +303,7 @@ def get_all_users(
     wait=wait_fixed(db_c.CONNECT_RETRY_INTERVAL),
     retry=retry_if_exception_type(pymongo.errors.AutoReconnect),
 )
+@changes_user
 def delete_user(
     database: DatabaseClient,
     okta_id: str = None,
@@ -264,6 +339,7 @@ def delete_user(
     wait=wait_fixed(db_c.CONNECT_RETRY_INTERVAL),
     retry=retry_if_exception_type(pymongo.errors.AutoReconnect),
 )
+@changes_user
 def update_user(
     database: DatabaseClient, okta_id: str, update_doc: dict
 ) -> Union[dict, None]:
@@ -334,6 +410,7 @@ def update_user(
     wait=wait_fixed(db_c.CONNECT_RETRY_INTERVAL),
     retry=retry_if_exception_type(pymongo.errors.AutoReconnect),
 )
+@changes_user
 def delete_favorite_from_all_users(
     database: DatabaseClient, component_name: str, component_id: ObjectId
 ) -> bool:
@@ -372,6 +449,7 @@ def delete_favorite_from_all_users(
     return False
 
 
+@changes_user
 def update_all_users(
     database: DatabaseClient, update_doc: dict
 ) -> Union[dict, None]:
@@ -433,6 +511,7 @@ def update_all_users(
     wait=wait_fixed(db_c.CONNECT_RETRY_INTERVAL),
     retry=retry_if_exception_type(pymongo.errors.AutoReconnect),
 )
+@changes_user
 def manage_user_favorites(
     database: DatabaseClient,
     okta_id: str,
@@ -519,6 +598,7 @@ def manage_user_favorites(
     wait=wait_fixed(db_c.CONNECT_RETRY_INTERVAL),
     retry=retry_if_exception_type(pymongo.errors.AutoReconnect),
 )
+@changes_user
 def manage_user_dashboard_config(
     database: DatabaseClient,
     okta_id: str,
@@ -572,6 +652,7 @@ def manage_user_dashboard_config(
     wait=wait_fixed(db_c.CONNECT_RETRY_INTERVAL),
     retry=retry_if_exception_type(pymongo.errors.AutoReconnect),
 )
+@changes_user
 def update_user_applications(
     database: DatabaseClient,
     okta_id: str,
@@ -616,6 +697,7 @@ def update_user_applications(
     wait=wait_fixed(db_c.CONNECT_RETRY_INTERVAL),
     retry=retry_if_exception_type(pymongo.errors.AutoReconnect),
 )
+@changes_user
 def add_applications_to_users(
     database: DatabaseClient,
     okta_id: str,
@@ -743,6 +825,7 @@ def get_user_applications(
     return None
 
 
+@changes_user
 def add_user_trust_id_segments(
     database: DatabaseClient, okta_id: str, segment: dict
 ) -> Union[list, None]:
@@ -775,6 +858,7 @@ def add_user_trust_id_segments(
     return None
 
 
+@changes_user
 def remove_user_trust_id_segments(
     database: DatabaseClient, okta_id: str, segment_name: str
 ) -> Union[list, None]:
@@ -1,9 +1,8 @@
-"""Database client tests."""
+"""Database indexes script tests."""
+import runpy
 from unittest import TestCase, mock
 import mongomock
-from huxunifylib.database import constants as db_c
-from pymongo import ASCENDING
-import database.create_database_indexes as cdi
+from huxunifylib.database.index_management import get_index_specs
 
 
 class TestCreateDBIndexes(TestCase):
@@ -18,30 +17,24 @@ class TestCreateDBIndexes(TestCase):
         # setup the mock DB client
         self.database = mongomock.MongoClient("localhost", 27017)
 
+        mock.patch(
+            "database.share.get_mongo_client", return_value=self.database
+        ).start()
+
         self.addCleanup(mock.patch.stopall)
 
-    def test_set_indexes(self):
-        """Unit Test for set Indexes."""
-
-        index_list = [
-            (
-                db_c.DATA_MANAGEMENT_DATABASE,
-                db_c.INGESTION_JOBS_COLLECTION,
-                [(db_c.DATA_SOURCE_ID, ASCENDING)],
-            ),
-        ]
-        cdi.set_indexes(self.database, index_list)
-        ingestion_jobs_collection = self.database[
-            db_c.DATA_MANAGEMENT_DATABASE
-        ][db_c.INGESTION_JOBS_COLLECTION]
-        self.assertTrue(ingestion_jobs_collection.index_information())
-
-    def test_add_unique_compound_index(self):
-        """Unit Test for set Indexes."""
-
-        cdi.add_unique_compound_index(self.database)
-        ing_collection = self.database[db_c.DATA_MANAGEMENT_DATABASE][
-            db_c.INGESTED_DATA_COLLECTION
-        ]
-
-        self.assertTrue(list(ing_collection.list_indexes()))
+    def test_create_database_indexes(self):
+        """Test running the script creates the indexes of the registry."""
+
+        runpy.run_module(
+            "database.create_database_indexes", run_name="__main__"
+        )
+
+        for database_name, collection_name, keys, _ in get_index_specs():
+            index_keys = [
+                index["key"]
+                for index in self.database[database_name][collection_name]
+                .index_information()
+                .values()
+            ]
+            self.assertIn(keys, index_keys)